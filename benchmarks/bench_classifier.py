@@ -0,0 +1,153 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_classifier.py: Offline packet classification against a large flow
+                     table with 'FlowClassifier' (build time, single
+                     lookups and batch lookups, packets per second)
+
+The flow table mixes L2-L4 flow entries (see 'fixtures.make_flows') with
+a few wildcard ones; two thirds of the packets are generated from the
+flow entries, the rest are random.
+
+Example:
+
+    PYTHONPATH=. python benchmarks/bench_classifier.py --flows 100000 \\
+        --packets 1000000
+
+
+"""
+
+import sys
+import random
+
+from benchutil import arg_parser, best_of, report
+from fixtures import make_flows
+from pysdn.openflowdev.ofswitch import FlowEntry
+
+try:
+    from pysdn.openflowdev.classifier import FlowClassifier
+except ImportError:
+    # not available in the library code of a baseline revision
+    FlowClassifier = None
+
+FIELDS = ('in_port', 'eth_type', 'eth_src', 'ipv4_dst', 'ip_proto',
+          'tcp_dst')
+
+
+def make_table(count):
+    flows = [FlowEntry(flow_dict=d) for d in make_flows(count)]
+    for i, match in enumerate([
+            {},
+            {'ethernet-match': {'ethernet-type': {'type': 2048}}},
+            {'ethernet-match': {'ethernet-type': {'type': 2048}},
+             'ipv4-destination': '10.0.0.0/8'},
+            {'ethernet-match': {'ethernet-type': {'type': 2048}},
+             'ip-match': {'ip-protocol': 6},
+             'tcp-destination-port': 22}]):
+        flows.append(FlowEntry(flow_dict={'id': 'wildcard-%d' % i,
+                                          'table_id': 0,
+                                          'priority': i,
+                                          'match': match}))
+    return flows
+
+
+def make_packets(count, flows, seed=1):
+    """ Returns header rows (values of FIELDS). """
+    rnd = random.Random(seed)
+    data = make_flows(len(flows) - 4)
+    packets = []
+    for _ in range(count):
+        if rnd.random() < 0.67:
+            m = rnd.choice(data)['match']
+            packets.append((
+                m['in-port'],
+                0x800,
+                m['ethernet-match']['ethernet-source']['address'],
+                m['ipv4-destination'].replace('.0/24',
+                                              '.%d' % rnd.randint(1, 254)),
+                6,
+                m['tcp-destination-port']))
+        else:
+            packets.append((
+                rnd.randint(1, 48), 0x800,
+                '00:00:00:00:%02x:%02x' % (rnd.randint(0, 255),
+                                           rnd.randint(0, 255)),
+                '10.%d.%d.%d' % (rnd.randint(0, 255), rnd.randint(0, 255),
+                                 rnd.randint(1, 254)),
+                6, rnd.choice([22, 80, 443])))
+    return packets
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--flows', type=int, default=20000,
+                        help="number of flow entries in the table")
+    parser.add_argument('--packets', type=int, default=100000,
+                        help="number of packets classified in a batch")
+    args = parser.parse_args()
+
+    results = {}
+    counts = {}
+    if FlowClassifier is not None:
+        m = args.flows
+        flows = make_table(m)
+        packets = make_packets(args.packets, flows)
+        headers = [dict(zip(FIELDS, p)) for p in packets[:10000]]
+        classifier = FlowClassifier(flows)
+
+        def classify():
+            for h in headers:
+                classifier.classify(h)
+
+        cases = [
+            ('classifier_build_x%d' % m,
+             lambda: FlowClassifier(flows), m),
+            ('classifier_classify_x%d' % len(headers),
+             classify, len(headers)),
+            ('classifier_batch_x%d' % len(packets),
+             lambda: classifier.classify_batch(packets, FIELDS),
+             len(packets)),
+        ]
+        for name, fn, n in cases:
+            results[name] = best_of(fn, args.repeat)
+            counts[name] = n
+    report(results, args, __file__, counts=counts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
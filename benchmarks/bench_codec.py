@@ -0,0 +1,124 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_codec.py: Time of decoding/encoding hot paths: flow entries
+                (including their JSON and fingerprints), OpenFlow
+                (ovs-ofctl like) rendering, notification parsing and the
+                'pysdn.common.utils' dictionary helpers
+
+Example (compare with the library code of an older revision):
+
+    PYTHONPATH=. python benchmarks/bench_codec.py --baseline HEAD~1
+
+
+"""
+
+import sys
+import json
+
+from benchutil import arg_parser, best_of, report
+from fixtures import (make_flows,
+                      make_flow_entries,
+                      make_inventory,
+                      make_topology_notification,
+                      make_inventory_notification)
+from pysdn.common.utils import (dict_keys_dashed_to_underscored,
+                                dict_keys_underscored_to_dashed,
+                                find_key_values_in_dict,
+                                remove_empty_from_dict,
+                                strip_none)
+from pysdn.controller.notification import (NetworkTopologyChangeNotification,
+                                           InventoryChangeNotification)
+from pysdn.openflowdev.ofswitch import FlowEntry
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--flows', type=int, default=5000)
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--switches', type=int, default=100)
+    args = parser.parse_args()
+
+    m = args.flows
+    flow_jsons = [json.dumps(d) for d in make_flows(m)]
+    decoded = [FlowEntry(flow_json=s) for s in flow_jsons]
+    entries = make_flow_entries(m)
+    topo_xml = make_topology_notification(args.events)
+    inv_xml = make_inventory_notification(args.events)
+    nodes = make_inventory(switches=args.switches, flows_per_table=5)
+    underscored = dict_keys_dashed_to_underscored({'node': nodes})
+    dashed = dict_keys_underscored_to_dashed(underscored)
+    payloads = [json.loads(f.get_payload()) for f in entries[:1000]]
+
+    r = args.repeat
+    results = {
+        'flow_entry_decode_x%d' % m:
+            best_of(lambda: [FlowEntry(flow_json=s) for s in flow_jsons], r),
+        'flow_entry_get_payload_x%d' % m:
+            best_of(lambda: [f.get_payload() for f in entries], r),
+        'flow_entry_to_ofp_oxm_syntax_x%d' % m:
+            best_of(lambda: [f.to_ofp_oxm_syntax() for f in decoded], r),
+        'topology_notification_%d_events' % args.events:
+            best_of(lambda: NetworkTopologyChangeNotification(topo_xml), r),
+        'inventory_notification_%d_events' % args.events:
+            best_of(lambda: InventoryChangeNotification(inv_xml), r),
+        'utils_dict_keys_dashed_to_underscored':
+            best_of(lambda: dict_keys_dashed_to_underscored(
+                {'node': nodes}), r),
+        'utils_dict_keys_underscored_to_dashed':
+            best_of(lambda: dict_keys_underscored_to_dashed(underscored), r),
+        'utils_strip_none':
+            best_of(lambda: strip_none(dashed), r),
+        'utils_remove_empty_from_dict_x%d' % len(payloads):
+            best_of(lambda: [remove_empty_from_dict(d) for d in payloads],
+                    r),
+        'utils_find_key_values_in_dict':
+            best_of(lambda: find_key_values_in_dict(dashed, 'flow-count'),
+                    r),
+        'flow_entry_to_json_x%d' % m:
+            best_of(lambda: set(f.to_json() for f in decoded), r),
+    }
+    # not available in the library code of a baseline revision
+    if hasattr(FlowEntry, 'fingerprint'):
+        results['flow_entry_fingerprint_x%d' % m] = \
+            best_of(lambda: set(f.fingerprint() for f in decoded), r)
+    report(results, args, __file__)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
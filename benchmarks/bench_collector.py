@@ -0,0 +1,140 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_collector.py: Counter collection rate (counters per second) of
+                    'CounterCollector' polls recorded into the ring
+                    buffer time series
+
+The switches are simulated: their counters are generated in memory, so
+the timings show the cost of recording the readings. The number of
+series and the memory they take after a short and a long run are printed
+to stderr (the latter must not be larger).
+
+Example:
+
+    PYTHONPATH=. python benchmarks/bench_collector.py --switches 200
+
+
+"""
+
+import sys
+
+from benchutil import arg_parser, best_of, report
+from pysdn.common.result import Result
+from pysdn.common.status import OperStatus, STATUS
+from pysdn.openflowdev.ofswitch import OFSwitch
+
+try:
+    from pysdn.openflowdev.collector import CounterCollector
+except ImportError:
+    # not available in the library code of a baseline revision
+    CounterCollector = None
+
+PORT_COUNTERS = ('packets-received', 'packets-transmitted',
+                 'bytes-received', 'bytes-transmitted', 'receive-drops',
+                 'transmit-drops', 'receive-errors', 'transmit-errors')
+
+
+class SimulatedSwitch(OFSwitch):
+    """ 'OFSwitch' with counters that grow on every read. """
+
+    def __init__(self, name, ports):
+        OFSwitch.__init__(self, name=name)
+        self.keys = [('port', p, c) for p in range(1, ports + 1)
+                     for c in PORT_COUNTERS]
+        self.reads = 0
+
+    def get_counters(self, kinds=None):
+        self.reads += 1
+        n = self.reads
+        counters = dict((k, n * i) for i, k in enumerate(self.keys))
+        return Result(OperStatus(STATUS.OK), counters)
+
+
+def series_size(collector):
+    """ Returns number of the series and bytes they take. """
+    count = 0
+    size = 0
+    for name in collector.get_switch_names():
+        for key in collector.get_keys(name):
+            count += 1
+            size += sys.getsizeof(collector.get_series(name, key))
+    return count, size
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--switches', type=int, default=100,
+                        help="number of switches")
+    parser.add_argument('--ports', type=int, default=48,
+                        help="number of ports per switch")
+    parser.add_argument('--capacity', type=int, default=60,
+                        help="number of samples kept per counter")
+    args = parser.parse_args()
+
+    results = {}
+    counts = {}
+    if CounterCollector is not None:
+        switches = [SimulatedSwitch("openflow:%d" % i, args.ports)
+                    for i in range(args.switches)]
+        collector = CounterCollector(None, switches,
+                                     capacity=args.capacity)
+        clock = [0.0]
+
+        def poll_all():
+            clock[0] += 30
+            for sw in switches:
+                collector.poll(sw.name, timestamp=clock[0])
+
+        name = 'collector_poll_x%d' % (args.switches * args.ports * 8)
+        results[name] = best_of(poll_all, args.repeat)
+        counts[name] = args.switches * args.ports * 8
+
+        short = series_size(collector)
+        for _ in range(2 * args.capacity):
+            poll_all()
+        after = series_size(collector)
+        sys.stderr.write("series: %d, buffers: %d bytes after %d polls, "
+                         "%d bytes after %d polls\n" %
+                         (short[0], short[1], args.repeat, after[1],
+                          args.repeat + 2 * args.capacity))
+    report(results, args, __file__, counts=counts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_flow_memory.py: Memory held by decoded 'FlowEntry' objects (bytes
+                      per flow entry) for large flow table snapshots
+
+Each snapshot size is measured in a separate process that decodes the flow
+entries from JSON (as received from the Controller, one by one) and
+reports the growth of its peak resident set size per flow entry. Note that
+a million flow entries take several GB of memory.
+
+Example (compare with the library code of an older revision):
+
+    PYTHONPATH=. python benchmarks/bench_flow_memory.py --flows 100000 \
+        --baseline HEAD~1
+
+
+"""
+
+import os
+import gc
+import sys
+import json
+import random
+import resource
+import argparse
+import subprocess
+
+from benchutil import arg_parser, report
+from fixtures import make_flow
+
+
+def peak_rss_bytes():
+    # 'ru_maxrss' is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(count, tables=4, seed=1):
+    from pysdn.openflowdev.ofswitch import FlowEntry
+
+    rnd = random.Random(seed)
+    rss0 = peak_rss_bytes()
+    flows = [FlowEntry(flow_json=json.dumps(make_flow('openflow:1',
+                                                      i % tables, i, rnd)))
+             for i in xrange(count)]
+    gc.collect()
+    return float(peak_rss_bytes() - rss0) / len(flows)
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--flows', type=int, nargs='+',
+                        default=[100000, 1000000],
+                        help="numbers of flow entries to measure")
+    parser.add_argument('--count', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.count:
+        print json.dumps(measure(args.count))
+        return
+
+    results = {}
+    for count in args.flows:
+        out = subprocess.check_output(
+            [sys.executable, os.path.abspath(__file__), '--count',
+             str(count)])
+        results['flow_entry_bytes_per_flow_x%d' % count] = json.loads(out)
+    report(results, args, __file__, unit='bytes')
+
+
+if __name__ == "__main__":
+    sys.exit(main())
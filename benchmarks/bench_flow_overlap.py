@@ -0,0 +1,107 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_flow_overlap.py: Shadowed and conflicting flow entries analysis
+                       ('analyze_flows') of flow tables of growing size
+                       (flows per second, should stay about the same)
+
+The flow tables are those of 'fixtures.make_flows' with every 50th flow
+entry copied at a lower priority (shadowed) and a few wildcard flow
+entries.
+
+Example:
+
+    PYTHONPATH=. python benchmarks/bench_flow_overlap.py --flows 100000
+
+
+"""
+
+import sys
+import copy
+
+from benchutil import arg_parser, best_of, report
+from fixtures import make_flows
+from pysdn.openflowdev.ofswitch import FlowEntry
+
+try:
+    from pysdn.openflowdev.classifier import analyze_flows
+except ImportError:
+    # not available in the library code of a baseline revision
+    analyze_flows = None
+
+
+def make_table(count):
+    data = make_flows(count, tables=1)
+    for i in range(0, count, 50):
+        d = copy.deepcopy(data[i])
+        d['id'] += '-copy'
+        d['priority'] = max(d['priority'] - 1, 0)
+        data.append(d)
+    for i, prefix in enumerate(['10.0.0.0/8', '10.1.0.0/16', '0.0.0.0/0']):
+        data.append({'id': 'wildcard-%d' % i, 'table_id': 0,
+                     'priority': 100 * i,
+                     'match': {
+                         'ethernet-match': {'ethernet-type': {'type': 2048}},
+                         'ipv4-destination': prefix}})
+    return [FlowEntry(flow_dict=d) for d in data]
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--flows', type=int, default=20000,
+                        help="number of flow entries in the largest table")
+    args = parser.parse_args()
+
+    results = {}
+    counts = {}
+    if analyze_flows is not None:
+        for m in (args.flows // 4, args.flows // 2, args.flows):
+            flows = make_table(m)
+            name = 'analyze_flows_x%d' % m
+            results[name] = best_of(lambda: analyze_flows(flows),
+                                    args.repeat)
+            counts[name] = len(flows)
+        r = analyze_flows(flows)
+        sys.stderr.write("%d flow entries: %d shadowed, %d conflicts\n" %
+                         (r.get_flows_cnt(), len(r.get_shadowed()),
+                          len(r.get_conflicts())))
+    report(results, args, __file__, counts=counts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
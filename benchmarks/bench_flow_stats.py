@@ -0,0 +1,129 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_flow_stats.py: Flow rates and top talkers (flows per second) of two
+                     polls of a flow table computed from 'FlowEntry'
+                     objects vs. NumPy 'FlowStatsSnapshot' snapshots
+
+Example (compare with the library code of an older revision):
+
+    PYTHONPATH=. python benchmarks/bench_flow_stats.py --baseline HEAD~1
+
+
+"""
+
+import sys
+import copy
+import heapq
+
+from benchutil import arg_parser, best_of, report
+from fixtures import make_flows
+from pysdn.openflowdev import ofswitch
+from pysdn.openflowdev.ofswitch import FlowEntry
+
+STATS = 'opendaylight-flow-statistics:flow-statistics'
+
+
+def advance(flows, seconds):
+    """ Returns copy of the flow entries polled 'seconds' later. """
+    flows = copy.deepcopy(flows)
+    for i, d in enumerate(flows):
+        stats = d[STATS]
+        stats['packet-count'] += i * seconds
+        stats['byte-count'] += i * seconds * 100
+        stats['duration']['second'] += seconds
+    return flows
+
+
+def entries_top(before, after, n):
+    """ Returns the 'n' flow entries with the highest byte rates computed
+        from 'FlowEntry' objects. """
+    counters = {}
+    for d in before:
+        fe = FlowEntry(flow_dict=d)
+        counters[(fe.get_flow_table_id(), fe.get_flow_id())] = \
+            (fe.get_bytes_cnt(), fe.get_duration())
+    rates = []
+    for d in after:
+        fe = FlowEntry(flow_dict=d)
+        key = (fe.get_flow_table_id(), fe.get_flow_id())
+        octets, duration = fe.get_bytes_cnt(), fe.get_duration()
+        if key in counters:
+            octets -= counters[key][0]
+            duration -= counters[key][1]
+        if duration > 0:
+            rates.append((octets / duration, key))
+    return heapq.nlargest(n, rates)
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--flows', type=int, default=20000,
+                        help="number of flow entries in the table")
+    parser.add_argument('--top', type=int, default=10,
+                        help="number of top flow entries")
+    args = parser.parse_args()
+
+    m = args.flows
+    n = args.top
+    before = make_flows(m)
+    after = advance(before, 10)
+    cases = [
+        ('flow_entries_rates_top_x%d' % m,
+         lambda: entries_top(before, after, n)),
+    ]
+    # the snapshots are not available in the library code of a baseline
+    # revision
+    if hasattr(ofswitch, 'FlowStatsSnapshot'):
+        snapshot = ofswitch.FlowStatsSnapshot.from_flows
+        cases += [
+            ('flow_stats_rates_top_x%d' % m,
+             lambda: snapshot(after).rates(snapshot(before)).top(n)),
+        ]
+
+    r = args.repeat
+    results = {}
+    counts = {}
+    for name, fn in cases:
+        results[name] = best_of(fn, r)
+        counts[name] = m
+    report(results, args, __file__, counts=counts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_flow_view.py: Flow table scan throughput (flows per second) of
+                    'FlowEntry' objects vs. lazy 'FlowTableView' views
+                    (complete and projected to the flow ids and counters)
+
+Example (compare with the library code of an older revision):
+
+    PYTHONPATH=. python benchmarks/bench_flow_view.py --baseline HEAD~1
+
+
+"""
+
+import sys
+
+from benchutil import arg_parser, best_of, report
+from fixtures import make_flows
+from pysdn.openflowdev import ofswitch
+from pysdn.openflowdev.ofswitch import FlowEntry
+
+
+def counters(flows):
+    """ Returns {flow id: (packets, bytes)} for the flow entries. """
+    return dict((f.get_flow_id(), (f.get_pkts_cnt(), f.get_bytes_cnt()))
+                for f in flows)
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--flows', type=int, default=20000,
+                        help="number of flow entries in the table")
+    args = parser.parse_args()
+
+    m = args.flows
+    data = make_flows(m)
+    cases = [
+        ('flow_entries_counters_x%d' % m,
+         lambda: counters([FlowEntry(flow_dict=d) for d in data])),
+        ('flow_entries_priorities_x%d' % m,
+         lambda: sorted(FlowEntry(flow_dict=d).get_flow_priority()
+                        for d in data)),
+    ]
+    # the view is not available in the library code of a baseline
+    # revision
+    if hasattr(ofswitch, 'FlowTableView'):
+        FlowTableView = ofswitch.FlowTableView
+        fields = ('id', 'table_id', 'flow_statistics')
+        cases += [
+            ('flow_view_counters_x%d' % m,
+             lambda: counters(FlowTableView(data))),
+            ('flow_view_projected_counters_x%d' % m,
+             lambda: counters(FlowTableView(data, fields))),
+            ('flow_view_priorities_x%d' % m,
+             lambda: sorted(f.get_flow_priority()
+                            for f in FlowTableView(data))),
+        ]
+
+    r = args.repeat
+    results = {}
+    counts = {}
+    for name, fn in cases:
+        results[name] = best_of(fn, r)
+        counts[name] = m
+    report(results, args, __file__, counts=counts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
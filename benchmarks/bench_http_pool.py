@@ -0,0 +1,148 @@
+#!/usr/bin/python
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_http_pool.py: Requests/sec of one-shot HTTP requests versus the
+                    Controller's pooled keep-alive session, measured
+                    against a local RESTCONF-like HTTP server
+
+
+"""
+
+import sys
+import time
+import json
+import argparse
+import threading
+import requests
+import BaseHTTPServer
+import SocketServer
+
+from requests.auth import HTTPBasicAuth
+from pysdn.controller.controller import Controller
+
+
+BODY = json.dumps({'nodes': {'node': [{'id': 'openflow:1'},
+                                      {'id': 'controller-config'}]}})
+
+
+class RestconfHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send each response in a single segment, otherwise delayed ACKs on
+    # the reused connection dominate the measurement
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadedServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def run_threads(nthreads, count, fn):
+    def worker():
+        for _ in xrange(count):
+            fn()
+    threads = [threading.Thread(target=worker) for _ in xrange(nthreads)]
+    t0 = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return (nthreads * count) / (time.time() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('-n', '--requests', type=int, default=500,
+                        help="requests per thread")
+    parser.add_argument('-t', '--threads', type=int, default=4)
+    parser.add_argument('--json', action='store_true',
+                        help="print results as JSON")
+    args = parser.parse_args()
+
+    server = ThreadedServer(('127.0.0.1', 0), RestconfHandler)
+    port = server.server_address[1]
+    th = threading.Thread(target=server.serve_forever)
+    th.daemon = True
+    th.start()
+
+    url = ("http://127.0.0.1:%s/restconf/operational/"
+           "opendaylight-inventory:nodes" % port)
+
+    def one_shot():
+        # How every Controller request was sent before connection pooling
+        requests.get(url, auth=HTTPBasicAuth('admin', 'admin'),
+                     data=None, headers=None, timeout=5)
+
+    ctrl = Controller('127.0.0.1', port, 'admin', 'admin',
+                      pool_maxsize=args.threads)
+
+    def pooled():
+        ctrl.http_get_request(url, data=None, headers=None)
+
+    results = {}
+    results['one_shot_rps'] = run_threads(args.threads, args.requests,
+                                          one_shot)
+    results['pooled_rps'] = run_threads(args.threads, args.requests, pooled)
+    results['speedup'] = results['pooled_rps'] / results['one_shot_rps']
+    results['threads'] = args.threads
+    results['requests'] = args.threads * args.requests
+    ctrl.close()
+    server.shutdown()
+
+    if args.json:
+        print json.dumps(results, sort_keys=True, indent=4)
+    else:
+        print "one-shot requests : %10.1f req/s" % results['one_shot_rps']
+        print "pooled session    : %10.1f req/s" % results['pooled_rps']
+        print "speedup           : %10.2fx" % results['speedup']
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_inventory_lookup.py: Time of the per-switch/per-port/per-table
+                           inventory lookups done by oftool's inventory
+                           summary over a large inventory
+
+Example (compare with the library code of an older revision):
+
+    PYTHONPATH=. python benchmarks/bench_inventory_lookup.py --baseline HEAD~1
+
+
+"""
+
+import sys
+import json
+
+from benchutil import arg_parser, best_of, report
+from fixtures import make_inventory
+from pysdn.controller.inventory import Inventory
+
+
+def show_common(inv):
+    """ Lookups made by 'oftool show-inventory' and friends. """
+    flows_cnt = 0
+    for node_id in inv.get_openflow_node_ids():
+        node = inv.get_openflow_node(node_id)
+        flows_cnt += inv.get_openflow_node_flows_cnt(node_id)
+        for port_id in node.get_port_ids():
+            node.get_port_number(port_id)
+            node.get_port_name(port_id)
+            node.get_port_obj(port_id)
+        for table_id in range(node.get_flow_tables_cnt()):
+            node.get_flows_in_table_cnt(table_id)
+    for node_id in inv.get_netconf_node_ids():
+        inv.get_netconf_node(node_id)
+    return flows_cnt
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--switches', type=int, default=1000)
+    parser.add_argument('--ports', type=int, default=48)
+    args = parser.parse_args()
+
+    nodes = make_inventory(switches=args.switches, netconf_nodes=100,
+                           ports=args.ports, tables=8)
+    inv = Inventory(inv_json=json.dumps(nodes))
+
+    results = {
+        'show_common_%d_switches_%d_ports' % (args.switches, args.ports):
+            best_of(lambda: show_common(inv), args.repeat),
+        'get_openflow_node_x%d' % args.switches:
+            best_of(lambda: [inv.get_openflow_node(n) for n in
+                             inv.get_openflow_node_ids()], args.repeat),
+    }
+    report(results, args, __file__)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
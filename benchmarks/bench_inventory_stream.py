@@ -0,0 +1,143 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_inventory_stream.py: Peak memory and time of decoding a large
+                           inventory response at once vs. streaming it
+                           node by node ('Controller.iter_inventory_nodes')
+
+Each mode runs in a separate process that reads the response body from a
+file and reports the growth of its peak resident set size.
+
+    PYTHONPATH=. python benchmarks/bench_inventory_stream.py --switches 2000
+
+
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import argparse
+import subprocess
+
+from fixtures import make_inventory
+
+
+def peak_rss_mb():
+    # 'ru_maxrss' is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def run_mode(mode, path, chunk_size):
+    from pysdn.controller.inventory import Inventory
+    from pysdn.common.jsonstream import iter_json_array
+
+    rss0 = peak_rss_mb()
+    t0 = time.time()
+    count = 0
+    with open(path, 'rb') as f:
+        if mode == 'loads':
+            # what 'json.loads(resp.content)' does
+            items = json.loads(f.read())['nodes']['node']
+        else:
+            chunks = iter(lambda: f.read(chunk_size), '')
+            items = iter_json_array(chunks, ('nodes', 'node'))
+        for item in items:
+            count += len(Inventory.nodes_from_dict(item))
+    return {'nodes': count,
+            'seconds': time.time() - t0,
+            'peak_rss_mb': peak_rss_mb(),
+            'peak_rss_growth_mb': peak_rss_mb() - rss0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip()
+                                     .splitlines()[0])
+    parser.add_argument('--json', action='store_true',
+                        help="print results as JSON")
+    parser.add_argument('--switches', type=int, default=2000)
+    parser.add_argument('--flows-per-table', type=int, default=10)
+    parser.add_argument('--chunk-size', type=int, default=65536)
+    parser.add_argument('--mode', choices=['loads', 'stream'],
+                        help=argparse.SUPPRESS)
+    parser.add_argument('--file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print json.dumps(run_mode(args.mode, args.file, args.chunk_size))
+        return
+
+    fd, path = tempfile.mkstemp(prefix='pysdn-inventory-', suffix='.json')
+    try:
+        nodes = make_inventory(switches=args.switches,
+                               flows_per_table=args.flows_per_table)
+        with os.fdopen(fd, 'wb') as f:
+            json.dump({'nodes': {'node': nodes}}, f)
+        del nodes
+        size_mb = os.path.getsize(path) / 1048576.0
+
+        results = {}
+        for mode in ('loads', 'stream'):
+            out = subprocess.check_output(
+                [sys.executable, os.path.abspath(__file__),
+                 '--mode', mode, '--file', path,
+                 '--chunk-size', str(args.chunk_size)])
+            results[mode] = json.loads(out)
+    finally:
+        os.remove(path)
+
+    if args.json:
+        results['document_mb'] = size_mb
+        print json.dumps(results, sort_keys=True, indent=4)
+        return
+    print "inventory document: %.1f MB, %d switches" % (size_mb,
+                                                         args.switches)
+    print "%-8s %8s %10s %16s %16s" % ("mode", "nodes", "seconds",
+                                       "peak RSS (MB)", "growth (MB)")
+    for mode in ('loads', 'stream'):
+        r = results[mode]
+        print "%-8s %8d %10.3f %16.1f %16.1f" % (mode, r['nodes'],
+                                                 r['seconds'],
+                                                 r['peak_rss_mb'],
+                                                 r['peak_rss_growth_mb'])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/python
+
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_model_build.py: Time of building inventory/flow model objects from
+                      decoded RESTCONF data (1,000-switch inventory)
+
+Example (compare with the library code of an older revision):
+
+    PYTHONPATH=. python benchmarks/bench_model_build.py --baseline HEAD~1
+
+
+"""
+
+import sys
+import json
+import inspect
+
+from benchutil import arg_parser, best_of, report
+from fixtures import (make_inventory,
+                      make_netconf_node,
+                      make_flows,
+                      make_netconf_config_module)
+from pysdn.controller.inventory import (Inventory,
+                                        OpenFlowCapableNode,
+                                        NetconfCapableNode,
+                                        NetconfConfigModule)
+from pysdn.openflowdev.ofswitch import FlowEntry
+
+
+def build_inventory_fn(nodes):
+    """ Builds 'Inventory' the way 'Controller.build_inventory_object'
+        does in the library revision being measured. """
+    if 'inv_list' in inspect.getargspec(Inventory.__init__).args:
+        return lambda: Inventory(inv_list=nodes)
+    return lambda: Inventory(inv_json=json.dumps(nodes))
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--switches', type=int, default=1000)
+    parser.add_argument('--flows', type=int, default=10000)
+    args = parser.parse_args()
+
+    nodes = make_inventory(switches=args.switches, netconf_nodes=100)
+    netconf_nodes = [make_netconf_node(n) for n in range(1000)]
+    modules = [make_netconf_config_module(n) for n in range(1000)]
+    flows = make_flows(args.flows)
+
+    inv = build_inventory_fn(nodes)()
+    assert len(inv.openflow_nodes) == args.switches
+    assert len(inv.netconf_nodes) == 100
+
+    r = args.repeat
+    results = {
+        'inventory_%d_switches' % args.switches:
+            best_of(build_inventory_fn(nodes), r),
+        'openflow_capable_node_x%d' % args.switches:
+            best_of(lambda: [OpenFlowCapableNode(inv_dict=d)
+                             for d in nodes[:args.switches]], r),
+        'netconf_capable_node_x1000':
+            best_of(lambda: [NetconfCapableNode('VRouter5600', inv_dict=d)
+                             for d in netconf_nodes], r),
+        'netconf_config_module_x1000':
+            best_of(lambda: [NetconfConfigModule(d) for d in modules], r),
+        'flow_entry_from_dict_x%d' % args.flows:
+            best_of(lambda: [FlowEntry(flow_dict=d) for d in flows], r),
+    }
+    report(results, args, __file__)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
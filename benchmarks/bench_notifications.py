@@ -0,0 +1,114 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_notifications.py: Notification parsing throughput (events per
+                        second) for single event messages and event bursts,
+                        with each of the notification XML parsers
+
+Example (compare with the library code of an older revision):
+
+    PYTHONPATH=. python benchmarks/bench_notifications.py --baseline HEAD~1
+
+
+"""
+
+import sys
+
+from benchutil import arg_parser, best_of, report
+from fixtures import make_topology_notification, make_inventory_notification
+from pysdn.controller import notification
+from pysdn.controller.notification import (NetworkTopologyChangeNotification,
+                                           InventoryChangeNotification)
+
+
+def single_event_messages(count, make_notification):
+    """ Returns 'count' notification messages with one event each. """
+    return [make_notification(1, seed=n) for n in range(count)]
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=2000,
+                        help="number of single event messages")
+    parser.add_argument('--events', type=int, default=5000,
+                        help="number of events in a burst message")
+    args = parser.parse_args()
+
+    topo_single = single_event_messages(args.messages,
+                                        make_topology_notification)
+    inv_single = single_event_messages(args.messages,
+                                       make_inventory_notification)
+    topo_burst = make_topology_notification(args.events)
+    inv_burst = make_inventory_notification(args.events)
+
+    cases = [
+        ('topology_single_x%d' % args.messages, args.messages,
+         lambda: [NetworkTopologyChangeNotification(m)
+                  for m in topo_single]),
+        ('topology_burst_%d_events' % args.events, args.events,
+         lambda: NetworkTopologyChangeNotification(topo_burst)),
+        ('inventory_single_x%d' % args.messages, args.messages,
+         lambda: [InventoryChangeNotification(m) for m in inv_single]),
+        ('inventory_burst_%d_events' % args.events, args.events,
+         lambda: InventoryChangeNotification(inv_burst)),
+    ]
+
+    # None stands for the default parser (the only one of the library code
+    # of a baseline revision without the parser selection)
+    backends = [None]
+    if hasattr(notification, 'set_parser_backend'):
+        backends = [None, notification.PARSER_XMLTODICT]
+
+    r = args.repeat
+    results = {}
+    counts = {}
+    for backend in backends:
+        if backend is not None:
+            notification.set_parser_backend(backend)
+        for name, count, fn in cases:
+            # the default parser keeps the plain names, so that they match
+            # the results of a baseline revision
+            if backend is not None:
+                name = '%s_%s' % (name, backend)
+            results[name] = best_of(fn, r)
+            counts[name] = count
+    report(results, args, __file__, counts=counts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_ofp_render.py: Flow table dump in the OpenFlow syntax (flows per
+                     second and time to the first flow written), whole
+                     dump built of 'FlowEntry' objects vs. flows streamed
+                     from a 'FlowTableView'
+
+Example (compare with the library code of an older revision):
+
+    PYTHONPATH=. python benchmarks/bench_ofp_render.py --baseline HEAD~1
+
+
+"""
+
+import sys
+import time
+
+from benchutil import arg_parser, best_of, report
+from fixtures import make_flows
+from pysdn.openflowdev import ofswitch
+from pysdn.openflowdev.ofswitch import FlowEntry
+
+try:
+    from pysdn.openflowdev.ofpformat import write_ofp_flows
+except ImportError:
+    # not available in the library code of a baseline revision
+    write_ofp_flows = None
+
+
+class Sink(object):
+    """ File-like object that records when the first text is written. """
+
+    def __init__(self):
+        self.start = time.time()
+        self.first = None
+
+    def write(self, s):
+        if self.first is None:
+            self.first = time.time() - self.start
+
+    def flush(self):
+        pass
+
+
+def dump_entries(data, out):
+    """ Dump the way 'oftool show-flow --ofp' used to: all flows are built
+        as 'FlowEntry' objects and rendered before anything is written. """
+    flows = sorted((FlowEntry(flow_dict=d) for d in data),
+                   key=lambda fe: fe.get_flow_priority())
+    out.write("\n".join(" -- Flow id '%s'\n %s" % (fe.get_flow_id(),
+                                                   fe.to_ofp_oxm_syntax())
+                        for fe in flows))
+    return out
+
+
+def dump_stream(data, out):
+    flows = sorted(ofswitch.FlowTableView(data),
+                   key=lambda fe: fe.get_flow_priority())
+    write_ofp_flows(flows, out, " -- Flow id '{id}'\n {flow}\n")
+    return out
+
+
+def first_flow(dump, data, r):
+    """ Best time (seconds) to the first flow written out of 'r' dumps. """
+    return min(dump(data, Sink()).first for _ in range(r))
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--flows', type=int, default=10000,
+                        help="number of flow entries in the table")
+    args = parser.parse_args()
+
+    m = args.flows
+    data = make_flows(m)
+    r = args.repeat
+    results = {}
+    counts = {}
+
+    cases = [('ofp_entries_dump_x%d' % m, dump_entries)]
+    if write_ofp_flows is not None:
+        cases.append(('ofp_stream_dump_x%d' % m, dump_stream))
+    for name, dump in cases:
+        results[name] = best_of(lambda: dump(data, Sink()), r)
+        counts[name] = m
+        results[name.replace('_dump_', '_first_flow_')] = \
+            first_flow(dump, data, r)
+    report(results, args, __file__, counts=counts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
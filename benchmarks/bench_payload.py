@@ -0,0 +1,107 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_payload.py: Request body encoding throughput (flows per second) of
+                  'FlowEntry' and 'GroupEntry' objects
+
+Example (compare with the library code of an older revision):
+
+    PYTHONPATH=. python benchmarks/bench_payload.py --baseline HEAD~1
+
+
+"""
+
+import sys
+
+from benchutil import arg_parser, best_of, report
+from fixtures import make_flows, make_flow_entries
+from pysdn.openflowdev.ofswitch import (FlowEntry,
+                                        GroupEntry,
+                                        GroupBucket,
+                                        OutputAction)
+
+
+def make_group_entries(count, buckets=4):
+    """ Returns list of fast failover 'GroupEntry' objects. """
+    groups = []
+    for n in range(count):
+        group_entry = GroupEntry(group_id=n, group_type="group-ff")
+        for b in range(buckets):
+            bucket = GroupBucket(bucket_id=b)
+            bucket.set_watch_port(b + 1)
+            bucket.add_action(OutputAction(order=0, port=b + 1))
+            group_entry.add_bucket(bucket)
+        groups.append(group_entry)
+    return groups
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--flows', type=int, default=5000,
+                        help="number of flow (and group) entries")
+    args = parser.parse_args()
+
+    m = args.flows
+    built = make_flow_entries(m)
+    decoded = [FlowEntry(flow_dict=d) for d in make_flows(m)]
+    groups = make_group_entries(m)
+
+    cases = [
+        ('built_flow_get_payload_x%d' % m,
+         lambda: [f.get_payload() for f in built]),
+        ('built_flow_get_payload_dict_x%d' % m,
+         lambda: [f.get_payload_dict() for f in built]),
+        ('decoded_flow_get_payload_x%d' % m,
+         lambda: [f.get_payload() for f in decoded]),
+        ('decoded_flow_to_yang_json_strip_x%d' % m,
+         lambda: [f.to_yang_json(strip=True) for f in decoded]),
+        ('group_get_payload_x%d' % m,
+         lambda: [g.get_payload() for g in groups]),
+    ]
+
+    r = args.repeat
+    results = {}
+    counts = {}
+    for name, fn in cases:
+        results[name] = best_of(fn, r)
+        counts[name] = m
+    report(results, args, __file__, counts=counts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_reconcile.py: Desired-state resynchronization of a large flow set
+                    with a few changed flows ('OFSwitch.reconcile_flows'
+                    vs. re-sending every flow with 'add_modify_flow')
+
+The Controller is simulated: the configured flow tables are served from
+memory and the write requests are only counted (the flow payloads are
+still encoded), so the timings show the client side cost. The numbers of
+the requests made are printed to stderr.
+
+Example:
+
+    PYTHONPATH=. python benchmarks/bench_reconcile.py --flows 50000
+
+
+"""
+
+import sys
+import json
+
+from benchutil import arg_parser, best_of, report
+from fixtures import make_flow_entries
+from pysdn.common.result import Result
+from pysdn.common.status import OperStatus, STATUS
+from pysdn.openflowdev.ofswitch import OFSwitch
+
+
+class SimulatedSwitch(OFSwitch):
+    """ 'OFSwitch' with the configured flow tables kept in memory. """
+
+    def __init__(self, tables):
+        OFSwitch.__init__(self, name="openflow:1")
+        self.tables = tables
+        self.reads = 0
+        self.writes = 0
+
+    def get_configured_flows(self, tableid):
+        self.reads += 1
+        return Result(OperStatus(STATUS.OK), self.tables.get(tableid, []))
+
+    def _write(self, payload):
+        self.writes += 1
+        return Result(OperStatus(STATUS.OK), None)
+
+    def add_modify_flow(self, flow_entry):
+        return self._write(flow_entry.get_payload())
+
+    def add_modify_flows(self, flow_entries, chunk_size=500):
+        return [self.add_modify_flow(f) for f in flow_entries]
+
+    def delete_flows_by_ids(self, table_id, flow_ids, chunk_size=10):
+        return [self._write(None) for flow_id in flow_ids]
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--flows', type=int, default=50000,
+                        help="number of desired flows")
+    parser.add_argument('--changed', type=int, default=20,
+                        help="number of desired flows that differ from "
+                             "the configured ones")
+    args = parser.parse_args()
+
+    m = args.flows
+    desired = make_flow_entries(m)
+    # configured tables as decoded from the Controller responses
+    tables = {}
+    for flow_entry in desired:
+        d = json.loads(json.dumps(flow_entry.get_payload_dict()))
+        tables.setdefault(flow_entry.get_flow_table_id(), []).append(d)
+    step = max(m // max(args.changed, 1), 1)
+    for flow_entry in desired[::step][:args.changed]:
+        flow_entry.set_flow_priority(flow_entry.get_flow_priority() + 1)
+
+    def resend_all():
+        switch = SimulatedSwitch(tables)
+        for flow_entry in desired:
+            switch.add_modify_flow(flow_entry)
+        return switch
+
+    cases = [('resend_all_flows_x%d' % m, resend_all)]
+    if hasattr(OFSwitch, 'reconcile_flows'):
+        def reconcile():
+            switch = SimulatedSwitch(tables)
+            switch.reconcile_flows(desired)
+            return switch
+        cases.append(('reconcile_flows_x%d' % m, reconcile))
+
+    r = args.repeat
+    results = {}
+    counts = {}
+    for name, fn in cases:
+        switch = fn()
+        sys.stderr.write("%s: %d reads, %d writes\n" %
+                         (name, switch.reads, switch.writes))
+        results[name] = best_of(fn, r)
+        counts[name] = m
+    report(results, args, __file__, counts=counts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
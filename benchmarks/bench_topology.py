@@ -0,0 +1,100 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+bench_topology.py: Time of the node/peer lookups done by oftool's
+                   'show-topo -v' and 'show-switch -v' and of path queries
+                   on a large switch fabric
+
+Example (compare with the library code of an older revision):
+
+    PYTHONPATH=. python benchmarks/bench_topology.py --baseline HEAD~1
+
+
+"""
+
+import sys
+
+from benchutil import arg_parser, best_of, report
+from fixtures import make_topology
+from pysdn.controller.topology import Topology
+
+
+def show_topo(topo):
+    """ Lookups made by 'oftool show-topo -v' and 'show-switch -v' for every
+        switch of the topology. """
+    for switch_id in topo.get_switch_ids():
+        switch = topo.get_switch(switch_id)
+        for pnum in switch.get_port_numbers():
+            topo.get_peer_list_for_node_port_(switch, pnum)
+    for host_id in topo.get_host_ids():
+        node = topo.get_node_by_id(host_id)
+        node.get_ip_address_for_mac(node.get_mac_address())
+
+
+def main():
+    parser = arg_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--switches', type=int, default=1000)
+    parser.add_argument('--degree', type=int, default=16)
+    parser.add_argument('--paths', type=int, default=100,
+                        help="number of host pairs for path queries")
+    args = parser.parse_args()
+
+    d = make_topology(switches=args.switches, hosts_per_switch=2,
+                      degree=args.degree)
+    topo = Topology(topo_dict=d)
+    hosts = topo.get_host_ids()
+    pairs = [(hosts[i], hosts[-1 - i]) for i in range(args.paths)]
+
+    r = args.repeat
+    results = {
+        'build_%d_links' % len(d['link']):
+            best_of(lambda: Topology(topo_dict=d), r),
+        'show_topo_%d_switches' % args.switches:
+            best_of(lambda: show_topo(topo), r),
+    }
+    if hasattr(topo, 'get_k_shortest_paths'):
+        results['shortest_path_x%d' % args.paths] = best_of(
+            lambda: [topo.get_shortest_path(a, b) for a, b in pairs], r)
+        results['k_shortest_paths_k8_x%d' % args.paths] = best_of(
+            lambda: [topo.get_k_shortest_paths(a, b, 8) for a, b in pairs],
+            r)
+    report(results, args, __file__)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+benchutil.py: Timing and before/after comparison helpers shared by
+              the benchmark scripts
+
+
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+
+def best_of(fn, repeat=3, number=1):
+    """ Returns the best time (seconds) of a single 'fn()' call out of
+        'repeat' rounds of 'number' calls. """
+    best = None
+    gc.collect()
+    gcold = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.time()
+            for _ in range(number):
+                fn()
+            t = (time.time() - t0) / number
+            best = t if best is None else min(best, t)
+    finally:
+        if gcold:
+            gc.enable()
+    return best
+
+
+def arg_parser(description):
+    """ Returns argument parser with the options every benchmark has. """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--json', action='store_true',
+                        help="print results as JSON")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="number of timing rounds (best is reported)")
+    parser.add_argument('--baseline', metavar='REV',
+                        help="also run the benchmark against the library "
+                             "code of git revision REV and compare")
+    return parser
+
+
+def run_baseline(rev, script, argv):
+    """ Runs 'script' with the library code exported from git revision
+        'rev' and returns its JSON results. """
+    tmp = tempfile.mkdtemp(prefix='pysdn-bench-')
+    try:
+        archive = subprocess.Popen(['git', 'archive', rev, 'pysdn'],
+                                   cwd=REPO_DIR, stdout=subprocess.PIPE)
+        subprocess.check_call(['tar', '-x', '-C', tmp],
+                              stdin=archive.stdout)
+        if archive.wait() != 0:
+            raise RuntimeError("cannot export revision '%s'" % rev)
+        env = dict(os.environ)
+        env['PYTHONPATH'] = tmp
+        args = [a for a in argv if a != '--json']
+        i = args.index('--baseline')
+        del args[i:i + 2]
+        out = subprocess.check_output(
+            [sys.executable, os.path.abspath(script), '--json'] + args,
+            env=env)
+        return json.loads(out)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def report(results, args, script, unit='s', counts=None):
+    """ Prints benchmark 'results' ({name: value}) or compares them with
+        results of the baseline revision when requested. 'counts' gives
+        the number of items processed per timed call ({name: count}),
+        the rate (items per second) is then printed along with the time.
+    """
+    if args.baseline:
+        base = run_baseline(args.baseline, script, sys.argv[1:])
+        if args.json:
+            print json.dumps({'current': results, 'baseline': base},
+                             sort_keys=True, indent=4)
+            return
+        print "%-44s %14s %14s %9s" % ("benchmark", args.baseline[:14],
+                                       "current", "speedup")
+        for name in sorted(results):
+            cur = results[name]
+            old = base.get(name)
+            if old is None:
+                print "%-44s %14s %14.6f %9s" % (name, "n/a", cur, "")
+            else:
+                print "%-44s %14.6f %14.6f %8.2fx" % (name, old, cur,
+                                                      old / cur if cur
+                                                      else float('inf'))
+    elif args.json:
+        print json.dumps(results, sort_keys=True, indent=4)
+    else:
+        for name in sorted(results):
+            if counts and name in counts and results[name]:
+                print "%-44s %14.6f %s %14.0f/s" % (
+                    name, results[name], unit, counts[name] / results[name])
+            else:
+                print "%-44s %14.6f %s" % (name, results[name], unit)
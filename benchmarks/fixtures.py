@@ -0,0 +1,409 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+fixtures.py: Synthetic Controller data (RESTCONF JSON shaped) used by
+             the offline benchmarks
+
+
+"""
+
+import random
+
+from pysdn.openflowdev.ofswitch import (FlowEntry,
+                                        Match,
+                                        Instruction,
+                                        OutputAction,
+                                        PushVlanHeaderAction,
+                                        SetVlanIdAction)
+
+
+def make_flow(node_id, table_id, n, rnd):
+    """ Returns operational 'flow' entry of an OpenFlow flow table. """
+    return {
+        'id': 'flow-%d-%d' % (table_id, n),
+        'table_id': table_id,
+        'priority': rnd.randint(1, 65535),
+        'cookie': rnd.randint(0, 0xffffffff),
+        'idle-timeout': 0,
+        'hard-timeout': 0,
+        'flags': '',
+        'match': {
+            'in-port': '%s:%d' % (node_id, rnd.randint(1, 48)),
+            'ethernet-match': {
+                'ethernet-type': {'type': 2048},
+                'ethernet-source': {
+                    'address': '00:00:00:00:%02x:%02x' % (n >> 8 & 0xff,
+                                                          n & 0xff)},
+            },
+            'ipv4-destination': '10.%d.%d.0/24' % (n >> 8 & 0xff, n & 0xff),
+            'ip-match': {'ip-protocol': 6, 'ip-dscp': 0},
+            'tcp-destination-port': rnd.choice([22, 80, 443, 8080]),
+        },
+        'instructions': {
+            'instruction': [{
+                'order': 0,
+                'apply-actions': {
+                    'action': [
+                        {'order': 0,
+                         'set-field': {'vlan-match': {
+                             'vlan-id': {'vlan-id': rnd.randint(1, 4094),
+                                         'vlan-id-present': True}}}},
+                        {'order': 1,
+                         'output-action': {
+                             'output-node-connector': str(rnd.randint(1, 48)),
+                             'max-length': 65535}},
+                    ]
+                }
+            }]
+        },
+        'opendaylight-flow-statistics:flow-statistics': {
+            'packet-count': rnd.randint(0, 10 ** 9),
+            'byte-count': rnd.randint(0, 10 ** 12),
+            'duration': {'second': rnd.randint(0, 10 ** 6),
+                         'nanosecond': rnd.randint(0, 10 ** 9 - 1)},
+        },
+    }
+
+
+def make_port(node_id, pnum, rnd):
+    return {
+        'id': '%s:%d' % (node_id, pnum),
+        'flow-node-inventory:port-number': pnum,
+        'flow-node-inventory:name': 's%s-eth%d' % (node_id.split(':')[1],
+                                                    pnum),
+        'flow-node-inventory:hardware-address':
+            '02:00:%02x:%02x:%02x:%02x' % (rnd.randint(0, 255),
+                                           rnd.randint(0, 255),
+                                           rnd.randint(0, 255), pnum),
+        'flow-node-inventory:current-speed': 10000000,
+        'flow-node-inventory:current-feature': 'ten-gb-fd copper',
+        'flow-node-inventory:state': {'link-down': False,
+                                      'blocked': False,
+                                      'live': True},
+        'opendaylight-port-statistics:flow-capable-node-connector-statistics': {
+            'packets': {'received': rnd.randint(0, 10 ** 9),
+                        'transmitted': rnd.randint(0, 10 ** 9)},
+            'bytes': {'received': rnd.randint(0, 10 ** 12),
+                      'transmitted': rnd.randint(0, 10 ** 12)},
+            'receive-drops': 0,
+            'transmit-drops': 0,
+            'duration': {'second': rnd.randint(0, 10 ** 6),
+                         'nanosecond': 0},
+        },
+    }
+
+
+def make_openflow_node(n, ports=16, tables=4, flows_per_table=0, rnd=None):
+    """ Returns operational inventory 'node' entry of an OpenFlow switch. """
+    rnd = rnd or random.Random(n)
+    node_id = 'openflow:%d' % n
+    table_list = []
+    for t in range(tables):
+        table = {
+            'id': t,
+            'opendaylight-flow-statistics:aggregate-flow-statistics': {
+                'flow-count': flows_per_table,
+                'packet-count': rnd.randint(0, 10 ** 9),
+                'byte-count': rnd.randint(0, 10 ** 12)},
+            'opendaylight-flow-table-statistics:flow-table-statistics': {
+                'active-flows': flows_per_table,
+                'packets-looked-up': rnd.randint(0, 10 ** 9),
+                'packets-matched': rnd.randint(0, 10 ** 9)},
+        }
+        if flows_per_table:
+            table['flow'] = [make_flow(node_id, t, i, rnd)
+                             for i in range(flows_per_table)]
+        table_list.append(table)
+    return {
+        'id': node_id,
+        'flow-node-inventory:manufacturer': 'Nicira, Inc.',
+        'flow-node-inventory:hardware': 'Open vSwitch',
+        'flow-node-inventory:software': '2.3.1',
+        'flow-node-inventory:serial-number': 'None',
+        'flow-node-inventory:description': 'None',
+        'flow-node-inventory:ip-address': '10.0.%d.%d' % (n >> 8 & 0xff,
+                                                          n & 0xff),
+        'flow-node-inventory:switch-features': {
+            'max_buffers': 256,
+            'max_tables': 254,
+            'capabilities': [
+                'flow-node-inventory:flow-feature-capability-flow-stats',
+                'flow-node-inventory:flow-feature-capability-table-stats',
+                'flow-node-inventory:flow-feature-capability-port-stats',
+                'flow-node-inventory:flow-feature-capability-group-stats']},
+        'node-connector': [make_port(node_id, p, rnd)
+                           for p in range(1, ports + 1)],
+        'flow-node-inventory:table': table_list,
+        'opendaylight-group-statistics:group-features': {
+            'group-types-supported': [
+                'opendaylight-group-types:group-all',
+                'opendaylight-group-types:group-select'],
+            'max-groups': [65535, 65535],
+            'actions': [67082241, 67082241]},
+        'opendaylight-meter-statistics:meter-features': {
+            'max-meter': 0, 'max-bands': 0, 'max-color': 0},
+    }
+
+
+def make_netconf_node(n):
+    """ Returns operational inventory 'node' entry of a NETCONF device. """
+    caps = ['(urn:ietf:params:xml:ns:yang:ietf-inet-types?'
+            'revision=2010-09-24)ietf-inet-types',
+            '(urn:brocade.com:mgmt:brocade-interface-ext?'
+            'revision=2014-04-01)brocade-interface-ext'
+            if n % 2 else
+            '(http://www.vyatta.com/ns/vyatta-interfaces?'
+            'revision=2014-12-02)vyatta-interfaces']
+    caps += ['(urn:opendaylight:model:%d?revision=2015-01-01)model-%d' %
+             (i, i) for i in range(40)]
+    return {
+        'id': 'netconf-%d' % n,
+        'netconf-node-inventory:connected': True,
+        'netconf-node-inventory:initial-capability': caps,
+    }
+
+
+def make_inventory(switches=1000, netconf_nodes=0, ports=16, tables=4,
+                   flows_per_table=0, seed=1):
+    """ Returns the 'node' list of an operational inventory. """
+    rnd = random.Random(seed)
+    nodes = [make_openflow_node(n, ports, tables, flows_per_table, rnd)
+             for n in range(1, switches + 1)]
+    nodes += [make_netconf_node(n) for n in range(1, netconf_nodes + 1)]
+    return nodes
+
+
+def make_flows(count, tables=4, seed=1):
+    """ Returns list of operational 'flow' entries. """
+    rnd = random.Random(seed)
+    return [make_flow('openflow:1', i % tables, i, rnd)
+            for i in range(count)]
+
+
+def make_netconf_config_module(n):
+    p = 'odl-sal-netconf-connector-cfg:'
+    return {
+        'type': p + 'sal-netconf-connector',
+        'name': 'vrouter-%d' % n,
+        p + 'address': '172.22.%d.%d' % (n >> 8 & 0xff, n & 0xff),
+        p + 'port': 830,
+        p + 'username': 'vyatta',
+        p + 'password': 'vyatta',
+        p + 'tcp-only': False,
+        p + 'connection-timeout-millis': 20000,
+        p + 'between-attempts-timeout-millis': 2000,
+        p + 'max-connection-attempts': 0,
+        p + 'sleep-factor': 1.5,
+        p + 'event-executor': {
+            'type': 'netty:netty-event-executor',
+            'name': 'global-event-executor'},
+        p + 'binding-registry': {
+            'type': 'opendaylight-md-sal-binding:binding-broker-osgi-registry',
+            'name': 'binding-osgi-broker'},
+    }
+
+
+def make_topology(switches=1000, hosts_per_switch=2, degree=4, seed=1):
+    """ Returns 'topology' entry of the operational network topology: a
+        random switch fabric where each switch has 'degree' uplinks to
+        other switches (links in both directions) and attached hosts. """
+    rnd = random.Random(seed)
+    nodes = []
+    links = []
+    next_port = {}
+
+    def port(node_id):
+        next_port[node_id] = next_port.get(node_id, 0) + 1
+        return '%s:%d' % (node_id, next_port[node_id])
+
+    def link(src_node, src_tp, dst_node, dst_tp):
+        links.append({'link-id': src_tp,
+                      'source': {'source-node': src_node,
+                                 'source-tp': src_tp},
+                      'destination': {'dest-node': dst_node,
+                                      'dest-tp': dst_tp}})
+
+    switch_ids = ['openflow:%d' % n for n in range(1, switches + 1)]
+    for i, sid in enumerate(switch_ids):
+        peers = set()
+        if switches > 1:
+            # a ring keeps the fabric connected
+            peers.add(switch_ids[(i + 1) % switches])
+        while len(peers) < min(degree // 2, switches - 1):
+            peer = rnd.choice(switch_ids)
+            if peer != sid:
+                peers.add(peer)
+        for peer in sorted(peers):
+            a, b = port(sid), port(peer)
+            link(sid, a, peer, b)
+            link(peer, b, sid, a)
+        for h in range(hosts_per_switch):
+            n = i * hosts_per_switch + h
+            mac = '00:00:00:%02x:%02x:%02x' % (n >> 16 & 0xff,
+                                               n >> 8 & 0xff, n & 0xff)
+            hid = 'host:' + mac
+            hp = hid
+            sp = port(sid)
+            nodes.append({
+                'node-id': hid,
+                'host-tracker-service:id': mac,
+                'host-tracker-service:addresses': [
+                    {'id': n, 'mac': mac,
+                     'ip': '10.%d.%d.%d' % (n >> 16 & 0xff, n >> 8 & 0xff,
+                                            n & 0xff)}],
+                'host-tracker-service:attachment-points': [
+                    {'tp-id': sp, 'active': True,
+                     'corresponding-tp': hp}],
+                'termination-point': [{'tp-id': hp}]})
+            link(hid, hp, sid, sp)
+            link(sid, sp, hid, hp)
+    for sid in switch_ids:
+        nodes.append({
+            'node-id': sid,
+            'termination-point': [{'tp-id': '%s:%d' % (sid, p)}
+                                  for p in range(1, next_port.get(sid, 0)
+                                                 + 1)]})
+    return {'topology-id': 'flow:1', 'node': nodes, 'link': links}
+
+
+def make_flow_entry(n, tables=4, rnd=None):
+    """ Returns 'FlowEntry' object built the way applications build the
+        flows they program (match on L2-L4 fields, VLAN push and output
+        actions). """
+    rnd = rnd or random.Random(n)
+    flow_entry = FlowEntry()
+    flow_entry.set_flow_table_id(n % tables)
+    flow_entry.set_flow_id(n)
+    flow_entry.set_flow_priority(rnd.randint(1, 65535))
+    flow_entry.set_flow_cookie(rnd.randint(0, 0xffffffff))
+    instruction = Instruction(instruction_order=0)
+    instruction.add_apply_action(PushVlanHeaderAction(order=0,
+                                                      eth_type=0x8100))
+    instruction.add_apply_action(SetVlanIdAction(order=1,
+                                                 vid=rnd.randint(1, 4094)))
+    instruction.add_apply_action(OutputAction(order=2,
+                                              port=rnd.randint(1, 48)))
+    flow_entry.add_instruction(instruction)
+    match = Match()
+    match.set_in_port(rnd.randint(1, 48))
+    match.set_eth_type(0x0800)
+    match.set_ipv4_dst('10.%d.%d.0/24' % (rnd.randint(0, 255),
+                                          rnd.randint(0, 255)))
+    match.set_ip_proto(6)
+    match.set_tcp_dst(rnd.randint(1, 65535))
+    flow_entry.add_match(match)
+    return flow_entry
+
+
+def make_flow_entries(count, tables=4, seed=1):
+    """ Returns list of 'FlowEntry' objects (see 'make_flow_entry'). """
+    rnd = random.Random(seed)
+    return [make_flow_entry(n, tables, rnd) for n in range(count)]
+
+
+_NOTIFICATION = (
+    '<notification xmlns="urn:ietf:params:xml:ns:netconf:notification:1.0">'
+    '<eventTime>2015-06-12T12:00:00.000+00:00</eventTime>'
+    '<data-changed-notification xmlns="urn:opendaylight:params:xml:ns:yang:'
+    'controller:md:sal:remote">%s</data-changed-notification>'
+    '</notification>')
+
+_DATA_CHANGE_EVENT = (
+    '<data-change-event><path %s>%s</path>'
+    '<operation>%s</operation></data-change-event>')
+
+
+def make_topology_change_event(operation, kind, item_id):
+    """ Returns 'data-change-event' element of the network topology change
+        notification. 'kind' is 'node' or 'link'. """
+    ns = 'xmlns:a="urn:TBD:params:xml:ns:yang:network-topology"'
+    path = ("/a:network-topology/a:topology[a:topology-id='flow:1']"
+            "/a:%s[a:%s-id='%s']/a:%s-id" % (kind, kind, item_id, kind))
+    return _DATA_CHANGE_EVENT % (ns, path, operation)
+
+
+def make_topology_notification(events=100, seed=1):
+    """ Returns network topology change notification (XML) with a burst of
+        switch, host and link events. """
+    rnd = random.Random(seed)
+    items = []
+    for n in range(events):
+        operation = rnd.choice(['created', 'deleted', 'updated'])
+        kind = rnd.choice(['switch', 'host', 'link'])
+        if kind == 'switch':
+            items.append(make_topology_change_event(
+                operation, 'node', 'openflow:%d' % rnd.randint(1, 1000)))
+        elif kind == 'host':
+            items.append(make_topology_change_event(
+                operation, 'node', 'host:00:00:00:00:%02x:%02x' %
+                (rnd.randint(0, 255), rnd.randint(0, 255))))
+        else:
+            items.append(make_topology_change_event(
+                operation, 'link', 'openflow:%d:%d' %
+                (rnd.randint(1, 1000), rnd.randint(1, 48))))
+    return _NOTIFICATION % ''.join(items)
+
+
+def make_inventory_change_event(operation, node_id, table_id=None,
+                                flow_id=None):
+    """ Returns 'data-change-event' element of the inventory change
+        notification for a node, or for a flow entry of the node. """
+    ns = ('xmlns:a="urn:opendaylight:inventory" '
+          'xmlns:b="urn:opendaylight:flow:inventory"')
+    path = "/a:nodes/a:node[a:id='%s']" % node_id
+    if flow_id is not None:
+        path += "/b:table[b:id='%s']/b:flow[b:id='%s']" % (table_id,
+                                                           flow_id)
+    return _DATA_CHANGE_EVENT % (ns, path, operation)
+
+
+def make_inventory_notification(events=100, seed=1):
+    """ Returns inventory change notification (XML) with a burst of node
+        and flow entry events. """
+    rnd = random.Random(seed)
+    items = []
+    for n in range(events):
+        operation = rnd.choice(['created', 'deleted', 'updated'])
+        node_id = 'openflow:%d' % rnd.randint(1, 1000)
+        if rnd.random() < 0.2:
+            items.append(make_inventory_change_event(operation, node_id))
+        else:
+            items.append(make_inventory_change_event(
+                operation, node_id, rnd.randint(0, 3),
+                'flow-%d' % rnd.randint(0, 10000)))
+    return _NOTIFICATION % ''.join(items)
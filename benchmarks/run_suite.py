@@ -0,0 +1,181 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+run_suite.py: Runs the offline benchmarks (no Controller or network
+              needed) and saves the results to a JSON file that can be
+              compared with the results of another commit
+
+Examples:
+
+    PYTHONPATH=. python benchmarks/run_suite.py -o before.json
+    (... change the code ...)
+    PYTHONPATH=. python benchmarks/run_suite.py -o after.json \
+        --compare before.json
+
+
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+
+from benchutil import BENCH_DIR, REPO_DIR
+
+
+# Offline benchmarks (synthetic fixtures only) run by the suite
+SUITE = ['bench_model_build',
+         'bench_codec',
+         'bench_inventory_lookup',
+         'bench_topology',
+         'bench_notifications',
+         'bench_payload',
+         'bench_flow_view',
+         'bench_flow_stats',
+         'bench_collector',
+         'bench_classifier',
+         'bench_flow_overlap',
+         'bench_ofp_render']
+
+
+def git_revision():
+    """ Returns the commit the library code is taken from and whether
+        the working tree has local changes. """
+    try:
+        rev = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                      cwd=REPO_DIR).strip()
+        dirty = subprocess.call(['git', 'diff', '--quiet', 'HEAD', '--',
+                                 'pysdn'], cwd=REPO_DIR) != 0
+    except (OSError, subprocess.CalledProcessError):
+        rev, dirty = None, None
+    return rev, dirty
+
+
+def run_benchmark(name, repeat):
+    script = os.path.join(BENCH_DIR, name + '.py')
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [REPO_DIR] + [p for p in [env.get('PYTHONPATH')] if p])
+    out = subprocess.check_output([sys.executable, script, '--json',
+                                   '--repeat', str(repeat)], env=env)
+    return json.loads(out)
+
+
+def compare(current, previous, threshold):
+    """ Prints current vs previous timings and returns the list of
+        benchmarks that got slower by more than 'threshold' (fraction). """
+    regressions = []
+    print "%-60s %11s %11s %8s" % ("benchmark", "previous", "current",
+                                   "change")
+    for bench in sorted(current):
+        for name in sorted(current[bench]):
+            cur = current[bench][name]
+            old = previous.get(bench, {}).get(name)
+            label = "%s.%s" % (bench, name)
+            if old is None:
+                print "%-60s %11s %11.6f %8s" % (label, "n/a", cur, "")
+                continue
+            change = (cur - old) / old if old else 0.0
+            mark = ""
+            if change > threshold:
+                mark = "  <-- slower"
+                regressions.append(label)
+            print "%-60s %11.6f %11.6f %+7.1f%%%s" % (label, old, cur,
+                                                     change * 100, mark)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip()
+                                     .splitlines()[0])
+    parser.add_argument('-o', '--output', metavar='FILE',
+                        help="save the results to FILE (JSON)")
+    parser.add_argument('--compare', metavar='FILE',
+                        help="compare with results saved earlier")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="slowdown (percent) reported as a regression "
+                             "by --compare (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="number of timing rounds (best is reported)")
+    parser.add_argument('--only', metavar='NAME', action='append',
+                        choices=SUITE, help="run only the given benchmark "
+                                            "(may be repeated)")
+    args = parser.parse_args()
+
+    benchmarks = args.only or SUITE
+    rev, dirty = git_revision()
+    results = {}
+    for name in benchmarks:
+        sys.stderr.write("running %s ...\n" % name)
+        results[name] = run_benchmark(name, args.repeat)
+
+    doc = {'revision': rev,
+           'dirty': dirty,
+           'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+           'python': platform.python_version(),
+           'platform': platform.platform(),
+           'repeat': args.repeat,
+           'unit': 's',
+           'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(doc, f, sort_keys=True, indent=4)
+            f.write('\n')
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print "previous: %s, current: %s%s" % (
+            (previous.get('revision') or '?')[:12], (rev or '?')[:12],
+            ' (modified)' if dirty else '')
+        regressions = compare(results, previous.get('results', {}),
+                              args.threshold / 100.0)
+        if regressions:
+            print "\n%d benchmark(s) slower by more than %s%%" % (
+                len(regressions), args.threshold)
+            return 1
+    elif not args.output:
+        print json.dumps(doc, sort_keys=True, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
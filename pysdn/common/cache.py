@@ -0,0 +1,125 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+cache.py: Time-limited cache of data snapshots fetched from the Controller
+
+
+"""
+
+import time
+import threading
+
+from pysdn.common.result import Result
+from pysdn.common.status import OperStatus, STATUS
+
+
+class SnapshotCache(dict):
+    """ Keeps the most recently fetched snapshot of a data tree per key
+        (e.g. per datastore) for 'ttl' seconds.
+
+    Caching is disabled while 'ttl' is None. The cache settings are kept as
+    the dictionary items so that JSON dumps of the owning object only show
+    the settings and not the cached data.
+
+    """
+
+    def __init__(self, ttl=None):
+        """ Initializes this object properties. """
+        dict.__init__(self, ttl=ttl)
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def enabled(self):
+        return self['ttl'] is not None
+
+    def set_ttl(self, ttl):
+        """ Changes the time-to-live of cached snapshots (seconds),
+            None disables caching and drops cached snapshots. """
+        self['ttl'] = ttl
+        if ttl is None:
+            self.invalidate()
+
+    def lookup(self, key):
+        """ Returns the cached snapshot for 'key', None if there is no
+            fresh one. """
+        ttl = self['ttl']
+        if ttl is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry[0] >= ttl:
+            return None
+        return entry[1]
+
+    def store(self, key, value):
+        if self['ttl'] is not None:
+            with self._lock:
+                self._entries[key] = (time.time(), value)
+
+    def invalidate(self, key=None):
+        """ Drops the snapshot for 'key' (all snapshots if None). """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def load(self, key, loader):
+        """ Returns 'Result' with the cached snapshot for 'key', or calls
+            'loader()' (which must return a 'Result') to fetch a new one.
+
+        Concurrent callers missing the same key wait for a single fetch
+        instead of each fetching the snapshot. Only successful results are
+        cached.
+
+        """
+        if self['ttl'] is None:
+            return loader()
+        value = self.lookup(key)
+        if value is None:
+            with self._lock:
+                load_lock = self._load_locks.setdefault(key,
+                                                        threading.Lock())
+            with load_lock:
+                value = self.lookup(key)
+                if value is None:
+                    result = loader()
+                    if result.get_status().eq(STATUS.OK):
+                        self.store(key, result.get_data())
+                    return result
+        return Result(OperStatus(STATUS.OK), value)
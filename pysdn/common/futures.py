@@ -0,0 +1,300 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+futures.py: Minimal futures and bounded worker pool used to run blocking
+            Controller/device calls concurrently
+
+
+"""
+
+import sys
+import time
+import threading
+import Queue
+
+
+PENDING, RUNNING, CANCELLED, FINISHED = range(4)
+
+
+class FutureTimeout(Exception):
+    """ Raised when a future (or a set of futures) did not complete
+        within the given time. """
+    pass
+
+
+class FutureCancelled(Exception):
+    """ Raised when the result of a cancelled future is requested. """
+    pass
+
+
+class Future(object):
+    """ Result of a call submitted to a 'BoundedExecutor'. """
+
+    def __init__(self):
+        """ Initializes this object properties. """
+        self._cond = threading.Condition()
+        self._state = PENDING
+        self._result = None
+        self._exc_info = None
+        self._callbacks = []
+
+    def done(self):
+        """ Returns True if the call completed or was cancelled. """
+        return self._state in (CANCELLED, FINISHED)
+
+    def running(self):
+        return self._state == RUNNING
+
+    def cancelled(self):
+        return self._state == CANCELLED
+
+    def cancel(self):
+        """ Cancels the call if it has not started yet.
+            Returns True on success.
+        """
+        with self._cond:
+            if self._state == RUNNING or self._state == FINISHED:
+                return False
+            if self._state == PENDING:
+                self._state = CANCELLED
+                self._cond.notify_all()
+        self._invoke_callbacks()
+        return True
+
+    def result(self, timeout=None):
+        """ Returns the value returned by the call, re-raises the exception
+            raised by the call, or raises 'FutureTimeout' if the call did not
+            complete within 'timeout' seconds.
+        """
+        self._wait(timeout)
+        if self._exc_info is not None:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+        return self._result
+
+    def exception(self, timeout=None):
+        """ Returns the exception raised by the call (None if none). """
+        self._wait(timeout)
+        if self._exc_info is not None:
+            return self._exc_info[1]
+        return None
+
+    def add_done_callback(self, fn):
+        """ Attaches 'fn' to be called with this future once it completes
+            (immediately if it already did).
+        """
+        with self._cond:
+            if not self.done():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def set_running_or_notify_cancel(self):
+        """ Marks the future as running. Returns False if it was cancelled
+            (in which case the call must not be executed).
+        """
+        with self._cond:
+            if self._state == CANCELLED:
+                return False
+            self._state = RUNNING
+            return True
+
+    def set_result(self, result):
+        with self._cond:
+            self._result = result
+            self._state = FINISHED
+            self._cond.notify_all()
+        self._invoke_callbacks()
+
+    def set_exception(self, exc_info):
+        """ Completes the future with 'exc_info' as returned
+            by 'sys.exc_info()'. """
+        with self._cond:
+            self._exc_info = exc_info
+            self._state = FINISHED
+            self._cond.notify_all()
+        self._invoke_callbacks()
+
+    def _wait(self, timeout):
+        with self._cond:
+            if not self.done():
+                # Condition.wait() without timeout can not be interrupted
+                # by KeyboardInterrupt on Python 2, so wait in slices
+                end = None if timeout is None else time.time() + timeout
+                while not self.done():
+                    if end is None:
+                        self._cond.wait(1)
+                    else:
+                        remaining = end - time.time()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+            if self._state == CANCELLED:
+                raise FutureCancelled()
+            if self._state != FINISHED:
+                raise FutureTimeout()
+
+    def _invoke_callbacks(self):
+        with self._cond:
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception:
+                pass
+
+
+class BoundedExecutor(object):
+    """ Runs submitted calls on at most 'max_workers' threads.
+
+    Worker threads are started on demand and are daemonic, so an executor
+    that was not shut down never keeps the interpreter alive.
+
+    """
+
+    def __init__(self, max_workers):
+        """ Initializes this object properties. """
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+        self.max_workers = max_workers
+        self._queue = Queue.Queue()
+        self._threads = []
+        self._idle = 0
+        # calls queued but not taken by a worker yet
+        self._pending = 0
+        self._shutdown = False
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """ Schedules 'fn(*args, **kwargs)' and returns its 'Future'. """
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            f = Future()
+            self._queue.put((f, fn, args, kwargs))
+            self._pending += 1
+            # idle workers take the queued calls one each, a burst of
+            # calls needs more workers than there are idle ones
+            if (self._pending > self._idle and
+                    len(self._threads) < self.max_workers):
+                t = threading.Thread(target=self._worker)
+                t.daemon = True
+                t.start()
+                self._threads.append(t)
+            return f
+
+    def map(self, fn, iterable):
+        """ Submits 'fn(item)' for every item, returns the list of futures
+            in the order of 'iterable'. """
+        return [self.submit(fn, item) for item in iterable]
+
+    def shutdown(self, wait=True):
+        """ Stops the worker threads once queued calls are processed. """
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            for _ in self._threads:
+                self._queue.put(None)
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                self._idle += 1
+            item = self._queue.get()
+            with self._lock:
+                self._idle -= 1
+                if item is not None:
+                    self._pending -= 1
+            if item is None:
+                return
+            f, fn, args, kwargs = item
+            if not f.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                f.set_exception(sys.exc_info())
+            else:
+                f.set_result(result)
+            del item, f, fn, args, kwargs
+
+
+def as_completed(fs, timeout=None):
+    """ Yields futures from 'fs' as they complete (finished or cancelled).
+
+    :param fs: iterable of 'Future' objects
+    :param float timeout: maximum number of seconds to wait overall
+    :raises FutureTimeout: if some futures are still pending at timeout
+
+    """
+    fs = list(fs)
+    end = None if timeout is None else time.time() + timeout
+    done = Queue.Queue()
+    for f in fs:
+        f.add_done_callback(done.put)
+    for _ in xrange(len(fs)):
+        if end is None:
+            # see Future._wait() for why waiting is sliced
+            while True:
+                try:
+                    f = done.get(True, 1)
+                    break
+                except Queue.Empty:
+                    pass
+        else:
+            remaining = end - time.time()
+            try:
+                f = done.get(True, max(remaining, 0))
+            except Queue.Empty:
+                raise FutureTimeout()
+        yield f
+
+
+def wait_all(fs, timeout=None):
+    """ Waits for all futures in 'fs' and returns their results in order.
+
+    :raises FutureTimeout: if not all futures completed within 'timeout'
+
+    """
+    fs = list(fs)
+    for _ in as_completed(fs, timeout):
+        pass
+    return [f.result(0) for f in fs]
@@ -0,0 +1,118 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+httpsession.py: Pooled keep-alive HTTP session shared by a Controller
+                and by every device object that talks to it
+
+
+"""
+
+import threading
+import requests
+
+from requests.adapters import HTTPAdapter
+
+
+class HttpSessionPool(dict):
+    """ Keep-alive HTTP session with a bounded connection pool.
+
+    One instance is owned by each Controller and is reused for all RESTCONF
+    requests that go through it (including requests issued by OFSwitch,
+    VRouter5600, NOS and Ovrly_mgr objects), so TCP connections and
+    authentication state are set up once instead of once per call.
+
+    The pool settings are kept as the dictionary items so that JSON dumps
+    of a Controller (and of any device object holding a reference to one)
+    only show the settings and never try to serialize the live session.
+
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, max_retries=0,
+                 pool_block=False):
+        """Initializes this object properties.
+
+        :param int pool_connections: number of per-host connection pools
+                                     to keep cached
+        :param int pool_maxsize: maximum number of connections kept open
+                                 to a single host
+        :param int max_retries: number of retries for failed connection
+                                attempts (never applies to requests that
+                                already reached the server)
+        :param bool pool_block: when True, callers wait for a free
+                                connection instead of opening extra
+                                non-pooled connections to a busy host
+
+        """
+        dict.__init__(self,
+                      pool_connections=pool_connections,
+                      pool_maxsize=pool_maxsize,
+                      max_retries=max_retries,
+                      pool_block=pool_block)
+        self._session = None
+        self._lock = threading.Lock()
+
+    def get_session(self):
+        """ Returns the underlying `requests.Session`, creating it
+            on first use.
+        """
+        session = self._session
+        if session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._new_session()
+                session = self._session
+        return session
+
+    def close(self):
+        """ Closes all pooled connections. A new session is created
+            transparently on the next request.
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self['pool_connections'],
+                              pool_maxsize=self['pool_maxsize'],
+                              max_retries=self['max_retries'],
+                              pool_block=self['pool_block'])
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
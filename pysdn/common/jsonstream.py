@@ -0,0 +1,184 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+jsonstream.py: Incremental decoder for large JSON documents
+
+
+"""
+
+import re
+import json
+
+# Characters that matter to the scanner outside and inside of JSON strings
+_TOKEN_RE = re.compile(r'["{}\[\]:]')
+_STRING_RE = re.compile(r'["\\]')
+
+
+def _decode_key(raw):
+    if '\\' in raw:
+        return json.loads('"%s"' % raw)
+    return raw
+
+
+def _decode_element(decoder, buf, chunks):
+    """ Decodes the JSON value that 'buf' starts with, reading more
+        'chunks' while the value is incomplete. Returns the value and the
+        text that follows it. """
+    while True:
+        try:
+            value, end = decoder.raw_decode(buf)
+            return value, buf[end:]
+        except ValueError:
+            # Read ahead until the buffer doubles before decoding again, so
+            # that an element spanning many chunks is decoded only a
+            # logarithmic number of times
+            parts = [buf]
+            size = want = len(buf)
+            for chunk in chunks:
+                parts.append(chunk)
+                size += len(chunk)
+                if size >= 2 * want:
+                    break
+            if size == want:
+                raise
+            buf = ''.join(parts)
+
+
+def iter_json_array(chunks, path):
+    """ Decodes elements of a JSON array nested in a (possibly very large)
+        JSON document one at a time.
+
+    The document is read from 'chunks' (any iterable of string fragments,
+    e.g. 'requests.Response.iter_content()'). The array is located by
+    'path', the sequence of object keys leading to it from the top-level
+    object, e.g. ('nodes', 'node') for the RESTCONF inventory. Each object
+    (or array) element of the array is decoded and yielded as soon as it
+    has been read, so memory use is bounded by the size of the largest
+    element rather than by the size of the whole document. Other parts of
+    the document are scanned without being decoded.
+
+    :param chunks: iterable of fragments of the JSON document text
+    :param tuple path: keys of the objects containing the array
+    :return: generator of decoded array elements
+    :raises ValueError: if the document is malformed or truncated
+
+    """
+    chunks = iter(chunks)
+    decoder = json.JSONDecoder()
+    path = list(path)
+    target_depth = len(path) + 1
+    # Keys of the open containers (None for the top-level container and for
+    # containers that are elements of an array) and their kinds ('{', '[')
+    keys = []
+    kinds = []
+    key = None
+    last_string = None
+    in_string = False
+    skip_next = False
+    string_parts = None
+    buf = ''
+    pos = 0
+    string_start = 0
+
+    while True:
+        if pos >= len(buf):
+            if in_string and string_parts is not None:
+                string_parts.append(buf[string_start:])
+            buf = next(chunks, None)
+            if buf is None:
+                break
+            pos = 0
+            string_start = 0
+            if skip_next:
+                # the first character is escaped by the last one of the
+                # previous chunk
+                pos = 1
+                skip_next = False
+            continue
+
+        if in_string:
+            m = _STRING_RE.search(buf, pos)
+            if m is None:
+                pos = len(buf)
+                continue
+            i = m.start()
+            if buf[i] == '\\':
+                pos = i + 2
+                if pos > len(buf):
+                    skip_next = True
+                continue
+            in_string = False
+            if string_parts is not None:
+                string_parts.append(buf[string_start:i])
+                last_string = ''.join(string_parts)
+                string_parts = None
+            pos = i + 1
+            continue
+
+        m = _TOKEN_RE.search(buf, pos)
+        if m is None:
+            pos = len(buf)
+            continue
+        i = m.start()
+        c = buf[i]
+        pos = i + 1
+        if c == '"':
+            in_string = True
+            string_parts = []
+            string_start = pos
+        elif c == ':':
+            key = _decode_key(last_string)
+        elif c == '{' or c == '[':
+            if (len(keys) == target_depth and kinds[-1] == '[' and
+                    keys[1:] == path):
+                value, buf = _decode_element(decoder, buf[i:], chunks)
+                pos = 0
+                yield value
+                continue
+            keys.append(key if kinds and kinds[-1] == '{' else None)
+            kinds.append(c)
+            key = None
+        else:
+            if not kinds or kinds[-1] != ('{' if c == '}' else '['):
+                raise ValueError("Malformed JSON document: unexpected "
+                                 "'%s'" % c)
+            keys.pop()
+            kinds.pop()
+
+    if kinds or in_string:
+        raise ValueError("Malformed JSON document: unexpected end of data")
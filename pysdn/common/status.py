@@ -54,7 +54,8 @@ STATUS = enum('OK', 'CONN_ERROR',
               'UNAUTHORIZED_ACCESS', 'INTERNAL_ERROR',
               'NODE_CONNECTED', 'NODE_DISONNECTED',
               'NODE_NOT_FOUND', 'NODE_CONFIGURED',
-              'HTTP_ERROR', 'MALFORM_DATA', 'UNKNOWN')
+              'HTTP_ERROR', 'MALFORM_DATA', 'UNKNOWN',
+              'TIMEOUT')
 
 
 class OperStatus(object):
@@ -133,6 +134,8 @@ class OperStatus(object):
             return "Malformed data"
         elif(self.status_code == STATUS.UNKNOWN):
             return "Unknown error"
+        elif(self.status_code == STATUS.TIMEOUT):
+            return "Operation timed out"
         else:
             print ("Error: undefined status code %s" % self.status_code)
             raise ValueError('!!!undefined status code')
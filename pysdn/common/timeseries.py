@@ -0,0 +1,170 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+timeseries.py: Fixed-size time series of counter increments
+
+
+"""
+
+import math
+from array import array
+
+
+class CounterSeries(object):
+    """ Increments of a monotonic counter (packets, bytes, ...) between
+        consecutive readings, kept in fixed-size ring buffers ('array'
+        objects of 'capacity' samples), so that the memory taken does not
+        grow with the number of readings; the oldest samples are
+        overwritten.
+
+    Each sample is the time of the reading, the increment of the counter
+    since the previous reading and the time between the two readings. A
+    counter that went back (was reset, e.g. the port or flow entry was
+    re-created) is taken as counted from zero.
+
+    Rates are per second, 'window' arguments limit the samples to those
+    read within 'window' seconds of the latest reading.
+
+    """
+
+    __slots__ = ('capacity', '_times', '_deltas', '_intervals', '_next',
+                 '_count', '_last_value', '_last_time')
+
+    def __init__(self, capacity=60):
+        """ Initializes this object properties. """
+        if capacity < 1:
+            raise ValueError("[CounterSeries] capacity must be positive")
+        self.capacity = capacity
+        self._times = array('d', [0.0]) * capacity
+        self._deltas = array('d', [0.0]) * capacity
+        self._intervals = array('d', [0.0]) * capacity
+        self._next = 0
+        self._count = 0
+        self._last_value = None
+        self._last_time = None
+
+    def __len__(self):
+        return self._count
+
+    def __sizeof__(self):
+        return (object.__sizeof__(self) + self._times.__sizeof__() +
+                self._deltas.__sizeof__() + self._intervals.__sizeof__())
+
+    def add(self, value, timestamp):
+        """ Records reading of the counter taken at 'timestamp' (seconds).
+            Returns the increment since the previous reading (None for the
+            first reading or a reading not later than the previous one).
+        """
+        last_value = self._last_value
+        last_time = self._last_time
+        if last_time is not None and timestamp <= last_time:
+            return None
+        self._last_value = value
+        self._last_time = timestamp
+        if last_value is None:
+            return None
+        delta = value - last_value
+        if delta < 0:
+            delta = value
+        i = self._next
+        self._times[i] = timestamp
+        self._deltas[i] = delta
+        self._intervals[i] = timestamp - last_time
+        self._next = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        return delta
+
+    def get_last_value(self):
+        return self._last_value
+
+    def get_last_time(self):
+        return self._last_time
+
+    def _indexes(self, window):
+        # buffer positions of the samples, oldest first
+        start = (self._next - self._count) % self.capacity
+        idx = [(start + k) % self.capacity for k in range(self._count)]
+        if window is not None and idx:
+            since = self._last_time - window
+            times = self._times
+            idx = [i for i in idx if times[i] > since]
+        return idx
+
+    def get_samples(self, window=None):
+        """ Returns list of (time, increment, interval) samples, oldest
+            first. """
+        return [(self._times[i], self._deltas[i], self._intervals[i])
+                for i in self._indexes(window)]
+
+    def get_total(self, window=None):
+        """ Returns sum of the counter increments. """
+        deltas = self._deltas
+        return sum(deltas[i] for i in self._indexes(window))
+
+    def get_rate(self, window=None):
+        """ Returns average rate of the counter (None if there are no
+            samples). """
+        idx = self._indexes(window)
+        if not idx:
+            return None
+        deltas = self._deltas
+        intervals = self._intervals
+        return (sum(deltas[i] for i in idx) /
+                sum(intervals[i] for i in idx))
+
+    def get_rates(self, window=None):
+        """ Returns list of the rates of the samples, oldest first. """
+        deltas = self._deltas
+        intervals = self._intervals
+        return [deltas[i] / intervals[i] for i in self._indexes(window)]
+
+    def get_percentile(self, percent, window=None):
+        """ Returns the 'percent' (0 to 100) percentile of the rates of the
+            samples, interpolated linearly between the closest ranks
+            (None if there are no samples). """
+        if not 0 <= percent <= 100:
+            raise ValueError("[CounterSeries] percentile must be "
+                             "in range 0 to 100")
+        rates = sorted(self.get_rates(window))
+        if not rates:
+            return None
+        k = (len(rates) - 1) * percent / 100.0
+        lo = int(math.floor(k))
+        hi = min(lo + 1, len(rates) - 1)
+        return rates[lo] + (rates[hi] - rates[lo]) * (k - lo)
@@ -155,6 +155,23 @@ def replace_str_value_in_dict(d, old, new):
         return d
 
 
+def replace_str_in_dict(d, old, new):
+    """
+    Returns a copy of a dictionary (with nested lists and dictionaries)
+    with all occurrences of the 'old' substring in the keys and in the
+    string values replaced by 'new'.
+    """
+    if isinstance(d, dict):
+        return dict((k.replace(old, new), replace_str_in_dict(v, old, new))
+                    for k, v in d.iteritems())
+    elif isinstance(d, list):
+        return [replace_str_in_dict(v, old, new) for v in d]
+    elif isinstance(d, basestring):
+        return d.replace(old, new)
+    else:
+        return d
+
+
 def dict_keys_underscored_to_dashed(d):
     new_dict = {}
 
@@ -163,13 +180,33 @@ def dict_keys_underscored_to_dashed(d):
             if isinstance(v, dict):
                 v = dict_keys_underscored_to_dashed(v)
             elif isinstance(v, list):
-                v = [dict_keys_underscored_to_dashed(i) for i in v if i and dict_keys_underscored_to_dashed(i)]
+                v = [x for x in (dict_keys_underscored_to_dashed(i)
+                                 for i in v if i) if x]
             new_dict[k.replace('_', '-')] = v
     else:
         return d
     return new_dict
 
 
+# Converted dictionary keys shared by all the converted dictionaries (str
+# and unicode keys are kept apart, so that a key keeps its type)
+_underscored_keys = {str: {}, unicode: {}}
+_UNDERSCORED_KEYS_MAX = 10000
+
+
+def _underscored_key(k):
+    keys = _underscored_keys.get(type(k))
+    if keys is None:
+        return k.replace('-', '_')
+    try:
+        return keys[k]
+    except KeyError:
+        new_key = k.replace('-', '_')
+        if len(keys) < _UNDERSCORED_KEYS_MAX:
+            keys[k] = new_key
+        return new_key
+
+
 def dict_keys_dashed_to_underscored(d):
     new_dict = {}
 
@@ -178,8 +215,9 @@ def dict_keys_dashed_to_underscored(d):
             if isinstance(v, dict):
                 v = dict_keys_dashed_to_underscored(v)
             elif isinstance(v, list):
-                v = [dict_keys_dashed_to_underscored(i) for i in v if i and dict_keys_dashed_to_underscored(i)]
-            new_dict[k.replace('-', '_')] = v
+                v = [x for x in (dict_keys_dashed_to_underscored(i)
+                                 for i in v if i) if x]
+            new_dict[_underscored_key(k)] = v
     else:
         return d
 
@@ -0,0 +1,116 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+asynccontroller.py: Non-blocking Controller client
+
+
+"""
+
+from pysdn.common.futures import BoundedExecutor
+from pysdn.controller.controller import Controller
+
+
+class AsyncProxy(object):
+    """ Base class for the non-blocking clients.
+
+    Mirrors every public method of the wrapped (blocking) object. Calling a
+    mirrored method submits the blocking call to the executor and
+    immediately returns a 'Future'; 'future.result()' then returns exactly
+    what the blocking method returns (a 'Result' for RESTCONF calls).
+
+    Methods that do not talk to the Controller (object serialization and
+    URL builders) are passed through and run synchronously.
+
+    """
+
+    _sync_methods = ('to_string', 'to_json', 'brief_json')
+
+    def __init__(self, target, executor):
+        """ Initializes this object properties. """
+        self._target = target
+        self.executor = executor
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self._target, name)
+        if (not callable(attr) or name in self._sync_methods or
+                name.endswith('_url')):
+            return attr
+
+        def method(*args, **kwargs):
+            return self.executor.submit(attr, *args, **kwargs)
+        method.__name__ = name
+        method.__doc__ = attr.__doc__
+        return method
+
+
+class AsyncController(AsyncProxy):
+    """ Non-blocking counterpart of 'Controller'.
+
+    All calls issued through this object and through the device clients
+    created on top of it (e.g. 'AsyncOFSwitch') share one bounded pool of
+    'max_concurrency' workers, which caps the number of RESTCONF requests
+    in flight to the Controller. The HTTP connection pool is sized to the
+    same bound so every in-flight request gets a keep-alive connection.
+
+    Example:
+        actrl = AsyncController(ip, port, user, pswd, max_concurrency=128)
+        futures = [AsyncOFSwitch(actrl, name).get_switch_info()
+                   for name in names]
+        results = wait_all(futures)
+
+    """
+
+    def __init__(self, ipAddr, portNum, adminName, adminPassword, timeout=5,
+                 max_concurrency=32, **pool_kwargs):
+        """ Initializes this object properties. """
+        pool_kwargs['pool_maxsize'] = max(pool_kwargs.get('pool_maxsize', 0),
+                                          max_concurrency)
+        ctrl = Controller(ipAddr, portNum, adminName, adminPassword, timeout,
+                          **pool_kwargs)
+        super(AsyncController, self).__init__(
+            ctrl, BoundedExecutor(max_concurrency))
+        self.ctrl = ctrl
+        self.max_concurrency = max_concurrency
+
+    def close(self):
+        """ Waits for the calls in flight, then stops the workers and
+            closes the connections to the Controller. """
+        self.executor.shutdown(wait=True)
+        self.ctrl.close()
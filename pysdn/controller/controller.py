@@ -41,17 +41,21 @@ controller.py: Controller's properties and communication methods
 """
 
 import json
+import urllib2
 import xmltodict
-import requests
 
 from requests.auth import HTTPBasicAuth
 from requests.exceptions import ConnectionError, Timeout
 from pysdn.common.result import Result
+from pysdn.common.httpsession import HttpSessionPool
+from pysdn.common.cache import SnapshotCache
+from pysdn.common.jsonstream import iter_json_array
 from pysdn.common.status import OperStatus, STATUS
 from pysdn.common.utils import (find_key_values_in_dict,
                                 dbg_print,
-                                find_key_value_in_dict)
-from pysdn.controller.topology import Topology
+                                find_key_value_in_dict,
+                                dict_keys_dashed_to_underscored)
+from pysdn.controller.topology import Topology, Node, Link
 from pysdn.controller.inventory import (Inventory,
                                         OpenFlowCapableNode,
                                         NetconfCapableNode,
@@ -60,13 +64,33 @@ from pysdn.controller.inventory import (Inventory,
 
 class Controller():
     """ Class that represents a Controller device. """
-    def __init__(self, ipAddr, portNum, adminName, adminPassword, timeout=5):
-        """Initializes this object properties."""
+    def __init__(self, ipAddr, portNum, adminName, adminPassword, timeout=5,
+                 pool_connections=10, pool_maxsize=10, max_retries=0,
+                 pool_block=False, inventory_cache_ttl=None):
+        """Initializes this object properties.
+
+        :param int pool_connections: number of per-host connection pools
+                                     kept by the HTTP session
+        :param int pool_maxsize: maximum number of keep-alive connections
+                                 to the Controller
+        :param int max_retries: number of retries for failed connection
+                                attempts
+        :param bool pool_block: wait for a free pooled connection instead
+                                of opening extra ones when the pool is busy
+        :param float inventory_cache_ttl: enables the inventory snapshot
+                                          cache (see 'set_inventory_cache_ttl')
+
+        """
         self.ipAddr = ipAddr
         self.portNum = portNum
         self.adminName = adminName
         self.adminPassword = adminPassword
         self.timeout = timeout
+        self.http_pool = HttpSessionPool(pool_connections=pool_connections,
+                                         pool_maxsize=pool_maxsize,
+                                         max_retries=max_retries,
+                                         pool_block=pool_block)
+        self.inventory_cache = SnapshotCache(ttl=inventory_cache_ttl)
 
     def to_string(self):
         """ Returns string representation of this object. """
@@ -86,7 +110,37 @@ class Controller():
         return json.dumps(d, default=lambda o: o.__dict__, sort_keys=True,
                           indent=4)
 
-    def http_get_request(self, url, data, headers, timeout=None):
+    def close(self):
+        """ Closes all keep-alive connections to the Controller. """
+        self.http_pool.close()
+
+    def _http_request(self, method, url, data, headers, timeout=None,
+                      stream=False):
+        """ Sends HTTP request over the pooled session of this Controller
+            and returns the response (None on connection failure).
+        """
+        resp = None
+        if timeout is None:
+            timeout = self.timeout
+
+        if method != 'get':
+            self.inventory_cache.invalidate()
+
+        session = self.http_pool.get_session()
+        try:
+            resp = getattr(session, method)(url,
+                                            auth=HTTPBasicAuth(
+                                                self.adminName,
+                                                self.adminPassword),
+                                            data=data, headers=headers,
+                                            timeout=timeout, stream=stream)
+        except (ConnectionError, Timeout) as e:
+            print "Error: " + repr(e)
+
+        return (resp)
+
+    def http_get_request(self, url, data, headers, timeout=None,
+                         stream=False):
         """ Sends HTTP GET request to a remote server
             and returns the response.
 
@@ -96,25 +150,15 @@ class Controller():
                             Typically set to None.
         :param dict headers: The headers to include in the request.
         :param string timeout: Pass a timeout for longlived queries
+        :param bool stream: Defer downloading of the response body until
+                            it is read by the caller (the response must
+                            then be either fully read or closed)
         :return: The response from the http request.
         :rtype: None or `requests.response`
             <http://docs.python-requests.org/en/latest/api/#requests.Response>
 
         """
-
-        resp = None
-        if timeout is None:
-            timeout = self.timeout
-
-        try:
-            resp = requests.get(url,
-                                auth=HTTPBasicAuth(self.adminName,
-                                                   self.adminPassword),
-                                data=data, headers=headers, timeout=timeout)
-        except (ConnectionError, Timeout) as e:
-            print "Error: " + repr(e)
-
-        return (resp)
+        return self._http_request('get', url, data, headers, timeout, stream)
 
     def http_post_request(self, url, data, headers):
         """ Sends HTTP POST request to a remote server
@@ -130,19 +174,7 @@ class Controller():
             <http://docs.python-requests.org/en/latest/api/#requests.Response>
 
         """
-
-        resp = None
-
-        try:
-            resp = requests.post(url,
-                                 auth=HTTPBasicAuth(self.adminName,
-                                                    self.adminPassword),
-                                 data=data, headers=headers,
-                                 timeout=self.timeout)
-        except (ConnectionError, Timeout) as e:
-            print "Error: " + repr(e)
-
-        return (resp)
+        return self._http_request('post', url, data, headers)
 
     def http_put_request(self, url, data, headers):
         """ Sends HTTP PUT request to a remote server
@@ -158,19 +190,7 @@ class Controller():
             <http://docs.python-requests.org/en/latest/api/#requests.Response>
 
         """
-
-        resp = None
-
-        try:
-            resp = requests.put(url,
-                                auth=HTTPBasicAuth(self.adminName,
-                                                   self.adminPassword),
-                                data=data, headers=headers,
-                                timeout=self.timeout)
-        except (ConnectionError, Timeout) as e:
-            print "Error: " + repr(e)
-
-        return (resp)
+        return self._http_request('put', url, data, headers)
 
     def http_delete_request(self, url, data, headers):
         """ Sends HTTP DELETE request to a remote server
@@ -186,25 +206,31 @@ class Controller():
             <http://docs.python-requests.org/en/latest/api/#requests.Response>
 
         """
-        resp = None
+        return self._http_request('delete', url, data, headers)
 
-        try:
-            resp = requests.delete(url,
-                                   auth=HTTPBasicAuth(self.adminName,
-                                                      self.adminPassword),
-                                   data=data, headers=headers,
-                                   timeout=self.timeout)
-        except (ConnectionError, Timeout) as e:
-            print "Error: " + repr(e)
+    def get_inventory_nodes(self, operational=True):
+        """Return the list of nodes in the controller's inventory (each node
+           is a dict decoded from the RESTCONF JSON data).
 
-        return (resp)
+        When the inventory cache is enabled (see 'set_inventory_cache_ttl')
+        the list may be a snapshot fetched earlier, shared by all callers,
+        so it must not be modified.
 
-    def get_nodes_operational_list(self):
+        :param bool operational: True for the operational data store,
+                                 False for the configuration data store
+        :return: Status, list of node dicts
+        :rtype: :class:`pysdn.common.result.Result`
+
+        """
+        inv_type = "operational" if operational else "config"
+        return self.inventory_cache.load(
+            inv_type, lambda: self._fetch_inventory_nodes(inv_type))
+
+    def _fetch_inventory_nodes(self, inv_type):
         status = OperStatus()
-        templateUrl = ("http://{}:{}/restconf/operational/"
-                       "opendaylight-inventory:nodes")
-        url = templateUrl.format(self.ipAddr, self.portNum)
-        nlist = []
+        templateUrl = "http://{}:{}/restconf/{}/opendaylight-inventory:nodes"
+        url = templateUrl.format(self.ipAddr, self.portNum, inv_type)
+        nodes = None
 
         resp = self.http_get_request(url, data=None, headers=None)
         if(resp is None):
@@ -217,11 +243,7 @@ class Controller():
             try:
                 p1 = 'nodes'
                 p2 = 'node'
-                itemslist = json.loads(resp.content)[p1][p2]
-                for item in itemslist:
-                    p3 = 'id'
-                    node_id = item[p3]
-                    nlist.append(str(node_id))
+                nodes = json.loads(resp.content)[p1][p2]
                 status.set_status(STATUS.OK)
             except(Exception):
                 msg = "TODO (unexpected data format in response)"
@@ -230,6 +252,115 @@ class Controller():
         else:
             status.set_status(STATUS.HTTP_ERROR, resp)
 
+        return Result(status, nodes)
+
+    def iter_inventory_nodes(self, operational=True, chunk_size=65536):
+        """Return iterator over the nodes of the controller's inventory,
+           yielding them one at a time as 'OpenFlowCapableNode' and
+           'NetconfCapableNode' objects.
+
+        The inventory is read from the HTTP response body and decoded
+        incrementally, one inventory 'node' entry at a time, so that memory
+        use is bounded by the largest node rather than by the whole
+        inventory. A fresh snapshot of the inventory cache (see
+        'set_inventory_cache_ttl') is used instead when there is one.
+
+        The status reflects the HTTP response; a body that turns out to be
+        malformed while being iterated raises 'ValueError'. A partially
+        consumed iterator should be closed ('close()') to release the
+        connection.
+
+        :param bool operational: True for the operational data store,
+                                 False for the configuration data store
+        :param int chunk_size: number of bytes read from the connection
+                               at a time
+        :return: Status, iterator of inventory node objects
+        :rtype: :class:`pysdn.common.result.Result`
+
+        """
+        status = OperStatus()
+        inv_type = "operational" if operational else "config"
+        nodes = self.inventory_cache.lookup(inv_type)
+        if nodes is not None:
+            status.set_status(STATUS.OK)
+            return Result(status, self._iter_nodes_from_list(nodes))
+
+        templateUrl = "http://{}:{}/restconf/{}/opendaylight-inventory:nodes"
+        url = templateUrl.format(self.ipAddr, self.portNum, inv_type)
+        node_iter = None
+
+        resp = self.http_get_request(url, data=None, headers=None,
+                                     stream=True)
+        if(resp is None):
+            status.set_status(STATUS.CONN_ERROR)
+        elif(resp.status_code == 200):
+            status.set_status(STATUS.OK)
+            node_iter = self._iter_nodes_from_response(resp, chunk_size)
+        else:
+            status.set_status(STATUS.HTTP_ERROR, resp)
+            resp.close()
+
+        return Result(status, node_iter)
+
+    def _iter_nodes_from_list(self, nodes):
+        for item in nodes:
+            if isinstance(item, dict):
+                for node in Inventory.nodes_from_dict(item):
+                    yield node
+
+    def _iter_nodes_from_response(self, resp, chunk_size):
+        try:
+            chunks = resp.iter_content(chunk_size)
+            for item in iter_json_array(chunks, ('nodes', 'node')):
+                if isinstance(item, dict):
+                    for node in Inventory.nodes_from_dict(item):
+                        yield node
+        finally:
+            resp.close()
+
+    def set_inventory_cache_ttl(self, ttl):
+        """Enable caching of the inventory nodes list.
+
+        Inventory queries ('get_nodes_operational_list',
+        'check_node_conn_status', 'get_all_nodes_conn_status', etc.) are
+        answered from a snapshot of the inventory fetched at most 'ttl'
+        seconds ago. Snapshots are kept per data store and are dropped on
+        any write request sent through this Controller.
+
+        :param float ttl: time-to-live of the snapshot (seconds),
+                          None disables the cache
+
+        """
+        self.inventory_cache.set_ttl(ttl)
+
+    def invalidate_inventory_cache(self, operational=None):
+        """Drop the cached inventory snapshot of the operational (True) or
+           configuration (False) data store, or both (None).
+        """
+        if operational is None:
+            self.inventory_cache.invalidate()
+        else:
+            inv_type = "operational" if operational else "config"
+            self.inventory_cache.invalidate(inv_type)
+
+    def get_nodes_operational_list(self):
+        nlist = []
+        result = self.get_inventory_nodes(operational=True)
+        status = result.get_status()
+        if(status.eq(STATUS.OK)):
+            # If format of the response differs from our expectation then
+            # code in 'except' clause suppose to handle such condition
+            try:
+                itemslist = result.get_data()
+                for item in itemslist:
+                    p3 = 'id'
+                    node_id = item[p3]
+                    nlist.append(str(node_id))
+            except(Exception):
+                msg = "TODO (unexpected data format in response)"
+                dbg_print(msg)
+                status.set_status(STATUS.DATA_NOT_FOUND)
+
         return Result(status, nlist)
 
     def get_node_info(self, nodeId):
@@ -312,25 +443,15 @@ class Controller():
                              an error status code.
 
         """
-        status = OperStatus()
-        templateUrl = ("http://{}:{}/restconf/operational/"
-                       "opendaylight-inventory:nodes")
-        url = templateUrl.format(self.ipAddr, self.portNum)
-
-        resp = self.http_get_request(url, data=None, headers=None)
-        if(resp is None):
-            status.set_status(STATUS.CONN_ERROR)
-        elif(resp.content is None):
-            status.set_status(STATUS.CTRL_INTERNAL_ERROR)
-        elif(resp.status_code == 200):
+        result = self.get_inventory_nodes(operational=True)
+        status = result.get_status()
+        if(status.eq(STATUS.OK)):
             # If format of the response differs from our expectation then
             # code in 'except' clause suppose to handle such condition
             try:
                 found = False
                 connected = False
-                p1 = 'nodes'
-                p2 = 'node'
-                itemslist = json.loads(resp.content)[p1][p2]
+                itemslist = result.get_data()
                 for item in itemslist:
                     p3 = 'id'
                     p4 = 'netconf-node-inventory:connected'
@@ -362,9 +483,7 @@ class Controller():
             except(Exception):
                 msg = "TODO (unexpected data format in response)"
                 dbg_print(msg)
-                status.set_status(STATUS.DATA_NOT_FOUND, resp)
-        else:
-            status.set_status(STATUS.HTTP_ERROR, resp)
+                status.set_status(STATUS.DATA_NOT_FOUND)
 
         return Result(status, None)
 
@@ -384,35 +503,22 @@ class Controller():
                              status code.
 
         """
-        status = OperStatus()
-        templateUrl = ("http://{}:{}/restconf/config/"
-                       "opendaylight-inventory:nodes")
-        url = templateUrl.format(self.ipAddr, self.portNum)
         nlist = []
-
-        resp = self.http_get_request(url, data=None, headers=None)
-        if(resp is None):
-            status.set_status(STATUS.CONN_ERROR)
-        elif(resp.content is None):
-            status.set_status(STATUS.CTRL_INTERNAL_ERROR)
-        elif(resp.status_code == 200):
+        result = self.get_inventory_nodes(operational=False)
+        status = result.get_status()
+        if(status.eq(STATUS.OK)):
             # If format of the response differs from our expectation then
             # code in 'except' clause suppose to handle such condition
-            p1 = 'nodes'
-            p2 = 'node'
             try:
-                itemslist = json.loads(resp.content)[p1][p2]
+                itemslist = result.get_data()
                 for item in itemslist:
                     p3 = 'id'
                     node_id = item[p3]
                     nlist.append(str(node_id))
-                status.set_status(STATUS.OK)
             except(Exception):
                 msg = "TODO (unexpected data format in response)"
                 dbg_print(msg)
-                status.set_status(STATUS.DATA_NOT_FOUND, resp)
-        else:
-            status.set_status(STATUS.HTTP_ERROR, resp)
+                status.set_status(STATUS.DATA_NOT_FOUND)
 
         return Result(status, nlist)
 
@@ -434,29 +540,19 @@ class Controller():
                              status code.
 
         """
-
-        status = OperStatus()
-        templateUrl = ("http://{}:{}/restconf/operational/"
-                       "opendaylight-inventory:nodes")
-        url = templateUrl.format(self.ipAddr, self.portNum)
         nlist = []
-
-        resp = self.http_get_request(url, data=None, headers=None)
-        if(resp is None):
-            status.set_status(STATUS.CONN_ERROR)
-        elif(resp.content is None):
-            status.set_status(STATUS.CTRL_INTERNAL_ERROR)
-        elif(resp.status_code == 200):
+        result = self.get_inventory_nodes(operational=True)
+        status = result.get_status()
+        if(status.eq(STATUS.OK)):
             # If format of the response differs from our expectation then
             # the code in 'except' clause suppose to handle such condition
             try:
-                p1 = 'nodes'
                 p2 = 'node'
                 p3 = 'id'
                 p4 = 'netconf-node-inventory:connected'
                 p5 = 'connected'
                 p6 = 'openflow'
-                itemslist = json.loads(resp.content).get(p1).get(p2)
+                itemslist = result.get_data()
                 for item in itemslist:
                     node_id = item[p3]
                     nd = dict()
@@ -476,13 +572,10 @@ class Controller():
                     else:
                         nd.update({p5: False})
                     nlist.append(nd)
-                status.set_status(STATUS.OK)
             except(Exception):
                 msg = "TODO (unexpected data format in response)"
                 dbg_print(msg)
-                status.set_status(STATUS.DATA_NOT_FOUND, resp)
-        else:
-            status.set_status(STATUS.HTTP_ERROR, resp)
+                status.set_status(STATUS.DATA_NOT_FOUND)
 
         return Result(status, nlist)
 
@@ -503,25 +596,14 @@ class Controller():
                              status code.
 
         """
-
-        status = OperStatus()
-        templateUrl = ("http://{}:{}/restconf/config/"
-                       "opendaylight-inventory:nodes")
-        url = templateUrl.format(self.ipAddr, self.portNum)
         nlist = []
-
-        resp = self.http_get_request(url, data=None, headers=None)
-        if(resp is None):
-            status.set_status(STATUS.CONN_ERROR)
-        elif(resp.content is None):
-            status.set_status(STATUS.CTRL_INTERNAL_ERROR)
-        elif(resp.status_code == 200):
+        result = self.get_inventory_nodes(operational=False)
+        status = result.get_status()
+        if(status.eq(STATUS.OK)):
             # If format of the response differs from our expectation then
             # code in 'except' clause suppose to handle such condition
             try:
-                p1 = 'nodes'
-                p2 = 'node'
-                itemslist = json.loads(resp.content)[p1][p2]
+                itemslist = result.get_data()
                 for item in itemslist:
                     p3 = 'id'
                     p4 = 'openflow'
@@ -532,13 +614,10 @@ class Controller():
                     node_id = item[p3]
                     if(node_id.startswith(p4) is False):
                         nlist.append(str(node_id))
-                status.set_status(STATUS.OK)
             except(Exception):
                 msg = "TODO (unexpected data format in response)"
                 dbg_print(msg)
-                status.set_status(STATUS.DATA_NOT_FOUND, resp)
-        else:
-            status.set_status(STATUS.HTTP_ERROR, resp)
+                status.set_status(STATUS.DATA_NOT_FOUND)
 
         return Result(status, nlist)
 
@@ -560,29 +639,19 @@ class Controller():
                              status code.
 
         """
-
-        status = OperStatus()
-        templateUrl = ("http://{}:{}/restconf/operational/"
-                       "opendaylight-inventory:nodes")
-        url = templateUrl.format(self.ipAddr, self.portNum)
         nlist = []
-
-        resp = self.http_get_request(url, data=None, headers=None)
-        if(resp is None):
-            status.set_status(STATUS.CONN_ERROR)
-        elif(resp.content is None):
-            status.set_status(STATUS.CTRL_INTERNAL_ERROR)
-        elif(resp.status_code == 200):
+        result = self.get_inventory_nodes(operational=True)
+        status = result.get_status()
+        if(status.eq(STATUS.OK)):
             # If format of the response differs from our expectation then
             # code in 'except' clause suppose to handle such condition
             try:
-                p1 = 'nodes'
                 p2 = 'node'
                 p3 = 'id'
                 p4 = 'netconf-node-inventory:connected'
                 p5 = 'connected'
                 p6 = 'openflow'
-                itemslist = json.loads(resp.content)[p1][p2]
+                itemslist = result.get_data()
                 for item in itemslist:
                     node_id = item[p3]
                     # OpenFlow devices that are connected to the
@@ -600,13 +669,10 @@ class Controller():
                         else:
                             nd.update({p5: False})
                         nlist.append(nd)
-                status.set_status(STATUS.OK)
             except(Exception):
                 msg = "TODO (unexpected data format in response)"
                 dbg_print(msg)
-                status.set_status(STATUS.DATA_NOT_FOUND, resp)
-        else:
-            status.set_status(STATUS.HTTP_ERROR, resp)
+                status.set_status(STATUS.DATA_NOT_FOUND)
 
         return Result(status, nlist)
 
@@ -1249,68 +1315,45 @@ class Controller():
         return url
 
     def get_openflow_nodes_operational_list(self):
-        status = OperStatus()
-        templateUrl = ("http://{}:{}/restconf/operational/"
-                       "opendaylight-inventory:nodes")
-        url = templateUrl.format(self.ipAddr, self.portNum)
         nlist = []
-        resp = self.http_get_request(url, data=None, headers=None)
-        if(resp is None):
-            status.set_status(STATUS.CONN_ERROR)
-        elif(resp.content is None):
-            status.set_status(STATUS.CTRL_INTERNAL_ERROR)
-        elif(resp.status_code == 200):
+        result = self.get_inventory_nodes(operational=True)
+        status = result.get_status()
+        if(status.eq(STATUS.OK)):
             # If format of the response differs from our expectation then
             # code in 'except' clause suppose to handle such condition
             try:
-                p1 = 'nodes'
-                p2 = 'node'
                 p3 = 'id'
                 p4 = 'openflow'
-                itemslist = json.loads(resp.content)[p1][p2]
+                itemslist = result.get_data()
                 for item in itemslist:
                     if(item[p3].startswith(p4)):
                         nlist.append(item[p3])
-                status.set_status(STATUS.OK)
             except(Exception):
                 msg = "TODO (unexpected data format in response)"
                 dbg_print(msg)
                 status.set_status(STATUS.DATA_NOT_FOUND)
-        else:
-            status.set_status(STATUS.HTTP_ERROR, resp)
 
         return Result(status, sorted(nlist))
 
     def get_openflow_operational_flows_total_cnt(self):
-        status = OperStatus()
-        templateUrl = ("http://{}:{}/restconf/operational/"
-                       "opendaylight-inventory:nodes")
-        url = templateUrl.format(self.ipAddr, self.portNum)
         cnt = 0
-        resp = self.http_get_request(url, data=None, headers=None)
-        if(resp is None):
-            status.set_status(STATUS.CONN_ERROR)
-        elif(resp.content is None):
-            status.set_status(STATUS.CTRL_INTERNAL_ERROR)
-        elif(resp.status_code == 200):
+        result = self.get_inventory_nodes(operational=True)
+        status = result.get_status()
+        if(status.eq(STATUS.OK)):
             # If format of the response differs from our expectation then
             # the code in 'except' clause suppose to handle such condition
             try:
-                p1 = 'nodes'
                 p2 = 'opendaylight-flow-statistics:aggregate-flow-statistics'
                 p3 = 'flow-count'
-                d = json.loads(resp.content)[p1]
-                vlist = find_key_values_in_dict(d, p2)
+                vlist = find_key_values_in_dict({'node': result.get_data()},
+                                                p2)
                 if vlist:
                     for item in vlist:
                         cnt += item[p3]
-                status.set_status(STATUS.OK)
             except(Exception):
                 msg = "TODO (unexpected data format in response)"
                 dbg_print(msg)
-                status.set_status(STATUS.DATA_NOT_FOUND, resp)
-        else:
-            status.set_status(STATUS.HTTP_ERROR, resp)
+                status.set_status(STATUS.DATA_NOT_FOUND)
 
         return Result(status, cnt)
 
@@ -1380,13 +1423,25 @@ class Controller():
 
         return Result(status, topo_obj)
 
-    def build_inventory_object(self, operational=True):
+    def build_topology_node_object(self, topo_name, node_id):
+        """ Returns the node 'node_id' of the topology 'topo_name' (as the
+            'pysdn.controller.topology.Node' object). """
+        return self._get_topology_element(topo_name, 'node', node_id, Node)
+
+    def build_topology_link_object(self, topo_name, link_id):
+        """ Returns the link 'link_id' of the topology 'topo_name' (as the
+            'pysdn.controller.topology.Link' object). """
+        return self._get_topology_element(topo_name, 'link', link_id, Link)
+
+    def _get_topology_element(self, topo_name, kind, element_id, cls):
         status = OperStatus()
-        templateUrl = "http://{}:{}/restconf/{}/opendaylight-inventory:nodes"
-        inv_obj = None
+        templateUrl = ("http://{}:{}/restconf/operational/"
+                       "network-topology:network-topology/topology/{}/{}/{}")
+        obj = None
 
-        inv_type = "operational" if operational else "config"
-        url = templateUrl.format(self.ipAddr, self.portNum, inv_type)
+        # ids of the host links contain '/' (e.g. 'host:.../openflow:1:1')
+        url = templateUrl.format(self.ipAddr, self.portNum, topo_name, kind,
+                                 urllib2.quote(str(element_id), safe=''))
         resp = self.http_get_request(url, data=None, headers=None)
         if(resp is None):
             status.set_status(STATUS.CONN_ERROR)
@@ -1395,20 +1450,48 @@ class Controller():
         elif(resp.status_code == 200):
             # If format of the response differs from our expectation then
             # code in 'except' clause suppose to handle such condition
-            p1 = 'nodes'
-            p2 = 'node'
             try:
                 d = json.loads(resp.content)
-                v = d[p1][p2]
-                inv_obj = Inventory(inv_json=json.dumps(v))
+                v = d[kind][0]
+                obj = cls(dict_keys_dashed_to_underscored(v))
                 status.set_status(STATUS.OK)
             except(Exception):
                 msg = "TODO (unexpected data format in response)"
                 dbg_print(msg)
-                status.set_status(STATUS.DATA_NOT_FOUND)
+                status.set_status(STATUS.DATA_NOT_FOUND, resp)
+        elif(resp.status_code == 404):
+            status.set_status(STATUS.DATA_NOT_FOUND)
         else:
             status.set_status(STATUS.HTTP_ERROR, resp)
 
+        return Result(status, obj)
+
+    def build_inventory_object(self, operational=True, stream=False):
+        inv_obj = None
+        if stream:
+            result = self.iter_inventory_nodes(operational)
+        else:
+            result = self.get_inventory_nodes(operational)
+        status = result.get_status()
+        if(status.eq(STATUS.OK)):
+            # If format of the response differs from our expectation then
+            # code in 'except' clause suppose to handle such condition
+            try:
+                v = result.get_data()
+                if stream:
+                    inv_obj = Inventory()
+                    for node in v:
+                        if isinstance(node, OpenFlowCapableNode):
+                            inv_obj.add_openflow_node(node)
+                        else:
+                            inv_obj.add_netconf_node(node)
+                else:
+                    inv_obj = Inventory(inv_list=v)
+            except(Exception):
+                msg = "TODO (unexpected data format in response)"
+                dbg_print(msg)
+                status.set_status(STATUS.DATA_NOT_FOUND)
+
         return Result(status, inv_obj)
 
     def build_openflow_node_inventory_object(self, node_id, operational=True):
@@ -1432,7 +1515,7 @@ class Controller():
                 p1 = 'node'
                 d = json.loads(resp.content)
                 v = d[p1][0]
-                inv_obj = OpenFlowCapableNode(inv_json=json.dumps(v))
+                inv_obj = OpenFlowCapableNode(inv_dict=v)
                 status.set_status(STATUS.OK)
             except(Exception):
                 msg = "TODO (unexpected data format in response)"
@@ -43,7 +43,8 @@ inventory.py: Controller's inventory parser
 import re
 import json
 
-from pysdn.common.utils import dict_keys_dashed_to_underscored
+from pysdn.common.utils import (dict_keys_dashed_to_underscored,
+                                replace_str_in_dict)
 from pysdn.openflowdev.ofswitch import (GroupFeatures,
                                         GroupInfo,
                                         MeterFeatures)
@@ -54,60 +55,96 @@ class Inventory():
         the Controller's inventory store.
     """
 
-    def __init__(self, inv_json=None):
+    def __init__(self, inv_json=None, inv_list=None):
         self.openflow_nodes = []
         self.netconf_nodes = []
+        # Indexes of the nodes by their identifiers
+        self._openflow_nodes_by_id = {}
+        self._netconf_nodes_by_id = {}
         if (inv_json is not None):
             self.__init_from_json__(inv_json)
             return
+        if (inv_list is not None):
+            self.__init_from_list__(inv_list)
+            return
 
     def add_openflow_node(self, node):
         assert(isinstance(node, OpenFlowCapableNode))
         self.openflow_nodes.append(node)
+        self._openflow_nodes_by_id.setdefault(node.get_id(), node)
 
     def add_netconf_node(self, node):
         assert(isinstance(node, NetconfCapableNode))
         self.netconf_nodes.append(node)
+        self._netconf_nodes_by_id.setdefault(node.get_id(), node)
+
+    def remove_openflow_node(self, node_id):
+        """ Removes the OpenFlow node 'node_id', returns the removed node
+            (None if there is no such node). """
+        node = self._openflow_nodes_by_id.pop(node_id, None)
+        if node is not None:
+            self.openflow_nodes[:] = [n for n in self.openflow_nodes
+                                      if n.get_id() != node_id]
+        return node
+
+    def remove_netconf_node(self, node_id):
+        """ Removes the NETCONF node 'node_id', returns the removed node
+            (None if there is no such node). """
+        node = self._netconf_nodes_by_id.pop(node_id, None)
+        if node is not None:
+            self.netconf_nodes[:] = [n for n in self.netconf_nodes
+                                     if n.get_id() != node_id]
+        return node
 
     def __init_from_json__(self, s):
         if (isinstance(s, basestring)):
-            l = json.loads(s)
-            assert(isinstance(l, list))
-            p1 = 'id'
-            p2 = 'openflow'
-            p3 = 'netconf_node_inventory:initial_capability'
-            filter1 = 'brocade-interface-ext?revision=2014-04-01'
-            filter2 = 'vyatta-interfaces?revision=2014-12-02'
-            filter3 = 'controller:netty:eventexecutor?revision=2013-11-12'
-            devices = [{'clazz': 'NOS', 'filter': filter1},
-                       {'clazz': 'VRouter5600', 'filter': filter2},
-                       {'clazz': 'controller', 'filter': filter3}]
-            for item in l:
-                if isinstance(item, dict):
-                    d = dict_keys_dashed_to_underscored(item)
-                    if p1 in d and isinstance(d[p1], basestring):
-                        if (d[p1].startswith(p2)):
-                            node = OpenFlowCapableNode(inv_dict=d)
-                            self.add_openflow_node(node)
-                    if p3 in d:
-                        # Netconf
-                        capabilities = d.get(p3)
-                        nodes = [[d, dev['clazz']] for c in capabilities for
-                                 dev in devices if dev['filter'] in c]
-                        for node in nodes:
-                            if node is not None:
-                                node = NetconfCapableNode(clazz=node[1],
-                                                          inv_dict=node[0])
-                                self.add_netconf_node(node)
-                                break
-                            else:
-                                node = NetconfCapableNode(clazz='unknown',
-                                                          inv_dict=d)
-                                self.add_netconf_node(node)
+            self.__init_from_list__(json.loads(s))
         else:
             raise TypeError("[Inventory] wrong argument type '%s'"
                             " (JSON 'string' is expected)" % type(s))
 
+    def __init_from_list__(self, l):
+        assert(isinstance(l, list))
+        for item in l:
+            if isinstance(item, dict):
+                for node in self.nodes_from_dict(item):
+                    if isinstance(node, OpenFlowCapableNode):
+                        self.add_openflow_node(node)
+                    else:
+                        self.add_netconf_node(node)
+
+    @staticmethod
+    def nodes_from_dict(d):
+        """ Returns list of 'OpenFlowCapableNode' and 'NetconfCapableNode'
+            objects built from a single inventory 'node' entry (dict decoded
+            from RESTCONF JSON data).
+        """
+        nodes = []
+        # The node classes convert keys of the entry themselves, so here
+        # the entry is looked at in its original (dash-separated) form
+        p1 = 'id'
+        p2 = 'openflow'
+        p3 = 'netconf-node-inventory:initial-capability'
+        filter1 = 'brocade-interface-ext?revision=2014-04-01'
+        filter2 = 'vyatta-interfaces?revision=2014-12-02'
+        filter3 = 'controller:netty:eventexecutor?revision=2013-11-12'
+        devices = [{'clazz': 'NOS', 'filter': filter1},
+                   {'clazz': 'VRouter5600', 'filter': filter2},
+                   {'clazz': 'controller', 'filter': filter3}]
+        if p1 in d and isinstance(d[p1], basestring):
+            if (d[p1].startswith(p2)):
+                nodes.append(OpenFlowCapableNode(inv_dict=d))
+        if p3 not in d:
+            p3 = p3.replace('-', '_')
+        if p3 in d:
+            # Netconf
+            capabilities = d.get(p3)
+            clazz = next((dev['clazz'] for c in capabilities
+                          for dev in devices if dev['filter'] in c), None)
+            if clazz is not None:
+                nodes.append(NetconfCapableNode(clazz=clazz, inv_dict=d))
+        return nodes
+
     def get_openflow_node_ids(self):
         ids = []
         for item in self.openflow_nodes:
@@ -115,12 +152,7 @@ class Inventory():
         return sorted(ids)
 
     def get_openflow_node(self, node_id):
-        node = None
-        for item in self.openflow_nodes:
-            if node_id == item.get_id():
-                node = item
-                break
-        return node
+        return self._openflow_nodes_by_id.get(node_id)
 
     def get_openflow_node_flows_cnt(self, node_id):
         cnt = 0
@@ -137,12 +169,7 @@ class Inventory():
         return sorted(ids)
 
     def get_netconf_node(self, node_id):
-        node = None
-        for item in self.netconf_nodes:
-            if node_id == item.get_id():
-                node = item
-                break
-        return node
+        return self._netconf_nodes_by_id.get(node_id)
 
 
 class OpenFlowCapableNode():
@@ -153,6 +180,11 @@ class OpenFlowCapableNode():
 
     def __init__(self, inv_json=None, inv_dict=None):
         self.ports = []
+        # Indexes of the ports by port identifier and by port number, and
+        # of the flow tables statistics by table identifier
+        self._ports_by_id = {}
+        self._ports_by_number = {}
+        self._tables_by_id = {}
         # Group features of the switch
         self.group_features = []
         # Current groups on the switch
@@ -170,8 +202,11 @@ class OpenFlowCapableNode():
 
     def __init_from_json__(self, s):
         assert(isinstance(s, basestring))
-        obj = json.loads(s)
-        d = dict_keys_dashed_to_underscored(obj)
+        self.__init_from_dict__(json.loads(s))
+
+    def __init_from_dict__(self, d):
+        assert(isinstance(d, dict))
+        d = dict_keys_dashed_to_underscored(d)
         p1 = 'node_connector'
         p2 = 'opendaylight_group_statistics:group_features'
         p3 = 'flow_node_inventory:group'
@@ -191,19 +226,35 @@ class OpenFlowCapableNode():
                 self.meter_features = MeterFeatures(v)
             else:
                 setattr(self, k, v)
+        self._build_indexes()
 
-    def __init_from_dict__(self, d):
-        assert(isinstance(d, dict))
-        js = json.dumps(d)
-        self.__init_from_json__(js)
+    def _build_indexes(self):
+        p1 = 'id'
+        p2 = 'flow_node_inventory:port_number'
+        for item in self.ports:
+            pd = item.__dict__
+            if p1 in pd:
+                self._ports_by_id.setdefault(pd[p1], item)
+            if p2 in pd:
+                self._ports_by_number.setdefault(pd[p2], item)
+        p3 = 'flow_node_inventory:table'
+        p4 = 'opendaylight_flow_statistics:aggregate_flow_statistics'
+        for item in self.__dict__.get(p3, []):
+            if (isinstance(item, dict) and p4 in item):
+                self._tables_by_id.setdefault(item.get('id'), item)
+
+    def _public_vars(self):
+        return dict((k, v) for k, v in vars(self).items()
+                    if not k.startswith('_'))
 
     def to_string(self):
         """ Returns string representation of this object. """
-        return str(vars(self))
+        return str(self._public_vars())
 
     def to_json(self):
         """ Returns JSON representation of this object. """
-        return json.dumps(self, default=lambda o: o.__dict__,
+        return json.dumps(self._public_vars(),
+                          default=lambda o: o.__dict__,
                           sort_keys=True, indent=4)
 
     def get_id(self):
@@ -314,17 +365,28 @@ class OpenFlowCapableNode():
             assert(False)
         return cnt
 
+    def get_table_flow_ids(self):
+        """ Returns identifiers of the flow entries present in the node's
+            data, by flow table identifier. """
+        flow_ids = {}
+        p1 = 'flow_node_inventory:table'
+        p2 = 'id'
+        p3 = 'flow'
+        for item in self.__dict__.get(p1, []):
+            if isinstance(item, dict) and p2 in item:
+                ids = flow_ids.setdefault(item[p2], [])
+                for flow in item.get(p3, []):
+                    if isinstance(flow, dict) and p2 in flow:
+                        ids.append(flow[p2])
+        return flow_ids
+
     def get_flows_in_table_cnt(self, table_id):
         flow_cnt = 0
-        p1 = 'flow_node_inventory:table'
-        p2 = 'opendaylight_flow_statistics:aggregate_flow_statistics'
-        p3 = 'flow_count'
-        flow_table = self.__dict__[p1]
-        for item in flow_table:
-            if (isinstance(item, dict) and p2 in item):
-                if(item['id'] == table_id):
-                    flow_cnt += item[p2][p3]
-                    break
+        p1 = 'opendaylight_flow_statistics:aggregate_flow_statistics'
+        p2 = 'flow_count'
+        item = self._tables_by_id.get(table_id)
+        if item is not None:
+            flow_cnt += item[p1][p2]
         return flow_cnt
 
     def get_port_ids(self):
@@ -336,34 +398,27 @@ class OpenFlowCapableNode():
 
     def get_port_id(self, port_num):
         pid = None
-        for item in self.ports:
-            if(item.get_port_number() == port_num):
-                pid = item.get_port_id()
-                break
+        item = self._ports_by_number.get(port_num)
+        if item is not None:
+            pid = item.get_port_id()
         return pid
 
     def get_port_number(self, port_id):
         pnum = None
-        for item in self.ports:
-            if(item.get_port_id() == port_id):
-                pnum = item.get_port_number()
-                break
+        item = self._ports_by_id.get(port_id)
+        if item is not None:
+            pnum = item.get_port_number()
         return pnum
 
     def get_port_name(self, port_id):
         pname = None
-        for item in self.ports:
-            if(item.get_port_id() == port_id):
-                pname = item.get_port_name()
-                break
+        item = self._ports_by_id.get(port_id)
+        if item is not None:
+            pname = item.get_port_name()
         return pname
 
     def get_port_obj(self, port_id):
-        port_obj = None
-        for item in self.ports:
-            if(item.get_port_id() == port_id):
-                port_obj = item
-        return port_obj
+        return self._ports_by_id.get(port_id)
 
     def get_group_features(self):
         return self.group_features
@@ -543,15 +598,13 @@ class NetconfCapableNode():
 
     def __init_from_json__(self, s):
         assert(isinstance(s, basestring))
-        obj = json.loads(s)
-        d = dict_keys_dashed_to_underscored(obj)
-        for k, v in d.items():
-            setattr(self, k, v)
+        self.__init_from_dict__(json.loads(s))
 
     def __init_from_dict__(self, d):
         assert(isinstance(d, dict))
-        js = json.dumps(d)
-        self.__init_from_json__(js)
+        d = dict_keys_dashed_to_underscored(d)
+        for k, v in d.items():
+            setattr(self, k, v)
 
     def to_string(self):
         """ Returns string representation of this object. """
@@ -622,9 +675,7 @@ class NetconfConfigModule():
     def __init__(self, d):
         assert(isinstance(d, dict))
         p = 'odl-sal-netconf-connector-cfg:'
-        js = json.dumps(d)
-        obj = json.loads(js.replace(p, ''))
-        d1 = dict_keys_dashed_to_underscored(obj)
+        d1 = dict_keys_dashed_to_underscored(replace_str_in_dict(d, p, ''))
         for k, v in d1.items():
             setattr(self, k, v)
 
@@ -0,0 +1,361 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+liveinventory.py: Controller's inventory kept up to date by the inventory
+                  change notifications
+
+
+"""
+
+import threading
+
+from pysdn.common.result import Result
+from pysdn.common.status import STATUS
+from pysdn.common.utils import dbg_print
+from pysdn.controller.notification import NotificationListener
+
+# Kinds of the changes passed to the 'LiveInventory' callbacks
+NODE_ADDED = 'node-added'
+NODE_REMOVED = 'node-removed'
+FLOW_ADDED = 'flow-added'
+FLOW_REMOVED = 'flow-removed'
+
+
+def _table_key(table_id):
+    # table identifiers are numbers in the inventory data and strings in
+    # the notification paths
+    try:
+        return int(table_id)
+    except (TypeError, ValueError):
+        return table_id
+
+
+class LiveInventory(object):
+    """ Controller's inventory maintained incrementally.
+
+    The inventory is fetched once (streamed, see Controller's
+    'build_inventory_object') and then follows the inventory change
+    notifications: added OpenFlow nodes are fetched one by one, removed
+    nodes are dropped and added/removed flow entries update the flow index
+    (identifiers of the flow entries by node and flow table), so the full
+    inventory is never downloaded again.
+
+    Flow counts reported by 'get_flows_cnt' and 'get_flows_in_table_cnt'
+    come from the flow index. The flow tables data of the node objects in
+    'get_inventory' is that of the time the node was fetched.
+
+    Callbacks registered with 'add_callback' are called for every net
+    change as 'callback(change, node_id, table_id, flow_id)', 'change' is
+    one of NODE_ADDED, NODE_REMOVED, FLOW_ADDED and FLOW_REMOVED
+    ('table_id' and 'flow_id' are None for the node changes). Flow
+    entries of a removed node are dropped without FLOW_REMOVED calls.
+
+    Example:
+
+        live = LiveInventory(ctrl)
+        live.add_callback(on_change)
+        live.start()
+        ...
+        live.stop()
+
+    """
+
+    def __init__(self, ctrl, listener=None, connect_timeout=10.0):
+        """ Initializes this object properties.
+
+        :param ctrl: :class:`pysdn.controller.controller.Controller`
+        :param listener: :class:`NotificationListener` to take the inventory
+                         change notifications from, by default a listener
+                         of the inventory nodes is created
+        :param float connect_timeout: seconds 'start' waits for the
+                                      notification stream before fetching
+                                      the inventory
+
+        """
+        self.ctrl = ctrl
+        if listener is None:
+            path = ctrl.get_inventory_nodes_yang_schema_path()
+            listener = NotificationListener(ctrl, path)
+        self.listener = listener
+        self.connect_timeout = connect_timeout
+        self.inventory = None
+        self._lock = threading.Lock()
+        self._seed_lock = threading.Lock()
+        self._callbacks = []
+        # node presence and the flow index:
+        # node id -> {table id -> set of flow ids}
+        self._node_ids = set()
+        self._flows = {}
+        self._flows_cnt = {}
+        self._total_flows_cnt = 0
+        # changes notified while the inventory is being fetched, replayed
+        # on top of the fetched inventory
+        self._journal = None
+        self._counters = dict.fromkeys(['notifications', 'skipped',
+                                        'nodes_added', 'nodes_removed',
+                                        'flows_added', 'flows_removed',
+                                        'fetch_errors', 'callback_errors',
+                                        'seeds', 'seed_failures'], 0)
+
+    def add_callback(self, callback):
+        """ Registers 'callback' to be called for every inventory change.
+        """
+        with self._lock:
+            self._callbacks = self._callbacks + [callback]
+
+    def remove_callback(self, callback):
+        with self._lock:
+            self._callbacks = [cb for cb in self._callbacks
+                               if cb != callback]
+
+    def start(self):
+        """ Subscribes to the inventory change notifications and fetches
+            the inventory. Returns result of the fetch. """
+        # Subscribe first, so that no change made during the fetch is
+        # missed
+        self.listener.add_callback(self.apply_notification)
+        self.listener.start()
+        if not self.listener.wait_connected(self.connect_timeout):
+            dbg_print("notification stream is not connected, "
+                      "fetching the inventory anyway")
+        return self.seed()
+
+    def stop(self, timeout=None):
+        """ Stops the notification listener. """
+        self.listener.remove_callback(self.apply_notification)
+        self.listener.stop(timeout)
+
+    def get_inventory(self):
+        """ Returns the maintained 'Inventory' object (None before the
+            inventory was fetched). """
+        return self.inventory
+
+    def get_node_ids(self):
+        """ Returns sorted list of identifiers of the present nodes. """
+        with self._lock:
+            return sorted(self._node_ids)
+
+    def has_node(self, node_id):
+        return node_id in self._node_ids
+
+    def get_flows_cnt(self, node_id):
+        """ Returns number of flow entries of the node. """
+        return self._flows_cnt.get(node_id, 0)
+
+    def get_flows_in_table_cnt(self, node_id, table_id):
+        """ Returns number of flow entries in a flow table of the node. """
+        tables = self._flows.get(node_id)
+        if tables is None:
+            return 0
+        return len(tables.get(_table_key(table_id), ()))
+
+    def get_table_flows_cnt(self, node_id):
+        """ Returns number of flow entries of the node by flow table. """
+        with self._lock:
+            tables = self._flows.get(node_id, {})
+            return dict((t, len(ids)) for t, ids in tables.items() if ids)
+
+    def get_total_flows_cnt(self):
+        """ Returns number of flow entries of all nodes. """
+        return self._total_flows_cnt
+
+    def get_counters(self):
+        """ Returns snapshot of the counters: notifications applied and
+            'skipped' (received before the first fetch started), net node
+            and flow entry changes, failed fetches of added nodes, failed
+            callbacks and the inventory fetches ('seeds', 'seed_failures').
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def seed(self):
+        """ Fetches the whole inventory and replaces the maintained state
+            with it. Returns result of the fetch. """
+        with self._seed_lock:
+            with self._lock:
+                self._journal = []
+            try:
+                result = self.ctrl.build_inventory_object(stream=True)
+            except Exception:
+                with self._lock:
+                    self._journal = None
+                raise
+            with self._lock:
+                journal = self._journal
+                self._journal = None
+                inv = result.get_data()
+                if not result.get_status().eq(STATUS.OK) or inv is None:
+                    self._counters['seed_failures'] += 1
+                    return result
+                self._counters['seeds'] += 1
+                self.inventory = inv
+                self._node_ids = set()
+                self._flows = {}
+                self._flows_cnt = {}
+                self._total_flows_cnt = 0
+                for node in inv.openflow_nodes:
+                    self._node_ids.add(node.get_id())
+                    self._add_node_flows(node, None)
+                for node in inv.netconf_nodes:
+                    self._node_ids.add(node.get_id())
+                # changes notified after the fetch started are newer than
+                # the fetched inventory
+                changes = []
+                for op in journal:
+                    self._apply(op, changes)
+            self._notify(changes)
+        return Result(result.get_status(), self.inventory)
+
+    def apply_notification(self, notification):
+        """ Applies 'InventoryChangeNotification' to the inventory. """
+        # Added nodes are fetched before taking the lock
+        ops = []
+        for flow in notification.flows_removed():
+            ops.append(('flow', flow.node_id, flow.table_id, flow.flow_id,
+                        False))
+        for node_id in notification.nodes_removed():
+            ops.append(('node', node_id, None))
+        for node_id in notification.nodes_added():
+            result = None
+            if node_id.startswith('openflow'):
+                result = self.ctrl.build_openflow_node_inventory_object(
+                    node_id)
+            ops.append(('node', node_id, result))
+        for flow in notification.flows_added():
+            ops.append(('flow', flow.node_id, flow.table_id, flow.flow_id,
+                        True))
+
+        changes = []
+        with self._lock:
+            if self.inventory is None and self._journal is None:
+                self._counters['skipped'] += 1
+                return
+            self._counters['notifications'] += 1
+            if self._journal is not None:
+                self._journal.extend(ops)
+            if self.inventory is not None:
+                for op in ops:
+                    self._apply(op, changes)
+        self._notify(changes)
+
+    def _apply(self, op, changes):
+        # applies single change, appends the net changes to 'changes'
+        if op[0] == 'flow':
+            node_id, table_id, flow_id, added = op[1:]
+            if node_id is None or flow_id is None:
+                return
+            if added:
+                self._add_flow(node_id, table_id, flow_id, changes)
+            else:
+                self._remove_flow(node_id, table_id, flow_id, changes)
+            return
+
+        node_id, result = op[1:]
+        inv = self.inventory
+        if result is None:
+            if node_id.startswith('openflow'):
+                removed = inv.remove_openflow_node(node_id) is not None
+            else:
+                removed = inv.remove_netconf_node(node_id) is not None
+            if node_id in self._node_ids:
+                self._node_ids.discard(node_id)
+                removed = True
+            self._flows.pop(node_id, None)
+            cnt = self._flows_cnt.pop(node_id, 0)
+            self._total_flows_cnt -= cnt
+            if removed:
+                self._counters['nodes_removed'] += 1
+                changes.append((NODE_REMOVED, node_id, None, None))
+            return
+
+        status = result.get_status()
+        if status.eq(STATUS.DATA_NOT_FOUND):
+            # already gone again
+            self._apply(('node', node_id, None), changes)
+            return
+        if node_id not in self._node_ids:
+            self._node_ids.add(node_id)
+            self._counters['nodes_added'] += 1
+            changes.append((NODE_ADDED, node_id, None, None))
+        node = result.get_data()
+        if status.eq(STATUS.OK) and node is not None:
+            inv.remove_openflow_node(node_id)
+            inv.add_openflow_node(node)
+            self._add_node_flows(node, changes)
+        else:
+            self._counters['fetch_errors'] += 1
+
+    def _add_node_flows(self, node, changes):
+        node_id = node.get_id()
+        for table_id, flow_ids in node.get_table_flow_ids().items():
+            for flow_id in flow_ids:
+                self._add_flow(node_id, table_id, flow_id, changes)
+
+    def _add_flow(self, node_id, table_id, flow_id, changes):
+        table_id = _table_key(table_id)
+        ids = self._flows.setdefault(node_id, {}).setdefault(table_id, set())
+        if flow_id in ids:
+            return
+        ids.add(flow_id)
+        self._flows_cnt[node_id] = self._flows_cnt.get(node_id, 0) + 1
+        self._total_flows_cnt += 1
+        if changes is not None:
+            self._counters['flows_added'] += 1
+            changes.append((FLOW_ADDED, node_id, table_id, flow_id))
+
+    def _remove_flow(self, node_id, table_id, flow_id, changes):
+        table_id = _table_key(table_id)
+        ids = self._flows.get(node_id, {}).get(table_id)
+        if not ids or flow_id not in ids:
+            return
+        ids.discard(flow_id)
+        self._flows_cnt[node_id] -= 1
+        self._total_flows_cnt -= 1
+        self._counters['flows_removed'] += 1
+        changes.append((FLOW_REMOVED, node_id, table_id, flow_id))
+
+    def _notify(self, changes):
+        callbacks = self._callbacks
+        for change in changes:
+            for callback in callbacks:
+                try:
+                    callback(*change)
+                except Exception as e:
+                    with self._lock:
+                        self._counters['callback_errors'] += 1
+                    dbg_print("inventory callback failed: %r" % e)
@@ -0,0 +1,323 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+livetopology.py: Network topology kept up to date by the Controller's
+                 topology change notifications
+
+
+"""
+
+import time
+import threading
+
+from pysdn.common.result import Result
+from pysdn.common.status import STATUS
+from pysdn.common.utils import dbg_print
+from pysdn.controller.notification import NotificationListener
+
+
+class LiveTopology(object):
+    """ Network topology instance maintained incrementally.
+
+    The topology is seeded with a single full fetch (Controller's
+    'build_topology_object') and then updated in place from the network
+    topology change notifications: removed switches, hosts and links are
+    dropped from the 'Topology' object, added ones are fetched one by one.
+    A full fetch is repeated every 'reconcile_interval' seconds, and early
+    after the notification stream was reconnected or notifications were
+    dropped or could not be applied, to correct any drift.
+
+    'get_topology' always returns the same 'Topology' object, its lookups
+    keep working while it is updated.
+
+    Example:
+
+        live = LiveTopology(ctrl, 'flow:1')
+        live.start()
+        topo = live.get_topology()
+        ...
+        live.stop()
+
+    """
+
+    def __init__(self, ctrl, topo_name='flow:1', reconcile_interval=300.0,
+                 listener=None, connect_timeout=10.0, poll_interval=1.0):
+        """ Initializes this object properties.
+
+        :param ctrl: :class:`pysdn.controller.controller.Controller`
+        :param string topo_name: identifier of the topology instance
+        :param float reconcile_interval: seconds between full fetches of
+                                         the topology (None to disable)
+        :param listener: :class:`NotificationListener` to take the topology
+                         change notifications from, by default a listener
+                         of the topology 'topo_name' is created
+        :param float connect_timeout: seconds 'start' waits for the
+                                      notification stream before seeding
+        :param float poll_interval: seconds between checks whether an
+                                    early reconciliation is needed
+
+        """
+        self.ctrl = ctrl
+        self.topo_name = topo_name
+        self.reconcile_interval = reconcile_interval
+        if listener is None:
+            path = ctrl.get_network_topology_yang_schema_path(topo_name)
+            listener = NotificationListener(ctrl, path)
+        self.listener = listener
+        self.connect_timeout = connect_timeout
+        self.poll_interval = poll_interval
+        self.topology = None
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()
+        # changes applied while a full fetch is in progress, replayed on
+        # top of the fetched topology ((kind, id, object or None) tuples)
+        self._journal = None
+        self._dirty = False
+        self._stopping = threading.Event()
+        self._thread = None
+        self._counters = dict.fromkeys(['notifications', 'skipped',
+                                        'nodes_added', 'nodes_removed',
+                                        'links_added', 'links_removed',
+                                        'fetch_errors', 'reconciles',
+                                        'reconcile_failures',
+                                        'reconcile_changes'], 0)
+
+    def start(self):
+        """ Subscribes to the topology change notifications, seeds the
+            topology and starts periodic reconciliation. Returns result of
+            the seeding fetch (the topology is fetched again later if it
+            failed). """
+        assert self._thread is None, "live topology is already started"
+        self._stopping.clear()
+        # Subscribe first, so that no change made during the seeding fetch
+        # is missed
+        self.listener.add_callback(self.apply_notification)
+        self.listener.start()
+        if not self.listener.wait_connected(self.connect_timeout):
+            dbg_print("notification stream is not connected, "
+                      "seeding the topology anyway")
+        result = self.reconcile()
+        self._thread = threading.Thread(target=self._reconcile_loop,
+                                        name="pysdn-live-topology")
+        self._thread.daemon = True
+        self._thread.start()
+        return result
+
+    def stop(self, timeout=None):
+        """ Stops the notification listener and the reconciliation. """
+        self._stopping.set()
+        self.listener.remove_callback(self.apply_notification)
+        self.listener.stop(timeout)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_topology(self):
+        """ Returns the maintained 'Topology' object (None before the
+            topology was fetched for the first time). """
+        return self.topology
+
+    def get_counters(self):
+        """ Returns snapshot of the counters: notifications applied and
+            'skipped' (received before the first fetch started), nodes and
+            links added/removed, failed fetches of single elements, full
+            fetches ('reconciles', 'reconcile_failures') and the number of
+            differences the full fetches found ('reconcile_changes'). """
+        with self._lock:
+            return dict(self._counters)
+
+    def apply_notification(self, notification):
+        """ Applies 'NetworkTopologyChangeNotification' to the topology.
+        """
+        # Added elements are fetched before taking the lock, so that slow
+        # requests do not delay reconciliation
+        added = []
+        for node_id in (notification.switches_added() +
+                        notification.hosts_added()):
+            added.append(('node', node_id,
+                          self.ctrl.build_topology_node_object(
+                              self.topo_name, node_id)))
+        for link_id in notification.links_added():
+            added.append(('link', link_id,
+                          self.ctrl.build_topology_link_object(
+                              self.topo_name, link_id)))
+
+        with self._lock:
+            if self.topology is None and self._journal is None:
+                self._counters['skipped'] += 1
+                return
+            self._counters['notifications'] += 1
+            for node_id in (notification.switches_removed() +
+                            notification.hosts_removed()):
+                self._apply('node', node_id, None)
+            for link_id in notification.links_removed():
+                self._apply('link', link_id, None)
+            for kind, element_id, result in added:
+                status = result.get_status()
+                if status.eq(STATUS.OK):
+                    self._apply(kind, element_id, result.get_data())
+                elif status.eq(STATUS.DATA_NOT_FOUND):
+                    # already gone again
+                    self._apply(kind, element_id, None)
+                else:
+                    self._counters['fetch_errors'] += 1
+                    self._dirty = True
+
+    def _apply(self, kind, element_id, obj):
+        # replaces (obj is not None) or removes the node / link
+        if self._journal is not None:
+            self._journal.append((kind, element_id, obj))
+        topo = self.topology
+        if topo is None:
+            # seeding fetch is in progress, the change is replayed after it
+            return
+        if kind == 'node':
+            removed = topo.remove_node(element_id)
+            if obj is not None:
+                topo.add_node(obj)
+                self._counters['nodes_added'] += 1
+            elif removed is not None:
+                self._counters['nodes_removed'] += 1
+        else:
+            removed = topo.remove_link(element_id)
+            if obj is not None:
+                topo.add_link(obj)
+                self._counters['links_added'] += 1
+            elif removed:
+                self._counters['links_removed'] += 1
+
+    def reconcile(self):
+        """ Fetches the whole topology and brings the maintained one in
+            line with it. Returns result of the fetch. """
+        with self._reconcile_lock:
+            with self._lock:
+                self._journal = []
+                self._dirty = False
+            try:
+                result = self.ctrl.build_topology_object(self.topo_name)
+            except Exception:
+                with self._lock:
+                    self._journal = None
+                raise
+            with self._lock:
+                journal = self._journal
+                self._journal = None
+                fetched = result.get_data()
+                if (not result.get_status().eq(STATUS.OK) or
+                        fetched is None):
+                    self._counters['reconcile_failures'] += 1
+                    self._dirty = True
+                    return result
+                self._counters['reconciles'] += 1
+                if self.topology is None:
+                    self.topology = fetched
+                else:
+                    self._counters['reconcile_changes'] += \
+                        self._sync(fetched)
+                # changes notified after the fetch started are newer than
+                # the fetched topology
+                topo = self.topology
+                for kind, element_id, obj in journal:
+                    if kind == 'node':
+                        topo.remove_node(element_id)
+                        if obj is not None:
+                            topo.add_node(obj)
+                    else:
+                        topo.remove_link(element_id)
+                        if obj is not None:
+                            topo.add_link(obj)
+        return Result(result.get_status(), self.topology)
+
+    def _sync(self, fetched):
+        # updates the maintained topology to match the fetched one, returns
+        # the number of differences
+        topo = self.topology
+        changes = 0
+        topo.topology_id = fetched.topology_id
+        current = dict((n.get_id(), n) for n in topo.get_nodes())
+        wanted = dict((n.get_id(), n) for n in fetched.get_nodes())
+        for node_id in current:
+            if node_id not in wanted:
+                topo.remove_node(node_id)
+                changes += 1
+        for node_id, node in wanted.items():
+            old = current.get(node_id)
+            if old is None or vars(old) != vars(node):
+                topo.remove_node(node_id)
+                topo.add_node(node)
+                changes += 1
+        current = dict((l.get_id(), l) for l in topo.links)
+        wanted = dict((l.get_id(), l) for l in fetched.links)
+        for link_id in current:
+            if link_id not in wanted:
+                topo.remove_link(link_id)
+                changes += 1
+        for link_id, link in wanted.items():
+            old = current.get(link_id)
+            if old is None or vars(old) != vars(link):
+                topo.remove_link(link_id)
+                topo.add_link(link)
+                changes += 1
+        return changes
+
+    def _needs_reconcile(self, last, counters):
+        if self._dirty:
+            return True
+        if (self.reconcile_interval is not None and
+                time.time() - last >= self.reconcile_interval):
+            return True
+        # missed notifications: the stream was reconnected or the queue
+        # overflowed
+        now = self.listener.get_counters()
+        return (now.get('connects', 0) > counters.get('connects', 0) or
+                now.get('dropped', 0) > counters.get('dropped', 0))
+
+    def _reconcile_loop(self):
+        last = time.time()
+        counters = self.listener.get_counters()
+        while not self._stopping.wait(self.poll_interval):
+            if not self._needs_reconcile(last, counters):
+                continue
+            counters = self.listener.get_counters()
+            last = time.time()
+            try:
+                self.reconcile()
+            except Exception as e:
+                dbg_print("topology reconciliation failed: %r" % e)
+                with self._lock:
+                    self._counters['reconcile_failures'] += 1
@@ -36,14 +36,26 @@
 @version: 1.1.0
 
 notification.py: Parser for notification events received from Controller
+                 and listener of the Controller's notification streams
 
 
 """
 
 import os
 import re
+import time
+import Queue
+import threading
 import xmltodict
+from collections import OrderedDict
+from xml.parsers import expat
 from pysdn.common.utils import dbg_print
+from pysdn.common.status import STATUS
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
 
 yang_namespace_to_prefix_map = {
     'urn:opendaylight:inventory': 'inv',
@@ -73,6 +85,162 @@ def yang_prefix_to_nsname(prefix):
     return prefix
 
 
+# Parsers of the notification messages XML:
+# - PARSER_EXPAT reads only the elements of the data change notification
+#   the notification classes use, straight from the expat parser events
+#   (messages of any other structure are passed to xmltodict)
+# - PARSER_XMLTODICT builds the whole document tree with xmltodict
+PARSER_EXPAT = 'expat'
+PARSER_XMLTODICT = 'xmltodict'
+_parser_backend = PARSER_EXPAT
+
+
+def set_parser_backend(backend):
+    """ Selects the parser of the notification messages XML used by
+        'NetworkTopologyChangeNotification' and
+        'InventoryChangeNotification' (PARSER_EXPAT or PARSER_XMLTODICT).
+        Both produce the same objects. """
+    global _parser_backend
+    assert backend in (PARSER_EXPAT, PARSER_XMLTODICT), backend
+    _parser_backend = backend
+
+
+def get_parser_backend():
+    return _parser_backend
+
+
+class _UnexpectedFormat(Exception):
+    pass
+
+
+class _DataChangeNotificationParser(object):
+    """ Extracts the event time and the data change events (in the form
+        xmltodict represents them) from a data change notification message.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.skip_depth = None
+        self.timestamp = None
+        self.has_timestamp = False
+        self.events = []
+        self.event = None
+        self.notifications = 0
+        self.text = []
+        self.attrs = None
+
+    def parse(self, xml):
+        if isinstance(xml, unicode):
+            xml = xml.encode('utf-8')
+        parser = expat.ParserCreate()
+        parser.ordered_attributes = True
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = self.characters
+        parser.Parse(xml, True)
+        if not self.has_timestamp or not self.events:
+            raise _UnexpectedFormat()
+        return self.timestamp, self.events
+
+    def start_element(self, name, attrs):
+        names = self.names
+        names.append(name)
+        depth = len(names)
+        if self.skip_depth is not None:
+            return
+        if depth == 1:
+            if name != 'notification':
+                raise _UnexpectedFormat()
+        elif depth == 2:
+            if name == 'eventTime':
+                if self.has_timestamp or attrs:
+                    raise _UnexpectedFormat()
+                self.has_timestamp = True
+                self.text = []
+            elif name == 'data-changed-notification':
+                self.notifications += 1
+                if self.notifications > 1:
+                    raise _UnexpectedFormat()
+            else:
+                self.skip_depth = depth
+        elif depth == 3:
+            if names[1] == 'eventTime':
+                raise _UnexpectedFormat()
+            if names[1] == 'data-changed-notification' and \
+                    name == 'data-change-event':
+                if attrs:
+                    raise _UnexpectedFormat()
+                self.event = {}
+                self.events.append(self.event)
+                self.text = []
+            else:
+                self.skip_depth = depth
+        elif depth == 4:
+            if (name not in ('path', 'operation') or name in self.event or
+                    (name == 'operation' and attrs)):
+                raise _UnexpectedFormat()
+            self.attrs = attrs
+            self.text = []
+        else:
+            raise _UnexpectedFormat()
+
+    def end_element(self, name):
+        names = self.names
+        depth = len(names)
+        names.pop()
+        if self.skip_depth is not None:
+            if depth == self.skip_depth:
+                self.skip_depth = None
+            return
+        if depth == 2 and name == 'eventTime':
+            self.timestamp = self._text()
+        elif depth == 3 and name == 'data-change-event':
+            if self._text() is not None:
+                raise _UnexpectedFormat()
+            self.event = None
+        elif depth == 4:
+            text = self._text()
+            attrs = self.attrs
+            if attrs:
+                value = OrderedDict(('@' + attrs[i], attrs[i + 1])
+                                    for i in range(0, len(attrs), 2))
+                if text is not None:
+                    value['#text'] = text
+            else:
+                value = text
+            self.event[name] = value
+            self.text = []
+
+    def characters(self, data):
+        self.text.append(data)
+
+    def _text(self):
+        text = ''.join(self.text).strip() or None
+        self.text = []
+        return text
+
+
+def _parse_data_change_notification(event):
+    """ Returns the event time and the list of data change events of the
+        notification message, None if the message is not in the usual
+        format (then it is parsed with xmltodict). """
+    if _parser_backend != PARSER_EXPAT:
+        return None
+    try:
+        return _DataChangeNotificationParser().parse(event)
+    except (_UnexpectedFormat, expat.ExpatError):
+        return None
+
+
+# Patterns of the data tree paths of the network topology and inventory
+# elements the notification events refer to
+_TOPO_NODE_RE = re.compile('.*node-id$')
+_TOPO_LINK_RE = re.compile('.*link-id$')
+_INV_NODE_RE = re.compile('node\[.*:id=.*\]')
+_INV_FLOW_RE = re.compile('flow\[.*:id=.*\]')
+
+
 class NetworkTopologyChangeNotification():
     """ Parser for notification messages generated by the Controller
         when it detects changes in the network topology data tree.
@@ -86,18 +254,24 @@ class NetworkTopologyChangeNotification():
         self.added_links = []
         self.removed_links = []
 
-        d = xmltodict.parse(event)
+        parsed = _parse_data_change_notification(event)
+        if parsed is None:
+            d = xmltodict.parse(event)
         try:
-            p1 = 'notification'
-            notification = d[p1]
+            if parsed is not None:
+                self.timestamp, events = parsed
+                self.events = []
+            else:
+                p1 = 'notification'
+                notification = d[p1]
 
-            p2 = 'eventTime'
-            self.timestamp = notification[p2]
+                p2 = 'eventTime'
+                self.timestamp = notification[p2]
 
-            self.events = []
-            p3 = 'data-changed-notification'
-            p4 = 'data-change-event'
-            events = notification[p3][p4]
+                self.events = []
+                p3 = 'data-changed-notification'
+                p4 = 'data-change-event'
+                events = notification[p3][p4]
             if isinstance(events, list):
                 for item in events:
                     tc_evt = TopoChangeEvent(item)
@@ -180,6 +354,15 @@ class TopoChangeEvent():
             msg = ("DEBUG: event=%s, unexpected data format '%s'" %
                    (event, type(event)))
             dbg_print(msg)
+        # Kind of the changed element and its identifier, worked out from
+        # the path once (left None when that fails, the methods then
+        # repeat the failure to the caller)
+        self._ids = None
+        try:
+            self._ids = (self._is_node(), self._get_node_id(),
+                         self._is_link(), self._get_link_id())
+        except Exception:
+            pass
 
     def created(self):
         res = False
@@ -213,14 +396,18 @@ class TopoChangeEvent():
         return path
 
     def is_node(self):
+        if self._ids is not None:
+            return self._ids[0]
+        return self._is_node()
+
+    def _is_node(self):
         res = False
         p = 'path_info'
         if hasattr(self, p):
             path = self.path_info.path
             basename = os.path.basename(path)
             if basename:
-                p1 = '.*node-id$'
-                r = re.search(p1, basename)
+                r = _TOPO_NODE_RE.search(basename)
                 if r is not None:
                     res = True
         return res
@@ -242,6 +429,11 @@ class TopoChangeEvent():
         return res
 
     def get_node_id(self):
+        if self._ids is not None:
+            return self._ids[1]
+        return self._get_node_id()
+
+    def _get_node_id(self):
         node_id = None
         p = 'path_info'
         if hasattr(self, p):
@@ -257,19 +449,28 @@ class TopoChangeEvent():
         return node_id
 
     def is_link(self):
+        if self._ids is not None:
+            return self._ids[2]
+        return self._is_link()
+
+    def _is_link(self):
         res = False
         p = 'path_info'
         if hasattr(self, p):
             path = self.path_info.path
             basename = os.path.basename(path)
             if basename:
-                p1 = '.*link-id$'
-                r = re.search(p1, basename)
+                r = _TOPO_LINK_RE.search(basename)
                 if r is not None:
                     res = True
         return res
 
     def get_link_id(self):
+        if self._ids is not None:
+            return self._ids[3]
+        return self._get_link_id()
+
+    def _get_link_id(self):
         link_id = None
         p = 'path_info'
         if hasattr(self, p):
@@ -303,18 +504,24 @@ class InventoryChangeNotification():
         self.added_flows = []
         self.removed_flows = []
 
-        d = xmltodict.parse(event)
+        parsed = _parse_data_change_notification(event)
+        if parsed is None:
+            d = xmltodict.parse(event)
         try:
-            p1 = 'notification'
-            notification = d[p1]
+            if parsed is not None:
+                self.timestamp, events = parsed
+                self.events = []
+            else:
+                p1 = 'notification'
+                notification = d[p1]
 
-            p2 = 'eventTime'
-            self.timestamp = notification[p2]
+                p2 = 'eventTime'
+                self.timestamp = notification[p2]
 
-            self.events = []
-            p3 = 'data-changed-notification'
-            p4 = 'data-change-event'
-            events = notification[p3][p4]
+                self.events = []
+                p3 = 'data-changed-notification'
+                p4 = 'data-change-event'
+                events = notification[p3][p4]
             if isinstance(events, list):
                 for item in events:
                     evt = InventoryChangeEvent(item)
@@ -385,6 +592,15 @@ class InventoryChangeEvent():
             msg = ("DEBUG: events=%s, unexpected data format '%s'" %
                    (event, type(event)))
             dbg_print(msg)
+        # Kind of the changed element and its identifier, worked out from
+        # the path once (left None when that fails, the methods then
+        # repeat the failure to the caller)
+        self._ids = None
+        try:
+            self._ids = (self._is_node(), self._get_node_id(),
+                         self._is_flow_entry(), self._get_flow_entry_id())
+        except Exception:
+            pass
 
     def created(self):
         res = False
@@ -418,14 +634,18 @@ class InventoryChangeEvent():
         return path
 
     def is_node(self):
+        if self._ids is not None:
+            return self._ids[0]
+        return self._is_node()
+
+    def _is_node(self):
         res = False
         p = 'path_info'
         if hasattr(self, p):
             path = self.path_info.path
             basename = os.path.basename(path)
             if basename:
-                p1 = 'node\[.*:id=.*\]'
-                r = re.search(p1, basename)
+                r = _INV_NODE_RE.search(basename)
                 if r is not None:
                     res = True
         return res
@@ -439,6 +659,11 @@ class InventoryChangeEvent():
         return res
 
     def get_node_id(self):
+        if self._ids is not None:
+            return self._ids[1]
+        return self._get_node_id()
+
+    def _get_node_id(self):
         node_id = None
         p = 'path_info'
         if hasattr(self, p):
@@ -453,19 +678,28 @@ class InventoryChangeEvent():
         return node_id
 
     def is_flow_entry(self):
+        if self._ids is not None:
+            return self._ids[2]
+        return self._is_flow_entry()
+
+    def _is_flow_entry(self):
         res = False
         p = 'path_info'
         if hasattr(self, p):
             path = self.path_info.path
             basename = os.path.basename(path)
             if basename:
-                p1 = 'flow\[.*:id=.*\]'
-                r = re.search(p1, basename)
+                r = _INV_FLOW_RE.search(basename)
                 if r is not None:
                     res = True
         return res
 
     def get_flow_entry_id(self):
+        if self._ids is not None:
+            return self._ids[3]
+        return self._get_flow_entry_id()
+
+    def _get_flow_entry_id(self):
         flow_id = None
         p = 'path_info'
         if hasattr(self, p):
@@ -557,3 +791,450 @@ class PathInfo():
         for ns in self.namespaces:
             print " namespace: %s (prefix: %s)" % (ns['ns'], ns['pfx'])
         print " path: %s" % self.path
+
+
+class NotificationBatch(object):
+    """ Net changes of a number of successive
+        'NetworkTopologyChangeNotification' or
+        'InventoryChangeNotification' notifications.
+
+    Creation and removal of the same switch, host, link, inventory node or
+    flow entry cancel each other out, so a switch that was added, removed
+    and added again within the batch is reported as added once, and a
+    switch added and removed again is not reported at all. The batch has
+    the change accessors of the notification classes ('switches_added',
+    'links_removed', 'nodes_added', 'flows_removed' etc.), so it can be
+    passed to the handlers of single notifications.
+    """
+
+    # change accessors of the notification classes by category
+    CATEGORIES = (('switches', 'switches_added', 'switches_removed'),
+                  ('hosts', 'hosts_added', 'hosts_removed'),
+                  ('links', 'links_added', 'links_removed'),
+                  ('nodes', 'nodes_added', 'nodes_removed'),
+                  ('flows', 'flows_added', 'flows_removed'))
+
+    def __init__(self):
+        self.timestamp = None
+        self.notifications_cnt = 0
+        # (category, key) -> [net number of creations, changed item]
+        self._net = OrderedDict()
+
+    @staticmethod
+    def accepts(notification):
+        return isinstance(notification, (NetworkTopologyChangeNotification,
+                                         InventoryChangeNotification))
+
+    def add(self, notification):
+        """ Merges changes of 'notification' into the batch. """
+        assert self.accepts(notification), type(notification)
+        for category, added, removed in self.CATEGORIES:
+            if not hasattr(notification, added):
+                continue
+            for item in getattr(notification, removed)():
+                self._count(category, item, -1)
+            for item in getattr(notification, added)():
+                self._count(category, item, 1)
+        self.timestamp = notification.get_time()
+        self.notifications_cnt += 1
+
+    def _count(self, category, item, n):
+        key = item
+        if isinstance(item, FlowInfo):
+            key = (item.node_id, item.table_id, item.flow_id)
+        entry = self._net.get((category, key))
+        if entry is None:
+            self._net[(category, key)] = [n, item]
+        else:
+            entry[0] += n
+            entry[1] = item
+
+    def _changes(self, category, added):
+        return [item for (c, key), (n, item) in self._net.items()
+                if c == category and (n > 0 if added else n < 0)]
+
+    def is_empty(self):
+        """ Returns True if all changes of the batch cancelled out. """
+        return all(n == 0 for n, item in self._net.values())
+
+    def get_time(self):
+        """ Returns time of the last notification of the batch. """
+        return self.timestamp
+
+    def get_notifications_cnt(self):
+        return self.notifications_cnt
+
+    def switches_added(self):
+        return self._changes('switches', True)
+
+    def switches_removed(self):
+        return self._changes('switches', False)
+
+    def hosts_added(self):
+        return self._changes('hosts', True)
+
+    def hosts_removed(self):
+        return self._changes('hosts', False)
+
+    def links_added(self):
+        return self._changes('links', True)
+
+    def links_removed(self):
+        return self._changes('links', False)
+
+    def nodes_added(self):
+        return self._changes('nodes', True)
+
+    def nodes_removed(self):
+        return self._changes('nodes', False)
+
+    def flows_added(self):
+        return self._changes('flows', True)
+
+    def flows_removed(self):
+        return self._changes('flows', False)
+
+
+# Policies for notifications received while the listener's queue is full
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_DROP_NEWEST = 'drop_newest'
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+
+
+class NotificationListener(object):
+    """ Listener of a Controller's data change notification stream.
+
+    The listener owns the websocket connection to the notification stream.
+    A receiver thread reads raw notifications into a bounded queue and
+    worker threads parse them and pass the results to the registered
+    callbacks, so a slow callback does not block reading from the socket.
+    A dropped connection is re-established (with exponential backoff) after
+    creating the data change subscription and subscribing to its stream
+    anew.
+
+    When the queue is full, notifications are handled according to the
+    'overflow' policy: OVERFLOW_BLOCK stops reading from the socket until
+    there is room, OVERFLOW_DROP_NEWEST discards the received notification
+    and OVERFLOW_DROP_OLDEST discards the oldest queued one.
+
+    With a single worker (default) callbacks are called in the order the
+    notifications were received; with more workers they may be called
+    concurrently and out of order.
+
+    If 'coalesce_window' is set, network topology and inventory change
+    notifications are not passed to the callbacks one by one: each worker
+    collects the notifications received within 'coalesce_window' seconds
+    from the first one (at most 'coalesce_max_batch' of them) into a
+    'NotificationBatch' and passes the batch instead, so a burst of changes
+    that cancel each other out (e.g. a flapping switch) makes a single
+    callback call or none.
+
+    Example:
+
+        listener = NotificationListener(
+            ctrl, ctrl.get_network_topology_yang_schema_path('flow:1'))
+        listener.add_callback(lambda tcn: print_changes(tcn))
+        listener.start()
+        ...
+        listener.stop()
+
+    """
+
+    def __init__(self, ctrl, path, datastore="OPERATIONAL", scope="SUBTREE",
+                 parser=None, queue_size=1000, overflow=OVERFLOW_BLOCK,
+                 workers=1, lag_threshold=1.0, reconnect_delay=1.0,
+                 max_reconnect_delay=30.0, recv_timeout=1.0,
+                 coalesce_window=None, coalesce_max_batch=1000):
+        """ Initializes this object properties.
+
+        :param ctrl: :class:`pysdn.controller.controller.Controller`
+        :param string path: path to the YANG data tree node to listen for
+                            changes of (e.g. result of the Controller's
+                            'get_network_topology_yang_schema_path')
+        :param string datastore: 'OPERATIONAL' or 'CONFIGURATION'
+        :param string scope: 'BASE', 'ONE' or 'SUBTREE'
+        :param parser: callable that converts a raw notification (XML
+                       string) to the object passed to the callbacks.
+                       By default 'NetworkTopologyChangeNotification' is
+                       used for network topology paths,
+                       'InventoryChangeNotification' for inventory paths
+                       and raw strings are passed for other paths.
+        :param int queue_size: maximum number of queued notifications
+        :param string overflow: one of OVERFLOW_* policies
+        :param int workers: number of threads calling the callbacks
+        :param float lag_threshold: notifications that spent more than this
+                                    number of seconds in the queue are
+                                    counted as lagging
+        :param float reconnect_delay: initial delay before reconnecting
+        :param float max_reconnect_delay: limit of the reconnect delay that
+                                          doubles on every failed attempt
+        :param float recv_timeout: socket timeout, also bounds the time
+                                   'stop' waits for the receiver thread
+        :param float coalesce_window: seconds notifications are collected
+                                      into a 'NotificationBatch' for (None
+                                      to pass every notification alone)
+        :param int coalesce_max_batch: maximum number of notifications in
+                                       a batch
+
+        """
+        assert overflow in (OVERFLOW_BLOCK, OVERFLOW_DROP_NEWEST,
+                            OVERFLOW_DROP_OLDEST), overflow
+        self.ctrl = ctrl
+        self.path = path
+        self.datastore = datastore
+        self.scope = scope
+        if parser is None:
+            parser = self._default_parser(path)
+        self.parser = parser
+        self.overflow = overflow
+        self.workers = max(1, workers)
+        self.lag_threshold = lag_threshold
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.recv_timeout = recv_timeout
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_batch = max(1, coalesce_max_batch)
+        self.stream_location = None
+        self._callbacks = []
+        self._queue = Queue.Queue(max(1, queue_size))
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._connected = threading.Event()
+        self._threads = []
+        self._websock = None
+        self._counters = dict.fromkeys(['received', 'dispatched', 'dropped',
+                                        'lagging', 'parse_errors',
+                                        'callback_errors', 'connects',
+                                        'connect_failures', 'disconnects',
+                                        'batches', 'empty_batches'], 0)
+        self._counters['queue_high_water'] = 0
+
+    @staticmethod
+    def _default_parser(path):
+        if 'network-topology' in path:
+            return NetworkTopologyChangeNotification
+        if 'opendaylight-inventory' in path:
+            return InventoryChangeNotification
+        return lambda event: event
+
+    def add_callback(self, callback):
+        """ Registers 'callback' to be called with every parsed
+            notification. """
+        with self._lock:
+            self._callbacks = self._callbacks + [callback]
+
+    def remove_callback(self, callback):
+        with self._lock:
+            self._callbacks = [cb for cb in self._callbacks
+                               if cb != callback]
+
+    def start(self):
+        """ Starts receiving and dispatching of notifications. """
+        if websocket is None:
+            raise ImportError("NotificationListener requires the "
+                              "'websocket-client' package")
+        assert not self._threads, "listener is already started"
+        self._stopping.clear()
+        receiver = threading.Thread(target=self._receive_loop,
+                                    name="pysdn-notification-receiver")
+        self._threads.append(receiver)
+        for n in range(self.workers):
+            worker = threading.Thread(target=self._dispatch_loop,
+                                      name="pysdn-notification-worker-%d" % n)
+            self._threads.append(worker)
+        for t in self._threads:
+            t.daemon = True
+            t.start()
+
+    def stop(self, timeout=None):
+        """ Stops the listener: closes the connection and waits (at most
+            'timeout' seconds per thread) for the threads to finish.
+            Notifications still queued are discarded, those coalesced
+            into a batch are passed to the callbacks. """
+        self._stopping.set()
+        websock = self._websock
+        if websock is not None:
+            try:
+                websock.close()
+            except Exception:
+                pass
+        for t in self._threads:
+            if t is not threading.current_thread():
+                t.join(timeout)
+        self._threads = []
+
+    def is_connected(self):
+        return self._connected.is_set()
+
+    def wait_connected(self, timeout=None):
+        """ Waits until the listener is connected to the notification
+            stream, returns False on timeout. """
+        return self._connected.wait(timeout)
+
+    def get_counters(self):
+        """ Returns snapshot of the listener counters: notifications
+            'received' from the socket, 'dispatched' to the callbacks,
+            'dropped' on queue overflow, 'lagging' (queued for more than
+            'lag_threshold' seconds), parse and callback errors, connection
+            events, current ('queued') and maximum ('queue_high_water')
+            queue length, coalesced batches passed to the callbacks
+            ('batches') and those not passed as all their changes
+            cancelled out ('empty_batches'). """
+        with self._lock:
+            counters = dict(self._counters)
+        counters['queued'] = self._queue.qsize()
+        return counters
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def _subscribe(self):
+        """ Creates the data change subscription and returns location of
+            its notification stream (None on failure). """
+        result = self.ctrl.create_data_change_event_subscription(
+            self.datastore, self.scope, self.path)
+        if not result.get_status().eq(STATUS.OK):
+            return None
+        result = self.ctrl.subscribe_to_stream(result.get_data())
+        if not result.get_status().eq(STATUS.OK):
+            return None
+        return result.get_data()
+
+    def _receive_loop(self):
+        delay = self.reconnect_delay
+        while not self._stopping.is_set():
+            websock = None
+            try:
+                location = self._subscribe()
+                if location is not None:
+                    websock = websocket.create_connection(
+                        location, timeout=self.recv_timeout)
+            except Exception as e:
+                dbg_print("failed to connect to notification stream: %r"
+                          % e)
+                websock = None
+            if websock is None:
+                self._count('connect_failures')
+                self._stopping.wait(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            self.stream_location = location
+            self._websock = websock
+            self._connected.set()
+            self._count('connects')
+            delay = self.reconnect_delay
+            try:
+                self._read(websock)
+            finally:
+                self._connected.clear()
+                self._websock = None
+                try:
+                    websock.close()
+                except Exception:
+                    pass
+            if not self._stopping.is_set():
+                self._count('disconnects')
+                self._stopping.wait(delay)
+
+    def _read(self, websock):
+        while not self._stopping.is_set():
+            try:
+                event = websock.recv()
+            except websocket.WebSocketTimeoutException:
+                continue
+            except Exception as e:
+                if not self._stopping.is_set():
+                    dbg_print("notification stream disconnected: %r" % e)
+                return
+            if not event:
+                continue
+            self._count('received')
+            self._enqueue((time.time(), event))
+
+    def _enqueue(self, item):
+        q = self._queue
+        if self.overflow == OVERFLOW_BLOCK:
+            while not self._stopping.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    break
+                except Queue.Full:
+                    continue
+        elif self.overflow == OVERFLOW_DROP_NEWEST:
+            try:
+                q.put_nowait(item)
+            except Queue.Full:
+                self._count('dropped')
+        else:
+            while True:
+                try:
+                    q.put_nowait(item)
+                    break
+                except Queue.Full:
+                    try:
+                        q.get_nowait()
+                        self._count('dropped')
+                    except Queue.Empty:
+                        pass
+        qsize = q.qsize()
+        with self._lock:
+            if qsize > self._counters['queue_high_water']:
+                self._counters['queue_high_water'] = qsize
+
+    def _dispatch_loop(self):
+        batch = None
+        deadline = None
+        while not self._stopping.is_set():
+            timeout = 0.1
+            if batch is not None:
+                timeout = max(0, min(timeout, deadline - time.time()))
+            try:
+                received, event = self._queue.get(timeout=timeout)
+            except Queue.Empty:
+                if batch is not None and time.time() >= deadline:
+                    self._deliver_batch(batch)
+                    batch = None
+                continue
+            if time.time() - received > self.lag_threshold:
+                self._count('lagging')
+            try:
+                notification = self.parser(event)
+            except Exception as e:
+                self._count('parse_errors')
+                dbg_print("failed to parse notification: %r" % e)
+                continue
+            if (self.coalesce_window is None or
+                    not NotificationBatch.accepts(notification)):
+                self._deliver(notification)
+                self._count('dispatched')
+                continue
+            if batch is None:
+                batch = NotificationBatch()
+                deadline = time.time() + self.coalesce_window
+            batch.add(notification)
+            if (batch.get_notifications_cnt() >= self.coalesce_max_batch or
+                    time.time() >= deadline):
+                self._deliver_batch(batch)
+                batch = None
+        # the notifications taken off the queue are passed on when
+        # stopping, as the window would have ended
+        if batch is not None:
+            self._deliver_batch(batch)
+
+    def _deliver_batch(self, batch):
+        self._count('dispatched', batch.get_notifications_cnt())
+        if batch.is_empty():
+            self._count('empty_batches')
+        else:
+            self._count('batches')
+            self._deliver(batch)
+
+    def _deliver(self, notification):
+        for callback in self._callbacks:
+            try:
+                callback(notification)
+            except Exception as e:
+                self._count('callback_errors')
+                dbg_print("notification callback failed: %r" % e)
@@ -41,6 +41,7 @@ topology.py: Controller's topology parser
 """
 
 import json
+import heapq
 
 from pysdn.common.utils import dict_keys_dashed_to_underscored
 
@@ -54,6 +55,18 @@ class Topology():
         self.links = []
         self.switches = []
         self.hosts = []
+        # Indexes of the nodes by node identifier and of the links by their
+        # identifier and destination node / destination termination point,
+        # and the adjacency lists (source node id -> destination node ids
+        # and destination node id -> source node ids)
+        self._nodes_by_id = {}
+        self._switches_by_id = {}
+        self._host_ids = set()
+        self._links_by_id = {}
+        self._links_by_dst_node = {}
+        self._links_by_dst_tp = {}
+        self._successors = {}
+        self._predecessors = {}
 
         assert_msg = "[Topology] either '%s' or '%s' should be used, " \
                      "not both" % ('topo_json', 'topo_dict')
@@ -69,8 +82,14 @@ class Topology():
 
     def __init_from_json__(self, s):
         if (isinstance(s, basestring)):
-            obj = json.loads(s)
-            d = dict_keys_dashed_to_underscored(obj)
+            self.__init_from_dict__(json.loads(s))
+        else:
+            raise TypeError("[Topology] wrong argument type '%s'"
+                            " (JSON 'string' is expected)" % type(s))
+
+    def __init_from_dict__(self, d):
+        if (isinstance(d, dict)):
+            d = dict_keys_dashed_to_underscored(d)
             for k, v in d.items():
                 if ('topology_id' == k):
                     self.topology_id = v
@@ -86,33 +105,97 @@ class Topology():
                             self.add_link(link)
                 else:
                     assert(False)
-        else:
-            raise TypeError("[Topology] wrong argument type '%s'"
-                            " (JSON 'string' is expected)" % type(s))
-
-    def __init_from_dict__(self, d):
-        if (isinstance(d, dict)):
-            js = json.dumps(d)
-            self.__init_from_json__(js)
         else:
             raise TypeError("[Topology] wrong argument type '%s'"
                             " ('dict' is expected)" % type(d))
 
     def to_string(self):
         """ Returns string representation of this object. """
-        return str(vars(self))
+        return str(dict((k, v) for k, v in vars(self).items()
+                        if not k.startswith('_')))
 
     def add_node(self, node):
         assert(isinstance(node, Node))
         self.nodes.append(node)
+        node_id = node.get_id()
+        self._nodes_by_id.setdefault(node_id, node)
         if (node.is_switch()):
             self.switches.append(node)
+            self._switches_by_id.setdefault(node_id, node)
         elif (node.is_host()):
             self.hosts.append(node)
+            self._host_ids.add(node_id)
+
+    def remove_node(self, node_id):
+        """ Removes the node with identifier 'node_id' from the topology
+            (links of the node are kept). Returns the removed node, None if
+            there is no such node. """
+        node = self._nodes_by_id.pop(node_id, None)
+        if node is None:
+            return None
+        self._switches_by_id.pop(node_id, None)
+        self._host_ids.discard(node_id)
+        self.nodes[:] = [n for n in self.nodes if n.get_id() != node_id]
+        if (node.is_switch()):
+            self.switches[:] = [n for n in self.switches
+                                if n.get_id() != node_id]
+        elif (node.is_host()):
+            self.hosts[:] = [n for n in self.hosts if n.get_id() != node_id]
+        return node
 
     def add_link(self, link):
         assert(isinstance(link, Link))
         self.links.append(link)
+        link_id = getattr(link, 'link_id', None)
+        if link_id is not None:
+            self._links_by_id.setdefault(link_id, []).append(link)
+        src_node_id = link.get_src_node_id()
+        dst_node_id = link.get_dst_node_id()
+        if dst_node_id is not None:
+            self._links_by_dst_node.setdefault(dst_node_id, []).append(link)
+            dst_tp_id = link.get_dst_tp_id()
+            if dst_tp_id is not None:
+                key = (dst_node_id, dst_tp_id)
+                self._links_by_dst_tp.setdefault(key, []).append(link)
+            if src_node_id is not None:
+                self._successors.setdefault(src_node_id, []).append(
+                    dst_node_id)
+                self._predecessors.setdefault(dst_node_id, []).append(
+                    src_node_id)
+
+    def remove_link(self, link_id):
+        """ Removes the link(s) with identifier 'link_id' from the topology.
+            Returns the removed links (empty list if there is no such link).
+        """
+        removed = self._links_by_id.pop(link_id, [])
+        for link in removed:
+            self.links[:] = [l for l in self.links if l is not link]
+            src_node_id = link.get_src_node_id()
+            dst_node_id = link.get_dst_node_id()
+            if dst_node_id is None:
+                continue
+            self._discard(self._links_by_dst_node, dst_node_id, link)
+            dst_tp_id = link.get_dst_tp_id()
+            if dst_tp_id is not None:
+                self._discard(self._links_by_dst_tp,
+                              (dst_node_id, dst_tp_id), link)
+            if src_node_id is not None:
+                self._discard(self._successors, src_node_id, dst_node_id)
+                self._discard(self._predecessors, dst_node_id, src_node_id)
+        return removed
+
+    @staticmethod
+    def _discard(index, key, value):
+        # removes one occurrence of 'value' from the 'index[key]' list
+        values = index.get(key)
+        if values is None:
+            return
+        for i, v in enumerate(values):
+            if v is value or v == value:
+                del values[i]
+                break
+        if not values:
+            del index[key]
 
     def get_id(self):
         return self.topology_id
@@ -152,9 +235,7 @@ class Topology():
         return sorted(self.switches, key=lambda n: n.get_id())
 
     def get_switch(self, switch_id):
-        for item in self.switches:
-            if(item.get_id() == switch_id):
-                return item
+        return self._switches_by_id.get(switch_id)
 
     def get_hosts(self):
         return self.hosts
@@ -162,29 +243,160 @@ class Topology():
     def get_peer_list_for_node(self, node):
         plist = []
         print node.get_id()
-        for link in self.links:
-            if(link.is_dst_node(node)):
-                plist.append(link)
+        plist.extend(self._links_by_dst_node.get(node.get_id(), []))
         return plist
 
     def get_peer_list_for_node_port_(self, node, pnum):
         plist = []
-        for link in self.links:
-            if(link.is_dst_node_port(node, pnum)):
-                src_node_id = link.get_src_node_id()
-                if(src_node_id):
-                    src_node = self.get_node_by_id(src_node_id)
-                    if(src_node):
-                        plist.append(src_node)
+        node_id = node.get_id()
+        tp_id = node_id + ":" + pnum
+        for link in self._links_by_dst_tp.get((node_id, tp_id), []):
+            src_node_id = link.get_src_node_id()
+            if(src_node_id):
+                src_node = self.get_node_by_id(src_node_id)
+                if(src_node):
+                    plist.append(src_node)
         return plist
 
     def get_node_by_id(self, node_id):
-        node = None
-        for item in self.nodes:
-            if item.get_id() == node_id:
-                node = item
+        return self._nodes_by_id.get(node_id)
+
+    def get_link_by_id(self, link_id):
+        links = self._links_by_id.get(link_id)
+        return links[0] if links else None
+
+    def get_shortest_path(self, src_node_id, dst_node_id):
+        """ Returns the shortest (in number of links) path from one node
+            of the topology to another one.
+
+        Links are followed in their source-to-destination direction. Hosts
+        can only be the end points of a path, they are never transited.
+
+        :param string src_node_id: identifier of the first node of the path
+        :param string dst_node_id: identifier of the last node of the path
+        :return: list of node identifiers (starting with 'src_node_id'
+                 and ending with 'dst_node_id'), None if there is no path
+        :rtype: list of strings
+
+        """
+        return self._bfs_path(src_node_id, dst_node_id, set(), set())
+
+    def get_k_shortest_paths(self, src_node_id, dst_node_id, k):
+        """ Returns up to 'k' shortest loopless paths from one node of the
+            topology to another one, shortest first (see
+            'get_shortest_path').
+
+        Paths differ in the sequence of nodes they traverse, parallel links
+        between the same nodes do not make different paths.
+
+        :param string src_node_id: identifier of the first node of the path
+        :param string dst_node_id: identifier of the last node of the path
+        :param int k: maximum number of paths to return
+        :return: list of paths, each path is a list of node identifiers
+        :rtype: list of lists
+
+        """
+        # Yen's algorithm: each next path is the shortest deviation from
+        # one of the already found paths at one of its nodes
+        paths = []
+        path = self.get_shortest_path(src_node_id, dst_node_id)
+        if path is None or k < 1:
+            return paths
+        paths.append(path)
+        candidates = []
+        seen = set([tuple(path)])
+        while len(paths) < k:
+            prev = paths[-1]
+            for i in range(len(prev) - 1):
+                root = prev[:i + 1]
+                excluded_links = set((p[i], p[i + 1]) for p in paths
+                                     if p[:i + 1] == root)
+                excluded_nodes = set(root[:-1])
+                spur = self._bfs_path(prev[i], dst_node_id,
+                                      excluded_nodes, excluded_links)
+                if spur is not None:
+                    candidate = root[:-1] + spur
+                    key = tuple(candidate)
+                    if key not in seen:
+                        seen.add(key)
+                        heapq.heappush(candidates, (len(candidate), key))
+            if not candidates:
                 break
-        return node
+            paths.append(list(heapq.heappop(candidates)[1]))
+        return paths
+
+    def _bfs_path(self, src_node_id, dst_node_id, excluded_nodes,
+                  excluded_links):
+        nodes = self._nodes_by_id
+        if src_node_id not in nodes or dst_node_id not in nodes:
+            return None
+        if src_node_id == dst_node_id:
+            return [src_node_id]
+        # Bidirectional breadth-first search, the smaller frontier is
+        # expanded first. 'forward' maps nodes reached from the source to
+        # their predecessor, 'backward' maps nodes the destination is
+        # reachable from to their successor.
+        hosts = self._host_ids
+        forward = {src_node_id: None}
+        backward = {dst_node_id: None}
+        forward_frontier = [src_node_id]
+        backward_frontier = [dst_node_id]
+        meet = None
+        while forward_frontier and backward_frontier and meet is None:
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier = []
+                for u in forward_frontier:
+                    if u in hosts and u != src_node_id:
+                        continue
+                    for v in self._successors.get(u, ()):
+                        if (v in forward or v in excluded_nodes or
+                                v not in nodes or
+                                (v in hosts and v != dst_node_id)):
+                            continue
+                        if excluded_links and (u, v) in excluded_links:
+                            continue
+                        forward[v] = u
+                        if v in backward:
+                            meet = v
+                            break
+                        frontier.append(v)
+                    if meet is not None:
+                        break
+                forward_frontier = frontier
+            else:
+                frontier = []
+                for v in backward_frontier:
+                    if v in hosts and v != dst_node_id:
+                        continue
+                    for u in self._predecessors.get(v, ()):
+                        if (u in backward or u in excluded_nodes or
+                                u not in nodes or
+                                (u in hosts and u != src_node_id)):
+                            continue
+                        if excluded_links and (u, v) in excluded_links:
+                            continue
+                        backward[u] = v
+                        if u in forward:
+                            meet = u
+                            break
+                        frontier.append(u)
+                    if meet is not None:
+                        break
+                backward_frontier = frontier
+
+        if meet is None:
+            return None
+        path = []
+        node_id = meet
+        while node_id is not None:
+            path.append(node_id)
+            node_id = forward[node_id]
+        path.reverse()
+        node_id = backward[meet]
+        while node_id is not None:
+            path.append(node_id)
+            node_id = backward[node_id]
+        return path
 
 
 class Node():
@@ -343,6 +555,28 @@ class Link():
                 res = (attr[p2] == node_id and attr[p3] == tp_id)
         return res
 
+    def get_dst_node_id(self):
+        dst_node_id = None
+        p1 = 'destination'
+        p2 = 'dest_node'
+        if(hasattr(self, p1)):
+            attr = getattr(self, p1)
+            if(isinstance(attr, dict) and p2 in attr):
+                dst_node_id = attr[p2]
+
+        return dst_node_id
+
+    def get_dst_tp_id(self):
+        dst_tp_id = None
+        p1 = 'destination'
+        p2 = 'dest_tp'
+        if(hasattr(self, p1)):
+            attr = getattr(self, p1)
+            if(isinstance(attr, dict) and p2 in attr):
+                dst_tp_id = attr[p2]
+
+        return dst_tp_id
+
     def get_src_node_id(self):
         src_node_id = None
         p1 = 'source'
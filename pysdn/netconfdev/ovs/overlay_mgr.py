@@ -46,8 +46,10 @@ from pysdn.controller.controller import Controller
 
 # Class that represents an Overlay Application running on a Controller instance.
 class Ovrly_mgr(Controller, object):
-    def __init__(self, ipAddr, portNum, adminName, adminPassword, timeout):
-        super(Ovrly_mgr, self).__init__(ipAddr, portNum, adminName, adminPassword, timeout=5)
+    def __init__(self, ipAddr, portNum, adminName, adminPassword, timeout,
+                 **pool_kwargs):
+        super(Ovrly_mgr, self).__init__(ipAddr, portNum, adminName, adminPassword, timeout=5,
+                                        **pool_kwargs)
 
     def get_ovrl_mgr_hvsr_config_url(self, hvsr_ip, hvr_port):
         templateUrl = "http://{}:{}/restconf/config/brocade-app-overlay:devices/device/{}:{}"
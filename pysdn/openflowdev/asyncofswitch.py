@@ -0,0 +1,63 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+asyncofswitch.py: Non-blocking OpenFlow Switch client
+
+
+"""
+
+from pysdn.controller.asynccontroller import AsyncProxy
+from pysdn.openflowdev.ofswitch import OFSwitch
+
+
+class AsyncOFSwitch(AsyncProxy):
+    """ Non-blocking counterpart of 'OFSwitch'.
+
+    Methods have the same names and arguments as in 'OFSwitch' and return
+    a 'Future' of the 'Result' the blocking call returns. Calls are run on
+    the executor of the 'AsyncController' this switch belongs to, so the
+    concurrency bound is per Controller, not per switch.
+
+    """
+
+    def __init__(self, actrl, name=None, dpid=None):
+        """ Initializes this object properties. """
+        switch = OFSwitch(ctrl=actrl.ctrl, name=name, dpid=dpid)
+        super(AsyncOFSwitch, self).__init__(switch, actrl.executor)
+        self.actrl = actrl
+        self.switch = switch
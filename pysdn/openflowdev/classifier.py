@@ -0,0 +1,609 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+classifier.py: Offline lookup of the flow entry of a flow table that
+               matches a packet header and analysis of the flow entries
+               that shadow or overlap each other
+
+
+"""
+
+import socket
+import struct
+import binascii
+from operator import itemgetter
+
+# Kinds of the header field values
+_INT, _MAC, _IPV4, _IPV6, _PORT = range(5)
+
+# Header fields the flow entries can be classified by (names of the
+# 'Match' getters) and the kinds of their values; the order is that of
+# the values in the header rows passed to 'FlowClassifier.classify_batch'
+HEADER_FIELDS = ('in_port', 'metadata', 'eth_src', 'eth_dst', 'eth_type',
+                 'vlan_id', 'vlan_pcp', 'ip_dscp', 'ip_ecn', 'ip_proto',
+                 'ipv4_src', 'ipv4_dst', 'ipv6_src', 'ipv6_dst', 'tcp_src',
+                 'tcp_dst', 'udp_src', 'udp_dst', 'sctp_src', 'sctp_dst',
+                 'icmpv4_type', 'icmpv4_code', 'icmpv6_type', 'icmpv6_code')
+_FIELD_KINDS = {'in_port': _PORT, 'eth_src': _MAC, 'eth_dst': _MAC,
+                'ipv4_src': _IPV4, 'ipv4_dst': _IPV4, 'ipv6_src': _IPV6,
+                'ipv6_dst': _IPV6}
+_FIELD_INDEX = dict((name, (i, _FIELD_KINDS.get(name, _INT)))
+                    for i, name in enumerate(HEADER_FIELDS))
+
+# 'Match' attributes the flow entries can be classified by, flow entries
+# that match on anything else are not classified
+_CLASSIFIED_ATTRS = frozenset([
+    'in_port', 'metadata', 'ethernet_match', 'vlan_match', 'ip_match',
+    'ipv4_source', 'ipv4_destination', 'ipv6_source', 'ipv6_destination',
+    'tcp_source_port', 'tcp_destination_port', 'udp_source_port',
+    'udp_destination_port', 'sctp_source_port', 'sctp_destination_port',
+    'icmpv4_match', 'icmpv6_match'])
+
+_ADDR_BITS = {_MAC: 48, _IPV4: 32, _IPV6: 128}
+_METADATA_MASK = (1 << 64) - 1
+
+# Number of distinct headers 'classify_batch' keeps the results of
+_BATCH_CACHE_SIZE = 65536
+
+
+def _int(v):
+    if isinstance(v, basestring):
+        return int(v, 0)
+    return int(v)
+
+
+def _addr(kind, v):
+    # address as a number
+    if not isinstance(v, basestring):
+        return int(v)
+    if kind == _MAC:
+        return int(v.replace(':', '').replace('-', ''), 16)
+    elif kind == _IPV4:
+        return struct.unpack('!I', socket.inet_pton(socket.AF_INET,
+                                                    str(v)))[0]
+    return int(binascii.hexlify(socket.inet_pton(socket.AF_INET6,
+                                                 str(v))), 16)
+
+
+def _value(kind, v):
+    """ Returns header field value in the form the flow entry match fields
+        are indexed in. """
+    if kind == _INT:
+        return _int(v)
+    elif kind == _PORT:
+        return unicode(v).rsplit(u':', 1)[-1].strip().upper()
+    return _addr(kind, v)
+
+
+def _masked(kind, v, mask=None):
+    # (mask, value) of an address match field given as 'address/length'
+    # or with a separate mask, the mask is None for an exact match
+    bits = _ADDR_BITS[kind]
+    full = (1 << bits) - 1
+    if isinstance(v, basestring) and '/' in v:
+        v, plen = v.split('/', 1)
+        mask = full ^ ((1 << (bits - int(plen))) - 1)
+    elif mask is not None:
+        mask = _addr(kind, mask)
+    v = _addr(kind, v)
+    if mask is None or mask == full:
+        return None, v
+    return mask, v & mask
+
+
+def _constraints(match):
+    """ Returns {field index: (mask, value)} of the match fields of a flow
+        entry and whether these are all its match fields (False if it
+        also matches on fields that can not be classified). A value of
+        None is a match of packets without the field, a mask of 0 of
+        packets with the field of any value. """
+    res = {}
+    if match is None:
+        return res, True
+    complete = True
+    for name, v in vars(match).iteritems():
+        if v is not None and name not in _CLASSIFIED_ATTRS:
+            complete = False
+
+    def add(field, v, mask=None):
+        if v is not None:
+            idx, kind = _FIELD_INDEX[field]
+            if kind in _ADDR_BITS:
+                res[idx] = _masked(kind, v, mask)
+            else:
+                res[idx] = (None, _value(kind, v))
+
+    add('in_port', match.in_port)
+    metadata = match.metadata
+    if isinstance(metadata, dict):
+        v, mask = metadata.get('metadata'), metadata.get('metadata_mask')
+    elif metadata is not None:
+        v, mask = metadata.get_metadata(), metadata.get_metadata_mask()
+    if metadata is not None and v is not None:
+        v = _int(v)
+        mask = None if mask is None else _int(mask)
+        if mask is None or mask == _METADATA_MASK:
+            res[_FIELD_INDEX['metadata'][0]] = (None, v)
+        else:
+            res[_FIELD_INDEX['metadata'][0]] = (mask, v & mask)
+    em = match.ethernet_match
+    if em is not None:
+        add('eth_type', em.get_type())
+        for field, d in (('eth_src', em.ethernet_source),
+                         ('eth_dst', em.ethernet_destination)):
+            if isinstance(d, dict):
+                add(field, d.get('address'), d.get('mask'))
+    vm = match.vlan_match
+    if vm is not None:
+        vid = vm.vlan_id
+        if vid is not None:
+            idx = _FIELD_INDEX['vlan_id'][0]
+            if vid.vlan_id:
+                res[idx] = (None, _int(vid.vlan_id))
+            elif vid.vlan_id_present:
+                res[idx] = (0, 0)
+            else:
+                res[idx] = (None, None)
+        add('vlan_pcp', vm.vlan_pcp)
+    add('ip_dscp', match.get_ip_dscp())
+    add('ip_ecn', match.get_ip_ecn())
+    add('ip_proto', match.get_ip_proto())
+    add('ipv4_src', match.ipv4_source)
+    add('ipv4_dst', match.ipv4_destination)
+    add('ipv6_src', match.ipv6_source)
+    add('ipv6_dst', match.ipv6_destination)
+    add('tcp_src', match.tcp_source_port)
+    add('tcp_dst', match.tcp_destination_port)
+    add('udp_src', match.udp_source_port)
+    add('udp_dst', match.udp_destination_port)
+    add('sctp_src', match.sctp_source_port)
+    add('sctp_dst', match.sctp_destination_port)
+    add('icmpv4_type', match.get_icmp4_type())
+    add('icmpv4_code', match.get_icmpv4_code())
+    add('icmpv6_type', match.get_icmpv6_type())
+    add('icmpv6_code', match.get_icmpv6_code())
+    return res, complete
+
+
+def _key_function(items):
+    # function returning the key of a header (list of the field values)
+    # in a subtable of the match fields ('items', (field index, mask)
+    # pairs); a field the packet does not have gives None, which no
+    # masked match field value is equal to
+    idxs = [i for i, _ in items]
+    if not items:
+        return lambda h: ()
+    if all(mask is None for _, mask in items):
+        if len(idxs) == 1:
+            i = idxs[0]
+            return lambda h: (h[i],)
+        return itemgetter(*idxs)
+
+    def key(h):
+        k = []
+        for i, mask in items:
+            v = h[i]
+            if mask is not None and v is not None:
+                v &= mask
+            k.append(v)
+        return tuple(k)
+    return key
+
+
+class _Subtable(object):
+    """ Flow entries that match on the same fields with the same masks,
+        indexed by the values of their match fields. """
+
+    __slots__ = ('items', 'key', 'entries', 'max_priority')
+
+    def __init__(self, items):
+        self.items = items
+        self.key = _key_function(items)
+        # key -> list of (-priority, sequence number, flow entry), best
+        # first
+        self.entries = {}
+        self.max_priority = None
+
+
+class FlowClassifier(object):
+    """ Finds the flow entry of a flow table (list of 'FlowEntry' objects,
+        e.g. as returned by 'OFSwitch.get_FlowEntries') that a packet
+        matches, without the Controller or the switch.
+
+    A packet header is a dictionary of the header field values keyed by
+    the names in HEADER_FIELDS, e.g.:
+
+        {'in_port': 1, 'eth_type': 0x800, 'ipv4_dst': '10.0.0.5',
+         'ip_proto': 6, 'tcp_dst': 80}
+
+    The fields the packet does not have are left out. Ports are numbers
+    or names (e.g. 'LOCAL'), MAC and IP addresses strings or numbers.
+
+    Flow entries are grouped by the set of fields (and the masks or
+    prefix lengths) they match on and every group is a hash table of the
+    match field values (tuple space search), so a lookup takes one hash
+    probe per group. Groups are searched in the order of the highest
+    priority of their flow entries and the search stops at the first
+    group that can not have a better match. Of the matching flow entries
+    of the same priority the one added first wins.
+
+    Flow entries that match on fields not in HEADER_FIELDS (e.g. ARP, MPLS
+    or tunnel fields) are not classified, see 'get_skipped_flows'.
+
+    Example:
+
+        flows = ofswitch.get_operational_FlowEntries(0).get_data()
+        classifier = FlowClassifier(flows)
+        flow = classifier.classify({'in_port': 1, 'eth_type': 0x800,
+                                    'ipv4_dst': '10.0.0.5'})
+
+    """
+
+    def __init__(self, flows=()):
+        """ Initializes this object properties. """
+        self._subtables = {}
+        self._ordered = []
+        self._sorted = True
+        self._skipped = []
+        self._count = 0
+        self._seq = 0
+        for flow in flows:
+            self.add_flow(flow)
+
+    def __len__(self):
+        return self._count
+
+    def add_flow(self, flow):
+        """ Adds a flow entry ('FlowEntry' object) to the classifier.
+            Returns False if the flow entry can not be classified. """
+        constraints, complete = _constraints(flow.get_match_fields())
+        if not complete:
+            self._skipped.append(flow)
+            return False
+        items = tuple(sorted((i, mask)
+                             for i, (mask, _) in constraints.items()))
+        subtable = self._subtables.get(items)
+        if subtable is None:
+            subtable = self._subtables[items] = _Subtable(items)
+        values = [None] * len(HEADER_FIELDS)
+        for i, (_, v) in constraints.items():
+            values[i] = v
+        priority = flow.get_flow_priority()
+        priority = 0 if priority is None else int(priority)
+        entry = (-priority, self._seq, flow)
+        self._seq += 1
+        key = subtable.key(values)
+        entries = subtable.entries.get(key)
+        if entries is None:
+            subtable.entries[key] = [entry]
+        else:
+            entries.append(entry)
+            entries.sort()
+        if subtable.max_priority is None or priority > subtable.max_priority:
+            subtable.max_priority = priority
+            self._sorted = False
+        self._count += 1
+        return True
+
+    def get_skipped_flows(self):
+        """ Returns list of the flow entries that are not classified. """
+        return list(self._skipped)
+
+    def get_subtables_cnt(self):
+        """ Returns number of the distinct sets of match fields (and masks)
+            of the flow entries. """
+        return len(self._subtables)
+
+    def header_values(self, header):
+        """ Returns header dictionary as the list of the field values in
+            the order of HEADER_FIELDS (None for the missing fields). """
+        h = [None] * len(HEADER_FIELDS)
+        for name, v in header.iteritems():
+            try:
+                i, kind = _FIELD_INDEX[name]
+            except KeyError:
+                raise ValueError("[FlowClassifier] unknown header field "
+                                 "'%s'" % name)
+            if v is not None:
+                h[i] = _value(kind, v)
+        return h
+
+    def classify(self, header):
+        """ Returns the highest priority flow entry that matches the
+            packet header (None if there is none). """
+        return self._lookup(self.header_values(header))
+
+    def classify_all(self, header):
+        """ Returns list of all the flow entries that match the packet
+            header, highest priority first. """
+        h = self.header_values(header)
+        matches = []
+        for subtable in self._subtables.itervalues():
+            matches.extend(subtable.entries.get(subtable.key(h), ()))
+        matches.sort()
+        return [entry[2] for entry in matches]
+
+    def classify_batch(self, headers, fields=None):
+        """ Returns list of the highest priority flow entries (or None)
+            that match each of the packet headers.
+
+        Headers are dictionaries (as for 'classify') or, if 'fields' (list
+        of HEADER_FIELDS names) is given, sequences of the values of these
+        fields. Repeated headers are looked up once.
+        """
+        if fields is not None:
+            try:
+                # (field index, kind, converted values) per column
+                columns = [_FIELD_INDEX[name] + ({},) for name in fields]
+            except KeyError as e:
+                raise ValueError("[FlowClassifier] unknown header field "
+                                 "'%s'" % e.args[0])
+        n = len(HEADER_FIELDS)
+        lookup = self._lookup
+        cache = {}
+        res = []
+        for header in headers:
+            if fields is None:
+                h = self.header_values(header)
+                k = tuple(h)
+            else:
+                k = tuple(header)
+                flow = cache.get(k, self)
+                if flow is not self:
+                    res.append(flow)
+                    continue
+                h = [None] * n
+                for (i, kind, values), v in zip(columns, k):
+                    if v is not None:
+                        cv = values.get(v)
+                        if cv is None:
+                            if len(values) >= _BATCH_CACHE_SIZE:
+                                values.clear()
+                            cv = values[v] = _value(kind, v)
+                        h[i] = cv
+            flow = cache.get(k, self)
+            if flow is self:
+                if len(cache) >= _BATCH_CACHE_SIZE:
+                    cache.clear()
+                flow = cache[k] = lookup(h)
+            res.append(flow)
+        return res
+
+    def _lookup(self, h):
+        if not self._sorted:
+            self._ordered = sorted(self._subtables.values(),
+                                   key=lambda s: -s.max_priority)
+            self._sorted = True
+        best = None
+        for subtable in self._ordered:
+            if best is not None and -subtable.max_priority > best[0]:
+                break
+            entries = subtable.entries.get(subtable.key(h))
+            if entries is not None and (best is None or entries[0] < best):
+                best = entries[0]
+        return None if best is None else best[2]
+
+
+def _mask_within(mask, other):
+    # True if the bits of 'mask' are a subset of the bits of 'other'
+    # (None is a mask of all bits)
+    if other is None:
+        return True
+    return mask is not None and mask & other == mask
+
+
+def _mask_and(mask, other):
+    if mask is None:
+        return other
+    return mask if other is None else mask & other
+
+
+class FlowOverlapReport(object):
+    """ Outcome of 'analyze_flows': the flow entries that can never match
+        a packet and the flow entries that overlap ambiguously. """
+
+    def __init__(self):
+        ''' Number of the flow entries analyzed '''
+        self.flows = 0
+        ''' (flow entry, flow entry of a higher priority that matches all
+            the packets the former does) '''
+        self.shadowed = []
+        ''' (flow entry, flow entry) of the same priority that match some
+            of the same packets and have different instructions '''
+        self.conflicts = []
+        ''' Flow entries that also match on fields that are not analyzed
+            (these are only checked for being shadowed or overlapping
+            with the other flow entries on the analyzed fields) '''
+        self.partial = []
+
+    def get_flows_cnt(self):
+        return self.flows
+
+    def get_shadowed(self):
+        return self.shadowed
+
+    def get_conflicts(self):
+        return self.conflicts
+
+    def get_partial(self):
+        return self.partial
+
+    def is_clean(self):
+        """ Returns True if no flow entry is shadowed or conflicting. """
+        return not (self.shadowed or self.conflicts)
+
+    def to_string(self):
+        """ Returns list of the shadowed and conflicting flow entries. """
+        lines = ["%d flow entries, %d shadowed, %d conflicts" %
+                 (self.flows, len(self.shadowed), len(self.conflicts))]
+        for flow, by in self.shadowed:
+            lines.append("  shadowed: table %s flow %s (priority %s) by "
+                         "flow %s (priority %s)" %
+                         (flow.get_flow_table_id(), flow.get_flow_id(),
+                          flow.get_flow_priority(), by.get_flow_id(),
+                          by.get_flow_priority()))
+        for flow, other in self.conflicts:
+            lines.append("  conflict: table %s flows %s and %s "
+                         "(priority %s)" %
+                         (flow.get_flow_table_id(), flow.get_flow_id(),
+                          other.get_flow_id(), flow.get_flow_priority()))
+        return "\n".join(lines)
+
+
+def analyze_flows(flows):
+    """ Finds the flow entries that are shadowed (a flow entry of a higher
+        priority in the same flow table matches every packet they match,
+        so they never match any) and the conflicting ones (flow entries of
+        the same priority in the same flow table that match some of the
+        same packets but have different instructions, which of them
+        applies is undefined).
+
+    The match fields are those of 'FlowClassifier' (HEADER_FIELDS). Flow
+    entries are grouped by the fields and masks (prefix lengths) they
+    match on, as in 'FlowClassifier'. A flow entry is shadowed by another
+    one if the fields and masks of the latter are a subset of its own, so
+    each flow entry is checked with one hash lookup per such group, and
+    the overlapping pairs of the same priority are found by joining every
+    two groups on their common fields. The work grows with the number of
+    flow entries times the number of groups (plus the number of the pairs
+    found), not with the number of pairs of flow entries.
+
+    A flow entry covered only by several flow entries together is not
+    reported as shadowed.
+
+    :param list flows: 'FlowEntry' objects (of one or more flow tables)
+    :return: the shadowed and conflicting flow entries
+    :rtype: FlowOverlapReport
+
+    """
+    report = FlowOverlapReport()
+    tables = {}
+    for flow in flows:
+        report.flows += 1
+        constraints, complete = _constraints(flow.get_match_fields())
+        if not complete:
+            report.partial.append(flow)
+        items = tuple(sorted((i, mask)
+                             for i, (mask, _) in constraints.items()))
+        values = [None] * len(HEADER_FIELDS)
+        for i, (_, v) in constraints.items():
+            values[i] = v
+        priority = flow.get_flow_priority()
+        priority = 0 if priority is None else int(priority)
+        # rules are ordered by priority (highest first), then as given
+        rule = (-priority, report.flows, flow, items, values, complete)
+        tables.setdefault(flow.get_flow_table_id(), []).append(rule)
+    for table_id in sorted(tables):
+        _analyze_table(tables[table_id], report)
+    return report
+
+
+def _analyze_table(rules, report):
+    # group -> list of the rules (items are the fields and their masks)
+    groups = {}
+    for rule in rules:
+        groups.setdefault(rule[3], []).append(rule)
+    groups = sorted(groups.items())
+
+    # the groups whose flow entries may cover the flow entries of a group
+    # and these indexed by the match field values; flow entries matching
+    # on other fields as well can not cover any
+    index = []
+    for items, members in groups:
+        key = _key_function(items)
+        entries = {}
+        for rule in members:
+            if rule[5]:
+                entries.setdefault(key(rule[4]), []).append(rule)
+        for l in entries.itervalues():
+            l.sort()
+        index.append((items, key, entries))
+    shadowed = []
+    for items, members in groups:
+        fields = dict(items)
+        covering = [(okey, oentries) for other, okey, oentries in index
+                    if all(i in fields and _mask_within(mask, fields[i])
+                           for i, mask in other)]
+        for rule in members:
+            best = None
+            for key, entries in covering:
+                l = entries.get(key(rule[4]))
+                if l is not None and l[0][0] < rule[0]:
+                    if best is None or l[0] < best:
+                        best = l[0]
+            if best is not None:
+                shadowed.append((rule[1], rule[2], best[2]))
+    shadowed.sort()
+    report.shadowed.extend((flow, by) for _, flow, by in shadowed)
+
+    # overlapping flow entries of the same priority: two flow entries
+    # overlap if their values of the fields they both match on are equal
+    # under the masks of both
+    instructions = {}
+
+    def conflicting(a, b):
+        for rule in (a, b):
+            if rule[1] not in instructions:
+                canonical = dict(rule[2].canonical() or ())
+                instructions[rule[1]] = canonical.get(u'instructions')
+        return (instructions[a[1]] != instructions[b[1]] and
+                (a[5] or b[5]))
+
+    conflicts = []
+    for n, (items, members) in enumerate(groups):
+        fields = dict(items)
+        for other, other_members in groups[n:]:
+            common = tuple((i, _mask_and(fields[i], mask))
+                           for i, mask in other if i in fields)
+            key = _key_function(common)
+            joined = {}
+            for rule in members:
+                joined.setdefault((rule[0], key(rule[4])), []).append(rule)
+            if other == items:
+                for l in joined.itervalues():
+                    for j, a in enumerate(l):
+                        for b in l[j + 1:]:
+                            if conflicting(a, b):
+                                conflicts.append((a, b))
+                continue
+            for b in other_members:
+                for a in joined.get((b[0], key(b[4])), ()):
+                    if conflicting(a, b):
+                        conflicts.append(min((a, b), (b, a)))
+    conflicts.sort()
+    report.conflicts.extend((a[2], b[2]) for a, b in conflicts)
@@ -0,0 +1,392 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+collector.py: Periodic collection of OpenFlow switch counters into
+              fixed-size time series
+
+
+"""
+
+import time
+import heapq
+import random
+import itertools
+import threading
+
+from pysdn.common.result import Result
+from pysdn.common.status import OperStatus, STATUS
+from pysdn.common.futures import BoundedExecutor
+from pysdn.common.timeseries import CounterSeries
+from pysdn.openflowdev.ofswitch import (OFSwitch,
+                                        COUNTERS_PORT,
+                                        COUNTERS_QUEUE,
+                                        COUNTERS_GROUP)
+
+# Fractional part of the golden ratio, spreads the first polls of the
+# switches over the polling interval however many switches are added
+_PHASE_STEP = 0.6180339887498949
+
+# A switch is not polled more often than once in that many times the
+# duration of its last poll
+_POLL_LOAD_FACTOR = 4.0
+
+
+class _SwitchState(object):
+
+    __slots__ = ('switch', 'name', 'interval', 'phase', 'series',
+                 'activity', 'last_time', 'last_status', 'polls')
+
+    def __init__(self, switch, interval, phase):
+        self.switch = switch
+        self.name = switch.name
+        self.interval = interval
+        self.phase = phase
+        # (kind, object id, counter name) -> CounterSeries
+        self.series = {}
+        # increments per second of all counters at the last poll
+        self.activity = None
+        self.last_time = None
+        self.last_status = None
+        self.polls = 0
+
+
+class CounterCollector(object):
+    """ Polls the counters of OpenFlow switches (see 'OFSwitch.get_counters')
+        on a schedule and keeps their increments as 'CounterSeries' time
+        series, one per counter.
+
+    Every switch is polled with its own interval between 'min_interval'
+    and 'max_interval' seconds, starting from 'interval':
+
+      - the interval is halved when the combined rate of the counters of
+        the switch changed by more than 'change_threshold' (a fraction)
+        since the previous poll, and grows by a quarter while it is stable,
+      - it is doubled after a failed poll,
+      - it is never shorter than four times the duration of the last poll.
+
+    The first polls of the switches are spread over 'interval' and every
+    next poll is scheduled 'interval' +/- 'jitter' (a fraction) after the
+    previous one completed, so the polls of many switches do not come in
+    bursts. At most 'max_workers' polls run at the same time.
+
+    The memory taken is bounded: each series holds 'capacity' samples and
+    the series of counters that are no longer reported (removed ports,
+    groups or flow entries) are dropped.
+
+    Example:
+
+        collector = CounterCollector(ctrl, names, interval=30)
+        collector.start()
+        ...
+        rate = collector.get_rate('openflow:1', ('port', 1, 'bytes-received'),
+                                  window=300)
+        p95 = collector.get_percentile('openflow:1',
+                                       ('port', 1, 'bytes-received'), 95)
+        collector.stop()
+
+    """
+
+    def __init__(self, ctrl, switches=(), interval=30.0, min_interval=5.0,
+                 max_interval=300.0, jitter=0.1, capacity=60,
+                 kinds=(COUNTERS_PORT, COUNTERS_QUEUE, COUNTERS_GROUP),
+                 max_workers=8, change_threshold=0.25):
+        """ Initializes this object properties.
+
+        :param ctrl: :class:`pysdn.controller.controller.Controller`
+        :param list switches: 'OFSwitch' objects or switch names
+        :param float interval: initial polling interval (seconds)
+        :param float min_interval: shortest polling interval (seconds)
+        :param float max_interval: longest polling interval (seconds)
+        :param float jitter: random variation of the intervals (fraction)
+        :param int capacity: number of samples kept per counter
+        :param tuple kinds: kinds of the counters to collect (COUNTERS_*
+                            of 'pysdn.openflowdev.ofswitch')
+        :param int max_workers: number of concurrent polls
+        :param float change_threshold: relative change of the rates that
+                                       shortens the polling interval
+
+        """
+        if not 0 < min_interval <= interval <= max_interval:
+            raise ValueError("[CounterCollector] intervals must satisfy "
+                             "0 < min_interval <= interval <= max_interval")
+        if not 0 <= jitter < 1:
+            raise ValueError("[CounterCollector] jitter must be in range "
+                             "0 to 1")
+        self.ctrl = ctrl
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.capacity = capacity
+        self.kinds = tuple(kinds)
+        self.max_workers = max_workers
+        self.change_threshold = change_threshold
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._switches = {}
+        # scheduled polls: heap of (time, sequence number, switch state)
+        self._queue = []
+        self._seq = itertools.count()
+        self._added = 0
+        self._random = random.Random()
+        self._running = False
+        # bumped by every 'start', polls of an earlier run (still in
+        # progress when it was stopped) do not schedule the next one
+        self._generation = 0
+        self._thread = None
+        self._executor = None
+        self._counters = dict.fromkeys(['polls', 'poll_failures',
+                                        'samples', 'series_dropped'], 0)
+        for switch in switches:
+            self.add_switch(switch)
+
+    def add_switch(self, switch):
+        """ Adds a switch ('OFSwitch' object or name) to be polled. """
+        if not isinstance(switch, OFSwitch):
+            switch = OFSwitch(ctrl=self.ctrl, name=switch)
+        with self._cond:
+            if switch.name in self._switches:
+                return
+            phase = self.interval * ((self._added * _PHASE_STEP) % 1.0)
+            self._added += 1
+            state = _SwitchState(switch, self.interval, phase)
+            self._switches[switch.name] = state
+            if self._running:
+                self._schedule(state, time.time() + phase)
+
+    def remove_switch(self, name):
+        """ Stops polling a switch and drops its time series. """
+        with self._cond:
+            self._switches.pop(name, None)
+
+    def start(self):
+        """ Starts polling the switches in the background. """
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._generation += 1
+            self._executor = BoundedExecutor(self.max_workers)
+            now = time.time()
+            for state in self._switches.values():
+                self._schedule(state, now + state.phase)
+            self._thread = threading.Thread(target=self._run,
+                                            args=(self._generation,))
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """ Stops polling (polls in progress are not interrupted). """
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._queue = []
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+            executor, self._executor = self._executor, None
+        thread.join(timeout)
+        executor.shutdown(wait=False)
+
+    def is_running(self):
+        return self._running
+
+    def poll(self, name, timestamp=None):
+        """ Polls the counters of a switch now and records them as read at
+            'timestamp' (now by default). Returns result of the read. """
+        state = self._switches.get(name)
+        if state is None:
+            return Result(OperStatus(STATUS.DATA_NOT_FOUND), None)
+        return self._poll(state, timestamp)
+
+    def get_switch_names(self):
+        """ Returns sorted list of names of the polled switches. """
+        with self._lock:
+            return sorted(self._switches)
+
+    def get_interval(self, name):
+        """ Returns current polling interval of a switch (seconds). """
+        state = self._switches.get(name)
+        return None if state is None else state.interval
+
+    def get_last_status(self, name):
+        """ Returns status of the last poll of a switch. """
+        state = self._switches.get(name)
+        return None if state is None else state.last_status
+
+    def get_keys(self, name, kind=None):
+        """ Returns sorted list of keys of the counters of a switch (of the
+            given kind only). """
+        with self._lock:
+            state = self._switches.get(name)
+            if state is None:
+                return []
+            return sorted(k for k in state.series
+                          if kind is None or k[0] == kind)
+
+    def get_series(self, name, key):
+        """ Returns 'CounterSeries' of a counter of a switch (None if it is
+            not known). """
+        with self._lock:
+            state = self._switches.get(name)
+            return None if state is None else state.series.get(key)
+
+    def get_rate(self, name, key, window=None):
+        """ Returns average rate of a counter over the kept samples, or
+            those of the last 'window' seconds (None if not known). """
+        with self._lock:
+            series = self._get_series(name, key)
+            return None if series is None else series.get_rate(window)
+
+    def get_percentile(self, name, key, percent, window=None):
+        """ Returns the 'percent' percentile of the rates of a counter over
+            the kept samples, or those of the last 'window' seconds (None
+            if not known). """
+        with self._lock:
+            series = self._get_series(name, key)
+            if series is None:
+                return None
+            return series.get_percentile(percent, window)
+
+    def get_rates(self, name, kind=None, window=None):
+        """ Returns {key: average rate} of the counters of a switch (of the
+            given kind only). """
+        with self._lock:
+            state = self._switches.get(name)
+            if state is None:
+                return {}
+            return dict((k, s.get_rate(window))
+                        for k, s in state.series.iteritems()
+                        if kind is None or k[0] == kind)
+
+    def get_counters(self):
+        """ Returns snapshot of the counters of the collector: polls made,
+            failed polls, samples recorded and series dropped. """
+        with self._lock:
+            return dict(self._counters)
+
+    def _get_series(self, name, key):
+        state = self._switches.get(name)
+        return None if state is None else state.series.get(key)
+
+    def _schedule(self, state, due):
+        heapq.heappush(self._queue, (due, next(self._seq), state))
+        self._cond.notify()
+
+    def _run(self, generation):
+        with self._cond:
+            while self._running and self._generation == generation:
+                now = time.time()
+                queue = self._queue
+                if queue and queue[0][0] <= now:
+                    state = heapq.heappop(queue)[2]
+                    if self._switches.get(state.name) is state:
+                        self._executor.submit(self._poll_scheduled, state,
+                                              generation)
+                    continue
+                # wait in short slices, so that KeyboardInterrupt is
+                # handled on Python 2
+                wait = 1.0
+                if queue:
+                    wait = min(queue[0][0] - now, wait)
+                self._cond.wait(wait)
+
+    def _poll_scheduled(self, state, generation):
+        try:
+            self._poll(state)
+        finally:
+            with self._cond:
+                if (self._running and self._generation == generation and
+                        self._switches.get(state.name) is state):
+                    j = self._random.uniform(-self.jitter, self.jitter)
+                    self._schedule(state,
+                                   time.time() + state.interval * (1 + j))
+
+    def _poll(self, state, timestamp=None):
+        started = time.time()
+        result = state.switch.get_counters(self.kinds)
+        elapsed = time.time() - started
+        if timestamp is None:
+            timestamp = time.time()
+        status = result.get_status()
+        with self._lock:
+            self._counters['polls'] += 1
+            state.polls += 1
+            state.last_status = status
+            if not status.eq(STATUS.OK):
+                self._counters['poll_failures'] += 1
+                state.interval = min(state.interval * 2, self.max_interval)
+                return result
+            counters = result.get_data()
+            series = state.series
+            total = 0.0
+            samples = 0
+            for key, value in counters.iteritems():
+                s = series.get(key)
+                if s is None:
+                    s = series[key] = CounterSeries(self.capacity)
+                delta = s.add(value, timestamp)
+                if delta is not None:
+                    total += delta
+                    samples += 1
+            # counters of removed ports, groups and flow entries
+            dropped = [key for key in series if key not in counters]
+            for key in dropped:
+                del series[key]
+            self._counters['samples'] += samples
+            self._counters['series_dropped'] += len(dropped)
+            self._adapt(state, total, timestamp, elapsed)
+        return result
+
+    def _adapt(self, state, total, timestamp, elapsed):
+        activity = None
+        if state.last_time is not None and timestamp > state.last_time:
+            activity = total / (timestamp - state.last_time)
+        interval = state.interval
+        if activity is not None and state.activity is not None:
+            scale = max(activity, state.activity)
+            change = abs(activity - state.activity) / scale if scale else 0
+            if change > self.change_threshold:
+                interval /= 2
+            else:
+                interval *= 1.25
+        interval = max(interval, self.min_interval,
+                       elapsed * _POLL_LOAD_FACTOR)
+        state.interval = min(interval, self.max_interval)
+        state.activity = activity
+        state.last_time = timestamp
@@ -0,0 +1,193 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+fleet.py: Running the same operation on many OpenFlow switches
+
+
+"""
+
+import time
+import Queue
+
+from pysdn.common.result import Result
+from pysdn.common.status import OperStatus, STATUS
+from pysdn.common.futures import BoundedExecutor
+from pysdn.openflowdev.ofswitch import OFSwitch
+
+
+class FleetResults(dict):
+    """ Mapping of switch name to the 'Result' of the operation
+        run on that switch. """
+
+    def succeeded(self):
+        """ Returns names of the switches the operation succeeded on. """
+        return sorted(k for k, v in self.items()
+                      if v.get_status().eq(STATUS.OK))
+
+    def failed(self):
+        """ Returns {switch name: Result} for the switches the operation
+            failed (or timed out) on. """
+        return dict((k, v) for k, v in self.items()
+                    if not v.get_status().eq(STATUS.OK))
+
+
+class FleetExecutor(object):
+    """ Runs an operation across a list of OpenFlow switches on a bounded
+        pool of worker threads.
+
+    The operation is either a callable taking an 'OFSwitch' as the first
+    argument or the name of an 'OFSwitch' method, e.g.:
+
+        fleet = FleetExecutor(ctrl, max_workers=32)
+        results = fleet.run('delete_flows', names, args=(0,), timeout=10)
+        results = fleet.run(lambda sw: sw.add_modify_flow(flow), names)
+
+    Operations that return something other than a 'Result' have their
+    return value wrapped in a successful 'Result'. Operations that raise
+    an exception produce a 'Result' with STATUS.UNKNOWN and the exception
+    object as data. Operations that did not complete within 'timeout'
+    seconds of starting, or before the global 'deadline', produce a
+    'Result' with STATUS.TIMEOUT; note that the call itself can not be
+    interrupted and keeps a worker busy until it returns.
+
+    """
+
+    def __init__(self, ctrl, max_workers=16):
+        """ Initializes this object properties. """
+        self.ctrl = ctrl
+        self.max_workers = max_workers
+        self.executor = BoundedExecutor(max_workers)
+
+    def close(self):
+        """ Stops the worker threads. """
+        self.executor.shutdown(wait=False)
+
+    def get_switch(self, switch):
+        """ Returns 'OFSwitch' object for a switch object or name. """
+        if isinstance(switch, OFSwitch):
+            return switch
+        return OFSwitch(ctrl=self.ctrl, name=switch)
+
+    def run(self, fn, switches, args=(), kwargs=None, timeout=None,
+            deadline=None):
+        """ Runs the operation on every switch and waits for all of them.
+
+        :param fn: callable or 'OFSwitch' method name
+        :param list switches: 'OFSwitch' objects or switch names
+        :param tuple args: extra positional arguments for the operation
+        :param dict kwargs: extra keyword arguments for the operation
+        :param float timeout: per-switch timeout (seconds)
+        :param float deadline: timeout for the whole run (seconds)
+        :return: mapping of switch name to 'Result'
+        :rtype: FleetResults
+
+        """
+        results = FleetResults()
+        for name, result in self.iter_results(fn, switches, args, kwargs,
+                                              timeout, deadline):
+            results[name] = result
+        return results
+
+    def iter_results(self, fn, switches, args=(), kwargs=None,
+                     timeout=None, deadline=None):
+        """ Runs the operation on every switch and yields
+            (switch name, Result) pairs in the order of completion.
+            Parameters are the same as for 'run()'.
+        """
+        kwargs = kwargs or {}
+        end = None if deadline is None else time.time() + deadline
+        done = Queue.Queue()
+        pending = {}
+        started = {}
+        for idx, item in enumerate(switches):
+            switch = self.get_switch(item)
+            f = self.executor.submit(self._call, started, idx, fn, switch,
+                                     args, kwargs)
+            pending[f] = (idx, switch.name)
+            f.add_done_callback(done.put)
+
+        while pending:
+            now = time.time()
+            # wait until the nearest expiration (or in short slices, so
+            # that KeyboardInterrupt is handled on Python 2)
+            expires = [now + 1]
+            if end is not None:
+                expires.append(end)
+            if timeout is not None:
+                expires.append(now + timeout)
+                expires.extend(started[idx] + timeout
+                               for idx, _ in pending.values()
+                               if idx in started)
+            try:
+                f = done.get(True, max(min(expires) - now, 0))
+            except Queue.Empty:
+                f = None
+            if f is not None:
+                if f in pending:
+                    yield pending.pop(f)[1], self._result(f)
+                continue
+
+            now = time.time()
+            if end is not None and now >= end:
+                for f, (idx, name) in pending.items():
+                    f.cancel()
+                    yield name, Result(OperStatus(STATUS.TIMEOUT), None)
+                pending.clear()
+            elif timeout is not None:
+                for f, (idx, name) in pending.items():
+                    if idx in started and now - started[idx] >= timeout:
+                        del pending[f]
+                        yield name, Result(OperStatus(STATUS.TIMEOUT), None)
+
+    def _call(self, started, idx, fn, switch, args, kwargs):
+        # start time of each call, used for per-switch timeouts
+        started[idx] = time.time()
+        if isinstance(fn, basestring):
+            return getattr(switch, fn)(*args, **kwargs)
+        return fn(switch, *args, **kwargs)
+
+    def _result(self, f):
+        if f.cancelled():
+            return Result(OperStatus(STATUS.TIMEOUT), None)
+        e = f.exception()
+        if e is not None:
+            return Result(OperStatus(STATUS.UNKNOWN), e)
+        r = f.result()
+        if not isinstance(r, Result):
+            r = Result(OperStatus(STATUS.OK), r)
+        return r
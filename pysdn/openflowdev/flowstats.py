@@ -0,0 +1,324 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+flowstats.py: Columnar snapshots of OpenFlow flow counters and the flow
+              rates computed from them (requires NumPy)
+
+
+"""
+
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Name of the flow statistics in the operational flow entry data (and
+# in the 'FlowEntry' payload data), the counters named with dashes
+_STATISTICS_DATA_KEYS = ('opendaylight-flow-statistics:flow-statistics',
+                         'flow-statistics')
+
+RATE_PACKETS = 'packets'
+RATE_BYTES = 'bytes'
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("flow statistics snapshots require the 'numpy' "
+                          "package")
+
+
+def _top(values, n):
+    """ Returns indexes of the 'n' largest values in descending order of
+        the values (NaN values are left out). """
+    valid = numpy.flatnonzero(~numpy.isnan(values))
+    n = min(n, len(valid))
+    if n <= 0:
+        return valid[:0]
+    v = values[valid]
+    idx = numpy.argpartition(-v, n - 1)[:n]
+    idx = idx[numpy.argsort(-v[idx], kind='mergesort')]
+    return valid[idx]
+
+
+class FlowStatsSnapshot(object):
+    """ Counters of the flow entries of OpenFlow flow tables taken at one
+        moment, kept in columns (NumPy arrays) of one row per flow entry:
+
+        flow ids    - flow entry identifiers (unicode strings)
+        table ids   - flow table identifiers (-1 if unknown)
+        priorities  - flow entry priorities (-1 if unknown)
+        pkts_cnts   - packet counters (-1 if unknown)
+        bytes_cnts  - byte counters (-1 if unknown)
+        durations   - time the flow entries have been installed for
+                      (seconds, NaN if unknown)
+        times       - times the counters were read (seconds since epoch)
+
+    Two snapshots of the same tables give the flow rates ('rates').
+    """
+
+    def __init__(self, node_id=None, flow_ids=(), table_ids=(),
+                 priorities=(), pkts_cnts=(), bytes_cnts=(), durations=(),
+                 times=()):
+        _require_numpy()
+        self.node_id = node_id
+        self.flow_ids = numpy.array(flow_ids, dtype=numpy.unicode_)
+        self.table_ids = numpy.array(table_ids, dtype=numpy.int64)
+        self.priorities = numpy.array(priorities, dtype=numpy.int64)
+        self.pkts_cnts = numpy.array(pkts_cnts, dtype=numpy.int64)
+        self.bytes_cnts = numpy.array(bytes_cnts, dtype=numpy.int64)
+        self.durations = numpy.array(durations, dtype=numpy.float64)
+        self.times = numpy.array(times, dtype=numpy.float64)
+        self._keys = None
+
+    @classmethod
+    def from_flows(cls, flows, node_id=None, table_id=None, timestamp=None):
+        """ Returns snapshot of the counters of flow entries given as the
+            operational flow table data of the Controller (list of decoded
+            'flow' dictionaries); 'table_id' is used for the flow entries
+            that do not have one and 'timestamp' is the time the data was
+            read (now by default). Flow entries without an id are left out
+            (they can not be told apart between snapshots). """
+        _require_numpy()
+        if timestamp is None:
+            timestamp = time.time()
+        default_table = -1 if table_id is None else int(table_id)
+        flow_ids = []
+        table_ids = []
+        priorities = []
+        pkts_cnts = []
+        bytes_cnts = []
+        durations = []
+        nan = float('nan')
+        for d in flows:
+            if not isinstance(d, dict) or d.get('id') is None:
+                continue
+            flow_ids.append(unicode(d['id']))
+            v = d.get('table_id')
+            table_ids.append(default_table if v is None else v)
+            v = d.get('priority')
+            priorities.append(-1 if v is None else v)
+            stats = None
+            for p in _STATISTICS_DATA_KEYS:
+                stats = d.get(p)
+                if stats is not None:
+                    break
+            if not isinstance(stats, dict):
+                stats = {}
+            v = stats.get('packet-count')
+            pkts_cnts.append(-1 if v is None else v)
+            v = stats.get('byte-count')
+            bytes_cnts.append(-1 if v is None else v)
+            v = stats.get('duration')
+            if isinstance(v, dict) and 'second' in v:
+                durations.append(v['second'] +
+                                 v.get('nanosecond', 0) / 1000000000.0)
+            else:
+                durations.append(nan)
+        times = numpy.empty(len(flow_ids), dtype=numpy.float64)
+        times.fill(timestamp)
+        return cls(node_id, flow_ids, table_ids, priorities, pkts_cnts,
+                   bytes_cnts, durations, times)
+
+    @classmethod
+    def concatenate(cls, snapshots, node_id=None):
+        """ Returns one snapshot with the rows of all the 'snapshots'
+            (e.g. of the flow tables of a switch read one by one). """
+        _require_numpy()
+        snapshots = list(snapshots)
+        if node_id is None and snapshots:
+            node_id = snapshots[0].node_id
+        columns = ('flow_ids', 'table_ids', 'priorities', 'pkts_cnts',
+                   'bytes_cnts', 'durations', 'times')
+        snapshot = cls(node_id)
+        if snapshots:
+            for name in columns:
+                setattr(snapshot, name, numpy.concatenate(
+                    [getattr(s, name) for s in snapshots]))
+        return snapshot
+
+    def __len__(self):
+        return len(self.flow_ids)
+
+    def get_node_id(self):
+        return self.node_id
+
+    def get_flow_ids(self):
+        return self.flow_ids
+
+    def get_table_ids(self):
+        return self.table_ids
+
+    def get_priorities(self):
+        return self.priorities
+
+    def get_pkts_cnts(self):
+        return self.pkts_cnts
+
+    def get_bytes_cnts(self):
+        return self.bytes_cnts
+
+    def get_durations(self):
+        return self.durations
+
+    def get_times(self):
+        return self.times
+
+    def get_keys(self):
+        """ Returns the keys identifying the flow entries of the snapshot
+            ('<table id>/<flow id>' strings). """
+        if self._keys is None:
+            self._keys = numpy.char.add(
+                numpy.char.add(self.table_ids.astype(numpy.unicode_), u'/'),
+                self.flow_ids)
+        return self._keys
+
+    def rates(self, earlier):
+        """ Returns the packet and byte rates of the flow entries of this
+            snapshot since the 'earlier' snapshot as 'FlowRates'.
+
+        The flow entries are matched by table and flow id. The interval
+        of a flow entry is the growth of its duration or, if the duration
+        is unknown, the time between the snapshots. A flow entry that is
+        not in the earlier snapshot, or whose counters or duration went
+        back (the flow entry was re-installed), is rated over its whole
+        duration. Rates that can not be computed are NaN.
+        """
+        if not isinstance(earlier, FlowStatsSnapshot):
+            raise TypeError("[FlowStatsSnapshot] wrong argument type '%s'"
+                            " ('FlowStatsSnapshot' is expected)" %
+                            type(earlier))
+        n = len(self)
+        pkts = self.pkts_cnts.astype(numpy.float64)
+        octets = self.bytes_cnts.astype(numpy.float64)
+        durations = self.durations
+        if len(earlier) and n:
+            keys = self.get_keys()
+            old_keys = earlier.get_keys()
+            order = numpy.argsort(old_keys, kind='mergesort')
+            pos = numpy.searchsorted(old_keys[order], keys)
+            old = order[numpy.minimum(pos, len(order) - 1)]
+            matched = old_keys[old] == keys
+            old_pkts = earlier.pkts_cnts[old].astype(numpy.float64)
+            old_octets = earlier.bytes_cnts[old].astype(numpy.float64)
+            old_durations = earlier.durations[old]
+            old_times = earlier.times[old]
+        else:
+            matched = numpy.zeros(n, dtype=bool)
+            old_pkts = old_octets = numpy.full(n, -1.0)
+            old_durations = old_times = numpy.full(n, numpy.nan)
+        known = (pkts >= 0) & (octets >= 0)
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            # flow entries counted from the earlier snapshot
+            counted = (matched & known & (old_pkts >= 0) &
+                       (old_octets >= 0) & (pkts >= old_pkts) &
+                       (octets >= old_octets) &
+                       ~(durations < old_durations))
+            intervals = numpy.where(
+                numpy.isnan(durations) | numpy.isnan(old_durations),
+                self.times - old_times, durations - old_durations)
+            intervals = numpy.where(counted, intervals, durations)
+            valid = known & (intervals > 0)
+            pkts = numpy.where(counted, pkts - old_pkts, pkts)
+            octets = numpy.where(counted, octets - old_octets, octets)
+            pkts_rates = numpy.where(valid, pkts / intervals, numpy.nan)
+            bytes_rates = numpy.where(valid, octets / intervals, numpy.nan)
+        return FlowRates(self.node_id, self.flow_ids, self.table_ids,
+                         pkts_rates, bytes_rates, intervals)
+
+    def top(self, n, by=RATE_BYTES):
+        """ Returns (table id, flow id, counter) of the 'n' flow entries
+            with the largest byte (or packet) counters. """
+        values = self.bytes_cnts if by == RATE_BYTES else self.pkts_cnts
+        values = numpy.where(values >= 0, values, numpy.nan)
+        return [(int(self.table_ids[i]), self.flow_ids[i], int(values[i]))
+                for i in _top(values, n)]
+
+
+class FlowRates(object):
+    """ Packet and byte rates (per second) of the flow entries computed
+        from two 'FlowStatsSnapshot' objects, kept in columns (NumPy arrays)
+        of one row per flow entry of the later snapshot. """
+
+    def __init__(self, node_id, flow_ids, table_ids, pkts_rates,
+                 bytes_rates, intervals):
+        self.node_id = node_id
+        self.flow_ids = flow_ids
+        self.table_ids = table_ids
+        self.pkts_rates = pkts_rates
+        self.bytes_rates = bytes_rates
+        self.intervals = intervals
+
+    def __len__(self):
+        return len(self.flow_ids)
+
+    def get_node_id(self):
+        return self.node_id
+
+    def get_flow_ids(self):
+        return self.flow_ids
+
+    def get_table_ids(self):
+        return self.table_ids
+
+    def get_pkts_rates(self):
+        return self.pkts_rates
+
+    def get_bytes_rates(self):
+        return self.bytes_rates
+
+    def get_intervals(self):
+        return self.intervals
+
+    def get_rate(self, table_id, flow_id, by=RATE_BYTES):
+        """ Returns rate of a flow entry (None if it is not known). """
+        rows = numpy.flatnonzero((self.table_ids == int(table_id)) &
+                                 (self.flow_ids == unicode(flow_id)))
+        if len(rows) == 0:
+            return None
+        rates = self.bytes_rates if by == RATE_BYTES else self.pkts_rates
+        v = rates[rows[0]]
+        return None if numpy.isnan(v) else float(v)
+
+    def top(self, n, by=RATE_BYTES):
+        """ Returns (table id, flow id, rate) of the 'n' flow entries with
+            the highest byte (or packet) rates, highest first. """
+        rates = self.bytes_rates if by == RATE_BYTES else self.pkts_rates
+        return [(int(self.table_ids[i]), self.flow_ids[i], float(rates[i]))
+                for i in _top(rates, n)]
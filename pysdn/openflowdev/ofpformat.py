@@ -0,0 +1,207 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+@version: 1.1.0
+
+ofpformat.py: Rendering of the flow entries in the OpenFlow (OXM) text
+              syntax, one flow at a time straight to a file-like object
+
+
+"""
+
+import re
+import json
+from operator import methodcaller
+
+from pysdn.common.utils import dbg_print
+
+# Characters dropped from the rendered values (JSON quotes, brackets and
+# whitespace)
+_DROPPED_CHARS = '"{} '
+
+# Values rendered as they are (no characters JSON would escape)
+_ESCAPED_CHARS = re.compile(r'[^\x20-\x7e]|["\\]')
+
+# Number of the flows written between flushes of the output
+_FLUSH_FLOWS = 256
+
+
+def _ofp_value(v):
+    """ Return value of a field in the OpenFlow syntax (the way JSON
+        renders it, without quotes, brackets and spaces) """
+    t = type(v)
+    if t is int or t is long:
+        return str(v)
+    if (t is str or t is unicode) and not _ESCAPED_CHARS.search(v):
+        return str(v).translate(None, _DROPPED_CHARS)
+    s = json.dumps(v, separators=(',', '='))
+    return s.translate(None, _DROPPED_CHARS)
+
+
+def _hex_value(v):
+    return hex(int(v))
+
+
+def _duration_value(v):
+    return "{}s".format(v)
+
+
+def _field(name, getter, convert=None):
+    return (name, methodcaller(getter), convert)
+
+
+# Flow entry attributes rendered in front of the match fields: name in
+# the OpenFlow syntax, getter of the flow entry and value conversion
+_FLOW_FIELDS = (
+    _field('cookie', 'get_flow_cookie', _hex_value),
+    _field('duration', 'get_duration', _duration_value),
+    _field('table', 'get_flow_table_id'),
+    _field('n_packets', 'get_pkts_cnt'),
+    _field('n_bytes', 'get_bytes_cnt'),
+    _field('idle_timeout', 'get_flow_idle_timeout'),
+    _field('hard_timeout', 'get_flow_hard_timeout'),
+    _field('priority', 'get_flow_priority'),
+)
+
+# Match fields in the order they are rendered: name in the OpenFlow
+# syntax, getter of the 'Match' object and value conversion
+_MATCH_FIELDS = (
+    _field('in_port', 'get_in_port'),
+    _field('eth_type', 'get_eth_type', _hex_value),
+    _field('eth_src', 'get_eth_src'),
+    _field('eth_dst', 'get_eth_dst'),
+    _field('vlan_vid', 'get_vlan_id'),
+    _field('vlan_pcp', 'get_vlan_pcp'),
+    _field('ip_proto', 'get_ip_proto'),
+    _field('ip_dscp', 'get_ip_dscp'),
+    _field('ip_ecn', 'get_ip_ecn'),
+    _field('icmpv4_type', 'get_icmp4_type'),
+    _field('icmpv4_code', 'get_icmpv4_code'),
+    _field('icmpv6_type', 'get_icmpv6_type'),
+    _field('icmpv6_code', 'get_icmpv6_code'),
+    _field('ipv4_src', 'get_ipv4_src'),
+    _field('ipv4_dst', 'get_ipv4_dst'),
+    _field('ipv6_src', 'get_ipv6_src'),
+    _field('ipv6_dst', 'get_ipv6_dst'),
+    _field('ipv6_flabel', 'get_ipv6_flabel'),
+    _field('ipv6_exthdr', 'get_ipv6_exh_hdr'),
+    _field('udp_src', 'get_udp_src'),
+    _field('udp_dst', 'get_udp_dst'),
+    _field('tcp_src', 'get_tcp_src'),
+    _field('tcp_dst', 'get_tcp_dst'),
+    _field('sctp_src', 'get_sctp_src'),
+    _field('sctp_dst', 'get_sctp_dst'),
+    _field('arp_op', 'get_arp_opcode'),
+    _field('arp_spa', 'get_arp_src_transport_address'),
+    _field('arp_tpa', 'get_arp_tgt_transport_address'),
+    _field('arp_sha', 'get_arp_src_hw_address'),
+    _field('arp_tha', 'get_arp_tgt_hw_address'),
+    _field('mpls_label', 'get_mpls_label'),
+    _field('mpls_tc', 'get_mpls_tc'),
+    _field('mpls_bos', 'get_mpls_bos'),
+    _field('tunnel_id', 'get_tunnel_id'),
+    _field('metadata', 'get_metadata'),
+)
+
+
+def _render_fields(obj, fields):
+    items = []
+    for name, getter, convert in fields:
+        v = getter(obj)
+        if v is not None:
+            if convert is not None:
+                v = convert(v)
+            items.append(name + '=' + _ofp_value(v))
+    return ','.join(items)
+
+
+def format_ofp_flow(flow):
+    """ Return flow entry ('FlowEntry' or 'FlowEntryView') in the OpenFlow
+        syntax: the flow attributes, the match fields and the actions the
+        flow entry applies, e.g.
+
+        cookie=0x1,table=0,priority=1000 matches={in_port=1} actions={...}
+    """
+    sc = _render_fields(flow, _FLOW_FIELDS).replace(':', '=')
+
+    sm = ""
+    m = flow.get_match_fields()
+    if (m is not None):
+        sm = "matches={" + _render_fields(m, _MATCH_FIELDS) + "}"
+
+    apply_actions = []
+    for instruction in flow.get_instructions() or ():
+        if instruction.is_apply_actions_type():
+            for action in instruction.get_apply_actions():
+                s = action.to_ofp_oxm_syntax()
+                if (s):
+                    apply_actions.append(s)
+                else:
+                    msg = ("[format_ofp_flow] no value for action %s"
+                           % action)
+                    dbg_print(msg)
+    sa = "actions={" + ",".join(apply_actions) + "}"
+    return sc + " " + sm + " " + sa
+
+
+def write_ofp_flows(flows, out, line="{flow}\n", flush=_FLUSH_FLOWS):
+    """ Write flow entries ('FlowEntry' or 'FlowEntryView' objects, e.g.
+        a 'FlowTableView') in the OpenFlow syntax to the file-like object
+        'out' as they come, one flow at a time.
+
+    'line' is the format of the text written per flow entry ('{flow}' is
+    the flow in the OpenFlow syntax, '{id}' the flow id), e.g.
+
+        write_ofp_flows(view, sys.stdout, " -- Flow id '{id}'\\n {flow}\\n")
+
+    The output is flushed after the first flow entry and then every
+    'flush' flow entries (0 leaves flushing to the caller), so that the
+    reader sees the first flows without waiting for the whole dump.
+    Returns the number of the flow entries written.
+    """
+    write = out.write
+    flush_out = getattr(out, 'flush', None) if flush else None
+    with_id = '{id' in line
+    cnt = 0
+    for flow in flows:
+        s = format_ofp_flow(flow)
+        if with_id:
+            write(line.format(flow=s, id=flow.get_flow_id()))
+        else:
+            write(line.format(flow=s))
+        cnt += 1
+        if flush_out is not None and (cnt == 1 or cnt % flush == 0):
+            flush_out()
+    return cnt
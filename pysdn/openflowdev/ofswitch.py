@@ -40,14 +40,22 @@ ofswitch.py: OpenFlow switch properties and methods
 
 """
 
+import re
 import json
+import socket
 import urllib2
+import hashlib
+import binascii
 
 from collections import OrderedDict
 
 from pysdn.controller.openflownode import OpenflowNode
 from pysdn.common.result import Result
 from pysdn.common.status import OperStatus, STATUS
+from pysdn.common.futures import BoundedExecutor
+from pysdn.openflowdev.flowstats import FlowStatsSnapshot
+from pysdn.openflowdev.classifier import analyze_flows
+from pysdn.openflowdev.ofpformat import format_ofp_flow
 from pysdn.common.utils import (find_key_values_in_dict,
                                 replace_str_value_in_dict,
                                 find_key_value_in_dict,
@@ -57,6 +65,75 @@ from pysdn.common.utils import (find_key_values_in_dict,
                                 dbg_print)
 
 
+# Kinds of the counters read by 'OFSwitch.get_counters'
+COUNTERS_PORT = 'port'
+COUNTERS_QUEUE = 'queue'
+COUNTERS_GROUP = 'group'
+COUNTERS_FLOW = 'flow'
+COUNTERS_ALL = (COUNTERS_PORT, COUNTERS_QUEUE, COUNTERS_GROUP, COUNTERS_FLOW)
+
+# Counter names and their paths in the statistics of the operational data
+_PORT_COUNTERS = (('packets-received', ('packets', 'received')),
+                  ('packets-transmitted', ('packets', 'transmitted')),
+                  ('bytes-received', ('bytes', 'received')),
+                  ('bytes-transmitted', ('bytes', 'transmitted')),
+                  ('receive-drops', ('receive-drops',)),
+                  ('transmit-drops', ('transmit-drops',)),
+                  ('receive-errors', ('receive-errors',)),
+                  ('transmit-errors', ('transmit-errors',)))
+_QUEUE_COUNTERS = (('transmitted-packets', ('transmitted-packets',)),
+                   ('transmitted-bytes', ('transmitted-bytes',)),
+                   ('transmission-errors', ('transmission-errors',)))
+_ENTRY_COUNTERS = (('packet-count', ('packet-count',)),
+                   ('byte-count', ('byte-count',)))
+
+
+def _add_counters(counters, kind, obj_id, stats, names):
+    if not isinstance(stats, dict):
+        return
+    for name, path in names:
+        v = stats
+        for p in path:
+            v = v.get(p) if isinstance(v, dict) else None
+        if isinstance(v, (int, long)) and not isinstance(v, bool):
+            counters[(kind, obj_id, name)] = v
+
+
+def _node_counters(node, kinds):
+    """ Returns {(kind, object id, counter name): value} of the counters
+        found in the operational data of an OpenFlow node. """
+    counters = {}
+    if COUNTERS_PORT in kinds or COUNTERS_QUEUE in kinds:
+        p1 = ('opendaylight-port-statistics:'
+              'flow-capable-node-connector-statistics')
+        p2 = ('opendaylight-queue-statistics:'
+              'flow-capable-node-connector-queue-statistics')
+        for port in node.get('node-connector') or ():
+            pnum = port.get('flow-node-inventory:port-number',
+                            port.get('id'))
+            if COUNTERS_PORT in kinds:
+                _add_counters(counters, COUNTERS_PORT, pnum, port.get(p1),
+                              _PORT_COUNTERS)
+            if COUNTERS_QUEUE in kinds:
+                for queue in port.get('flow-node-inventory:queue') or ():
+                    qid = "%s/%s" % (pnum, queue.get('queue-id'))
+                    _add_counters(counters, COUNTERS_QUEUE, qid,
+                                  queue.get(p2), _QUEUE_COUNTERS)
+    if COUNTERS_GROUP in kinds:
+        p = 'opendaylight-group-statistics:group-statistics'
+        for group in node.get('flow-node-inventory:group') or ():
+            _add_counters(counters, COUNTERS_GROUP, group.get('group-id'),
+                          group.get(p), _ENTRY_COUNTERS)
+    if COUNTERS_FLOW in kinds:
+        p = 'opendaylight-flow-statistics:flow-statistics'
+        for table in node.get('flow-node-inventory:table') or ():
+            for flow in table.get('flow') or ():
+                fid = "%s/%s" % (table.get('id'), flow.get('id'))
+                _add_counters(counters, COUNTERS_FLOW, fid, flow.get(p),
+                              _ENTRY_COUNTERS)
+    return counters
+
+
 class OFSwitch(OpenflowNode):
     """ Class that represents an instance of 'OpenFlow Switch'
         (OpenFlow capable device). """
@@ -305,6 +382,65 @@ class OFSwitch(OpenflowNode):
             status.set_status(STATUS.MALFORM_DATA)
         return Result(status, resp)
 
+    def add_modify_flows(self, flow_entries, chunk_size=500):
+        """ Adds (or modifies) a list of flows with as few requests
+            as possible.
+
+        Flows are grouped per table and each group is sent to the
+        Controller in chunks of up to 'chunk_size' flows per request.
+        The Controller rejects a chunk as a whole if any of its flows is
+        invalid or already exists; the flows of such a chunk are then
+        re-sent one by one, so every flow gets its own outcome.
+
+        :param list flow_entries: 'FlowEntry' objects (table and flow
+                                  identifiers must be set)
+        :param int chunk_size: maximum number of flows per request
+        :return: list of 'Result' objects, one per flow, in the order of
+                 'flow_entries'
+        :rtype: list
+        :raises ValueError: if 'chunk_size' is less than 1
+
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be greater than 0")
+        flow_entries = list(flow_entries)
+        results = [None] * len(flow_entries)
+        tables = OrderedDict()
+        for idx, flow_entry in enumerate(flow_entries):
+            if (isinstance(flow_entry, FlowEntry) and
+                    flow_entry.get_flow_table_id() is not None and
+                    flow_entry.get_flow_id() is not None):
+                table_id = flow_entry.get_flow_table_id()
+                tables.setdefault(table_id, []).append(idx)
+            else:
+                status = OperStatus()
+                status.set_status(STATUS.MALFORM_DATA)
+                results[idx] = Result(status, None)
+
+        templateUrlExt = "/table/{}"
+        headers = {'content-type': 'application/yang.data+json'}
+        ctrl = self.ctrl
+        for table_id, indexes in tables.items():
+            url = ctrl.get_node_config_url(self.name)
+            url += templateUrlExt.format(table_id)
+            for i in range(0, len(indexes), chunk_size):
+                chunk = indexes[i:i + chunk_size]
+                flows = [flow_entries[j].get_payload_dict() for j in chunk]
+                payload = json.dumps({FlowEntry._mn: flows})
+                resp = ctrl.http_post_request(url, payload, headers)
+                if (resp is not None and resp.content is not None and
+                        resp.status_code in (200, 204)):
+                    for j in chunk:
+                        results[j] = Result(OperStatus(STATUS.OK), resp)
+                elif (resp is None):
+                    for j in chunk:
+                        results[j] = Result(OperStatus(STATUS.CONN_ERROR),
+                                            None)
+                else:
+                    for j in chunk:
+                        results[j] = self.add_modify_flow(flow_entries[j])
+        return results
+
     def add_modify_flow_json(self, table_id, flow_id, flow_json):
         status = OperStatus()
         model_ref = "flow-node-inventory:flow"
@@ -351,6 +487,138 @@ class OFSwitch(OpenflowNode):
             status.set_status(STATUS.HTTP_ERROR, resp)
         return Result(status, None)
 
+    def delete_flows_by_ids(self, table_id, flow_ids, chunk_size=10):
+        """ Deletes a list of flows from a flow table.
+
+        RESTCONF has no request for deleting several list entries at once,
+        so flows are deleted in windows of up to 'chunk_size' concurrent
+        requests sharing the Controller's keep-alive connections.
+
+        :param int table_id: flow table identifier
+        :param list flow_ids: identifiers of the flows to delete
+        :param int chunk_size: maximum number of delete requests in flight
+        :return: list of 'Result' objects, one per flow, in the order of
+                 'flow_ids'
+        :rtype: list
+        :raises ValueError: if 'chunk_size' is less than 1
+
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be greater than 0")
+        flow_ids = list(flow_ids)
+        if (len(flow_ids) == 0):
+            return []
+        executor = BoundedExecutor(min(chunk_size, len(flow_ids)))
+        try:
+            futures = executor.map(lambda flow_id:
+                                   self.delete_flow(table_id, flow_id),
+                                   flow_ids)
+            results = [f.result() for f in futures]
+        finally:
+            executor.shutdown(wait=False)
+        return results
+
+    def reconcile_flows(self, flow_entries, table_ids=None, prune=True,
+                        dry_run=False, chunk_size=500):
+        """ Brings the flows configured on the Controller to the desired
+            state with as few write requests as possible.
+
+        Every flow table having desired flows (and every table listed in
+        'table_ids') is read once from the configuration data store. The
+        configured and the desired flows are matched by flow id and
+        compared by the digests of their canonical form ('flow_digest'),
+        which leaves only the flows to add, to modify and (if 'prune' is
+        set) to delete, the flows of the read tables that are not desired.
+        New flows are added in bulk ('add_modify_flows'), modified flows
+        are replaced one by one and stale flows are deleted
+        ('delete_flows_by_ids').
+
+        :param list flow_entries: desired 'FlowEntry' objects (table and
+                                  flow identifiers must be set)
+        :param list table_ids: tables to reconcile in addition to the
+                               tables of the desired flows (e.g. to empty
+                               a table)
+        :param bool prune: delete configured flows that are not desired
+        :param bool dry_run: only report what would be changed
+        :param int chunk_size: maximum number of flows per add request
+        :return: 'Result' with 'FlowReconcileReport' as the data; the
+                 status is the status of the first failed request (no
+                 changes are made if reading a table fails)
+        :rtype: Result
+
+        """
+        desired = OrderedDict()
+        for flow_entry in flow_entries:
+            if (not isinstance(flow_entry, FlowEntry) or
+                    flow_entry.get_flow_table_id() is None or
+                    flow_entry.get_flow_id() is None):
+                raise ValueError("[OFSwitch] flow entry '%s' has no table "
+                                 "or flow identifier" % flow_entry)
+            table = desired.setdefault(flow_entry.get_flow_table_id(),
+                                       OrderedDict())
+            flow_id = unicode(flow_entry.get_flow_id())
+            if flow_id in table:
+                raise ValueError("[OFSwitch] duplicate flow '%s' in table "
+                                 "'%s'" % (flow_id,
+                                           flow_entry.get_flow_table_id()))
+            table[flow_id] = flow_entry
+        for table_id in (table_ids or []):
+            desired.setdefault(table_id, OrderedDict())
+
+        report = FlowReconcileReport(dry_run)
+        for table_id, table in desired.items():
+            result = self.get_configured_flows(table_id)
+            status = result.get_status()
+            report.reads += 1
+            if status.eq(STATUS.DATA_NOT_FOUND):
+                configured = []
+            elif status.eq(STATUS.OK):
+                configured = result.get_data()
+            else:
+                return Result(status, None)
+            seen = set()
+            for d in configured:
+                if not isinstance(d, dict) or d.get('id') is None:
+                    continue
+                flow_id = unicode(d['id'])
+                seen.add(flow_id)
+                flow_entry = table.get(flow_id)
+                if flow_entry is None:
+                    if prune:
+                        report.to_delete.append((table_id, d['id']))
+                elif flow_digest(flow_entry) != flow_digest(d):
+                    report.to_modify.append(flow_entry)
+                else:
+                    report.unchanged += 1
+            report.to_add.extend(flow_entry for flow_id, flow_entry
+                                 in table.items() if flow_id not in seen)
+
+        status = OperStatus(STATUS.OK)
+        if not dry_run:
+            results = report.results
+            adds = self.add_modify_flows(report.to_add, chunk_size)
+            for flow_entry, result in zip(report.to_add, adds):
+                results.append((FlowReconcileReport.ADD,
+                                flow_entry.get_flow_table_id(),
+                                flow_entry.get_flow_id(), result))
+            for flow_entry in report.to_modify:
+                results.append((FlowReconcileReport.MODIFY,
+                                flow_entry.get_flow_table_id(),
+                                flow_entry.get_flow_id(),
+                                self.add_modify_flow(flow_entry)))
+            deletes = OrderedDict()
+            for table_id, flow_id in report.to_delete:
+                deletes.setdefault(table_id, []).append(flow_id)
+            for table_id, flow_ids in deletes.items():
+                deleted = self.delete_flows_by_ids(table_id, flow_ids)
+                for flow_id, result in zip(flow_ids, deleted):
+                    results.append((FlowReconcileReport.DELETE, table_id,
+                                    flow_id, result))
+            failed = report.get_failed_results()
+            if failed:
+                status = failed[0][3].get_status()
+        return Result(status, report)
+
     def delete_flows(self, flow_table_id):
         status = OperStatus()
         templateUrlExt = "/table/{}"
@@ -479,6 +747,95 @@ class OFSwitch(OpenflowNode):
     def get_configured_FlowEntries(self, flow_table_id):
         return self.get_FlowEntries(flow_table_id, False)
 
+    def analyze_flow_tables(self, table_ids, operational=False):
+        """ Find the shadowed flow entries (never matching a packet) and
+            the conflicting ones (overlapping at the same priority) of the
+            given flow table(s) in the configuration (or operational) data
+            store, see 'pysdn.openflowdev.classifier.analyze_flows'.
+            Return 'Result' with 'FlowOverlapReport' as the data.
+        """
+        if isinstance(table_ids, (int, long, basestring)):
+            table_ids = [table_ids]
+        flows = []
+        for table_id in table_ids:
+            result = self.get_FlowEntries(table_id, operational)
+            status = result.get_status()
+            if(status.eq(STATUS.OK)):
+                flows.extend(result.get_data())
+            elif(not status.eq(STATUS.DATA_NOT_FOUND)):
+                return Result(status, None)
+        return Result(OperStatus(STATUS.OK), analyze_flows(flows))
+
+    def get_FlowTableView(self, tableid, operational=True, fields=None):
+        """ Return flow table as 'FlowTableView' (the flow entries become
+            objects when accessed); 'fields' projects the flow entries to
+            the given attributes (see 'FlowTableView').
+        """
+        view = FlowTableView([])
+        result = self.get_flows(tableid, operational)
+        status = result.get_status()
+        if(status.eq(STATUS.OK)):
+            view = FlowTableView(result.get_data(), fields)
+        return Result(status, view)
+
+    def get_operational_FlowTableView(self, flow_table_id, fields=None):
+        return self.get_FlowTableView(flow_table_id, True, fields)
+
+    def get_configured_FlowTableView(self, flow_table_id, fields=None):
+        return self.get_FlowTableView(flow_table_id, False, fields)
+
+    def get_flow_stats_snapshot(self, table_ids):
+        """ Return counters of the flow entries of the given flow table(s)
+            in the operational data store as 'FlowStatsSnapshot' (requires
+            NumPy); two snapshots give the flow rates (see
+            'FlowStatsSnapshot.rates').
+        """
+        if isinstance(table_ids, (int, long, basestring)):
+            table_ids = [table_ids]
+        status = OperStatus(STATUS.OK)
+        parts = []
+        for table_id in table_ids:
+            result = self.get_operational_flows(table_id)
+            st = result.get_status()
+            if(st.eq(STATUS.OK)):
+                parts.append(FlowStatsSnapshot.from_flows(
+                    result.get_data(), self.name, table_id))
+            elif(not st.eq(STATUS.DATA_NOT_FOUND)):
+                return Result(st, None)
+        snapshot = FlowStatsSnapshot.concatenate(parts, node_id=self.name)
+        return Result(status, snapshot)
+
+    def get_counters(self, kinds=COUNTERS_ALL):
+        """ Return the port, queue, group and flow entry counters of the
+            switch (the 'kinds' given) read from the operational data store
+            in one request, as a dictionary keyed by
+            (kind, object id, counter name) tuples, e.g.
+            ('port', 1, 'bytes-received'), ('queue', '1/0',
+            'transmitted-bytes'), ('group', 10, 'packet-count') or
+            ('flow', '0/flow-1', 'byte-count').
+        """
+        status = OperStatus()
+        counters = {}
+        ctrl = self.ctrl
+        url = ctrl.get_node_operational_url(self.name)
+        resp = ctrl.http_get_request(url, data=None, headers=None)
+        if(resp is None):
+            status.set_status(STATUS.CONN_ERROR)
+        elif(resp.content is None):
+            status.set_status(STATUS.CTRL_INTERNAL_ERROR)
+        elif (resp.status_code == 200):
+            l = json.loads(resp.content).get('node')
+            if (isinstance(l, list) and l and isinstance(l[0], dict)):
+                counters = _node_counters(l[0], kinds)
+            status.set_status(STATUS.OK
+                              if counters
+                              else STATUS.DATA_NOT_FOUND)
+        elif (resp.status_code == 404):
+            status.set_status(STATUS.DATA_NOT_FOUND)
+        else:
+            status.set_status(STATUS.HTTP_ERROR, resp)
+        return Result(status, counters)
+
     def get_group_ids(self, operational=True):
         """ Retrieve list of group IDs available on the Controller
             (refer to operational or configuration data store)
@@ -1001,12 +1358,368 @@ class OFSwitch(OpenflowNode):
         return Result(status, meter_features)
 
 
-class FlowEntry(object):
+class _Compact(object):
+    """ Base of the flow entry classes ('FlowEntry', 'Match', 'Instruction',
+        'Action' and their parts).
+
+    Attributes the classes define are kept in '__slots__' (an unassigned
+    slot takes no more than a pointer, unlike a per-instance '__dict__'
+    entry); any other attribute set by '_set_attr' (e.g. statistics the
+    Controller returns along with the flow entry) goes to the '_extra'
+    dictionary, which is created on demand.
+
+    '__dict__' is a snapshot of all the assigned attributes (the same
+    content an instance dictionary would have), so 'vars(obj)' and
+    'json.dumps(obj, default=lambda o: o.__dict__)' work as before.
+    """
+
+    __slots__ = ('_extra',)
+
+    # (name, descriptor) pairs of the slots of every class
+    _slots_by_class = {}
+
+    @classmethod
+    def _slots(cls):
+        slots = _Compact._slots_by_class.get(cls)
+        if slots is None:
+            slots = []
+            for c in reversed(cls.__mro__):
+                for name in c.__dict__.get('__slots__', ()):
+                    if name != '_extra':
+                        slots.append((name, c.__dict__[name]))
+            _Compact._slots_by_class[cls] = slots
+        return slots
+
+    @property
+    def __dict__(self):
+        d = {}
+        for name, slot in self._slots():
+            # reading an unassigned slot through its descriptor does not
+            # fall back to '__getattr__'
+            try:
+                d[name] = slot.__get__(self)
+            except AttributeError:
+                pass
+        try:
+            d.update(self._extra)
+        except AttributeError:
+            pass
+        return d
+
+    def __getattr__(self, name):
+        # called only when the attribute is neither an assigned slot nor
+        # a class attribute
+        if name != '_extra':
+            try:
+                return self._extra[name]
+            except (AttributeError, KeyError):
+                pass
+        raise AttributeError("'%s' object has no attribute '%s'" %
+                             (type(self).__name__, name))
+
+    def _set_attr(self, name, value):
+        try:
+            object.__setattr__(self, name, value)
+        except AttributeError:
+            try:
+                extra = self._extra
+            except AttributeError:
+                extra = self._extra = {}
+            extra[name] = value
+
+    def __getstate__(self):
+        return self.__dict__
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            self._set_attr(name, value)
+
+    def _iter_attrs(self):
+        # (name, value) pairs of the attributes set to a value other than
+        # None (without making the '__dict__' snapshot)
+        for name, slot in self._slots():
+            try:
+                v = slot.__get__(self)
+            except AttributeError:
+                continue
+            if v is not None:
+                yield name, v
+        try:
+            extra = self._extra
+        except AttributeError:
+            return
+        for item in extra.iteritems():
+            yield item
+
+    def canonical(self):
+        """ Return canonical form of this object content (a hashable
+            value that is the same for the objects that mean the same) """
+        return _canonical_value(self)
+
+    def fingerprint(self):
+        """ Return stable hash (hex string) of the canonical form of this
+            object content, e.g. for finding duplicates or changes """
+        return _fingerprint(self.canonical())
+
+
+# Multi-part keywords of the ODL YANG models are dash-separated, except for
+# the following ones (the attribute names are converted the same way, and
+# a keyword listed here keeps its underscores also when it is a part of a
+# longer attribute name)
+_FLOW_UNDERSCORED_KEYWORDS = ('table_id', 'cookie_mask')
+_GROUP_UNDERSCORED_KEYWORDS = ('watch_group', 'watch_port')
+
+# YANG keyword for every attribute name, per set of the exceptions above
+_yang_keys = {}
+
+_SCALAR_TYPES = frozenset([str, unicode, int, long, float, bool])
+
+
+def _yang_key(name, keep=()):
+    try:
+        return _yang_keys[keep][name]
+    except KeyError:
+        if not isinstance(name, basestring):
+            return name
+        key = name.replace('_', '-')
+        for k in keep:
+            key = key.replace(k.replace('_', '-'), k)
+        _yang_keys.setdefault(keep, {})[name] = key
+        return key
+
+
+def _yang_data(obj, keep=(), strip=True):
+    """ Return a copy of the object tree (the object attributes, nested
+        objects, dictionaries and lists) built of plain dictionaries and
+        lists with the names converted to the YANG keywords ('keep' is the
+        exceptions from the conversion rule) and, if 'strip' is set, the
+        unassigned (None) values left out. String values are not changed.
+    """
+    if type(obj) in _SCALAR_TYPES or obj is None:
+        return obj
+    if isinstance(obj, _Compact):
+        items = []
+        for name, slot in obj._slots():
+            try:
+                items.append((name, slot.__get__(obj)))
+            except AttributeError:
+                pass
+        try:
+            items.extend(obj._extra.iteritems())
+        except AttributeError:
+            pass
+    elif isinstance(obj, dict):
+        items = obj.iteritems()
+    elif isinstance(obj, (list, tuple)):
+        return [_yang_data(v, keep, strip) for v in obj
+                if not (strip and v is None)]
+    elif hasattr(obj, '__dict__'):
+        items = vars(obj).iteritems()
+    else:
+        return obj
+    keys = _yang_keys.get(keep)
+    if keys is None:
+        keys = _yang_keys[keep] = {}
+    d = {}
+    for name, v in items:
+        if v is None and strip:
+            continue
+        try:
+            key = keys[name]
+        except KeyError:
+            key = _yang_key(name, keep)
+        d[key] = _yang_data(v, keep, strip)
+    return d
+
+
+def _yang_payload(name, obj, keep=()):
+    """ Return compact JSON document with the YANG data of the object
+        as the value of the 'name' member. """
+    # the members are not sorted ('sort_keys' would make 'json' use its
+    # pure Python encoder)
+    return json.dumps({name: _yang_data(obj, keep)}, separators=(',', ':'))
+
+
+# Canonical form of the flow and group entry content ('canonical()' and
+# 'fingerprint()' methods): equal for the entries that mean the same to
+# a switch, no matter how their content is ordered or formatted
+
+# attributes holding port numbers (also given as 'openflow:<dpid>:<port>')
+_CANONICAL_PORT_ATTRS = frozenset(['in_port', 'in_phy_port',
+                                   'output_node_connector', 'watch_port'])
+
+# attributes holding IPv4/IPv6 addresses or prefixes
+_CANONICAL_PREFIX_ATTRS = frozenset(['ipv4_source', 'ipv4_destination',
+                                     'ipv6_source', 'ipv6_destination',
+                                     'ipv4_address', 'ipv6_address',
+                                     'ipv6_nd_target',
+                                     'arp_source_transport_address',
+                                     'arp_target_transport_address'])
+
+# attributes holding space separated flags (their order does not matter)
+_CANONICAL_FLAGS_ATTRS = frozenset(['flags'])
+
+_MAC_RE = re.compile(r'^[0-9A-Fa-f]{2}([:-][0-9A-Fa-f]{2}){5}$')
+
+
+def _canonical_port(v):
+    s = unicode(v).strip()
+    if s.startswith(u'openflow:'):
+        s = s.rsplit(u':', 1)[1]
+    return s.upper()
+
+
+def _canonical_prefix(v):
+    # network address (host bits cleared) with the prefix length, e.g.
+    # '10.0.0.1' -> '10.0.0.1/32', '10.1.2.3/24' -> '10.1.2.0/24'
+    s = unicode(v).strip()
+    addr, sep, plen = s.partition(u'/')
+    family, bits = ((socket.AF_INET6, 128) if u':' in addr
+                    else (socket.AF_INET, 32))
+    try:
+        plen = int(plen) if sep else bits
+        if not (0 <= plen <= bits):
+            return s
+        n = int(binascii.hexlify(socket.inet_pton(family, str(addr))), 16)
+        n &= ((1 << plen) - 1) << (bits - plen)
+        packed = binascii.unhexlify('%0*x' % (bits // 4, n))
+        return u'%s/%d' % (socket.inet_ntop(family, packed), plen)
+    except (socket.error, ValueError):
+        return s
+
+
+def _canonical_attrs(obj):
+    # (name, value) pairs of the attributes of an object (or a dict),
+    # None for a scalar
+    if isinstance(obj, dict):
+        return obj.iteritems()
+    elif isinstance(obj, _Compact):
+        return obj._iter_attrs()
+    d = getattr(obj, '__dict__', None)
+    return None if d is None else d.iteritems()
+
+
+def _canonical_mapping(attrs, skip=None):
+    items = []
+    for name, v in attrs:
+        if v is None or name == skip:
+            continue
+        v = _canonical_value(v, name)
+        if v is not None:
+            items.append((unicode(name), v))
+    items.sort()
+    return tuple(items) or None
+
+
+def _canonical_value(v, name=None):
+    """ Return canonical (immutable and hashable) form of a value: None
+        values, empty strings, empty lists and objects with no attributes
+        set are left out (empty dictionaries are kept as they mark the
+        presence of a parameterless item, e.g. an action), scalars
+        become strings (with port numbers, IP prefixes and MAC addresses
+        in one format, flags sorted), lists of ordered entries
+        (instructions, actions) are sorted by their 'order' which is then
+        left out (only the relative order matters) and other lists are
+        sorted. Attribute names are matched in either spelling ('in-port'
+        of the Controller data or 'in_port').
+    """
+    t = type(v)
+    if v is None:
+        return None
+    if name is not None and '-' in name:
+        name = name.replace('-', '_')
+    if t is str or t is unicode:
+        if not v:
+            return None
+        if name in _CANONICAL_FLAGS_ATTRS:
+            return u' '.join(sorted(unicode(v).split())) or None
+        if name in _CANONICAL_PORT_ATTRS:
+            return _canonical_port(v)
+        if name in _CANONICAL_PREFIX_ATTRS:
+            return _canonical_prefix(v)
+        if len(v) == 17 and _MAC_RE.match(v):
+            return unicode(v.lower().replace('-', ':'))
+        return unicode(v)
+    elif t is bool:
+        return u'true' if v else u'false'
+    elif t is int or t is long:
+        if name in _CANONICAL_PORT_ATTRS:
+            return _canonical_port(v)
+        return unicode(v)
+    elif t is dict and not v:
+        # presence container (e.g. an action without parameters)
+        return ()
+    elif t is list or t is tuple:
+        ordered = []
+        others = []
+        for item in v:
+            if isinstance(item, dict):
+                order = item.get('order')
+            else:
+                order = getattr(item, 'order', None)
+            if order is not None:
+                c = _canonical_mapping(_canonical_attrs(item), 'order')
+                try:
+                    order = int(order)
+                except (TypeError, ValueError):
+                    pass
+                ordered.append((order, c))
+            else:
+                c = _canonical_value(item, name)
+                if c is not None:
+                    others.append(c)
+        ordered.sort()
+        others.sort()
+        items = tuple(c for _, c in ordered) + tuple(others)
+        return items or None
+    attrs = _canonical_attrs(v)
+    if attrs is not None:
+        return _canonical_mapping(attrs)
+    return unicode(v)
+
+
+def _fingerprint(canonical):
+    return hashlib.sha1(repr(canonical)).hexdigest()
+
+
+def flow_digest(flow):
+    """ Return digest (hex string) of the canonical form of a flow entry
+        given either as 'FlowEntry' or as the flow entry data of the
+        Controller configuration data store (decoded 'flow' dictionary).
+        Flow entries with the same content have the same digest; unlike
+        'FlowEntry.fingerprint' it covers all the data the Controller
+        keeps for the flow entry (flow id, name, etc.).
+    """
+    if isinstance(flow, FlowEntry):
+        flow = flow.get_payload_dict()
+    elif not isinstance(flow, dict):
+        raise TypeError("[flow_digest] wrong argument type '%s'"
+                        " ('FlowEntry' or 'dict' is expected)" % type(flow))
+    return _fingerprint(_canonical_value(flow))
+
+
+# Name of the flow statistics in the Controller data ('FlowEntry' keeps
+# them as 'flow_statistics')
+_FLOW_STATISTICS_KEYS = ('opendaylight-flow-statistics:flow-statistics',
+                         'opendaylight_flow_statistics:flow_statistics')
+
+
+class FlowEntry(_Compact):
     """ Class for creating and interacting with OpenFlow flows """
 
     ''' Reference name in the YANG data tree on the Controller '''
     _mn = "flow-node-inventory:flow"
 
+    ''' Attributes making the content of a flow entry ('canonical') '''
+    _CANONICAL_ATTRS = ('table_id', 'priority', 'cookie', 'idle_timeout',
+                        'hard_timeout', 'flags', 'match', 'instructions')
+    _CANONICAL_ZEROS = ('cookie', 'idle_timeout', 'hard_timeout')
+
+    __slots__ = ('id', 'cookie', 'cookie_mask', 'table_id', 'priority',
+                 'idle_timeout', 'hard_timeout', 'strict', 'out_port',
+                 'out_group', 'flags', 'flow_name', 'installHw', 'barrier',
+                 'buffer_id', 'match', 'instructions')
+
     def __attrs__(self):
         ''' Unique identifier of this FlowEntry in the Controller's
             data store
@@ -1089,8 +1802,18 @@ class FlowEntry(object):
         if (s is not None and isinstance(s, basestring)):
             js = s.replace('opendaylight_flow_statistics:flow_statistics',
                            'flow_statistics')
-            obj = json.loads(js)
-            d = dict_keys_dashed_to_underscored(obj)
+            self.__init_from_dict__(json.loads(js))
+        else:
+            raise TypeError("[FlowEntry] wrong argument type '%s'"
+                            " (JSON 'string' is expected)" % type(s))
+
+    def __init_from_dict__(self, d):
+        if (d is not None and isinstance(d, dict)):
+            for p in _FLOW_STATISTICS_KEYS:
+                if p in d:
+                    d = dict(d)
+                    d['flow_statistics'] = d.pop(p)
+            d = dict_keys_dashed_to_underscored(d)
             for k, v in d.items():
                 if (k == 'match'):
                     match = Match(v)
@@ -1099,15 +1822,7 @@ class FlowEntry(object):
                     instructions = Instructions(v)
                     self.add_instructions(instructions)
                 else:
-                    setattr(self, k, v)
-        else:
-            raise TypeError("[FlowEntry] wrong argument type '%s'"
-                            " (JSON 'string' is expected)" % type(s))
-
-    def __init_from_dict__(self, d):
-        if (d is not None and isinstance(d, dict)):
-            js = json.dumps(d)
-            self.__init_from_json__(js)
+                    self._set_attr(k, v)
         else:
             raise TypeError("[FlowEntry] wrong argument type '%s'"
                             " ('dict' is expected)" % type(d))
@@ -1118,208 +1833,41 @@ class FlowEntry(object):
                           sort_keys=True, indent=4)
 
     def to_yang_json(self, strip=False):
-        s = self.to_json()
-        # Convert all 'underscored' keywords to 'dash-separated' form used
-        # by ODL YANG models naming conventions
-        s = s.replace('_', '-')
-        # Following are exceptions from the common ODL rules for having all
-        # multi-part keywords in YANG models being hash separated
-        s = s.replace('table-id', 'table_id')
-        s = s.replace('cookie-mask', 'cookie_mask')
-        if strip:
-            # ignore unassigned ("empty") attributes
-            d1 = json.loads(s)
-            d2 = strip_none(d1)
-            s = json.dumps(d2, sort_keys=True, indent=4)
-        return s
+        """ Return FlowEntry as JSON with the keywords named as in the ODL
+            YANG models ('strip' leaves out unassigned attributes) """
+        d = _yang_data(self, _FLOW_UNDERSCORED_KEYWORDS, strip)
+        return json.dumps(d, sort_keys=True, indent=4)
 
     def get_payload(self):
-        """ Return FlowEntry as a payload for the HTTP request body """
-        s = self.to_json()
-        # Convert all 'underscored' keywords to 'dash-separated' form used
-        # by ODL YANG models naming conventions
-        s = s.replace('_', '-')
-        # Following are exceptions from the common ODL rules for having all
-        # multi-part keywords in YANG models being hash separated
-        s = s.replace('table-id', 'table_id')
-        s = s.replace('cookie-mask', 'cookie_mask')
-        d1 = json.loads(s)
-        d2 = strip_none(d1)
-        payload = {self._mn: d2}
-        return json.dumps(payload, default=lambda o: o.__dict__,
-                          sort_keys=True, indent=4)
+        """ Return FlowEntry as a payload for the HTTP request body
+            (compact JSON) """
+        return _yang_payload(self._mn, self, _FLOW_UNDERSCORED_KEYWORDS)
+
+    def get_payload_dict(self):
+        """ Return FlowEntry content of the HTTP request body as a dict
+            (without the YANG model reference name wrapper) """
+        return _yang_data(self, _FLOW_UNDERSCORED_KEYWORDS)
+
+    def canonical(self):
+        """ Return canonical form of this flow entry content: the table,
+            priority, cookie, timeouts, flags, match fields and
+            instructions. Identifiers and names the Controller keeps
+            along with the flow entry, counters and attributes meaningful
+            for modify/delete requests only are left out, as well as the
+            cookie and timeouts of 0 (the same as not set).
+        """
+        items = []
+        for name in self._CANONICAL_ATTRS:
+            v = _canonical_value(getattr(self, name, None), name)
+            if name in self._CANONICAL_ZEROS and v == u'0':
+                v = None
+            if v is not None:
+                items.append((unicode(name), v))
+        return tuple(sorted(items)) or None
 
     def to_ofp_oxm_syntax(self):
-        odc = OrderedDict()
-        # Flow Cookie
-        v = self.get_flow_cookie()
-        if (v is not None):
-            odc['cookie'] = hex(int(v))
-        # Flow Duration
-        v = self.get_duration()
-        if (v is not None):
-            odc['duration'] = "{}s".format(v)
-        # Flow Table ID
-        v = self.get_flow_table_id()
-        if (v is not None):
-            odc['table'] = v
-        # Flow Counters
-        v = self.get_pkts_cnt()
-        if (v is not None):
-            odc['n_packets'] = v
-        v = self.get_bytes_cnt()
-        if (v is not None):
-            odc['n_bytes'] = v
-        # Flow Timeouts
-        v = self.get_flow_idle_timeout()
-        if (v is not None):
-            odc['idle_timeout'] = v
-        v = self.get_flow_hard_timeout()
-        if (v is not None):
-            odc['hard_timeout'] = v
-        # Flow Priority
-        v = self.get_flow_priority()
-        if (v is not None):
-            odc['priority'] = v
-        sc = json.dumps(odc, separators=(',', '='))
-        sc = sc.translate(None, '"{} ').replace(':', '=')
-
-        # Flow Match
-        sm = ""
-        m = self.get_match_fields()
-        if (m is not None):
-            odm = OrderedDict()
-            v = m.get_in_port()
-            if (v is not None):
-                odm['in_port'] = v
-            v = m.get_eth_type()
-            if (v is not None):
-                odm['eth_type'] = hex(int(v))
-            v = m.get_eth_src()
-            if (v is not None):
-                odm['eth_src'] = v
-            v = m.get_eth_dst()
-            if (v is not None):
-                odm['eth_dst'] = v
-            v = m.get_vlan_id()
-            if (v is not None):
-                odm['vlan_vid'] = v
-            v = m.get_vlan_pcp()
-            if (v is not None):
-                odm['vlan_pcp'] = v
-            v = m.get_ip_proto()
-            if (v is not None):
-                odm['ip_proto'] = v
-            v = m.get_ip_dscp()
-            if (v is not None):
-                odm['ip_dscp'] = v
-            v = m.get_ip_ecn()
-            if (v is not None):
-                odm['ip_ecn'] = v
-            v = m.get_icmp4_type()
-            if (v is not None):
-                odm['icmpv4_type'] = v
-            v = m.get_icmpv4_code()
-            if (v is not None):
-                odm['icmpv4_code'] = v
-            v = m.get_icmpv6_type()
-            if (v is not None):
-                odm['icmpv6_type'] = v
-                v = m.get_icmpv6_code()
-            if (v is not None):
-                odm['icmpv6_code'] = v
-            v = m.get_ipv4_src()
-            if (v is not None):
-                odm['ipv4_src'] = v
-            v = m.get_ipv4_dst()
-            if (v is not None):
-                odm['ipv4_dst'] = v
-            v = m.get_ipv6_src()
-            if (v is not None):
-                odm['ipv6_src'] = v
-            v = m.get_ipv6_dst()
-            if (v is not None):
-                odm['ipv6_dst'] = v
-                v = m.get_ipv6_flabel()
-            if (v is not None):
-                odm['ipv6_flabel'] = v
-            v = m.get_ipv6_exh_hdr()
-            if (v is not None):
-                odm['ipv6_exthdr'] = v
-            v = m.get_udp_src()
-            if (v is not None):
-                odm['udp_src'] = v
-            v = m.get_udp_dst()
-            if (v is not None):
-                odm['udp_dst'] = v
-            v = m.get_tcp_src()
-            if (v is not None):
-                odm['tcp_src'] = v
-            v = m.get_tcp_dst()
-            if (v is not None):
-                odm['tcp_dst'] = v
-            v = m.get_sctp_src()
-            if (v is not None):
-                odm['sctp_src'] = v
-            v = m.get_sctp_dst()
-            if (v is not None):
-                odm['sctp_dst'] = v
-            v = m.get_arp_opcode()
-            if (v is not None):
-                odm['arp_op'] = v
-            v = m.get_arp_src_transport_address()
-            if (v is not None):
-                odm['arp_spa'] = v
-            v = m.get_arp_tgt_transport_address()
-            if (v is not None):
-                odm['arp_tpa'] = v
-            v = m.get_arp_src_hw_address()
-            if (v is not None):
-                odm['arp_sha'] = v
-            v = m.get_arp_tgt_hw_address()
-            if (v is not None):
-                odm['arp_tpa'] = v
-            v = m.get_mpls_label()
-            if (v is not None):
-                odm['mpls_label'] = v
-            v = m.get_mpls_tc()
-            if (v is not None):
-                odm['mpls_tc'] = v
-            v = m.get_mpls_bos()
-            if (v is not None):
-                odm['mpls_bos'] = v
-            v = m.get_tunnel_id()
-            if (v is not None):
-                odm['tunnel_id'] = v
-            v = m.get_metadata()
-            if (v is not None):
-                odm['metadata'] = v
-
-            sm = json.dumps(odm, separators=(',', '='))
-            sm = sm.translate(None, '"{} ')
-            sm = "matches={" + sm + "}"
-
-        # Flow Instructions/Actions
-        instructions = self.get_instructions()
-        apply_actions = []
-        for instruction in instructions:
-            if instruction.is_apply_actions_type():
-                actions = instruction.get_apply_actions()
-                for action in actions:
-                    s = action.to_ofp_oxm_syntax()
-                    if (s):
-                        apply_actions.append(s)
-                    else:
-                        msg = ("[FlowEntry->to_ofp_oxm_syntax]"
-                               " no value for action %s" % action)
-                        dbg_print(msg)
-
-        sa = "actions={"
-        actions_list = apply_actions
-        if(actions_list):
-            sa += ",".join(actions_list)
-        sa += "}"
-        return sc + " " + sm + " " + sa
+        """ Return FlowEntry in the OpenFlow syntax """
+        return format_ofp_flow(self)
 
     def set_flow_table_id(self, table_id):
         self.table_id = table_id
@@ -1486,9 +2034,270 @@ class FlowEntry(object):
         return res
 
 
-class Instructions():
+class FlowEntryView(object):
+    """ Read-only view of a flow entry in the Controller data (decoded
+        'flow' dictionary) that offers the 'FlowEntry' getters.
+
+    Plain attributes (ids, priority, counters, etc.) are read directly from
+    the dictionary; the 'Match' and 'Instruction' objects and the complete
+    'FlowEntry' object are built on first access only.
+    """
+
+    __slots__ = ('_d', '_match', '_instructions', '_flow_entry')
+
+    def __init__(self, d):
+        if not isinstance(d, dict):
+            raise TypeError("[FlowEntryView] wrong argument type '%s'"
+                            " ('dict' is expected)" % type(d))
+        self._d = d
+        self._match = None
+        self._instructions = None
+        self._flow_entry = None
+
+    def get_flow_data(self):
+        """ Return the flow entry dictionary this view is based on """
+        return self._d
+
+    def get_flow_entry(self):
+        """ Return 'FlowEntry' object built from the flow entry data """
+        if self._flow_entry is None:
+            self._flow_entry = FlowEntry(flow_dict=self._d)
+        return self._flow_entry
+
+    def get_flow_id(self):
+        return self._d.get('id')
+
+    def get_flow_table_id(self):
+        return self._d.get('table_id')
+
+    def get_flow_name(self):
+        return self._d.get('flow-name')
+
+    def get_flow_priority(self):
+        return self._d.get('priority')
+
+    def get_flow_cookie(self):
+        return self._d.get('cookie')
+
+    def get_flow_cookie_mask(self):
+        return self._d.get('cookie_mask')
+
+    def get_flow_idle_timeout(self):
+        return self._d.get('idle-timeout')
+
+    def get_flow_hard_timeout(self):
+        return self._d.get('hard-timeout')
+
+    def _get_statistics(self):
+        for p in _FLOW_STATISTICS_KEYS:
+            v = self._d.get(p)
+            if isinstance(v, dict):
+                return v
+        return None
+
+    def get_duration(self):
+        res = None
+        stats = self._get_statistics()
+        if stats is not None:
+            v = stats.get('duration')
+            if isinstance(v, dict):
+                s = v.get('second')
+                ns = v.get('nanosecond')
+                if (s is not None and ns is not None):
+                    res = float(s * 1000000000 + ns) / 1000000000
+        return res
+
+    def get_pkts_cnt(self):
+        res = None
+        stats = self._get_statistics()
+        if stats is not None:
+            v = stats.get('packet-count', stats.get('packet_count'))
+            if isinstance(v, (int, long)):
+                res = v
+        return res
+
+    def get_bytes_cnt(self):
+        res = None
+        stats = self._get_statistics()
+        if stats is not None:
+            v = stats.get('byte-count', stats.get('byte_count'))
+            if isinstance(v, (int, long)):
+                res = v
+        return res
+
+    def get_match_fields(self):
+        """ Return 'Match' object of the flow entry (None if the entry
+            has no match fields) """
+        if self._match is None:
+            v = self._d.get('match')
+            if isinstance(v, dict):
+                self._match = Match(dict_keys_dashed_to_underscored(v))
+        return self._match
+
+    def get_instructions(self):
+        """ Return list of 'Instruction' objects of the flow entry """
+        if self._instructions is None:
+            v = self._d.get('instructions')
+            if isinstance(v, dict):
+                d = dict_keys_dashed_to_underscored(v)
+                self._instructions = Instructions(d).get_instructions()
+            else:
+                self._instructions = []
+        return self._instructions
+
+    def to_ofp_oxm_syntax(self):
+        """ Return the flow entry in the OpenFlow syntax (without building
+            the 'FlowEntry' object) """
+        return format_ofp_flow(self)
+
+
+class FlowTableView(object):
+    """ Flow table of the Controller data (list of decoded 'flow'
+        dictionaries) seen as a sequence of 'FlowEntryView' objects.
+
+    The views are created on first access. 'fields' (optional) projects
+    the flow entries to the given attributes, named as 'FlowEntry' names
+    them ('flow_statistics' stands for the flow counters), e.g.
+
+        FlowTableView(flows, fields=('id', 'table_id', 'flow_statistics'))
+
+    keeps only the ids and counters of the flow entries and releases the
+    rest of the data (the getters of the attributes left out return None).
+    """
+
+    def __init__(self, flows, fields=None):
+        if not isinstance(flows, list):
+            raise TypeError("[FlowTableView] wrong argument type '%s'"
+                            " ('list' is expected)" % type(flows))
+        if fields is not None:
+            keys = set()
+            for name in fields:
+                keys.add(name)
+                keys.add(name.replace('_', '-'))
+                if name == 'flow_statistics':
+                    keys.update(_FLOW_STATISTICS_KEYS)
+            flows = [{k: d[k] for k in keys if k in d}
+                     for d in flows if isinstance(d, dict)]
+        else:
+            flows = [d for d in flows if isinstance(d, dict)]
+        self._flows = flows
+        self._views = [None] * len(flows)
+
+    def __len__(self):
+        return len(self._flows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in xrange(*i.indices(len(self)))]
+        view = self._views[i]
+        if view is None:
+            view = self._views[i] = FlowEntryView(self._flows[i])
+        return view
+
+    def __iter__(self):
+        for i in xrange(len(self._flows)):
+            yield self[i]
+
+    def get_flow_ids(self):
+        """ Return list of the flow entry ids """
+        return [d.get('id') for d in self._flows]
+
+    def get_FlowEntries(self):
+        """ Return list of 'FlowEntry' objects of the flow entries """
+        return [view.get_flow_entry() for view in self]
+
+
+class FlowReconcileReport(object):
+    """ Outcome of 'OFSwitch.reconcile_flows': the flows to add, modify
+        and delete (the changes made unless it is a dry run) and the
+        results of the requests that made the changes.
+    """
+
+    ADD = 'add'
+    MODIFY = 'modify'
+    DELETE = 'delete'
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        ''' 'FlowEntry' objects of the flows missing on the Controller '''
+        self.to_add = []
+        ''' 'FlowEntry' objects of the flows that differ on the Controller '''
+        self.to_modify = []
+        ''' (table id, flow id) of the configured flows not desired '''
+        self.to_delete = []
+        ''' Number of the desired flows configured as they are '''
+        self.unchanged = 0
+        ''' Number of the flow tables read from the Controller '''
+        self.reads = 0
+        ''' (change, table id, flow id, 'Result') of every request made '''
+        self.results = []
+
+    def is_dry_run(self):
+        return self.dry_run
+
+    def get_flows_to_add(self):
+        return self.to_add
+
+    def get_flows_to_modify(self):
+        return self.to_modify
+
+    def get_flows_to_delete(self):
+        return self.to_delete
+
+    def get_unchanged_cnt(self):
+        return self.unchanged
+
+    def get_reads_cnt(self):
+        return self.reads
+
+    def get_changes_cnt(self):
+        return len(self.to_add) + len(self.to_modify) + len(self.to_delete)
+
+    def get_results(self):
+        return self.results
+
+    def get_failed_results(self):
+        """ Return (change, table id, flow id, 'Result') of the requests
+            that failed """
+        failed = []
+        for r in self.results:
+            status = r[3].get_status()
+            # a flow deleted meanwhile is not a failure
+            if not (status.eq(STATUS.OK) or
+                    (r[0] == self.DELETE and
+                     status.eq(STATUS.DATA_NOT_FOUND))):
+                failed.append(r)
+        return failed
+
+    def is_in_sync(self):
+        """ Return True if the configured flows were found in the desired
+            state (nothing to change) """
+        return self.get_changes_cnt() == 0
+
+    def to_string(self):
+        """ Return summary of the changes per flow table """
+        tables = OrderedDict()
+        for flow_entry in self.to_add:
+            tables.setdefault(flow_entry.get_flow_table_id(),
+                              [0, 0, 0])[0] += 1
+        for flow_entry in self.to_modify:
+            tables.setdefault(flow_entry.get_flow_table_id(),
+                              [0, 0, 0])[1] += 1
+        for table_id, _ in self.to_delete:
+            tables.setdefault(table_id, [0, 0, 0])[2] += 1
+        lines = ["%s%d to add, %d to modify, %d to delete, %d unchanged" %
+                 ("(dry run) " if self.dry_run else "", len(self.to_add),
+                  len(self.to_modify), len(self.to_delete), self.unchanged)]
+        for table_id, (a, m, d) in tables.items():
+            lines.append("  table %s: +%d ~%d -%d" % (table_id, a, m, d))
+        return "\n".join(lines)
+
+
+class Instructions(_Compact):
     ''' 'Class representing OpenFlow flow instructions set '''
 
+    __slots__ = ('instructions',)
+
     def __attrs__(self):
         self.instructions = []
 
@@ -1528,9 +2337,11 @@ class Instructions():
         return res
 
 
-class Instruction():
+class Instruction(_Compact):
     """ Class representing an OpenFlow flow instruction """
 
+    __slots__ = ('order', 'apply_actions')
+
     def __attrs__(self):
         self.order = None
         self.apply_actions = {'action': []}
@@ -1577,7 +2388,7 @@ class Instruction():
                 elif p3:
                     self.order = v
                 else:
-                    setattr(self, k, v)
+                    self._set_attr(k, v)
         else:
             raise TypeError("[Instruction] wrong argument type '%s'"
                             " ('dict' is expected)" % type(d))
@@ -1704,7 +2515,9 @@ class Instruction():
                             " ('dict' is expected)" % type(d))
 
 
-class Action(object):
+class Action(_Compact):
+
+    __slots__ = ('order',)
 
     def __init__(self, order=None):
         self.order = order
@@ -1720,6 +2533,8 @@ class OutputAction(Action):
         (OpenFlow Switch Specification Version 1.0 and 1.3)
     """
 
+    __slots__ = ('output_action',)
+
     def __attrs__(self):
         self.output_action = {'output_node_connector': None,
                               'max_length': None}
@@ -1792,6 +2607,8 @@ class DropAction(Action):
         (OpenFlow Switch Specification Version 1.0 and 1.3)
     """
 
+    __slots__ = ('drop_action',)
+
     def __attrs__(self):
         self.drop_action = {}
 
@@ -1815,6 +2632,8 @@ class SetVlanIdAction(Action):
         (OpenFlow Switch Specification Version 1.0)
     """
 
+    __slots__ = ('set_vlan_id_action',)
+
     def __attrs__(self):
         self.set_vlan_id_action = {'vlan_id': None}
 
@@ -1860,6 +2679,8 @@ class SetVlanPCPAction(Action):
         (OpenFlow Switch Specification Version 1.0)
     """
 
+    __slots__ = ('set_vlan_pcp_action',)
+
     def __attrs__(self):
         self.set_vlan_pcp_action = {'vlan_pcp': None}
 
@@ -1925,6 +2746,8 @@ class StripVlanAction(Action):
         (OpenFlow Switch Specification Version 1.0)
     """
 
+    __slots__ = ('strip_vlan_action',)
+
     def __attrs__(self):
         self.strip_vlan_action = {}
 
@@ -1944,6 +2767,8 @@ class SetDlSrcAction(Action):
         (OpenFlow Switch Specification Version 1.0)
     """
 
+    __slots__ = ('set_dl_src_action',)
+
     def __attrs__(self):
         self.set_dl_src_action = {'address': None}
 
@@ -1988,6 +2813,8 @@ class SetDlDstAction(Action):
         (OpenFlow Switch Specification Version 1.0)
     """
 
+    __slots__ = ('set_dl_dst_action',)
+
     def __attrs__(self):
         self.set_dl_dst_action = {'address': None}
 
@@ -2033,6 +2860,8 @@ class SetNwSrcAction(Action):
         (OpenFlow Switch Specification Version 1.0)
     """
 
+    __slots__ = ('set_nw_src_action',)
+
     def __attrs__(self):
         self.set_nw_src_action = {'ipv4_address': None}
 
@@ -2078,6 +2907,8 @@ class SetNwDstAction(Action):
         (OpenFlow Switch Specification Version 1.0)
     """
 
+    __slots__ = ('set_nw_dst_action',)
+
     def __attrs__(self):
         self.set_nw_dst_action = {'ipv4_address': None}
 
@@ -2122,6 +2953,8 @@ class SetNwTosAction(Action):
         (OpenFlow Switch Specification Version 1.0)
     """
 
+    __slots__ = ('set_nw_tos_action',)
+
     def __attrs__(self):
         ''' Value with which to replace existing IPv4 ToS field
             NOTE: The modern redefinition of the ToS field is a 6 bit
@@ -2173,6 +3006,8 @@ class SetTpSrcAction(Action):
         (OpenFlow Switch Specification Version 1.0)
     """
 
+    __slots__ = ('set_tp_src_action',)
+
     def __attrs__(self):
         self.set_tp_src_action = {'port': None}
 
@@ -2218,6 +3053,8 @@ class SetTpDstAction(Action):
         (OpenFlow Switch Specification Version 1.0)
     """
 
+    __slots__ = ('set_tp_dst_action',)
+
     def __attrs__(self):
         self.set_tp_dst_action = {'port': None}
 
@@ -2262,6 +3099,8 @@ class PushVlanHeaderAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('push_vlan_action',)
+
     def __attrs__(self):
         self.push_vlan_action = {'ethernet_type': None, 'tag': None,
                                  'pcp': None, 'cfi': None, 'vlan_id': None}
@@ -2330,6 +3169,8 @@ class PopVlanHeaderAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('pop_vlan_action',)
+
     def __attrs__(self):
         self.pop_vlan_action = {}
 
@@ -2349,6 +3190,8 @@ class PushMplsHeaderAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('push_mpls_action',)
+
     def __attrs__(self):
         self.push_mpls_action = {'ethernet_type': None}
 
@@ -2398,6 +3241,8 @@ class PopMplsHeaderAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('pop_mpls_action',)
+
     def __attrs__(self):
         self.pop_mpls_action = {'ethernet_type': None}
 
@@ -2442,6 +3287,8 @@ class SetMplsTTLAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('set_mpls_ttl_action',)
+
     def __attrs__(self):
         self.set_mpls_ttl_action = {'mpls_ttl': None}
 
@@ -2486,6 +3333,8 @@ class DecMplsTTLAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('dec_mpls_ttl',)
+
     def __attrs__(self):
         self.dec_mpls_ttl = {}
 
@@ -2505,6 +3354,8 @@ class SetNwTTLAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('set_nw_ttl_action',)
+
     def __attrs__(self):
         self.set_nw_ttl_action = {'nw_ttl': None}
 
@@ -2549,6 +3400,8 @@ class DecNwTTLAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('dec_nw_ttl',)
+
     def __attrs__(self):
         self.dec_nw_ttl = {}
 
@@ -2567,6 +3420,8 @@ class CopyTTLOutwardsAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('copy_ttl_out',)
+
     def __attrs__(self):
         self.copy_ttl_out = {}
 
@@ -2585,6 +3440,8 @@ class CopyTTLInwardsAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('copy_ttl_in',)
+
     def __attrs__(self):
         self.copy_ttl_in = {}
 
@@ -2607,6 +3464,8 @@ class SetQueueAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('set_queue_action',)
+
     def __attrs__(self):
         self.set_queue_action = {'queue': None, 'queue_id': None}
 
@@ -2656,6 +3515,8 @@ class GroupAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('group_action',)
+
     def __attrs__(self):
         self.group_action = {'group': None, 'group_id': None}
 
@@ -2717,6 +3578,8 @@ class SetFieldAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('set_field',)
+
     def __attrs__(self):
         self.set_field = {'vlan_match': None,
                           'protocol_match_fields': None,
@@ -2976,6 +3839,8 @@ class PushPBBHeaderAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('push_pbb_action',)
+
     def __attrs__(self):
         self.push_pbb_action = {'ethernet_type': None}
 
@@ -3013,6 +3878,8 @@ class PopPBBHeaderAction(Action):
         (OpenFlow Switch Specification Version 1.3)
     """
 
+    __slots__ = ('pop_pbb_action',)
+
     def __attrs__(self):
         self.pop_pbb_action = {}
 
@@ -3071,9 +3938,22 @@ class LoopbackAction(Action):
 '''
 
 
-class Match(object):
+class Match(_Compact):
     """ Class that represents OpenFlow flow matching attributes """
 
+    __slots__ = ('in_port', 'in_phy_port', 'ethernet_match', 'ipv4_source',
+                 'ipv4_destination', 'ip_match', 'ipv6_source',
+                 'ipv6_destination', 'ipv6_nd_target', 'ipv6_nd_sll',
+                 'ipv6_nd_tll', 'ipv6_label', 'ipv6_ext_header',
+                 'protocol_match_fields', 'udp_source_port',
+                 'udp_destination_port', 'tcp_source_port',
+                 'tcp_destination_port', 'sctp_source_port',
+                 'sctp_destination_port', 'icmpv4_match', 'icmpv6_match',
+                 'vlan_match', 'arp_op', 'arp_source_transport_address',
+                 'arp_target_transport_address',
+                 'arp_source_hardware_address', 'arp_target_hardware_address',
+                 'tunnel', 'metadata')
+
     def __attrs__(self):
         ''' Ingress port. Numerical representation of in-coming port,
             starting at 1 (may be a physical or switch-defined logical port)
@@ -3191,7 +4071,7 @@ class Match(object):
                 elif (k == 'vlan_match'):
                     self.vlan_match = VlanMatch(d[k])
                 else:
-                    setattr(self, k, v)
+                    self._set_attr(k, v)
         else:
             raise TypeError("[Match] wrong argument type '%s'"
                             " ('dict is expected)" % type(d))
@@ -3652,6 +4532,8 @@ class Match(object):
 class EthernetMatch(Match):
     """ Ethernet specific match fields """
 
+    __slots__ = ('ethernet_type', 'ethernet_source', 'ethernet_destination')
+
     def __attrs__(self):
         self.ethernet_type = None
         self.ethernet_source = None
@@ -3665,7 +4547,7 @@ class EthernetMatch(Match):
     def __init_from_dict__(self, d):
         if (d is not None and isinstance(d, dict)):
             for k, v in d.items():
-                setattr(self, k, v)
+                self._set_attr(k, v)
         else:
             raise TypeError("[Match] wrong argument type '%s'"
                             " ('dict is expected)" % type(d))
@@ -3719,6 +4601,8 @@ class EthernetMatch(Match):
 class VlanMatch(Match):
     """ VLAN specific match fields """
 
+    __slots__ = ('vlan_id', 'vlan_pcp')
+
     def __attrs__(self):
         ''' VLAN-ID from 802.1Q header '''
         self.vlan_id = None
@@ -3736,7 +4620,7 @@ class VlanMatch(Match):
                 if (k == 'vlan_id'):
                     self.vlan_id = VlanId(v)
                 else:
-                    setattr(self, k, v)
+                    self._set_attr(k, v)
         else:
             raise TypeError("!!!Error, argument '%s' is of a wrong type "
                             "('dict' is expected)" % d)
@@ -3770,6 +4654,8 @@ class VlanId(VlanMatch):
         of VLAN ID information encoded in match rules of a flow entry
     """
 
+    __slots__ = ('vlan_id_present',)
+
     def __attrs__(self):
         ''' VLAN-ID from 802.1Q header '''
         self.vlan_id = None
@@ -3786,7 +4672,7 @@ class VlanId(VlanMatch):
     def __init_from_dict__(self, d):
         if d is not None and isinstance(d, dict):
             for k, v in d.items():
-                setattr(self, k, v)
+                self._set_attr(k, v)
         else:
             raise TypeError("!!!Error, argument '%s' is of a wrong type "
                             "('dict' is expected)" % d)
@@ -3806,6 +4692,8 @@ class VlanId(VlanMatch):
 class IcmpMatch(Match):
     """ ICMPv4 specific match fields """
 
+    __slots__ = ('icmpv4_type', 'icmpv4_code')
+
     def __attrs__(self):
         ''' ICMP type '''
         self.icmpv4_type = None
@@ -3820,7 +4708,7 @@ class IcmpMatch(Match):
     def __init_from_dict__(self, d):
         if d is not None and isinstance(d, dict):
             for k, v in d.items():
-                setattr(self, k, v)
+                self._set_attr(k, v)
         else:
             raise TypeError("!!!Error, argument '%s' is of a wrong type "
                             "('dict' is expected)" % d)
@@ -3849,6 +4737,8 @@ class IcmpMatch(Match):
 class IcmpV6Match(Match):
     """ ICMPv6 specific match fields """
 
+    __slots__ = ('icmpv6_type', 'icmpv6_code')
+
     def __attrs__(self):
         ''' ICMPv6 type '''
         self.icmpv6_type = None
@@ -3863,7 +4753,7 @@ class IcmpV6Match(Match):
     def __init_from_dict__(self, d):
         if (d is not None and isinstance(d, dict)):
             for k, v in d.items():
-                setattr(self, k, v)
+                self._set_attr(k, v)
         else:
             raise TypeError("!!!Error, argument '%s' is of a wrong type "
                             "('dict' is expected)" % d)
@@ -3892,6 +4782,8 @@ class IcmpV6Match(Match):
 class IpMatch(Match):
     """ IPv4 protocol specific match fields """
 
+    __slots__ = ('ip_dscp', 'ip_ecn', 'ip_protocol')
+
     def __attrs__(self):
         ''' "IP DSCP (6 bits in ToS field) '''
         self.ip_dscp = None
@@ -3908,7 +4800,7 @@ class IpMatch(Match):
     def __init_from_dict__(self, d):
         if (d is not None and isinstance(d, dict)):
             for k, v in d.items():
-                setattr(self, k, v)
+                self._set_attr(k, v)
         else:
             raise TypeError("!!!Error, argument '%s' is of a wrong type "
                             "('dict' is expected)" % d)
@@ -3947,6 +4839,8 @@ class IpMatch(Match):
 class Ipv6Label(Match):
     """ IPv6 Flow Label """
 
+    __slots__ = ('ipv6_flabel', 'flabel_mask')
+
     def __attrs__(self):
         self.ipv6_flabel = None
         self.flabel_mask = None
@@ -3981,6 +4875,8 @@ class Ipv6Label(Match):
 class Ipv6ExtHdr(Match):
     """ IPv6 Extension Header pseudo-field """
 
+    __slots__ = ('ipv6_exthdr', 'ipv6_exthdr_mask')
+
     def __attrs__(self):
         self.ipv6_exthdr = None
         self.ipv6_exthdr_mask = None
@@ -4015,6 +4911,8 @@ class Ipv6ExtHdr(Match):
 class ProtocolMatchFields(Match):
     """ Protocol match fields """
 
+    __slots__ = ('mpls_label', 'mpls_tc', 'mpls_bos', 'pbb')
+
     def __attrs__(self):
         ''' The LABEL in the first MPLS shim header '''
         self.mpls_label = None
@@ -4033,7 +4931,7 @@ class ProtocolMatchFields(Match):
     def __init_from_dict__(self, d):
         if (d is not None and isinstance(d, dict)):
             for k, v in d.items():
-                setattr(self, k, v)
+                self._set_attr(k, v)
         else:
             raise TypeError("!!!Error, argument '%s' is of a wrong type "
                             "('dict' is expected)" % d)
@@ -4072,6 +4970,8 @@ class ProtocolMatchFields(Match):
 class Pbb(ProtocolMatchFields):
     """ The I-SID in the first PBB service instance tag """
 
+    __slots__ = ('pbb_isid', 'pbb_mask')
+
     def __attrs__(self):
         self.pbb_isid = None
         self.pbb_mask = None
@@ -4089,6 +4989,8 @@ class Pbb(ProtocolMatchFields):
 class ArpSrcHwAddrMatch(Match):
     """ ARP source hardware address """
 
+    __slots__ = ('address',)
+
     def __attrs__(self):
         self.address = None
 
@@ -4099,6 +5001,8 @@ class ArpSrcHwAddrMatch(Match):
 class ArpTgtHwAddrMatch(Match):
     ''' ARP target hardware address '''
 
+    __slots__ = ('address',)
+
     def __attrs__(self):
         self.address = None
 
@@ -4109,6 +5013,8 @@ class ArpTgtHwAddrMatch(Match):
 class Tunnel(Match):
     """ Metadata associated with a logical port """
 
+    __slots__ = ('tunnel_id',)
+
     def __attrs__(self):
         self.tunnel_id = None
 
@@ -4129,6 +5035,8 @@ class Tunnel(Match):
 class Metadata(Match):
     """ Table metadata. Used to pass information between tables """
 
+    __slots__ = ('metadata_mask',)
+
     def __attrs__(self):
         self.metadata = None
         self.metadata_mask = None
@@ -4200,8 +5108,14 @@ class GroupEntry():
 
     def __init_from_json__(self, js):
         if (js is not None and isinstance(js, basestring)):
-            obj = json.loads(js)
-            d = dict_keys_dashed_to_underscored(obj)
+            self.__init_from_dict__(json.loads(js))
+        else:
+            raise TypeError("[GroupEntry] wrong argument type '%s'"
+                            " (JSON 'string' is expected)" % type(js))
+
+    def __init_from_dict__(self, d):
+        if (d is not None and isinstance(d, dict)):
+            d = dict_keys_dashed_to_underscored(d)
             p1 = 'buckets'
             p2 = 'bucket'
             for k, v in d.items():
@@ -4214,14 +5128,6 @@ class GroupEntry():
                                 self.buckets[p2].append(bucket)
                 else:
                     setattr(self, k, v)
-        else:
-            raise TypeError("[GroupEntry] wrong argument type '%s'"
-                            " (JSON 'string' is expected)" % type(js))
-
-    def __init_from_dict__(self, d):
-        if (d is not None and isinstance(d, dict)):
-            js = json.dumps(d)
-            self.__init_from_json__(js)
         else:
             raise TypeError("[GroupEntry] wrong argument type '%s'"
                             " ('dict' is expected)" % type(d))
@@ -4236,37 +5142,28 @@ class GroupEntry():
                           sort_keys=True, indent=4)
 
     def to_yang_json(self, strip=False):
-        s = self.to_json()
-        # Convert all 'underscored' keywords to 'dash-separated' form used
-        # by ODL YANG models naming conventions
-        s = s.replace('_', '-')
-        # Following are exceptions from the common ODL rules for having all
-        # multi-part keywords in YANG models being hash separated
-#        s = s.replace('table-id', 'table_id')
-#        s = s.replace('cookie-mask', 'cookie_mask')
-        if strip:
-            # ignore unassigned ("empty") attributes
-            d1 = json.loads(s)
-            d2 = strip_none(d1)
-            s = json.dumps(d2, sort_keys=True, indent=4)
-
-        return s
+        """ Return GroupEntry as JSON with the keywords named as in the ODL
+            YANG models ('strip' leaves out unassigned attributes) """
+        d = _yang_data(self, strip=strip)
+        return json.dumps(d, sort_keys=True, indent=4)
 
     def get_payload(self):
-        """ Return GroupEntry as a payload for the HTTP request body """
-        s = self.to_json()
-        # Convert all 'underscored' keywords to 'dash-separated' form used
-        # by ODL YANG models naming conventions
-        s = s.replace('_', '-')
-        # Following are exceptions from the common ODL rules for having all
-        # multi-part keywords in YANG models being hash separated
-        s = s.replace('watch-group', 'watch_group')
-        s = s.replace('watch-port', 'watch_port')
-        d1 = json.loads(s)
-        d2 = strip_none(d1)
-        payload = {self._mn: d2}
-        return json.dumps(payload, default=lambda o: o.__dict__,
-                          sort_keys=True, indent=4)
+        """ Return GroupEntry as a payload for the HTTP request body
+            (compact JSON) """
+        return _yang_payload(self._mn, self, _GROUP_UNDERSCORED_KEYWORDS)
+
+    def canonical(self):
+        """ Return canonical form of this group entry content: the group
+            id, type and buckets (names and other attributes the Controller
+            keeps along with the group are left out) """
+        return _canonical_mapping([('group_id', self.group_id),
+                                   ('group_type', self.group_type),
+                                   ('buckets', self.buckets)])
+
+    def fingerprint(self):
+        """ Return stable hash (hex string) of the canonical form of this
+            group entry content """
+        return _fingerprint(self.canonical())
 
     def to_ofp_oxm_syntax(self):
         gl = []
@@ -4362,8 +5259,14 @@ class GroupBucket():
 
     def __init_from_json__(self, js):
         if (js is not None and isinstance(js, basestring)):
-            obj = json.loads(js)
-            d = dict_keys_dashed_to_underscored(obj)
+            self.__init_from_dict__(json.loads(js))
+        else:
+            raise TypeError("[GroupBucket] wrong argument type '%s'"
+                            " (JSON 'string' is expected)" % type(js))
+
+    def __init_from_dict__(self, d):
+        if (d is not None and isinstance(d, dict)):
+            d = dict_keys_dashed_to_underscored(d)
             p1 = 'action'
             for k, v in d.items():
                 if (k == p1):
@@ -4386,14 +5289,6 @@ class GroupBucket():
                         dbg_print(msg)
                 else:
                     setattr(self, k, v)
-        else:
-            raise TypeError("[GroupBucket] wrong argument type '%s'"
-                            " (JSON 'string' is expected)" % type(js))
-
-    def __init_from_dict__(self, d):
-        if (d is not None and isinstance(d, dict)):
-            js = json.dumps(d)
-            self.__init_from_json__(js)
         else:
             raise TypeError("[GroupBucket] wrong argument type '%s'"
                             " ('dict' is expected)" % type(d))
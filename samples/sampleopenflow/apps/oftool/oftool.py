@@ -41,6 +41,7 @@ oftool.py: OpenFlow tool command line utility (sample application)
 
 """
 
+import sys
 import json
 import yaml
 import argparse
@@ -56,6 +57,7 @@ from pysdn.openflowdev.ofswitch import (OFSwitch,
                                         GroupDescription,
                                         GroupStatistics,
                                         MeterFeatures)
+from pysdn.openflowdev.ofpformat import write_ofp_flows
 from pysdn.controller.topology import Topology, Node
 from pysdn.controller.inventory import (Inventory,
                                         OpenFlowCapableNode,
@@ -593,16 +595,14 @@ class FlowInfo():
         self.switchid = switch_id
 
     def show_table(self, table_id, oper, ofp):
-        flow_entries = []
+        flows = []
         ofswitch = OFSwitch(self.ctrl, self.switchid)
-        if oper:
-            result = ofswitch.get_operational_FlowEntries(table_id)
-        else:
-            result = ofswitch.get_configured_FlowEntries(table_id)
+        # The flows become objects as they get displayed
+        result = ofswitch.get_FlowTableView(table_id, oper)
         status = result.get_status()
         if(status.eq(STATUS.OK)):
             data = result.get_data()
-            flow_entries = sorted(data, key=lambda fe: fe.get_flow_priority())
+            flows = sorted(data, key=lambda fe: fe.get_flow_priority())
         elif(status.eq(STATUS.DATA_NOT_FOUND)):
             print "\n".strip()
             print " Requested data not found"
@@ -618,13 +618,14 @@ class FlowInfo():
         print (" Switch '%s' - %s Flows" % (self.switchid, s))
         print "\n".strip()
 
-        if len(flow_entries) > 0:
-            for flow_entry in flow_entries:
-                assert(isinstance(flow_entry, FlowEntry))
-                if(ofp):
-                    print (" -- Flow id '%s'" % flow_entry.get_flow_id())
-                    print (" %s" % flow_entry.to_ofp_oxm_syntax())
-                else:
+        if len(flows) > 0:
+            if(ofp):
+                write_ofp_flows(flows, sys.stdout,
+                                " -- Flow id '{id}'\n {flow}\n")
+            else:
+                for flow in flows:
+                    flow_entry = flow.get_flow_entry()
+                    assert(isinstance(flow_entry, FlowEntry))
                     lines = flow_entry.to_yang_json(strip=True).split('\n')
                     for line in lines:
                         print " %s" % line
@@ -0,0 +1,168 @@
+#!/usr/bin/python
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+
+
+"""
+
+import unittest
+import threading
+import time
+import mock
+
+from pysdn.controller.asynccontroller import AsyncController
+from pysdn.openflowdev.asyncofswitch import AsyncOFSwitch
+from pysdn.common.futures import (BoundedExecutor,
+                                  FutureTimeout,
+                                  as_completed,
+                                  wait_all)
+from pysdn.common.result import Result
+from pysdn.common.status import STATUS
+
+
+class MockResponse:
+    def __init__(self, content, status_code=200):
+        self.status_code = status_code
+        self.reason = "_NoRealReason_"
+        self.content = content
+
+
+class InFlightCounter(object):
+    """ Mocked 'requests.Session.get' that records the maximum number
+        of concurrent requests. """
+    def __init__(self, content, delay):
+        self.content = content
+        self.delay = delay
+        self.current = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(self.delay)
+        with self.lock:
+            self.current -= 1
+        return MockResponse(self.content)
+
+
+class FuturesTests(unittest.TestCase):
+
+    def test_ExecutorResultsAndErrors(self):
+        executor = BoundedExecutor(2)
+        ok = executor.submit(lambda x: x * 2, 21)
+        bad = executor.submit(lambda: {}['missing'])
+        self.assertEquals(42, ok.result(5))
+        self.assertRaises(KeyError, bad.result, 5)
+        self.assertTrue(isinstance(bad.exception(), KeyError))
+        executor.shutdown()
+
+    def test_AsCompletedOrder(self):
+        executor = BoundedExecutor(3)
+        slow = executor.submit(time.sleep, 0.3)
+        fast = executor.submit(time.sleep, 0)
+        order = list(as_completed([slow, fast], timeout=5))
+        self.assertTrue(order[0] is fast)
+        self.assertTrue(order[1] is slow)
+        executor.shutdown()
+
+    def test_AsCompletedTimeout(self):
+        executor = BoundedExecutor(1)
+        f = executor.submit(time.sleep, 1)
+        self.assertRaises(FutureTimeout, wait_all, [f], 0.05)
+        executor.shutdown()
+
+    def test_ExecutorBurstGrowsPool(self):
+        executor = BoundedExecutor(20)
+        wait_all(executor.map(time.sleep, [0.1] * 10), 5)
+        end = time.time() + 5
+        while executor._idle < 10 and time.time() < end:
+            time.sleep(0.01)
+        self.assertEquals(10, len(executor._threads))
+
+        # idle workers must not keep a burst from getting more threads
+        counter = InFlightCounter(None, 0.3)
+        wait_all([executor.submit(counter) for _ in range(20)], 5)
+        self.assertEquals(20, len(executor._threads))
+        self.assertEquals(20, counter.peak)
+        executor.shutdown()
+
+
+class AsyncClientTests(unittest.TestCase):
+
+    def test_AsyncControllerConcurrencyBound(self):
+        get = InFlightCounter('{"nodes":{"node":[{"id":"openflow:1"}]}}',
+                              0.05)
+        with mock.patch('requests.Session.get', side_effect=get):
+            actrl = AsyncController("192.0.2.168", 8181, "name", "password",
+                                    max_concurrency=4)
+            futures = [actrl.get_nodes_operational_list()
+                       for _ in range(16)]
+            results = wait_all(futures, timeout=10)
+            actrl.close()
+
+        self.assertEquals(16, len(results))
+        for result in results:
+            self.assertTrue(isinstance(result, Result))
+            self.assertTrue(result.get_status().eq(STATUS.OK))
+            self.assertEquals(['openflow:1'], result.get_data())
+        self.assertEquals(4, get.peak)
+        self.assertEquals(4, actrl.ctrl.http_pool['pool_maxsize'])
+
+    def test_AsyncOFSwitchSharesControllerBound(self):
+        get = InFlightCounter('{"flow-node-inventory:table":'
+                              '[{"id":0,"flow":[{"id":"f1","table_id":0}]}]}',
+                              0.05)
+        with mock.patch('requests.Session.get', side_effect=get):
+            actrl = AsyncController("192.0.2.168", 8181, "name", "password",
+                                    max_concurrency=3)
+            switches = [AsyncOFSwitch(actrl, "openflow:%d" % i)
+                        for i in range(6)]
+            futures = [s.get_flows(0) for s in switches]
+            results = wait_all(futures, timeout=10)
+            actrl.close()
+
+        self.assertEquals(3, get.peak)
+        self.assertEquals("openflow:5", switches[5].name)
+        url = switches[0].ctrl.get_node_operational_url("openflow:0")
+        self.assertTrue(url.endswith("node/openflow:0"))
+        for result in results:
+            self.assertTrue(result.get_status().eq(STATUS.OK))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -66,7 +66,7 @@ class ControllerTests(unittest.TestCase):
             print ("Failed to get Controller device attributes")
             exit(0)
 
-    # This method will be used by the mock to replace requests.get
+    # This method will be used by the mock to replace requests.Session.get
     def mocked_requests_http_error(*args, **kwargs):
         class MockResponse:
             def __init__(self, json_data, status_code):
@@ -92,7 +92,7 @@ class ControllerTests(unittest.TestCase):
 
         return MockResponse({"key2": "value2"}, 200)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_http_error)
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_http_error)
     def test_ControllerGetSchemas_404(self, controller):
 
         print ("--------------------------------------------------------- ")
@@ -112,7 +112,7 @@ class ControllerTests(unittest.TestCase):
         # and verify the results: STATUS.HTTP_ERROR
         self.assertEquals(10, status.status_code)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_empty_content)
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_empty_content)
     def test_ControllerGetSchemas_no_content(self, controller):
 
         print ("--------------------------------------------------------- ")
@@ -135,7 +135,7 @@ class ControllerTests(unittest.TestCase):
         # and verify the results: STATUS.DATA_NOT_FOUND
         self.assertEquals(2, status.status_code)
 
-    # This method will be used by the mock to replace requests.get
+    # This method will be used by the mock to replace requests.Session.get
     def mocked_requests_get_schemas(*args, **kwargs):
         class MockResponse:
             def __init__(self, json_data, status_code):
@@ -149,7 +149,7 @@ class ControllerTests(unittest.TestCase):
 
         return MockResponse({"key1": "value1"}, 200)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_get_schemas)
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get_schemas)
     def test_ControllerGetSchemas(self, controller):
 
         print ("--------------------------------------------------------- ")
@@ -181,7 +181,7 @@ class ControllerTests(unittest.TestCase):
         # and verify the results
         self.assertEquals(str(slist), "[u'(urn:ietf:params:xml:ns:yang:ietf-network-topology?revision=2015-06-08)ietf-network-topology', u'(urn:opendaylight:flow:errors?revision=2013-11-16)flow-errors', u'(urn:opendaylight:params:xml:ns:yang:topology:pcep?revision=2013-10-24)network-topology-pcep', u'(urn:opendaylight:params:xml:ns:yang:bgp-message?revision=2013-09-19)bgp-message', u'(urn:opendaylight:params:xml:ns:yang:netvirt:providers:config?revision=2016-01-09)netvirt-providers-config', u'(urn:opendaylight:params:xml:ns:yang:controller:netty:timer?revision=2013-11-19)netty-timer']")
 
-    # This method will be used by the mock to replace requests.get
+    # This method will be used by the mock to replace requests.Session.get
     def mocked_requests_get_nodes_list(*args, **kwargs):
         class MockResponse:
             def __init__(self, json_data, status_code):
@@ -195,7 +195,7 @@ class ControllerTests(unittest.TestCase):
 
         return MockResponse({"key1": "value1"}, 200)
 
-    @mock.patch('requests.get', side_effect=mocked_requests_get_nodes_list)
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get_nodes_list)
     def test_ControllerGetNodeList(self, controller):
 
         print ("--------------------------------------------------------- ")
@@ -222,6 +222,80 @@ class ControllerTests(unittest.TestCase):
         # and verify the results
         self.assertEquals(3, len(nlist))
 
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get_nodes_list)
+    def test_ControllerHttpPool(self, controller):
+
+        print ("--------------------------------------------------------- ")
+        print ("<< Test ControllerHttpPool Start")
+        print ("--------------------------------------------------------- ")
+        print ("<< Verifying that requests share one keep-alive session ")
+
+        ctrl = Controller(self.ctrlIpAddr, self.ctrlPortNum, self.ctrlUname, self.ctrlPswd,
+                          pool_maxsize=4, max_retries=2)
+        session = ctrl.http_pool.get_session()
+        ctrl.get_nodes_operational_list()
+        ctrl.get_nodes_operational_list()
+
+        # and verify the results
+        self.assertEquals(2, controller.call_count)
+        self.assertTrue(session is ctrl.http_pool.get_session())
+        adapter = session.get_adapter("http://%s" % self.ctrlIpAddr)
+        self.assertEquals(4, adapter._pool_maxsize)
+        d = json.loads(ctrl.to_json())
+        self.assertEquals(4, d['http_pool']['pool_maxsize'])
+        self.assertEquals(2, d['http_pool']['max_retries'])
+
+        ctrl.close()
+        self.assertFalse(session is ctrl.http_pool.get_session())
+
+
+    @mock.patch('requests.Session.post')
+    @mock.patch('requests.Session.get', side_effect=mocked_requests_get_nodes_list)
+    def test_ControllerInventoryCache(self, controller, post):
+
+        print ("--------------------------------------------------------- ")
+        print ("<< Test ControllerInventoryCache Start")
+        print ("--------------------------------------------------------- ")
+        print ("<< Verifying that inventory queries share one snapshot ")
+
+        ctrl = Controller(self.ctrlIpAddr, self.ctrlPortNum, self.ctrlUname, self.ctrlPswd)
+        ctrl.get_nodes_operational_list()
+        ctrl.get_nodes_operational_list()
+        # and verify the results: no caching unless enabled
+        self.assertEquals(2, controller.call_count)
+
+        ctrl.set_inventory_cache_ttl(60)
+        nlist = ctrl.get_nodes_operational_list().get_data()
+        status = ctrl.check_node_conn_status("vRouter_110").get_status()
+        clist = ctrl.get_all_nodes_conn_status().get_data()
+        ctrl.get_netconf_nodes_conn_status()
+        ctrl.get_openflow_nodes_operational_list()
+        ctrl.get_openflow_operational_flows_total_cnt()
+        self.assertEquals(3, controller.call_count)
+        self.assertEquals(['vRouter', 'vRouter_110', 'vRouter_120'], nlist)
+        self.assertTrue(status.eq(STATUS.NODE_DISONNECTED))
+        self.assertEquals(3, len(clist))
+
+        # config data store snapshot is kept under its own key
+        ctrl.get_all_nodes_in_config()
+        ctrl.get_netconf_nodes_in_config()
+        self.assertEquals(4, controller.call_count)
+
+        ctrl.invalidate_inventory_cache(operational=True)
+        ctrl.get_nodes_operational_list()
+        ctrl.get_all_nodes_in_config()
+        self.assertEquals(5, controller.call_count)
+
+        # write requests drop cached snapshots
+        ctrl.http_post_request("http://%s" % self.ctrlIpAddr, None, None)
+        ctrl.get_nodes_operational_list()
+        self.assertEquals(6, controller.call_count)
+
+        ctrl.set_inventory_cache_ttl(None)
+        ctrl.get_nodes_operational_list()
+        self.assertEquals(7, controller.call_count)
+        self.assertEquals({'ttl': None}, json.loads(ctrl.to_json())['inventory_cache'])
+
 
 if __name__ == '__main__':
     # unittest.main()
@@ -0,0 +1,323 @@
+#!/usr/bin/python
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+
+
+"""
+
+import unittest
+import json
+import mock
+
+from pysdn.controller.controller import Controller
+from pysdn.controller.inventory import (Inventory,
+                                        OpenFlowCapableNode,
+                                        NetconfConfigModule)
+from pysdn.controller.liveinventory import (LiveInventory,
+                                            NODE_ADDED, NODE_REMOVED,
+                                            FLOW_ADDED, FLOW_REMOVED)
+from pysdn.common.jsonstream import iter_json_array
+from pysdn.common.result import Result
+from pysdn.common.status import OperStatus, STATUS
+
+
+def openflow_node(n):
+    return {
+        "id": "openflow:%d" % n,
+        "flow-node-inventory:manufacturer": "Nicira, Inc.",
+        "node-connector": [
+            {"id": "openflow:%d:%d" % (n, p),
+             "flow-node-inventory:port-number": str(p),
+             "flow-node-inventory:name": "s%d-eth%d" % (n, p),
+             "flow-node-inventory:state": {"link-down": False}}
+            for p in (1, 2)],
+        "flow-node-inventory:table": [
+            {"id": t,
+             "opendaylight-flow-statistics:aggregate-flow-statistics":
+                {"flow-count": t + n}}
+            for t in (0, 1)],
+    }
+
+
+def netconf_node(name, capability):
+    return {
+        "id": name,
+        "netconf-node-inventory:connected": True,
+        "netconf-node-inventory:initial-capability": [
+            "(urn:ietf:params:xml:ns:yang:ietf-inet-types?"
+            "revision=2010-09-24)ietf-inet-types", capability],
+    }
+
+
+NODES = [openflow_node(1), openflow_node(2),
+         netconf_node("vRouter", "(http://www.vyatta.com/ns/"
+                      "vyatta-interfaces?revision=2014-12-02)"
+                      "vyatta-interfaces"),
+         netconf_node("other", "(urn:other?revision=2015-01-01)other")]
+
+
+def dump(obj):
+    return json.dumps(obj, default=lambda o: o.__dict__, sort_keys=True)
+
+
+class MockResponse:
+    def __init__(self, content, status_code=200):
+        self.status_code = status_code
+        self.reason = "_NoRealReason_"
+        self.content = content
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class InventoryTests(unittest.TestCase):
+
+    @mock.patch('requests.Session.get')
+    def test_BuildInventoryObject(self, get):
+        get.return_value = MockResponse(json.dumps({"nodes":
+                                                    {"node": NODES}}))
+        ctrl = Controller("192.0.2.168", 8181, "name", "password")
+        result = ctrl.build_inventory_object()
+
+        self.assertTrue(result.get_status().eq(STATUS.OK))
+        inv = result.get_data()
+        self.assertEquals(["openflow:1", "openflow:2"],
+                          inv.get_openflow_node_ids())
+        self.assertEquals(["vRouter"], inv.get_netconf_node_ids())
+        self.assertEquals("VRouter5600", inv.get_netconf_node("vRouter").clazz)
+        node = inv.get_openflow_node("openflow:2")
+        self.assertEquals("s2-eth1", node.get_port_name("openflow:2:1"))
+        self.assertEquals(5, node.get_flows_cnt())
+
+    def test_DictAndJsonPathsAreEquivalent(self):
+        self.assertEquals(dump(Inventory(inv_json=json.dumps(NODES))),
+                          dump(Inventory(inv_list=NODES)))
+        self.assertEquals(
+            OpenFlowCapableNode(inv_json=json.dumps(NODES[0])).to_json(),
+            OpenFlowCapableNode(inv_dict=NODES[0]).to_json())
+        # the input data is not modified
+        self.assertTrue("node-connector" in NODES[0])
+
+    def test_Lookups(self):
+        inv = Inventory(inv_list=NODES)
+        self.assertEquals(None, inv.get_openflow_node("openflow:3"))
+        self.assertEquals(None, inv.get_netconf_node("other"))
+        self.assertEquals(5, inv.get_openflow_node_flows_cnt("openflow:2"))
+        self.assertEquals(0, inv.get_openflow_node_flows_cnt("openflow:3"))
+
+        node = OpenFlowCapableNode(inv_dict=openflow_node(3))
+        inv.add_openflow_node(node)
+        self.assertTrue(inv.get_openflow_node("openflow:3") is node)
+        self.assertEquals("openflow:3:2", node.get_port_id("2"))
+        self.assertEquals(None, node.get_port_id("3"))
+        self.assertEquals("1", node.get_port_number("openflow:3:1"))
+        self.assertEquals("s3-eth2", node.get_port_obj("openflow:3:2")
+                          .get_port_name())
+        self.assertEquals(None, node.get_port_obj("openflow:3:3"))
+        self.assertEquals(4, node.get_flows_in_table_cnt(1))
+        self.assertEquals(0, node.get_flows_in_table_cnt(2))
+        # indexes are not part of the object representation
+        self.assertFalse("_ports_by_id" in node.to_json())
+        self.assertFalse("_ports_by_id" in node.to_string())
+
+    def test_NetconfConfigModule(self):
+        p = "odl-sal-netconf-connector-cfg:"
+        module = NetconfConfigModule({
+            "type": p + "sal-netconf-connector",
+            "name": "vRouter",
+            p + "address": "192.0.2.1",
+            p + "port": 830,
+            p + "max-connection-attempts": 0})
+
+        self.assertEquals("sal-netconf-connector", module.type)
+        self.assertEquals("192.0.2.1", module.get_ip_address())
+        self.assertEquals(830, module.get_tcp_port())
+        self.assertEquals(0, module.get_max_conn_attempts())
+
+
+class InventoryStreamTests(unittest.TestCase):
+
+    def test_IterJsonArray(self):
+        doc = json.dumps({"other": {"node": ["not", "this"]},
+                          "nodes": {"name": "a \\\"}]", "node": NODES}})
+        for chunk_size in (1, 3, 64, len(doc)):
+            chunks = [doc[i:i + chunk_size]
+                      for i in range(0, len(doc), chunk_size)]
+            self.assertEquals(NODES, list(iter_json_array(chunks,
+                                                          ("nodes", "node"))))
+        self.assertEquals([], list(iter_json_array(['{"nodes": {}}'],
+                                                   ("nodes", "node"))))
+        self.assertRaises(ValueError, list,
+                          iter_json_array([doc[:-3]], ("nodes", "node")))
+
+    @mock.patch('requests.Session.get')
+    def test_IterInventoryNodes(self, get):
+        resp = MockResponse(json.dumps({"nodes": {"node": NODES}}))
+        get.return_value = resp
+        ctrl = Controller("192.0.2.168", 8181, "name", "password")
+        result = ctrl.iter_inventory_nodes(chunk_size=7)
+
+        self.assertTrue(result.get_status().eq(STATUS.OK))
+        self.assertTrue(get.call_args[1]['stream'])
+        nodes = list(result.get_data())
+        self.assertEquals(["openflow:1", "openflow:2", "vRouter"],
+                          [node.get_id() for node in nodes])
+        self.assertTrue(isinstance(nodes[0], OpenFlowCapableNode))
+        self.assertTrue(resp.closed)
+
+        streamed = ctrl.build_inventory_object(stream=True).get_data()
+        self.assertEquals(dump(ctrl.build_inventory_object().get_data()),
+                          dump(streamed))
+
+    @mock.patch('requests.Session.get')
+    def test_IterInventoryNodesHttpError(self, get):
+        get.return_value = MockResponse("", status_code=404)
+        ctrl = Controller("192.0.2.168", 8181, "name", "password")
+        result = ctrl.iter_inventory_nodes()
+
+        self.assertTrue(result.get_status().eq(STATUS.HTTP_ERROR))
+        self.assertEquals(None, result.get_data())
+        self.assertTrue(get.return_value.closed)
+
+
+def with_flows(node, table_id, flow_ids):
+    for table in node["flow-node-inventory:table"]:
+        if table["id"] == table_id:
+            table["flow"] = [{"id": f} for f in flow_ids]
+    return node
+
+
+def flow(node_id, table_id, flow_id):
+    return mock.Mock(node_id=node_id, table_id=table_id, flow_id=flow_id)
+
+
+def change(nodes_added=(), nodes_removed=(), flows_added=(),
+           flows_removed=()):
+    n = mock.Mock()
+    n.nodes_added.return_value = list(nodes_added)
+    n.nodes_removed.return_value = list(nodes_removed)
+    n.flows_added.return_value = list(flows_added)
+    n.flows_removed.return_value = list(flows_removed)
+    return n
+
+
+class LiveInventoryTests(unittest.TestCase):
+
+    def setUp(self):
+        nodes = [with_flows(openflow_node(1), 0, ["f1", "f2"]),
+                 openflow_node(2)] + NODES[2:]
+        self.ctrl = mock.Mock()
+        self.ctrl.build_inventory_object.side_effect = \
+            lambda stream: Result(OperStatus(STATUS.OK),
+                                  Inventory(inv_list=nodes))
+        self.ctrl.build_openflow_node_inventory_object.side_effect = \
+            lambda node_id: Result(OperStatus(STATUS.OK),
+                                   OpenFlowCapableNode(inv_dict=with_flows(
+                                       openflow_node(3), 1, ["f9"])))
+        self.live = LiveInventory(self.ctrl, listener=mock.Mock())
+        self.changes = []
+        self.live.add_callback(lambda *c: self.changes.append(c))
+
+    def test_AppliesNotifications(self):
+        live = self.live
+        live.apply_notification(change(nodes_removed=["openflow:1"]))
+        self.assertEquals(1, live.get_counters()['skipped'])
+
+        self.assertTrue(live.seed().get_status().eq(STATUS.OK))
+        self.assertEquals(["openflow:1", "openflow:2", "vRouter"],
+                          live.get_node_ids())
+        self.assertEquals(2, live.get_flows_cnt("openflow:1"))
+        self.assertEquals([], self.changes)
+
+        live.apply_notification(change(
+            nodes_added=["openflow:3"],
+            flows_added=[flow("openflow:1", "0", "f3"),
+                         flow("openflow:1", "0", "f1"),
+                         flow("openflow:2", "1", "g1")],
+            flows_removed=[flow("openflow:1", "0", "f2"),
+                           flow("openflow:1", "0", "f7")]))
+        self.assertEquals([(FLOW_REMOVED, "openflow:1", 0, "f2"),
+                           (NODE_ADDED, "openflow:3", None, None),
+                           (FLOW_ADDED, "openflow:3", 1, "f9"),
+                           (FLOW_ADDED, "openflow:1", 0, "f3"),
+                           (FLOW_ADDED, "openflow:2", 1, "g1")],
+                          self.changes)
+        self.assertEquals(2, live.get_flows_cnt("openflow:1"))
+        self.assertEquals(1, live.get_flows_in_table_cnt("openflow:2", "1"))
+        self.assertEquals({1: 1}, live.get_table_flows_cnt("openflow:3"))
+        self.assertEquals(4, live.get_total_flows_cnt())
+        self.assertTrue(live.get_inventory().get_openflow_node("openflow:3"))
+
+        del self.changes[:]
+        live.apply_notification(change(nodes_removed=["openflow:1",
+                                                      "vRouter"]))
+        self.assertEquals([(NODE_REMOVED, "openflow:1", None, None),
+                           (NODE_REMOVED, "vRouter", None, None)],
+                          self.changes)
+        self.assertEquals(0, live.get_flows_cnt("openflow:1"))
+        self.assertEquals(2, live.get_total_flows_cnt())
+        self.assertEquals(None,
+                          live.get_inventory().get_openflow_node("openflow:1"))
+        self.assertEquals(["openflow:2", "openflow:3"], live.get_node_ids())
+        self.assertEquals(1, self.ctrl.build_inventory_object.call_count)
+
+    def test_ChangesDuringSeed(self):
+        live = self.live
+        fetch = self.ctrl.build_inventory_object.side_effect
+
+        def fetch_during_change(stream):
+            result = fetch(stream)
+            live.apply_notification(change(
+                nodes_removed=["openflow:2"],
+                flows_added=[flow("openflow:1", "0", "f4")]))
+            return result
+        self.ctrl.build_inventory_object.side_effect = fetch_during_change
+
+        live.seed()
+        self.assertEquals(["openflow:1", "vRouter"], live.get_node_ids())
+        self.assertEquals(3, live.get_flows_cnt("openflow:1"))
+        self.assertEquals([(NODE_REMOVED, "openflow:2", None, None),
+                           (FLOW_ADDED, "openflow:1", 0, "f4")],
+                          self.changes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,467 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+
+
+"""
+
+import time
+import threading
+import unittest
+import mock
+import websocket
+
+from pysdn.common.result import Result
+from pysdn.common.status import OperStatus, STATUS
+from pysdn.controller.controller import Controller
+from pysdn.controller.notification import (NotificationListener,
+                                           NetworkTopologyChangeNotification,
+                                           InventoryChangeNotification,
+                                           NotificationBatch,
+                                           OVERFLOW_DROP_NEWEST,
+                                           OVERFLOW_DROP_OLDEST,
+                                           PARSER_EXPAT, PARSER_XMLTODICT,
+                                           set_parser_backend)
+
+NOTIFICATION = ('<notification xmlns="urn:ietf:params:xml:ns:netconf:'
+                'notification:1.0"><eventTime>%s</eventTime>'
+                '<data-changed-notification xmlns="urn:opendaylight:params:'
+                'xml:ns:yang:controller:md:sal:remote">%s'
+                '</data-changed-notification></notification>')
+
+
+EVENT = ('<data-change-event><path xmlns:a="urn:TBD:params:xml:ns:yang:'
+         'network-topology">/a:network-topology/a:topology[a:topology-id='
+         '\'flow:1\']/a:node[a:node-id=\'%s\']/a:node-id</path>'
+         '<operation>%s</operation></data-change-event>')
+
+
+INV_EVENT = ('<data-change-event><path xmlns:a="urn:opendaylight:inventory"'
+             ' xmlns:b="urn:opendaylight:flow:inventory">/a:nodes/a:node['
+             'a:id=\'%s\']%s</path><operation>%s</operation>'
+             '</data-change-event>')
+
+
+def switch_added(*nums):
+    events = ''.join(EVENT % ('openflow:%d' % n, 'created') for n in nums)
+    return NOTIFICATION % (nums[0], events)
+
+
+def switch_removed(*nums):
+    events = ''.join(EVENT % ('openflow:%d' % n, 'deleted') for n in nums)
+    return NOTIFICATION % (nums[0], events)
+
+
+def topo_event(kind, item_id, operation):
+    path = ('/a:network-topology/a:topology[a:topology-id=\'flow:1\']'
+            '/a:%s[a:%s-id=\'%s\']/a:%s-id' % (kind, kind, item_id, kind))
+    return ('<data-change-event><path xmlns:a="urn:TBD:params:xml:ns:yang:'
+            'network-topology">%s</path><operation>%s</operation>'
+            '</data-change-event>' % (path, operation))
+
+
+class FakeWebSocket(object):
+    """ Returns the given messages from 'recv', then reports the connection
+        as closed (or blocks until closed if 'hold' is set). If 'gate' is
+        given, messages after the first one wait for the gate to open. """
+
+    def __init__(self, messages, hold=False, gate=None):
+        self.messages = list(messages)
+        self.hold = hold
+        self.gate = gate
+        self.closed = threading.Event()
+        self.sent = 0
+
+    def recv(self):
+        if self.gate is not None and self.sent == 1:
+            self.gate.wait(5)
+        if self.messages:
+            self.sent += 1
+            return self.messages.pop(0)
+        if self.hold and not self.closed.wait(0.05):
+            raise websocket.WebSocketTimeoutException("timed out")
+        raise websocket.WebSocketConnectionClosedException("closed")
+
+    def close(self):
+        self.closed.set()
+
+
+def ok(data):
+    return Result(OperStatus(STATUS.OK), data)
+
+
+def wait_for(cond, timeout=5.0):
+    deadline = time.time() + timeout
+    while not cond() and time.time() < deadline:
+        time.sleep(0.01)
+    return cond()
+
+
+class NotificationListenerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.ctrl = Controller("192.0.2.168", 8181, "name", "password")
+        self.path = self.ctrl.get_network_topology_yang_schema_path('flow:1')
+        patcher = mock.patch.multiple(
+            Controller,
+            create_data_change_event_subscription=mock.DEFAULT,
+            subscribe_to_stream=mock.DEFAULT)
+        mocks = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.create = mocks['create_data_change_event_subscription']
+        self.subscribe = mocks['subscribe_to_stream']
+        self.create.return_value = ok("stream-1")
+        self.subscribe.return_value = ok("ws://192.0.2.168:8185/stream-1")
+
+    @mock.patch('websocket.create_connection')
+    def test_DispatchAndReconnect(self, connect):
+        connect.side_effect = [
+            FakeWebSocket([switch_added(1), switch_added(2)]),
+            FakeWebSocket([switch_added(3)], hold=True)]
+        received = []
+        listener = NotificationListener(self.ctrl, self.path,
+                                        reconnect_delay=0.01)
+        listener.add_callback(lambda n: received.extend(n.switches_added()))
+        listener.start()
+        try:
+            self.assertTrue(wait_for(lambda: len(received) == 3))
+        finally:
+            listener.stop()
+
+        self.assertEquals(["openflow:1", "openflow:2", "openflow:3"],
+                          received)
+        # subscription is re-created for the new connection
+        self.assertEquals(2, self.create.call_count)
+        self.assertEquals(2, self.subscribe.call_count)
+        connect.assert_called_with("ws://192.0.2.168:8185/stream-1",
+                                   timeout=listener.recv_timeout)
+        counters = listener.get_counters()
+        self.assertEquals(3, counters['received'])
+        self.assertEquals(3, counters['dispatched'])
+        self.assertEquals(2, counters['connects'])
+        self.assertEquals(1, counters['disconnects'])
+        self.assertEquals(0, counters['dropped'])
+        self.assertFalse(listener.is_connected())
+
+    @mock.patch('websocket.create_connection')
+    def test_ConnectFailureRetried(self, connect):
+        self.create.side_effect = [Result(OperStatus(STATUS.CONN_ERROR),
+                                          None), ok("stream-1")]
+        connect.return_value = FakeWebSocket([switch_added(1)], hold=True)
+        received = []
+        listener = NotificationListener(self.ctrl, self.path,
+                                        reconnect_delay=0.01)
+        listener.add_callback(received.append)
+        listener.start()
+        try:
+            self.assertTrue(wait_for(lambda: received))
+            self.assertTrue(listener.wait_connected(1))
+        finally:
+            listener.stop()
+        self.assertTrue(isinstance(received[0],
+                                   NetworkTopologyChangeNotification))
+        self.assertEquals(1, listener.get_counters()['connect_failures'])
+        self.assertTrue(connect.return_value.closed.is_set())
+
+    def _overflow(self, policy):
+        busy = threading.Event()
+        release = threading.Event()
+        received = []
+
+        def slow(n):
+            busy.set()
+            release.wait(5)
+            received.extend(n.switches_added())
+
+        with mock.patch('websocket.create_connection') as connect:
+            connect.return_value = FakeWebSocket(
+                [switch_added(i) for i in range(10)], hold=True, gate=busy)
+            listener = NotificationListener(self.ctrl, self.path,
+                                            queue_size=3, overflow=policy,
+                                            lag_threshold=0)
+            listener.add_callback(slow)
+            listener.start()
+            try:
+                self.assertTrue(wait_for(
+                    lambda: listener.get_counters()['received'] == 10))
+                release.set()
+                self.assertTrue(wait_for(
+                    lambda: listener.get_counters()['queued'] == 0))
+                self.assertTrue(wait_for(lambda: len(received) == 4))
+            finally:
+                listener.stop()
+        counters = listener.get_counters()
+        self.assertEquals(6, counters['dropped'])
+        self.assertEquals(3, counters['queue_high_water'])
+        self.assertEquals(4, counters['lagging'])
+        return received
+
+    def test_OverflowDropNewest(self):
+        # the first notification is being handled, the next three are queued
+        self.assertEquals(["openflow:0", "openflow:1", "openflow:2",
+                           "openflow:3"],
+                          self._overflow(OVERFLOW_DROP_NEWEST))
+
+    def test_OverflowDropOldest(self):
+        self.assertEquals(["openflow:0", "openflow:7", "openflow:8",
+                           "openflow:9"],
+                          self._overflow(OVERFLOW_DROP_OLDEST))
+
+    @mock.patch('websocket.create_connection')
+    def test_CallbackErrorsCounted(self, connect):
+        connect.return_value = FakeWebSocket(
+            [switch_added(1, 2, 3), switch_added(4)], hold=True)
+        received = []
+
+        def failing(n):
+            raise ValueError("callback failure")
+
+        listener = NotificationListener(self.ctrl, self.path)
+        listener.add_callback(failing)
+        listener.add_callback(received.append)
+        listener.start()
+        try:
+            self.assertTrue(wait_for(lambda: len(received) == 2))
+        finally:
+            listener.stop()
+        self.assertEquals(2, listener.get_counters()['callback_errors'])
+
+    @mock.patch('websocket.create_connection')
+    def test_Coalescing(self, connect):
+        # openflow:1 flaps, openflow:2 is added, openflow:3 is removed,
+        # openflow:4 is added and removed again
+        flaps = [switch_added(1), switch_removed(1)] * 20
+        connect.return_value = FakeWebSocket(
+            flaps + [switch_added(1, 2, 4), switch_removed(3, 4)],
+            hold=True)
+        batches = []
+        listener = NotificationListener(self.ctrl, self.path,
+                                        coalesce_window=0.3)
+        listener.add_callback(batches.append)
+        listener.start()
+        try:
+            self.assertTrue(wait_for(lambda: len(batches) == 1))
+            time.sleep(0.4)
+        finally:
+            listener.stop()
+
+        self.assertEquals(1, len(batches))
+        batch = batches[0]
+        self.assertEquals(42, batch.get_notifications_cnt())
+        self.assertEquals(["openflow:1", "openflow:2"],
+                          batch.switches_added())
+        self.assertEquals(["openflow:3"], batch.switches_removed())
+        self.assertEquals([], batch.links_added())
+        counters = listener.get_counters()
+        self.assertEquals(42, counters['dispatched'])
+        self.assertEquals(1, counters['batches'])
+
+    @mock.patch('websocket.create_connection')
+    def test_CoalescingStopFlushes(self, connect):
+        connect.return_value = FakeWebSocket(
+            [switch_added(1), switch_added(2)], hold=True)
+        batches = []
+        listener = NotificationListener(self.ctrl, self.path,
+                                        coalesce_window=30)
+        listener.add_callback(batches.append)
+        listener.start()
+        try:
+            self.assertTrue(wait_for(
+                lambda: listener.get_counters()['received'] == 2))
+            time.sleep(0.2)
+            self.assertEquals([], batches)
+            self.assertEquals(0, listener.get_counters()['dispatched'])
+        finally:
+            listener.stop(5)
+
+        # stopped within the window, the batch is still passed on
+        self.assertEquals(1, len(batches))
+        self.assertEquals(["openflow:1", "openflow:2"],
+                          batches[0].switches_added())
+        counters = listener.get_counters()
+        self.assertEquals(2, counters['dispatched'])
+        self.assertEquals(1, counters['batches'])
+
+    @mock.patch('websocket.create_connection')
+    def test_CoalescingMaxBatch(self, connect):
+        connect.return_value = FakeWebSocket(
+            [switch_added(n) for n in range(1, 6)] +
+            [switch_removed(5), switch_added(6)], hold=True)
+        batches = []
+        listener = NotificationListener(self.ctrl, self.path,
+                                        coalesce_window=0.2,
+                                        coalesce_max_batch=2)
+        listener.add_callback(batches.append)
+        listener.start()
+        try:
+            # the last batch is passed when the window ends
+            self.assertTrue(wait_for(lambda: len(batches) == 3))
+        finally:
+            listener.stop()
+
+        self.assertEquals([["openflow:1", "openflow:2"],
+                           ["openflow:3", "openflow:4"],
+                           ["openflow:6"]],
+                          [b.switches_added() for b in batches])
+        self.assertEquals(1, listener.get_counters()['empty_batches'])
+
+
+class NotificationParserTests(unittest.TestCase):
+
+    TOPOLOGY = [
+        NOTIFICATION % ('2015-08-05T12:00:00Z',
+                        topo_event('node', 'openflow:1', 'created') +
+                        topo_event('node', 'host:00:00:00:00:00:01',
+                                   'created') +
+                        topo_event('link', 'openflow:1:2', 'created') +
+                        topo_event('node', 'openflow:2', 'deleted') +
+                        topo_event('node', 'host:00:00:00:00:00:02',
+                                   'deleted') +
+                        topo_event('link', 'openflow:2:1', 'deleted') +
+                        topo_event('link', 'openflow:3:1', 'updated')),
+        # single event
+        NOTIFICATION % ('2015-08-05T12:00:01Z',
+                        topo_event('node', 'openflow:3', 'created')),
+        # whitespace between the elements
+        NOTIFICATION % (' 2015-08-05T12:00:02Z\n',
+                        '\n  ' + topo_event('link', 'openflow:4:1',
+                                             'deleted') + '\n'),
+        # path without namespace declarations
+        NOTIFICATION % ('2015-08-05T12:00:03Z',
+                        '<data-change-event><path>/a:node[a:node-id='
+                        '\'openflow:5\']/a:node-id</path><operation>'
+                        'created</operation></data-change-event>'),
+        # formats handed over to xmltodict
+        NOTIFICATION % ('2015-08-05T12:00:04Z',
+                        '<data-change-event><path>/a:node-id</path>'
+                        '<operation>created</operation><extra>1</extra>'
+                        '</data-change-event>'),
+        NOTIFICATION % ('2015-08-05T12:00:05Z', ''),
+        '<notification><data-changed-notification/></notification>',
+        '<notification><eventTime>2015',
+    ]
+
+    INVENTORY = [
+        NOTIFICATION % ('2015-08-05T12:00:00Z',
+                        INV_EVENT % ('openflow:1', '', 'created') +
+                        INV_EVENT % ('openflow:2', '', 'deleted') +
+                        INV_EVENT % ('openflow:1',
+                                     "/b:table[b:id='0']/b:flow[b:id='f1']",
+                                     'created') +
+                        INV_EVENT % ('openflow:1',
+                                     "/b:table[b:id='0']/b:flow[b:id='f2']",
+                                     'deleted') +
+                        INV_EVENT % ('openflow:1',
+                                     "/b:table[b:id='0']", 'updated')),
+        NOTIFICATION % ('2015-08-05T12:00:01Z',
+                        INV_EVENT % ('openflow:3', '', 'created')),
+    ]
+
+    def tearDown(self):
+        set_parser_backend(PARSER_EXPAT)
+
+    def _parse(self, cls, xml, backend):
+        set_parser_backend(backend)
+        try:
+            n = cls(xml)
+        except Exception as e:
+            return type(e).__name__
+        events = [(vars(e.path_info), getattr(e, 'operation', None),
+                   e.is_node(), e.get_node_id())
+                  for e in getattr(n, 'events', [])]
+        flows = [vars(f) for f in getattr(n, 'added_flows', []) +
+                 getattr(n, 'removed_flows', [])]
+        attrs = dict((k, v) for k, v in vars(n).items()
+                     if k not in ('events', 'added_flows', 'removed_flows'))
+        return attrs, events, flows
+
+    def test_TopologyBackendsAgree(self):
+        for xml in self.TOPOLOGY:
+            expat = self._parse(NetworkTopologyChangeNotification, xml,
+                                PARSER_EXPAT)
+            legacy = self._parse(NetworkTopologyChangeNotification, xml,
+                                 PARSER_XMLTODICT)
+            self.assertEquals(repr(legacy), repr(expat), xml)
+
+        set_parser_backend(PARSER_EXPAT)
+        n = NetworkTopologyChangeNotification(self.TOPOLOGY[0])
+        self.assertEquals(['openflow:1'], n.switches_added())
+        self.assertEquals(['openflow:2'], n.switches_removed())
+        self.assertEquals(['openflow:1:2'], n.links_added())
+        self.assertEquals(['openflow:2:1'], n.links_removed())
+        self.assertEquals(1, len(n.hosts_added()))
+        self.assertEquals(1, len(n.hosts_removed()))
+
+    def test_InventoryBackendsAgree(self):
+        for xml in self.INVENTORY:
+            expat = self._parse(InventoryChangeNotification, xml,
+                                PARSER_EXPAT)
+            legacy = self._parse(InventoryChangeNotification, xml,
+                                 PARSER_XMLTODICT)
+            self.assertEquals(repr(legacy), repr(expat), xml)
+
+        set_parser_backend(PARSER_EXPAT)
+        n = InventoryChangeNotification(self.INVENTORY[0])
+        self.assertEquals(['openflow:1'], n.nodes_added())
+        self.assertEquals(['openflow:2'], n.nodes_removed())
+        self.assertEquals(1, len(n.flows_added()))
+        self.assertEquals(1, len(n.flows_removed()))
+
+    def test_Batch(self):
+        batch = NotificationBatch()
+        for xml in self.INVENTORY:
+            batch.add(InventoryChangeNotification(xml))
+        batch.add(InventoryChangeNotification(
+            NOTIFICATION % ('2015-08-05T12:00:02Z',
+                            INV_EVENT % ('openflow:3', '', 'deleted') +
+                            INV_EVENT % ('openflow:2', '', 'created') +
+                            INV_EVENT % ('openflow:1',
+                                         "/b:table[b:id='0']/b:flow"
+                                         "[b:id='f1']", 'deleted'))))
+        self.assertEquals(3, batch.get_notifications_cnt())
+        self.assertEquals('2015-08-05T12:00:02Z', batch.get_time())
+        self.assertEquals(['openflow:1'], batch.nodes_added())
+        self.assertEquals([], batch.nodes_removed())
+        self.assertEquals([], batch.flows_added())
+        self.assertEquals([('openflow:1', '0', 'f2')],
+                          [(f.node_id, f.table_id, f.flow_id)
+                           for f in batch.flows_removed()])
+        self.assertEquals([], batch.switches_added())
+        self.assertFalse(batch.is_empty())
+
+
+if __name__ == '__main__':
+    unittest.main()
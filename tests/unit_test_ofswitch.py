@@ -0,0 +1,1071 @@
+#!/usr/bin/python
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+
+
+"""
+
+import unittest
+import time
+import json
+import threading
+import mock
+from StringIO import StringIO
+
+from pysdn.controller.controller import Controller
+from pysdn.openflowdev.ofswitch import (OFSwitch,
+                                        FlowEntry,
+                                        Match,
+                                        Instruction,
+                                        OutputAction,
+                                        GroupEntry,
+                                        GroupBucket,
+                                        FlowEntryView,
+                                        FlowTableView,
+                                        flow_digest,
+                                        COUNTERS_QUEUE,
+                                        COUNTERS_GROUP)
+from pysdn.openflowdev.fleet import FleetExecutor
+from pysdn.openflowdev.collector import CounterCollector
+from pysdn.openflowdev.classifier import FlowClassifier, analyze_flows
+from pysdn.openflowdev.ofpformat import format_ofp_flow, write_ofp_flows
+from pysdn.openflowdev.flowstats import (FlowStatsSnapshot,
+                                         RATE_PACKETS,
+                                         numpy)
+from pysdn.common.result import Result
+from pysdn.common.status import OperStatus, STATUS
+from pysdn.common.timeseries import CounterSeries
+
+
+class MockResponse:
+    def __init__(self, status_code, content=''):
+        self.status_code = status_code
+        self.reason = "_NoRealReason_"
+        self.content = content
+
+
+def make_flow(table_id, flow_id, in_port=1, out_port=2):
+    flow_entry = FlowEntry()
+    flow_entry.set_flow_table_id(table_id)
+    flow_entry.set_flow_id(flow_id)
+    flow_entry.set_flow_priority(1000)
+    instruction = Instruction(instruction_order=0)
+    action = OutputAction(order=0, port=out_port)
+    instruction.add_apply_action(action)
+    flow_entry.add_instruction(instruction)
+    match = Match()
+    match.set_in_port(in_port)
+    flow_entry.add_match(match)
+    return flow_entry
+
+
+class OFSwitchBulkTests(unittest.TestCase):
+
+    def setUp(self):
+        self.ctrl = Controller("192.0.2.168", 8181, "name", "password")
+        self.ofswitch = OFSwitch(self.ctrl, "openflow:1")
+
+    @mock.patch('requests.Session.put')
+    @mock.patch('requests.Session.post')
+    def test_AddModifyFlowsChunked(self, post, put):
+        post.return_value = MockResponse(204)
+        flows = [make_flow(i % 2, i) for i in range(7)]
+        results = self.ofswitch.add_modify_flows(flows, chunk_size=2)
+
+        # table 0 has 4 flows (2 chunks), table 1 has 3 flows (2 chunks)
+        self.assertEquals(4, post.call_count)
+        self.assertEquals(0, put.call_count)
+        self.assertEquals(7, len(results))
+        for result in results:
+            self.assertTrue(result.get_status().eq(STATUS.OK))
+        url = post.call_args_list[0][0][0]
+        self.assertTrue(url.endswith("node/openflow:1/table/0"))
+        body = json.loads(post.call_args_list[0][1]['data'])
+        sent = body[FlowEntry._mn]
+        self.assertEquals(['0', '2'], [str(f['id']) for f in sent])
+        self.assertEquals(json.loads(flows[0].get_payload())[FlowEntry._mn],
+                          sent[0])
+
+    @mock.patch('requests.Session.put')
+    @mock.patch('requests.Session.post')
+    def test_AddModifyFlowsPerFlowFallback(self, post, put):
+        post.return_value = MockResponse(409, '{"errors":{}}')
+        put.side_effect = [MockResponse(200), MockResponse(400),
+                           MockResponse(200)]
+        flows = [make_flow(0, 1), make_flow(0, 2), "bogus", make_flow(0, 3)]
+        results = self.ofswitch.add_modify_flows(flows)
+
+        self.assertEquals(1, post.call_count)
+        self.assertEquals(3, put.call_count)
+        codes = [r.get_status().status_code for r in results]
+        self.assertEquals([STATUS.OK, STATUS.HTTP_ERROR,
+                           STATUS.MALFORM_DATA, STATUS.OK], codes)
+
+    @mock.patch('requests.Session.post')
+    def test_BadChunkSize(self, post):
+        flows = [make_flow(0, 1)]
+        for chunk_size in (0, -1):
+            self.assertRaises(ValueError, self.ofswitch.add_modify_flows,
+                              flows, chunk_size)
+            self.assertRaises(ValueError, self.ofswitch.delete_flows_by_ids,
+                              0, [1], chunk_size)
+        self.assertEquals(0, post.call_count)
+
+    @mock.patch('requests.Session.delete')
+    def test_DeleteFlowsByIds(self, delete):
+        def mocked_delete(url, **kwargs):
+            if url.endswith("/flow/missing"):
+                return MockResponse(404)
+            return MockResponse(200)
+        delete.side_effect = mocked_delete
+        ids = ["a", "missing", "b", "c"]
+        results = self.ofswitch.delete_flows_by_ids(3, ids, chunk_size=2)
+
+        self.assertEquals(4, delete.call_count)
+        codes = [r.get_status().status_code for r in results]
+        self.assertEquals([STATUS.OK, STATUS.DATA_NOT_FOUND,
+                           STATUS.OK, STATUS.OK], codes)
+
+
+def make_flow_data(flow_id, priority=1000, pkts=10):
+    return {'id': flow_id,
+            'table_id': 0,
+            'priority': priority,
+            'match': {'in-port': '1',
+                      'ethernet-match': {'ethernet-type': {'type': 2048}}},
+            'instructions': {'instruction': [
+                {'order': 0,
+                 'apply-actions': {'action': [
+                     {'order': 0,
+                      'output-action': {'output-node-connector': '2'}}]}}]},
+            'opendaylight-flow-statistics:flow-statistics': {
+                'packet-count': pkts, 'byte-count': pkts * 100,
+                'duration': {'second': 3, 'nanosecond': 500000000}}}
+
+
+class FlowTableViewTests(unittest.TestCase):
+
+    def setUp(self):
+        ctrl = Controller("192.0.2.168", 8181, "name", "password")
+        self.ofswitch = OFSwitch(ctrl, "openflow:1")
+        flows = [make_flow_data("f%d" % i, 1000 + i, i) for i in range(3)]
+        self.content = json.dumps({'flow-node-inventory:table':
+                                   [{'id': 0, 'flow': flows}]})
+
+    @mock.patch('requests.Session.get')
+    def test_LazyView(self, get):
+        get.return_value = MockResponse(200, self.content)
+        result = self.ofswitch.get_FlowTableView(0)
+
+        self.assertTrue(result.get_status().eq(STATUS.OK))
+        view = result.get_data()
+        self.assertEquals(3, len(view))
+        self.assertEquals(["f0", "f1", "f2"], view.get_flow_ids())
+        flow = view[1]
+        self.assertTrue(isinstance(flow, FlowEntryView))
+        self.assertTrue(flow is view[1])
+        self.assertEquals(1001, flow.get_flow_priority())
+        self.assertEquals(1, flow.get_pkts_cnt())
+        self.assertEquals(100, flow.get_bytes_cnt())
+        self.assertEquals(3.5, flow.get_duration())
+        # sub-objects are built on first access only
+        self.assertEquals(None, flow._match)
+        self.assertEquals(None, flow._flow_entry)
+        match = flow.get_match_fields()
+        self.assertTrue(isinstance(match, Match))
+        self.assertTrue(match is flow.get_match_fields())
+        self.assertEquals(2048, match.get_eth_type())
+        instructions = flow.get_instructions()
+        self.assertEquals(1, len(instructions))
+        self.assertTrue(isinstance(instructions[0], Instruction))
+
+        flow_entry = flow.get_flow_entry()
+        self.assertTrue(isinstance(flow_entry, FlowEntry))
+        self.assertEquals("f1", flow_entry.get_flow_id())
+        self.assertEquals(1, flow_entry.get_pkts_cnt())
+        self.assertEquals(flow_entry.to_ofp_oxm_syntax(),
+                          FlowEntry(flow_dict=make_flow_data("f1", 1001, 1))
+                          .to_ofp_oxm_syntax())
+        self.assertEquals(["f0", "f1", "f2"],
+                          [fe.get_flow_id() for fe in view.get_FlowEntries()])
+
+    @mock.patch('requests.Session.get')
+    def test_Projection(self, get):
+        get.return_value = MockResponse(200, self.content)
+        fields = ('id', 'flow_statistics')
+        view = self.ofswitch.get_FlowTableView(0, fields=fields).get_data()
+
+        self.assertEquals([0, 1, 2], [f.get_pkts_cnt() for f in view])
+        self.assertEquals(["f0", "f1"], [f.get_flow_id() for f in view[:2]])
+        flow = view[2]
+        self.assertEquals(None, flow.get_flow_priority())
+        self.assertEquals(None, flow.get_match_fields())
+        self.assertEquals([], flow.get_instructions())
+        self.assertEquals(2, len(flow.get_flow_data()))
+
+    @mock.patch('requests.Session.get')
+    def test_NotFound(self, get):
+        get.return_value = MockResponse(404)
+        result = self.ofswitch.get_FlowTableView(0)
+
+        self.assertTrue(result.get_status().eq(STATUS.DATA_NOT_FOUND))
+        self.assertEquals(0, len(result.get_data()))
+
+
+class ReconcileFlowsTests(unittest.TestCase):
+
+    def setUp(self):
+        ctrl = Controller("192.0.2.168", 8181, "name", "password")
+        self.ofswitch = OFSwitch(ctrl, "openflow:1")
+        # configuration data store content as returned by the Controller
+        # (numbers may come back as strings)
+        configured = [make_flow(0, i).get_payload_dict() for i in range(6)]
+        configured[1]['priority'] = "1000"
+        configured[2]['match']['in-port'] = "1"
+        self.tables = {
+            "table/0": json.dumps({'flow-node-inventory:table':
+                                    [{'id': 0, 'flow': configured}]})}
+
+    def http_get(self, url, *args, **kwargs):
+        for k, v in self.tables.items():
+            if url.endswith(k):
+                return MockResponse(200, v)
+        return MockResponse(404)
+
+    def desired(self):
+        flows = [make_flow(0, i) for i in range(4)]
+        # flow 3 modified, flow 10 of table 0 and flow 0 of table 1 new
+        flows[3] = make_flow(0, 3, out_port=7)
+        flows.append(make_flow(0, 10))
+        flows.append(make_flow(1, 0))
+        return flows
+
+    @mock.patch('requests.Session.delete')
+    @mock.patch('requests.Session.put')
+    @mock.patch('requests.Session.post')
+    @mock.patch('requests.Session.get')
+    def test_DryRun(self, get, post, put, delete):
+        get.side_effect = self.http_get
+        result = self.ofswitch.reconcile_flows(self.desired(), dry_run=True)
+
+        self.assertTrue(result.get_status().eq(STATUS.OK))
+        report = result.get_data()
+        self.assertTrue(report.is_dry_run())
+        self.assertEquals(2, report.get_reads_cnt())
+        self.assertEquals(3, report.get_unchanged_cnt())
+        self.assertEquals([(0, 10), (1, 0)],
+                          [(f.get_flow_table_id(), f.get_flow_id())
+                           for f in report.get_flows_to_add()])
+        self.assertEquals([3], [f.get_flow_id()
+                                for f in report.get_flows_to_modify()])
+        self.assertEquals([(0, 4), (0, 5)], report.get_flows_to_delete())
+        self.assertEquals(5, report.get_changes_cnt())
+        self.assertFalse(report.is_in_sync())
+        self.assertEquals([], report.get_results())
+        self.assertTrue("table 0: +1 ~1 -2" in report.to_string())
+        self.assertEquals(2, get.call_count)
+        self.assertEquals(0, post.call_count + put.call_count +
+                          delete.call_count)
+
+    @mock.patch('requests.Session.delete')
+    @mock.patch('requests.Session.put')
+    @mock.patch('requests.Session.post')
+    @mock.patch('requests.Session.get')
+    def test_Apply(self, get, post, put, delete):
+        get.side_effect = self.http_get
+        post.return_value = MockResponse(204)
+        put.return_value = MockResponse(200)
+        delete.return_value = MockResponse(404)
+        result = self.ofswitch.reconcile_flows(self.desired(),
+                                               table_ids=[2])
+
+        self.assertTrue(result.get_status().eq(STATUS.OK))
+        report = result.get_data()
+        self.assertEquals(3, report.get_reads_cnt())
+        self.assertEquals(5, len(report.get_results()))
+        self.assertEquals([], report.get_failed_results())
+        # one bulk add per table, one replacement, two deletes
+        self.assertEquals(2, post.call_count)
+        self.assertEquals(1, put.call_count)
+        self.assertTrue(put.call_args[0][0].endswith("table/0/flow/3"))
+        self.assertEquals(2, delete.call_count)
+
+        put.return_value = MockResponse(400)
+        result = self.ofswitch.reconcile_flows(self.desired(), prune=False)
+        self.assertTrue(result.get_status().eq(STATUS.HTTP_ERROR))
+        failed = result.get_data().get_failed_results()
+        self.assertEquals([("modify", 0, 3)], [r[:3] for r in failed])
+        self.assertEquals([], result.get_data().get_flows_to_delete())
+
+    @mock.patch('requests.Session.get')
+    def test_InSync(self, get):
+        get.side_effect = self.http_get
+        flows = [make_flow(0, i) for i in range(6)]
+        result = self.ofswitch.reconcile_flows(flows)
+
+        self.assertTrue(result.get_status().eq(STATUS.OK))
+        self.assertTrue(result.get_data().is_in_sync())
+        self.assertEquals(6, result.get_data().get_unchanged_cnt())
+        self.assertEquals(flow_digest(flows[1]),
+                          flow_digest(json.loads(self.tables["table/0"])
+                                      ['flow-node-inventory:table'][0]
+                                      ['flow'][1]))
+
+        get.side_effect = None
+        get.return_value = MockResponse(500)
+        result = self.ofswitch.reconcile_flows(flows)
+        self.assertTrue(result.get_status().eq(STATUS.HTTP_ERROR))
+        self.assertEquals(None, result.get_data())
+        self.assertRaises(ValueError, self.ofswitch.reconcile_flows,
+                          [flows[0], flows[0]])
+
+
+def with_duration(d, seconds):
+    d['opendaylight-flow-statistics:flow-statistics']['duration'] = {
+        'second': seconds, 'nanosecond': 0}
+    return d
+
+
+@unittest.skipIf(numpy is None, "requires NumPy")
+class FlowStatsTests(unittest.TestCase):
+
+    def test_Snapshot(self):
+        flows = [make_flow_data("f%d" % i, 1000 + i, i) for i in range(3)]
+        del flows[2]['opendaylight-flow-statistics:flow-statistics']
+        del flows[1]['table_id']
+        s = FlowStatsSnapshot.from_flows(flows, "openflow:1", table_id=4,
+                                         timestamp=10.0)
+        self.assertEquals(3, len(s))
+        self.assertEquals([u"f0", u"f1", u"f2"], list(s.get_flow_ids()))
+        self.assertEquals([0, 4, 0], list(s.get_table_ids()))
+        self.assertEquals([1000, 1001, 1002], list(s.get_priorities()))
+        self.assertEquals([0, 1, -1], list(s.get_pkts_cnts()))
+        self.assertEquals([0, 100, -1], list(s.get_bytes_cnts()))
+        self.assertEquals(3.5, s.get_durations()[0])
+        self.assertTrue(numpy.isnan(s.get_durations()[2]))
+        self.assertEquals([(4, u"f1", 100), (0, u"f0", 0)], s.top(5))
+        # flow entries without an id can not be told apart
+        no_ids = [make_flow_data(None, pkts=5), make_flow_data(None)]
+        s2 = FlowStatsSnapshot.from_flows(flows + no_ids)
+        self.assertEquals([u"f0", u"f1", u"f2"], list(s2.get_flow_ids()))
+        self.assertEquals(3, len(s2.rates(s2)))
+        both = FlowStatsSnapshot.concatenate([s, s])
+        self.assertEquals(6, len(both))
+        self.assertEquals("openflow:1", both.get_node_id())
+
+    def test_Rates(self):
+        t0 = [with_duration(make_flow_data("f%d" % i, pkts=10), 10)
+              for i in range(4)]
+        t1 = [with_duration(make_flow_data("f0", pkts=30), 20),
+              # re-installed, counted from zero
+              with_duration(make_flow_data("f1", pkts=5), 5),
+              # added
+              with_duration(make_flow_data("f4", pkts=40), 4),
+              with_duration(make_flow_data("f3", pkts=10), 20)]
+        del t1[3]['opendaylight-flow-statistics:flow-statistics']['duration']
+        s0 = FlowStatsSnapshot.from_flows(t0, timestamp=100.0)
+        s1 = FlowStatsSnapshot.from_flows(t1, timestamp=110.0)
+        rates = s1.rates(s0)
+
+        self.assertEquals(4, len(rates))
+        self.assertEquals(2.0, rates.get_rate(0, "f0", RATE_PACKETS))
+        self.assertEquals(200.0, rates.get_rate(0, "f0"))
+        self.assertEquals(1.0, rates.get_rate(0, "f1", RATE_PACKETS))
+        self.assertEquals(10.0, rates.get_rate(0, "f4", RATE_PACKETS))
+        # no duration, interval is the time between the snapshots
+        self.assertEquals(0.0, rates.get_rate(0, "f3", RATE_PACKETS))
+        self.assertEquals(None, rates.get_rate(0, "f2"))
+        self.assertEquals([(0, u"f4", 1000.0), (0, u"f0", 200.0)],
+                          rates.top(2))
+        # no earlier counters, all flow entries rated over their durations
+        rates = s1.rates(FlowStatsSnapshot())
+        self.assertEquals(1.5, rates.get_rate(0, "f0", RATE_PACKETS))
+        self.assertRaises(TypeError, s1.rates, t0)
+
+    @mock.patch('requests.Session.get')
+    def test_SwitchSnapshot(self, get):
+        ctrl = Controller("192.0.2.168", 8181, "name", "password")
+        ofswitch = OFSwitch(ctrl, "openflow:1")
+        content = json.dumps({'flow-node-inventory:table':
+                              [{'id': 0, 'flow': [make_flow_data("f0")]}]})
+
+        def http_get(url, *args, **kwargs):
+            if url.endswith("table/0"):
+                return MockResponse(200, content)
+            return MockResponse(404)
+        get.side_effect = http_get
+        result = ofswitch.get_flow_stats_snapshot([0, 1])
+        self.assertTrue(result.get_status().eq(STATUS.OK))
+        snapshot = result.get_data()
+        self.assertEquals("openflow:1", snapshot.get_node_id())
+        self.assertEquals([u"f0"], list(snapshot.get_flow_ids()))
+        self.assertEquals([10], list(snapshot.get_pkts_cnts()))
+
+        get.side_effect = None
+        get.return_value = MockResponse(500)
+        result = ofswitch.get_flow_stats_snapshot(0)
+        self.assertTrue(result.get_status().eq(STATUS.HTTP_ERROR))
+        self.assertEquals(None, result.get_data())
+
+
+def make_match_flow(flow_id, priority, match, out_port=1, table_id=0):
+    return FlowEntry(flow_dict={
+        'id': flow_id, 'table_id': table_id, 'priority': priority,
+        'match': match,
+        'instructions': {'instruction': [
+            {'order': 0,
+             'apply-actions': {'action': [
+                 {'order': 0,
+                  'output-action': {
+                      'output-node-connector': str(out_port)}}]}}]}})
+
+
+class FlowClassifierTests(unittest.TestCase):
+
+    def setUp(self):
+        ip = {'ethernet-type': {'type': 2048}}
+        self.flows = [
+            make_match_flow("default", 0, {}),
+            make_match_flow("ip", 100, {'ethernet-match': ip}),
+            make_match_flow("net", 200, {'ethernet-match': ip,
+                                         'ipv4-destination': '10.0.0.0/24'}),
+            make_match_flow("web", 300, {'ethernet-match': ip,
+                                         'ipv4-destination': '10.0.0.5/32',
+                                         'ip-match': {'ip-protocol': 6},
+                                         'tcp-destination-port': 80}),
+            make_match_flow("port", 150, {'in-port': 'openflow:1:1'}),
+            make_match_flow("vlan", 400, {'vlan-match': {'vlan-id': {
+                'vlan-id': 10, 'vlan-id-present': True}}}),
+            make_match_flow("tagged", 350, {'vlan-match': {'vlan-id': {
+                'vlan-id-present': True}}}),
+            make_match_flow("mac", 120, {'ethernet-match': {
+                'ethernet-source': {'address': '00:00:00:00:00:01'}}}),
+            make_match_flow("same", 100, {'ethernet-match': ip}),
+            make_match_flow("arp", 500, {'arp-op': 1})]
+        self.classifier = FlowClassifier(self.flows)
+
+    def classify(self, header):
+        flow = self.classifier.classify(header)
+        return None if flow is None else flow.get_flow_id()
+
+    def test_Classify(self):
+        web = {'eth_type': 0x800, 'ipv4_dst': '10.0.0.5', 'ip_proto': 6,
+               'tcp_dst': 80}
+        self.assertEquals("web", self.classify(web))
+        web['tcp_dst'] = 81
+        self.assertEquals("net", self.classify(web))
+        self.assertEquals("ip", self.classify({'eth_type': 2048,
+                                               'ipv4_dst': '10.0.1.5'}))
+        self.assertEquals("port", self.classify({'eth_type': 0x806,
+                                                 'in_port': 1}))
+        self.assertEquals("vlan", self.classify({'in_port': 'openflow:1:1',
+                                                 'vlan_id': 10}))
+        self.assertEquals("tagged", self.classify({'in_port': 2,
+                                                   'vlan_id': 11}))
+        self.assertEquals("mac", self.classify(
+            {'eth_src': '00:00:00:00:00:01'}))
+        self.assertEquals("default", self.classify({}))
+        self.assertEquals(None, FlowClassifier().classify({}))
+        self.assertRaises(ValueError, self.classify, {'tcp_port': 80})
+
+        web['tcp_dst'] = 80
+        web['in_port'] = 1
+        self.assertEquals(["web", "net", "port", "ip", "same", "default"],
+                          [f.get_flow_id() for f in
+                           self.classifier.classify_all(web)])
+        self.assertEquals(9, len(self.classifier))
+        self.assertEquals(["arp"], [f.get_flow_id() for f in
+                                    self.classifier.get_skipped_flows()])
+
+    def test_Batch(self):
+        fields = ('eth_type', 'ipv4_dst', 'vlan_id')
+        rows = [(0x800, '10.0.0.5', None), (0x800, '10.0.0.5', None),
+                (None, None, 10), (0x800, None, None)]
+        self.assertEquals(["net", "net", "vlan", "ip"],
+                          [f.get_flow_id() for f in
+                           self.classifier.classify_batch(rows, fields)])
+        headers = [dict(zip(fields, row)) for row in rows]
+        self.assertEquals(self.classifier.classify_batch(rows, fields),
+                          self.classifier.classify_batch(headers))
+        self.assertRaises(ValueError, self.classifier.classify_batch,
+                          rows, ('eth_type', 'ipv4_dest'))
+
+
+class FlowOverlapTests(unittest.TestCase):
+
+    def setUp(self):
+        ip = {'ethernet-type': {'type': 2048}}
+        tcp = {'ip-protocol': 6}
+        vlan = {'vlan-id': {'vlan-id': 5, 'vlan-id-present': True}}
+        self.flows = [
+            make_match_flow("net8", 300, {'ethernet-match': ip,
+                                          'ipv4-destination': '10.0.0.0/8'}),
+            # shadowed by 'net8'
+            make_match_flow("net24", 200, {'ethernet-match': ip,
+                                           'ipv4-destination': '10.1.2.0/24',
+                                           'ip-match': tcp}),
+            make_match_flow("other", 200, {'ethernet-match': ip,
+                                           'ipv4-destination': '11.0.0.0/8'}),
+            make_match_flow("web", 100, {'ethernet-match': ip,
+                                         'ip-match': tcp,
+                                         'tcp-destination-port': 80}, 2),
+            make_match_flow("lan", 100, {'ethernet-match': ip,
+                                         'ipv4-source': '192.168.0.0/16'}, 3),
+            make_match_flow("lan2", 100, {'ethernet-match': ip,
+                                          'ipv4-source': '192.168.0.0/16'},
+                            3),
+            make_match_flow("v6", 100, {'ethernet-match': {
+                'ethernet-type': {'type': 0x86dd}}}, 6),
+            # matches on ARP fields, shadowed by 'net8' on the rest
+            make_match_flow("arp", 50, {'ethernet-match': ip,
+                                        'ipv4-destination': '10.9.0.0/16',
+                                        'arp-op': 1}),
+            make_match_flow("vlan", 100, {'vlan-match': vlan}, 4),
+            make_match_flow("other-table", 100, {}, 5, table_id=1)]
+
+    def test_Analyze(self):
+        report = analyze_flows(self.flows)
+
+        self.assertEquals(10, report.get_flows_cnt())
+        self.assertEquals([("net24", "net8"), ("arp", "net8")],
+                          [(f.get_flow_id(), by.get_flow_id())
+                           for f, by in report.get_shadowed()])
+        self.assertEquals([("web", "lan"), ("web", "lan2"), ("web", "vlan"),
+                           ("lan", "vlan"), ("lan2", "vlan"),
+                           ("v6", "vlan")],
+                          [(a.get_flow_id(), b.get_flow_id())
+                           for a, b in report.get_conflicts()])
+        self.assertEquals(["arp"], [f.get_flow_id() for f in
+                                    report.get_partial()])
+        self.assertFalse(report.is_clean())
+        self.assertTrue(analyze_flows(self.flows[2:4]).is_clean())
+        self.assertTrue("flow net24 (priority 200) by flow net8" in
+                        report.to_string())
+
+    @mock.patch('requests.Session.get')
+    def test_SwitchTables(self, get):
+        ctrl = Controller("192.0.2.168", 8181, "name", "password")
+        ofswitch = OFSwitch(ctrl, "openflow:1")
+        flows = [make_flow_data("f%d" % i, 1000 - i) for i in range(3)]
+        content = json.dumps({'flow-node-inventory:table':
+                              [{'id': 0, 'flow': flows}]})
+
+        def http_get(url, *args, **kwargs):
+            self.assertTrue("/config/" in url)
+            if url.endswith("table/0"):
+                return MockResponse(200, content)
+            return MockResponse(404)
+        get.side_effect = http_get
+        result = ofswitch.analyze_flow_tables([0, 1])
+        self.assertTrue(result.get_status().eq(STATUS.OK))
+        report = result.get_data()
+        self.assertEquals(3, report.get_flows_cnt())
+        self.assertEquals([("f1", "f0"), ("f2", "f0")],
+                          [(f.get_flow_id(), by.get_flow_id())
+                           for f, by in report.get_shadowed()])
+
+        get.side_effect = None
+        get.return_value = MockResponse(500)
+        result = ofswitch.analyze_flow_tables(0)
+        self.assertTrue(result.get_status().eq(STATUS.HTTP_ERROR))
+        self.assertEquals(None, result.get_data())
+
+
+class OfpFormatTests(unittest.TestCase):
+
+    def setUp(self):
+        self.flows = [make_flow_data("f%d" % i, 1000 + i, i)
+                      for i in range(3)]
+
+    def test_FormatFlow(self):
+        flow_entry = FlowEntry(flow_dict=self.flows[1])
+        self.assertEquals("duration=3.5s,table=0,n_packets=1,n_bytes=100,"
+                          "priority=1001 matches={in_port=1,eth_type=0x800}"
+                          " actions={output=2}",
+                          flow_entry.to_ofp_oxm_syntax())
+        view = FlowEntryView(self.flows[1])
+        self.assertEquals(flow_entry.to_ofp_oxm_syntax(),
+                          view.to_ofp_oxm_syntax())
+        self.assertEquals(None, view._flow_entry)
+
+        flow_entry = FlowEntry(flow_dict={
+            'id': 'arp', 'cookie': 10,
+            'match': {'arp-op': 1,
+                      'arp-source-hardware-address': {
+                          'address': '00:00:00:00:00:01'},
+                      'arp-target-hardware-address': {
+                          'address': '00:00:00:00:00:02'}}})
+        self.assertEquals("cookie=0xa matches={arp_op=1,"
+                          "arp_sha=00:00:00:00:00:01,"
+                          "arp_tha=00:00:00:00:00:02} actions={}",
+                          format_ofp_flow(flow_entry))
+
+    def test_WriteFlows(self):
+        out = StringIO()
+        out.flush = mock.Mock()
+        view = FlowTableView(self.flows)
+        cnt = write_ofp_flows(view, out, " -- Flow id '{id}'\n {flow}\n",
+                              flush=2)
+
+        self.assertEquals(3, cnt)
+        lines = out.getvalue().split('\n')
+        self.assertEquals(7, len(lines))
+        self.assertEquals(" -- Flow id 'f2'", lines[4])
+        self.assertEquals(" " + view[2].to_ofp_oxm_syntax(), lines[5])
+        self.assertEquals(2, out.flush.call_count)
+
+        out = StringIO()
+        self.assertEquals(0, write_ofp_flows([], out))
+        self.assertEquals("", out.getvalue())
+
+
+class FingerprintTests(unittest.TestCase):
+
+    def test_FlowEntry(self):
+        d1 = make_flow_data("f1")
+        d1['cookie'] = 0
+        d1['match']['ethernet-match']['ethernet-source'] = {
+            'address': "00:0a:0B:0c:0d:0e"}
+        d1['match']['ipv4-destination'] = "10.1.2.3/24"
+        d1['instructions']['instruction'][0]['apply-actions']['action'] = [
+            {'order': 1, 'output-action': {'output-node-connector': '2'}},
+            {'order': 0, 'pop-vlan-action': {}},
+            {'order': 2, 'dec-nw-ttl': {}}]
+        # the same flow entry with other id, counters and formatting
+        d2 = make_flow_data("f2", pkts=99)
+        d2['idle-timeout'] = 0
+        d2['match']['in-port'] = "openflow:1:1"
+        d2['match']['ethernet-match']['ethernet-source'] = {
+            'address': "00-0A-0B-0C-0D-0E"}
+        d2['match']['ipv4-destination'] = "10.1.2.0/24"
+        d2['instructions']['instruction'][0]['apply-actions']['action'] = [
+            {'order': 5, 'dec-nw-ttl': {}},
+            {'order': 3, 'output-action': {'output-node-connector':
+                                           'openflow:1:2'}},
+            {'order': 1, 'pop-vlan-action': {}}]
+        f1 = FlowEntry(flow_dict=d1)
+        f2 = FlowEntry(flow_json=json.dumps(d2))
+
+        self.assertEquals(f1.canonical(), f2.canonical())
+        self.assertEquals(f1.fingerprint(), f2.fingerprint())
+        self.assertEquals(40, len(f1.fingerprint()))
+        self.assertEquals(1, len(set([f1.fingerprint(), f2.fingerprint()])))
+        self.assertEquals(f1.get_match_fields().fingerprint(),
+                          f2.get_match_fields().fingerprint())
+        self.assertEquals(hash(f1.canonical()), hash(f2.canonical()))
+
+        # content that differs
+        f2.set_flow_priority(5)
+        self.assertNotEquals(f1.fingerprint(), f2.fingerprint())
+        f3 = FlowEntry(flow_dict=d1)
+        f3.set_flow_hard_timeout(30)
+        self.assertNotEquals(f1.fingerprint(), f3.fingerprint())
+        d4 = make_flow_data("f1")
+        d4['instructions']['instruction'][0]['apply-actions']['action'] = [
+            {'order': 0, 'output-action': {'output-node-connector': '2'}},
+            {'order': 1, 'pop-vlan-action': {}},
+            {'order': 2, 'dec-nw-ttl': {}}]
+        f4 = FlowEntry(flow_dict=d4)
+        self.assertNotEquals(f1.fingerprint(), f4.fingerprint())
+        actions = d4['instructions']['instruction'][0]['apply-actions']
+        actions['action'][2] = {'order': 2, 'pop-vlan-action': {}}
+        self.assertNotEquals(f4.fingerprint(),
+                             FlowEntry(flow_dict=d4).fingerprint())
+
+    def test_Stable(self):
+        flow_entry = make_flow(1, 7)
+        self.assertEquals(flow_entry.fingerprint(),
+                          FlowEntry(flow_dict=flow_entry.get_payload_dict())
+                          .fingerprint())
+        self.assertEquals(flow_digest(flow_entry),
+                          flow_digest(flow_entry.get_payload_dict()))
+
+    def test_FlowDigest(self):
+        # Controller data vs. a 'FlowEntry' with the content formatted
+        # another way
+        stats = 'opendaylight-flow-statistics:flow-statistics'
+        d = make_flow_data("f1")
+        del d[stats]
+        d['flags'] = "SEND_FLOW_REM CHECK_OVERLAP"
+        d['match']['in-port'] = "openflow:1:2"
+        d['match']['ipv4-destination'] = "10.0.0.1"
+        d2 = make_flow_data("f1")
+        del d2[stats]
+        d2['flags'] = "CHECK_OVERLAP SEND_FLOW_REM"
+        flow_entry = FlowEntry(flow_dict=d2)
+        flow_entry.get_match_fields().set_in_port(2)
+        flow_entry.get_match_fields().set_ipv4_dst("10.0.0.1/32")
+
+        self.assertEquals(flow_digest(d), flow_digest(flow_entry))
+        self.assertEquals(flow_digest({'match': {
+                          'in-port': "openflow:1:2",
+                          'ipv4-destination': "10.0.0.1"}}),
+                          flow_digest({'match': {
+                              'in-port': "2",
+                              'ipv4-destination': "10.0.0.1/32"}}))
+        flow_entry.get_match_fields().set_in_port(3)
+        self.assertNotEquals(flow_digest(d), flow_digest(flow_entry))
+
+    def test_GroupEntry(self):
+        group_entry = GroupEntry(group_id=7, group_type="group-ff")
+        bucket = GroupBucket(bucket_id=1)
+        bucket.set_watch_port(3)
+        bucket.add_action(OutputAction(order=0, port=2))
+        group_entry.add_bucket(bucket)
+        d = json.loads(group_entry.get_payload())[GroupEntry._mn]
+        d['group-name'] = "g7"
+        other = GroupEntry(group_dict=d)
+
+        self.assertEquals(group_entry.fingerprint(), other.fingerprint())
+        other.get_buckets()[0].set_watch_port(4)
+        self.assertNotEquals(group_entry.fingerprint(), other.fingerprint())
+
+
+class PayloadTests(unittest.TestCase):
+
+    def test_FlowPayload(self):
+        flow_entry = make_flow(1, "f_1")
+        flow_entry.set_flow_name("my_flow")
+        flow_entry.set_flow_cookie_mask(255)
+        payload = flow_entry.get_payload()
+
+        self.assertTrue(" " not in payload)
+        d = json.loads(payload)[FlowEntry._mn]
+        self.assertEquals(flow_entry.get_payload_dict(), d)
+        # values keep their underscores
+        self.assertEquals("f_1", d['id'])
+        self.assertEquals("my_flow", d['flow-name'])
+        self.assertEquals(1, d['table_id'])
+        self.assertEquals(255, d['cookie_mask'])
+        self.assertEquals(1000, d['priority'])
+        self.assertEquals({'in-port': 1}, d['match'])
+        self.assertFalse('hard-timeout' in d)
+        inst = d['instructions']['instruction'][0]
+        self.assertEquals({'order': 0, 'output-action':
+                           {'output-node-connector': 2}},
+                          inst['apply-actions']['action'][0])
+
+        d = json.loads(flow_entry.to_yang_json())
+        self.assertEquals(None, d['hard-timeout'])
+        self.assertEquals(json.loads(payload)[FlowEntry._mn],
+                          json.loads(flow_entry.to_yang_json(strip=True)))
+
+    def test_GroupPayload(self):
+        group_entry = GroupEntry(group_id=7, group_type="group-ff")
+        group_entry.set_group_name("g_7")
+        bucket = GroupBucket(bucket_id=1)
+        bucket.set_watch_port(3)
+        bucket.add_action(OutputAction(order=0, port=2))
+        group_entry.add_bucket(bucket)
+        d = json.loads(group_entry.get_payload())[GroupEntry._mn]
+
+        self.assertEquals("g_7", d['group-name'])
+        self.assertFalse('barrier' in d)
+        b = d['buckets']['bucket'][0]
+        self.assertEquals(3, b['watch_port'])
+        self.assertEquals(1, b['bucket-id'])
+        self.assertFalse('watch_group' in b)
+        self.assertEquals(3, json.loads(group_entry.to_yang_json())[
+            'buckets']['bucket'][0]['watch-port'])
+
+
+def make_node_data(name, rx_bytes=1000, queue_bytes=500, group_pkts=7):
+    stats = ('opendaylight-port-statistics:'
+             'flow-capable-node-connector-statistics')
+    queue_stats = ('opendaylight-queue-statistics:'
+                   'flow-capable-node-connector-queue-statistics')
+    return {'node': [{
+        'id': name,
+        'node-connector': [
+            {'id': name + ':1',
+             'flow-node-inventory:port-number': 1,
+             stats: {'packets': {'received': 10, 'transmitted': 20},
+                     'bytes': {'received': rx_bytes, 'transmitted': 2000},
+                     'receive-drops': 0},
+             'flow-node-inventory:queue': [
+                 {'queue-id': 0,
+                  queue_stats: {'transmitted-packets': 5,
+                                'transmitted-bytes': queue_bytes}}]}],
+        'flow-node-inventory:group': [
+            {'group-id': 10,
+             'opendaylight-group-statistics:group-statistics': {
+                 'packet-count': group_pkts, 'byte-count': 700}}],
+        'flow-node-inventory:table': [
+            {'id': 0, 'flow': [make_flow_data("f0")]}]}]}
+
+
+class CounterSeriesTests(unittest.TestCase):
+
+    def test_RingBuffer(self):
+        series = CounterSeries(capacity=3)
+        readings = [(0, 0), (1, 10), (2, 30), (3, 60), (5, 100), (6, 5)]
+        deltas = [series.add(v, t) for t, v in readings]
+
+        # the counter went back at t=6 (reset), counted from zero
+        self.assertEquals([None, 10, 20, 30, 40, 5], deltas)
+        self.assertEquals(None, series.add(200, 6))
+        self.assertEquals(3, len(series))
+        self.assertEquals([(3.0, 30.0, 1.0), (5.0, 40.0, 2.0),
+                           (6.0, 5.0, 1.0)], series.get_samples())
+        self.assertEquals(75.0, series.get_total())
+        self.assertEquals(18.75, series.get_rate())
+        self.assertEquals(15.0, series.get_rate(window=1.5))
+        self.assertEquals([30.0, 20.0, 5.0], series.get_rates())
+        self.assertEquals(20.0, series.get_percentile(50))
+        self.assertEquals(25.0, series.get_percentile(75))
+        self.assertEquals(5.0, series.get_percentile(0))
+        self.assertEquals(None, CounterSeries().get_percentile(50))
+        self.assertRaises(ValueError, series.get_percentile, 101)
+        self.assertRaises(ValueError, CounterSeries, 0)
+
+
+class CounterCollectorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.ctrl = Controller("192.0.2.168", 8181, "name", "password")
+
+    @mock.patch('requests.Session.get')
+    def test_GetCounters(self, get):
+        ofswitch = OFSwitch(self.ctrl, "openflow:1")
+        get.return_value = MockResponse(
+            200, json.dumps(make_node_data("openflow:1")))
+        counters = ofswitch.get_counters().get_data()
+
+        self.assertEquals(1000, counters[('port', 1, 'bytes-received')])
+        self.assertEquals(0, counters[('port', 1, 'receive-drops')])
+        self.assertFalse(('port', 1, 'transmit-drops') in counters)
+        self.assertEquals(500, counters[('queue', '1/0',
+                                         'transmitted-bytes')])
+        self.assertEquals(7, counters[('group', 10, 'packet-count')])
+        self.assertEquals(1000, counters[('flow', '0/f0', 'byte-count')])
+        counters = ofswitch.get_counters([COUNTERS_GROUP]).get_data()
+        self.assertEquals([('group', 10, 'byte-count'),
+                           ('group', 10, 'packet-count')], sorted(counters))
+
+        get.return_value = MockResponse(404)
+        result = ofswitch.get_counters()
+        self.assertTrue(result.get_status().eq(STATUS.DATA_NOT_FOUND))
+
+    @mock.patch('requests.Session.get')
+    def test_Poll(self, get):
+        collector = CounterCollector(self.ctrl, ["openflow:1"], interval=10,
+                                     min_interval=2, max_interval=40,
+                                     capacity=4)
+        key = ('port', 1, 'bytes-received')
+        # steady traffic, then a burst
+        for t, rx in enumerate([0, 1000, 2000, 3000, 4000, 14000]):
+            get.return_value = MockResponse(
+                200, json.dumps(make_node_data("openflow:1", rx)))
+            result = collector.poll("openflow:1", timestamp=100.0 + t)
+            self.assertTrue(result.get_status().eq(STATUS.OK))
+            if t == 4:
+                # stable rates stretch the interval
+                self.assertEquals(10 * 1.25 ** 3,
+                                  collector.get_interval("openflow:1"))
+        self.assertEquals(10 * 1.25 ** 3 / 2,
+                          collector.get_interval("openflow:1"))
+        self.assertEquals(4, len(collector.get_series("openflow:1", key)))
+        self.assertEquals(3250.0, collector.get_rate("openflow:1", key))
+        self.assertEquals(10000.0,
+                          collector.get_rate("openflow:1", key, window=1))
+        self.assertEquals(10000.0,
+                          collector.get_percentile("openflow:1", key, 100))
+        self.assertEquals(None, collector.get_rate("openflow:1", ('x',)))
+        self.assertEquals([('queue', '1/0', 'transmitted-bytes'),
+                           ('queue', '1/0', 'transmitted-packets')],
+                          collector.get_keys("openflow:1", COUNTERS_QUEUE))
+        self.assertEquals(0.0, collector.get_rates(
+            "openflow:1", COUNTERS_GROUP)[('group', 10, 'packet-count')])
+
+        # the group was removed, the port went down
+        data = make_node_data("openflow:1", 15000)
+        del data['node'][0]['flow-node-inventory:group']
+        get.return_value = MockResponse(200, json.dumps(data))
+        collector.poll("openflow:1", timestamp=106.0)
+        self.assertEquals([], collector.get_keys("openflow:1",
+                                                 COUNTERS_GROUP))
+        get.return_value = MockResponse(500)
+        interval = collector.get_interval("openflow:1")
+        result = collector.poll("openflow:1", timestamp=107.0)
+        self.assertTrue(result.get_status().eq(STATUS.HTTP_ERROR))
+        self.assertEquals(interval * 2, collector.get_interval("openflow:1"))
+        counters = collector.get_counters()
+        self.assertEquals(8, counters['polls'])
+        self.assertEquals(1, counters['poll_failures'])
+        self.assertEquals(2, counters['series_dropped'])
+
+    def test_Schedule(self):
+        polls = []
+        lock = threading.Lock()
+
+        def get_counters(switch, kinds):
+            with lock:
+                polls.append((switch.name, time.time()))
+            return Result(OperStatus(STATUS.OK), {('port', 1, 'x'): 1})
+
+        names = ["openflow:%d" % i for i in range(8)]
+        collector = CounterCollector(self.ctrl, names, interval=0.4,
+                                     min_interval=0.4, max_interval=0.4,
+                                     jitter=0.2, max_workers=4)
+        with mock.patch.object(OFSwitch, 'get_counters', autospec=True,
+                               side_effect=get_counters):
+            t0 = time.time()
+            collector.start()
+            time.sleep(0.3)
+            with lock:
+                first = sorted(t - t0 for _, t in polls)
+            time.sleep(0.6)
+            collector.stop()
+        with lock:
+            polled = set(name for name, _ in polls)
+            count = len(polls)
+
+        # the first polls are spread over the interval
+        self.assertTrue(len(first) < 8)
+        self.assertEquals(set(names), polled)
+        self.assertTrue(12 <= count <= 24)
+        self.assertFalse(collector.is_running())
+
+    def test_Restart(self):
+        polls = []
+        started = threading.Event()
+        gate = threading.Event()
+
+        def get_counters(switch, kinds):
+            polls.append(time.time())
+            started.set()
+            gate.wait(5)
+            return Result(OperStatus(STATUS.OK), {('port', 1, 'x'): 1})
+
+        collector = CounterCollector(self.ctrl, ["openflow:1"], interval=0.2,
+                                     min_interval=0.2, max_interval=0.2,
+                                     jitter=0)
+        with mock.patch.object(OFSwitch, 'get_counters', autospec=True,
+                               side_effect=get_counters):
+            collector.start()
+            self.assertTrue(started.wait(5))
+            # restarted while a poll of the first run is in progress
+            collector.stop()
+            collector.start()
+            gate.set()
+            time.sleep(0.3)
+            t0 = time.time()
+            time.sleep(1.0)
+            collector.stop()
+
+        # polled once per interval, not once per run
+        count = len([t for t in polls if t >= t0])
+        self.assertTrue(4 <= count <= 6, count)
+
+
+class FleetExecutorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.ctrl = Controller("192.0.2.168", 8181, "name", "password")
+        self.fleet = FleetExecutor(self.ctrl, max_workers=4)
+
+    def tearDown(self):
+        self.fleet.close()
+
+    @mock.patch('requests.Session.delete')
+    def test_RunMethodByName(self, delete):
+        # 'call_count' of a mock called from several threads at once may
+        # miss calls, so the calls are counted here
+        urls = []
+
+        def http_delete(url, *args, **kwargs):
+            urls.append(url)
+            return MockResponse(200)
+
+        delete.side_effect = http_delete
+        names = ["openflow:%d" % i for i in range(10)]
+        results = self.fleet.run('delete_flows', names, args=(0,))
+
+        self.assertEquals(10, len(urls))
+        self.assertEquals(sorted(names), results.succeeded())
+        self.assertEquals({}, results.failed())
+
+    def test_PartialFailures(self):
+        def operation(switch):
+            n = int(switch.name.split(':')[1])
+            if n == 1:
+                raise ValueError("broken switch")
+            if n == 2:
+                return Result(OperStatus(STATUS.HTTP_ERROR), None)
+            return [n]
+        names = ["openflow:%d" % i for i in range(4)]
+        results = self.fleet.run(operation, names)
+
+        self.assertEquals(["openflow:0", "openflow:3"], results.succeeded())
+        self.assertEquals([3], results["openflow:3"].get_data())
+        failed = results.failed()
+        self.assertTrue(isinstance(failed["openflow:1"].get_data(),
+                                   ValueError))
+        self.assertTrue(failed["openflow:1"].get_status().eq(STATUS.UNKNOWN))
+        self.assertTrue(failed["openflow:2"].get_status().eq(
+            STATUS.HTTP_ERROR))
+
+    def test_StreamingAndTimeouts(self):
+        delays = {"fast": 0, "slow": 0.3, "stuck": 5}
+        switches = [OFSwitch(self.ctrl, name) for name in
+                    ("stuck", "slow", "fast")]
+        t0 = time.time()
+        stream = self.fleet.iter_results(
+            lambda sw: time.sleep(delays[sw.name]), switches, timeout=1)
+        order = [(name, result.get_status().status_code)
+                 for name, result in stream]
+
+        self.assertEquals([("fast", STATUS.OK), ("slow", STATUS.OK),
+                           ("stuck", STATUS.TIMEOUT)], order)
+        self.assertTrue(time.time() - t0 < 2)
+
+    def test_GlobalDeadline(self):
+        fleet = FleetExecutor(self.ctrl, max_workers=1)
+        names = ["openflow:%d" % i for i in range(5)]
+        t0 = time.time()
+        results = fleet.run(lambda sw: time.sleep(0.2), names, deadline=0.5)
+        fleet.close()
+
+        self.assertTrue(time.time() - t0 < 1)
+        self.assertEquals(5, len(results))
+        self.assertTrue(1 <= len(results.succeeded()) <= 3)
+        self.assertTrue(len(results.failed()) >= 2)
+        for result in results.failed().values():
+            self.assertTrue(result.get_status().eq(STATUS.TIMEOUT))
+
+
+if __name__ == '__main__':
+    unittest.main()
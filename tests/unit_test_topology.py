@@ -0,0 +1,293 @@
+
+# Copyright (c) 2015,  BROCADE COMMUNICATIONS SYSTEMS, INC
+
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from this
+# software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+# THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+
+@authors: Sergei Garbuzov
+@status: Development
+
+
+"""
+
+import json
+import unittest
+import mock
+
+from pysdn.common.result import Result
+from pysdn.common.status import OperStatus, STATUS
+from pysdn.common.utils import dict_keys_dashed_to_underscored
+from pysdn.controller.controller import Controller
+from pysdn.controller.livetopology import LiveTopology
+from pysdn.controller.topology import Topology, Node, Link
+
+
+def link(src, src_tp, dst, dst_tp):
+    return {"link-id": src_tp,
+            "source": {"source-node": src, "source-tp": src_tp},
+            "destination": {"dest-node": dst, "dest-tp": dst_tp}}
+
+
+def topology():
+    #  h1 - s1 - s2 - s3 - h2
+    #         \         /
+    #          s4 ---- s5
+    nodes = [{"node-id": "openflow:%d" % n} for n in range(1, 6)]
+    nodes += [{"node-id": "host:00:00:00:00:00:0%d" % n,
+               "host-tracker-service:id": "00:00:00:00:00:0%d" % n}
+              for n in (1, 2)]
+    links = []
+    for a, b, pa, pb in [("openflow:1", "openflow:2", "2", "1"),
+                         ("openflow:2", "openflow:3", "2", "1"),
+                         ("openflow:1", "openflow:4", "3", "1"),
+                         ("openflow:4", "openflow:5", "2", "1"),
+                         ("openflow:5", "openflow:3", "2", "2"),
+                         ("host:00:00:00:00:00:01", "openflow:1", "", "1"),
+                         ("host:00:00:00:00:00:02", "openflow:3", "", "3")]:
+        ta = a + (":" + pa if pa else "")
+        tb = b + ":" + pb
+        links.append(link(a, ta, b, tb))
+        links.append(link(b, tb, a, ta))
+    return {"topology-id": "flow:1", "node": nodes, "link": links}
+
+
+class TopologyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.topo = Topology(topo_dict=topology())
+
+    def test_Lookups(self):
+        topo = self.topo
+        s1 = topo.get_switch("openflow:1")
+        self.assertEquals("openflow:1", s1.get_id())
+        self.assertEquals(None, topo.get_switch("host:00:00:00:00:00:01"))
+        self.assertTrue(topo.get_node_by_id("host:00:00:00:00:00:01")
+                        .is_host())
+        self.assertEquals(None, topo.get_node_by_id("openflow:9"))
+        peers = topo.get_peer_list_for_node_port_(s1, "1")
+        self.assertEquals(["host:00:00:00:00:00:01"],
+                          [n.get_id() for n in peers])
+        peers = topo.get_peer_list_for_node_port_(s1, "3")
+        self.assertEquals(["openflow:4"], [n.get_id() for n in peers])
+        self.assertEquals([], topo.get_peer_list_for_node_port_(s1, "4"))
+        self.assertEquals(3, len(topo.get_peer_list_for_node(s1)))
+        self.assertFalse("_adjacency" in topo.to_string())
+
+    def test_ShortestPath(self):
+        topo = self.topo
+        self.assertEquals(["host:00:00:00:00:00:01", "openflow:1",
+                           "openflow:2", "openflow:3",
+                           "host:00:00:00:00:00:02"],
+                          topo.get_shortest_path("host:00:00:00:00:00:01",
+                                                 "host:00:00:00:00:00:02"))
+        self.assertEquals(["openflow:4"],
+                          topo.get_shortest_path("openflow:4", "openflow:4"))
+        self.assertEquals(None, topo.get_shortest_path("openflow:4",
+                                                       "openflow:9"))
+        # hosts are not transited
+        topo.add_link(Link(
+            link("openflow:2", "openflow:2:3",
+                 "host:00:00:00:00:00:01", "host:00:00:00:00:00:01")))
+        self.assertEquals(["openflow:2", "openflow:1", "openflow:4"],
+                          topo.get_shortest_path("openflow:2",
+                                                 "openflow:4"))
+
+    def test_KShortestPaths(self):
+        paths = self.topo.get_k_shortest_paths("openflow:1", "openflow:3", 5)
+        self.assertEquals([["openflow:1", "openflow:2", "openflow:3"],
+                           ["openflow:1", "openflow:4", "openflow:5",
+                            "openflow:3"]], paths)
+        self.assertEquals(paths[:1], self.topo.get_k_shortest_paths(
+            "openflow:1", "openflow:3", 1))
+        self.assertEquals([], self.topo.get_k_shortest_paths(
+            "openflow:1", "openflow:9", 3))
+
+    def test_RemoveNodeAndLinks(self):
+        topo = self.topo
+        self.assertEquals("openflow:1:2",
+                          topo.get_link_by_id("openflow:1:2").get_id())
+        self.assertEquals("openflow:2",
+                          topo.remove_node("openflow:2").get_id())
+        self.assertEquals(None, topo.remove_node("openflow:2"))
+        self.assertEquals(None, topo.get_switch("openflow:2"))
+        self.assertEquals(4, topo.get_switches_cnt())
+        self.assertEquals(["openflow:1", "openflow:4", "openflow:5",
+                           "openflow:3"],
+                          topo.get_shortest_path("openflow:1", "openflow:3"))
+        self.assertEquals(1, len(topo.remove_link("openflow:4:2")))
+        self.assertEquals([], topo.remove_link("openflow:4:2"))
+        self.assertEquals(None, topo.get_link_by_id("openflow:4:2"))
+        self.assertEquals(None, topo.get_shortest_path("openflow:1",
+                                                       "openflow:3"))
+        # the reverse link is still there
+        self.assertEquals(["openflow:5", "openflow:4"],
+                          topo.get_shortest_path("openflow:5", "openflow:4"))
+        s5 = topo.get_switch("openflow:5")
+        self.assertEquals(1, len(topo.get_peer_list_for_node(s5)))
+
+
+def ok(data):
+    return Result(OperStatus(STATUS.OK), data)
+
+
+def not_found():
+    return Result(OperStatus(STATUS.DATA_NOT_FOUND), None)
+
+
+def node_obj(node_id):
+    return Node(dict_keys_dashed_to_underscored({"node-id": node_id}))
+
+
+def link_obj(src, src_tp, dst, dst_tp):
+    return Link(dict_keys_dashed_to_underscored(link(src, src_tp, dst,
+                                                     dst_tp)))
+
+
+def change(switches_added=(), switches_removed=(), links_added=(),
+           links_removed=()):
+    n = mock.Mock()
+    n.switches_added.return_value = list(switches_added)
+    n.switches_removed.return_value = list(switches_removed)
+    n.hosts_added.return_value = []
+    n.hosts_removed.return_value = []
+    n.links_added.return_value = list(links_added)
+    n.links_removed.return_value = list(links_removed)
+    return n
+
+
+class MockResponse:
+    def __init__(self, status_code, content='{}'):
+        self.status_code = status_code
+        self.reason = "_NoRealReason_"
+        self.content = content
+
+
+class TopologyElementTests(unittest.TestCase):
+
+    @mock.patch('requests.Session.get')
+    def test_LinkIdWithSlash(self, get):
+        link_id = "host:00:00:00:00:00:01/openflow:1:1"
+        content = '{"link": [%s]}' % json.dumps(
+            link("host:00:00:00:00:00:01", link_id,
+                 "openflow:1", "openflow:1:1"))
+        get.return_value = MockResponse(200, content)
+        ctrl = Controller("192.0.2.168", 8181, "name", "password")
+        result = ctrl.build_topology_link_object("flow:1", link_id)
+
+        self.assertTrue(result.get_status().eq(STATUS.OK))
+        self.assertEquals(link_id, result.get_data().link_id)
+        url = get.call_args[0][0]
+        self.assertTrue(url.endswith(
+            "/topology/flow:1/link/"
+            "host%3A00%3A00%3A00%3A00%3A00%3A01%2Fopenflow%3A1%3A1"))
+
+
+class LiveTopologyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.ctrl = mock.Mock()
+        self.ctrl.build_topology_object.side_effect = \
+            lambda name: ok(Topology(topo_dict=topology()))
+        self.live = LiveTopology(self.ctrl, listener=mock.Mock())
+
+    def test_AppliesNotifications(self):
+        live = self.live
+        live.apply_notification(change(switches_removed=["openflow:2"]))
+        self.assertEquals(1, live.get_counters()['skipped'])
+        self.assertEquals(None, live.get_topology())
+
+        live.reconcile()
+        topo = live.get_topology()
+        self.assertEquals(5, topo.get_switches_cnt())
+
+        self.ctrl.build_topology_node_object.side_effect = \
+            lambda name, node_id: ok(node_obj(node_id))
+        self.ctrl.build_topology_link_object.side_effect = \
+            lambda name, link_id: ok(link_obj("openflow:6", link_id,
+                                              "openflow:3", "openflow:3:3"))
+        live.apply_notification(change(switches_added=["openflow:6"],
+                                       switches_removed=["openflow:2"],
+                                       links_added=["openflow:6:1"],
+                                       links_removed=["openflow:2:2"]))
+        self.assertTrue(topo is live.get_topology())
+        self.assertEquals(None, topo.get_switch("openflow:2"))
+        self.assertEquals(["openflow:6", "openflow:3"],
+                          topo.get_shortest_path("openflow:6", "openflow:3"))
+
+        # added and removed again before it was fetched
+        self.ctrl.build_topology_node_object.side_effect = \
+            lambda name, node_id: not_found()
+        live.apply_notification(change(switches_added=["openflow:6"]))
+        self.assertEquals(None, topo.get_switch("openflow:6"))
+
+        counters = live.get_counters()
+        self.assertEquals(1, counters['nodes_added'])
+        self.assertEquals(2, counters['nodes_removed'])
+        self.assertEquals(1, counters['links_added'])
+        self.assertEquals(1, counters['links_removed'])
+
+    def test_Reconcile(self):
+        live = self.live
+        live.reconcile()
+        topo = live.get_topology()
+        topo.remove_node("openflow:5")
+        topo.remove_link("openflow:1:2")
+        topo.add_node(node_obj("openflow:7"))
+
+        # a change notified while the topology is being fetched
+        fetch = self.ctrl.build_topology_object.side_effect
+
+        def fetch_during_change(name):
+            result = fetch(name)
+            live.apply_notification(change(switches_removed=["openflow:4"]))
+            return result
+        self.ctrl.build_topology_object.side_effect = fetch_during_change
+
+        result = live.reconcile()
+        self.assertTrue(result.get_status().eq(STATUS.OK))
+        self.assertTrue(topo is result.get_data())
+        self.assertEquals(["openflow:1", "openflow:2", "openflow:3",
+                           "openflow:5"], topo.get_switch_ids())
+        self.assertEquals(["openflow:1", "openflow:2"],
+                          topo.get_shortest_path("openflow:1", "openflow:2"))
+        # openflow:5, openflow:7, openflow:1:2 and openflow:4 (removed
+        # before the fetch completed, restored by it, removed again)
+        self.assertEquals(4, live.get_counters()['reconcile_changes'])
+
+        self.ctrl.build_topology_object.side_effect = \
+            lambda name: Result(OperStatus(STATUS.CONN_ERROR), None)
+        live.reconcile()
+        self.assertEquals(1, live.get_counters()['reconcile_failures'])
+        self.assertEquals(4, topo.get_switches_cnt())
+
+
+if __name__ == '__main__':
+    unittest.main()